@@ -1,12 +1,13 @@
 
 
+import threading
 from langgraph.graph import StateGraph, END
 from src_v3.memory.schema import GraphState
 # from src_v3.components.bias_analyzer.bias_agent import bias_analyzer_agent
 from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
 # from src_v3.components.fact_checker.fact_checker_Agent import fact_checker_agent
 from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
-from src_v3.components.kg_builder.kg_builder import KnowledgeGraph
+from src_v3.workflow.factory import get_knowledge_graph
 from src_v3.agent_manager.transistions import TransitionManager
 
 
@@ -14,7 +15,10 @@ class AgentManager:
     def __init__(self):
         """Initialize the agent manager with a state graph"""
         self.graph = StateGraph(GraphState)
-        self.kg = KnowledgeGraph()
+        self.kg = get_knowledge_graph()
+        # Compiled once on first use and reused for every message
+        self._workflow = None
+        self._workflow_lock = threading.Lock()
 
     def register_agents(self):
         """Register all agents as nodes"""
@@ -97,7 +101,7 @@ class AgentManager:
             Response to the user
         """
         # Create workflow if not already created
-        workflow = self.create_workflow()
+        workflow = self.get_workflow()
 
         # Create initial state with user message
         initial_state = GraphState(
@@ -153,12 +157,17 @@ class AgentManager:
 
         return response
 
+    def get_workflow(self):
+        """Return the compiled workflow, compiling it on the first call only"""
+        if self._workflow is None:
+            with self._workflow_lock:
+                if self._workflow is None:
+                    self._workflow = self.create_workflow()
+        return self._workflow
+
     def create_workflow(self):
         """Create and return the complete workflow"""
-        # Add a chatbot node as the main entry point
-        self.graph.add_node("chatbot", self._chatbot_node)
-
-        # Register other agent nodes
+        # Register agent nodes, including the chatbot entry point
         self.register_agents()
 
         # Define workflow
@@ -2,6 +2,9 @@ from langchain_core.prompts import ChatPromptTemplate
 
 # Initial bias detection prompt
 
+# Bump when the prompt text changes so token usage and results can be compared per version
+BIAS_PROMPT_VERSION = "bias-simplified-v1"
+
 BiasAnalysisSimplifiedPrompt = ChatPromptTemplate.from_messages([
     ("system", """
         You are a political bias analyst tasked with determining the political bias of a news article.
@@ -39,4 +42,42 @@ BiasAnalysisSimplifiedPrompt = ChatPromptTemplate.from_messages([
     SHARED ENTITIES:
     {matched_entities}
     """)
-])
\ No newline at end of file
+])
+
+# Alternative that judges framing first and uses the KG hint only to break ties
+BIAS_FRAMING_PROMPT_VERSION = "bias-framing-v1"
+
+BiasAnalysisFramingPrompt = ChatPromptTemplate.from_messages([
+    ("system", """
+        You are a political bias analyst. Classify the political bias of a news article as "Left", "Right" or "Center".
+
+        First judge the article on its own: which perspectives it quotes, what it leaves out, and the tone and
+        word choice of its framing. Only if that reading is ambiguous, use the bias of the most structurally
+        similar article in a political knowledge graph and the entities both articles mention to decide.
+
+        Respond in JSON with this exact format:
+
+        {{
+            "bias": "Left" | "Right" | "Center",
+            "confidence_score": 0-100,
+            "reasoning": "Explain your determination briefly, and say whether the similar article bias changed it.",
+            "related_nodes": [list of article titles or node names used in comparison]
+        }}
+        """),
+    ("user", """
+    ARTICLE TEXT:
+    {article_text}
+
+    MOST SIMILAR ARTICLE BIAS:
+    {similar_bias}
+
+    SHARED ENTITIES:
+    {matched_entities}
+    """)
+])
+
+# Prompt version -> template, for create_bias_analysis_chain and the ablation grid
+BIAS_PROMPTS = {
+    BIAS_PROMPT_VERSION: BiasAnalysisSimplifiedPrompt,
+    BIAS_FRAMING_PROMPT_VERSION: BiasAnalysisFramingPrompt,
+}
@@ -1,6 +1,10 @@
 import logging
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src_v3.memory.schema import GraphState
+from src_v3.memory.article import as_article_record
+from src_v3.memory.entity_matcher import match_entities
 from .tools import (
     create_bias_analysis_chain,
     create_llm,
@@ -10,6 +14,11 @@ from .tools import (
     transformer
 )
 from src_v3.utils.aws_helpers import diagnostic_check
+from src_v3.utils.rate_limiter import Priority, request_priority
+from src_v3.utils.tracing import current_span, span, token_usage
+from src_v3.utils.token_meter import current_attribution, metering
+from src_v3.components.entity_extraction import AGENT_EXTRACTION_PROMPT_VERSION
+from .b_prompts import BIAS_PROMPT_VERSION
 import os
 
 # Configure logging
@@ -23,16 +32,17 @@ logging.basicConfig(
 )
 
 
-def bias_analyzer_agent(graph_state: GraphState, knowledge_graph) -> GraphState:
-    """
-    Bias analysis agent that uses LLM to analyze articles with KG context.
+# Batch defaults, overridable through the environment
+BIAS_BATCH_SIZE = int(os.environ.get("BIAS_BATCH_SIZE", "50"))
+BIAS_MAX_WORKERS = int(os.environ.get("BIAS_MAX_WORKERS", "10"))
 
-    Args:
-        graph_state: Current system state
-        knowledge_graph: Neo4j knowledge graph instance
+
+def _prepare_bias_analysis():
+    """
+    One-time setup shared by a whole run: entity extractor, diagnostics and the analysis chain.
 
     Returns:
-        Updated graph state
+        Bias analysis chain
     """
     # Initialize transformer if needed
     global transformer
@@ -50,54 +60,207 @@ def bias_analyzer_agent(graph_state: GraphState, knowledge_graph) -> GraphState:
         llm = create_llm()
         initialize_entity_extractor(llm)
 
-    logging.info("Starting direct KG bias analysis")
+    return create_bias_analysis_chain()
+
+
+def _extract_article_entities(article, knowledge_graph=None):
+    """
+    Entities of one article: frozen ones from a KG context snapshot, else the KG entities
+    the text mentions, else via the LLM graph transformer
+    """
+    frozen_entities = getattr(knowledge_graph, "frozen_entities", None)
+    if frozen_entities is not None:
+        entities = frozen_entities(article.get("url") or article.get("title") or "")
+        if isinstance(entities, list):
+            return entities
+    record = as_article_record(article)
+    with span("bias.match_entities") as stage:
+        entities = match_entities(knowledge_graph, " ".join(filter(None, (record.title, record.full_content))))
+        stage.set_attribute("entity_count", len(entities or []))
+    if entities is not None:
+        return entities
+    with span("bias.extract_entities") as stage, \
+            metering(stage="entity_extraction", prompt_version=AGENT_EXTRACTION_PROMPT_VERSION):
+        entities = extract_entities(article)
+        stage.set_attribute("entity_count", len(entities))
+    return entities
+
+
+def _similar_bias(entities, knowledge_graph):
+    """Bias label of the KG article most structurally similar to the given entities"""
+    with span("bias.kg_lookup", entity_count=len(entities)) as stage:
+        most_similar_bias = knowledge_graph.query_most_structurally_similar_bias(entities)
+        stage.set_attribute("similar_bias", most_similar_bias)
+    return most_similar_bias
+
 
+def _invoke_bias_chain(analysis_chain, article_text, similar_bias, entities_str,
+                       prompt_version=BIAS_PROMPT_VERSION):
+    """Single bias analysis LLM call"""
+    with span("bias.llm_call", prompt_version=prompt_version) as stage, \
+            metering(stage="bias_analysis", prompt_version=prompt_version):
+        result = analysis_chain.invoke({
+            "article_text": article_text,
+            "similar_bias": similar_bias,
+            "matched_entities": entities_str
+        })
+        stage.set_attributes(**token_usage(result))
+    return result
+
+
+def _analyze_article(article, analysis_chain, knowledge_graph):
+    """
+    Run entity extraction, KG lookup and the LLM call for one article.
+
+    Args:
+        article: Article record or dict
+        analysis_chain: Bias analysis chain from create_bias_analysis_chain
+        knowledge_graph: Knowledge graph instance, or None for LLM-only analysis
+
+    Returns:
+        Copy of the article with bias_result set
+    """
+    logging.info("Analyzing article: %s", article.get("title", "Untitled"))
+    start = time.perf_counter()
+
+    # Step 1: Format main article
+    with span("bias.format_article") as stage:
+        article_text = format_article(article)
+        stage.set_attribute("prompt_chars", len(article_text))
+
+    # Step 2: Extract entities
+    if knowledge_graph is not None:
+        entities = _extract_article_entities(article, knowledge_graph)
+        entities_str = ", ".join(entities)
+        most_similar_bias = _similar_bias(entities, knowledge_graph)
+        logging.info("Extracted entities: %s", entities)
+        logging.info("Most similar bias: %s", most_similar_bias)
+    else:
+        most_similar_bias = "Unknown"
+        entities_str = "N/A"
+        logging.info("No similar articles available. Use only the article text.")
+
+    # Step 3: Invoke LLM with both article and context
+    result = _invoke_bias_chain(analysis_chain, article_text, most_similar_bias, entities_str)
+
+    logging.info("LLM bias result: %s", result)
+
+    # Update article with result
+    article_copy = article.copy()
+    article_copy["bias_result"] = result
+    article_copy["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return article_copy
+
+
+def bias_analyzer_agent(graph_state: GraphState, knowledge_graph) -> GraphState:
+    """
+    Bias analysis agent that uses LLM to analyze articles with KG context.
+
+    Args:
+        graph_state: Current system state
+        knowledge_graph: Neo4j knowledge graph instance
+
+    Returns:
+        Updated graph state
+    """
     if isinstance(graph_state, dict):
         graph_state = GraphState(**graph_state)
 
-    new_state = graph_state.copy()
+    with span("bias_analyzer_agent", article_count=len(graph_state.articles),
+              kg_context=knowledge_graph is not None) as agent_span:
+        with span("bias.prepare"):
+            analysis_chain = _prepare_bias_analysis()
 
-    analysis_chain = create_bias_analysis_chain()
-    analyzed_articles = []
+        logging.info("Starting direct KG bias analysis")
 
-    for article in graph_state.articles:
-        try:
-            logging.info("Analyzing article: %s", article.get("title", "Untitled"))
-
-            # Step 1: Format main article
-            article_text = format_article(article)
-
-            # Step 2: Extract entities
-            if knowledge_graph is not None:
-                entities = extract_entities(article)
-                entities_str = ", ".join(entities)
-                most_similar_bias = knowledge_graph.query_most_structurally_similar_bias(entities)
-                similar_context = f"The most similar article in the political news KG has bias: {most_similar_bias}."
-                logging.info("Extracted entities: %s", entities)
-                logging.info("Most similar bias: %s", most_similar_bias)
-            else:
-                similar_context = "No similar articles available. Use only the article text."
-                most_similar_bias = "Unknown"
-                entities_str = "N/A"
-                logging.info("No similar articles available. Use only the article text.")
-
-            # Step 5: Invoke LLM with both article and context
-            result = analysis_chain.invoke({
-                "article_text": article_text,
-                "similar_bias": most_similar_bias,
-                "matched_entities": entities_str
-            })
-
-            logging.info("LLM bias result: %s", result)
-
-            # Update article with result
-            article_copy = article.copy()
-            article_copy["bias_result"] = result
-            analyzed_articles.append(article_copy)
+        new_state = graph_state.copy()
+        analyzed_articles = []
 
-        except Exception as e:
-            logging.error("Error processing article '%s': %s", article.get("title", "Untitled"), e)
+        for article in graph_state.articles:
+            try:
+                with span("bias.analyze_article", url=article.get("url"), title=article.get("title")), \
+                        metering(agent="bias_analyzer", article=article.get("url")):
+                    analyzed_articles.append(_analyze_article(article, analysis_chain, knowledge_graph))
+            except Exception as e:
+                logging.error("Error processing article '%s': %s", article.get("title", "Untitled"), e)
+
+        agent_span.set_attribute("failed_count", len(graph_state.articles) - len(analyzed_articles))
 
     new_state.articles = analyzed_articles
     new_state.current_status = "bias_analyzed"
-    return new_state
\ No newline at end of file
+    return new_state
+
+
+def _mark_processing_error(article, error: Exception):
+    """Keep a failed article in the batch output with the error recorded"""
+    article['processing_error'] = str(error)
+    article['bias_analysis'] = {'status': 'error', 'message': str(error)}
+    return article
+
+
+def bias_analyzer_batch(articles, knowledge_graph, batch_size: int = None, max_workers: int = None,
+                        progress_callback=None):
+    """
+    Batch entry point for bias analysis over many articles.
+
+    Setup (entity extractor, diagnostics, chain) runs once for the whole batch.
+    Articles are processed in chunks of batch_size, with up to max_workers
+    articles in flight at a time. A failing article is kept in the output,
+    marked with processing_error, and does not affect the others. If setup
+    fails, every article is marked with the setup error in the same way.
+
+    Args:
+        articles: Article records or dicts
+        knowledge_graph: Knowledge graph instance, or None for LLM-only analysis
+        batch_size: Number of articles per chunk (default BIAS_BATCH_SIZE)
+        max_workers: Maximum concurrent articles (default BIAS_MAX_WORKERS)
+        progress_callback: Optional callable(done, total) invoked after each chunk
+
+    Returns:
+        List of analyzed articles, in input order
+    """
+    batch_size = batch_size or BIAS_BATCH_SIZE
+    max_workers = max_workers or BIAS_MAX_WORKERS
+    total = len(articles)
+    if not total:
+        return []
+
+    try:
+        with span("bias.prepare"):
+            analysis_chain = _prepare_bias_analysis()
+    except Exception as e:
+        logging.error(f"Bias analysis setup failed, marking all {total} articles: {str(e)}")
+        results = [_mark_processing_error(article, e) for article in articles]
+        if progress_callback is not None:
+            progress_callback(total, total)
+        return results
+    # Worker threads do not inherit the caller's context, so article spans name their parent
+    parent_span = current_span()
+    attribution = current_attribution()
+    logging.info(f"Starting batch bias analysis of {total} articles "
+                 f"(batch size {batch_size}, {max_workers} workers)")
+
+    def analyze(article):
+        try:
+            # Batch traffic queues behind interactive requests in the shared Bedrock limiter
+            with request_priority(Priority.BATCH), \
+                    span("bias.analyze_article", parent=parent_span, url=article.get("url"),
+                         title=article.get("title")), \
+                    metering(**attribution), metering(agent="bias_analyzer", article=article.get("url")):
+                return _analyze_article(article, analysis_chain, knowledge_graph)
+        except Exception as e:
+            logging.error(f"Error processing article: {article.get('title', 'Unknown')} - {str(e)}")
+            return _mark_processing_error(article, e)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, total, batch_size):
+            chunk = articles[start:start + batch_size]
+            results.extend(executor.map(analyze, chunk))
+
+            done = len(results)
+            logging.info(f"Bias analysis progress: {done}/{total} articles")
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+    return results
@@ -2,19 +2,26 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_aws import ChatBedrock
 from src_v3.utils.aws_helpers import get_aws_credentials, diagnostic_check
+from src_v3.utils.llm_backend import bedrock_runtime_client
 from typing import List
 from langchain_neo4j import Neo4jGraph
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_core.documents import Document
+from src_v3.memory.article import as_article_record
+from src_v3.components.entity_extraction import ENTITY_EXTRACTION_MODE, EntityExtractor
 import logging
 from .b_prompts import (
-    BiasAnalysisSimplifiedPrompt
+    BIAS_PROMPT_VERSION,
+    BIAS_PROMPTS
 )
 from dotenv import load_dotenv
 import boto3
 import os
 load_dotenv()
 
+# Bedrock model used for bias analysis unless a caller picks another one
+BIAS_MODEL_ID = os.getenv("BIAS_MODEL_ID", "anthropic.claude-3-5-sonnet-20240620-v1:0")
+
 
 def create_bedrock_client():
     """Create authenticated Bedrock client"""
@@ -34,25 +41,25 @@ def create_bedrock_client():
         # Create session
         session = boto3.Session(**credentials)
 
-        # Create client
+        # Create client, sharing the process-wide Bedrock rate limit
         bedrock_client = session.client(service_name='bedrock-runtime')
 
-        return bedrock_client
+        return bedrock_runtime_client(bedrock_client)
     except Exception as e:
         print(f"Error creating bedrock client: {e}")
         print(f"Current working directory: {os.getcwd()}")
         raise
 
 
-def create_llm():
-    """Create Bedrock LLM Instance"""
+def create_llm(model_id: str = None):
+    """Create Bedrock LLM Instance (BIAS_MODEL_ID unless model_id is given)"""
     try:
         # Always use real AWS Bedrock - no mocks
         print("Using real AWS Bedrock")
         client = create_bedrock_client()
         llm = ChatBedrock(
             client=client,
-            model_id="anthropic.claude-3-5-sonnet-20240620-v1:0", #anthropic.claude-3-sonnet-20240229-v1:0
+            model_id=model_id or BIAS_MODEL_ID, #anthropic.claude-3-sonnet-20240229-v1:0
             model_kwargs={
                 "max_tokens": 4096,
                 "temperature": 0.2,
@@ -65,14 +72,22 @@ def create_llm():
         raise  # raise error if AWS fails
 
 
-def create_bias_analysis_chain():
-    """Create the bias analysis chain"""
+def create_bias_analysis_chain(prompt_version: str = BIAS_PROMPT_VERSION, model_id: str = None):
+    """
+    Create the bias analysis chain
+
+    Args:
+        prompt_version: Key of the prompt in BIAS_PROMPTS
+        model_id: Bedrock model id (default BIAS_MODEL_ID)
+    """
+    if prompt_version not in BIAS_PROMPTS:
+        raise ValueError(f"Unknown bias prompt {prompt_version!r}, expected one of {sorted(BIAS_PROMPTS)}")
     try:
         # Always use real AWS Bedrock LLM - no mocks
         client = create_bedrock_client()
         llm = ChatBedrock(
             client=client,
-            model_id="anthropic.claude-3-5-sonnet-20240620-v1:0",
+            model_id=model_id or BIAS_MODEL_ID,
             model_kwargs={
                 "max_tokens": 4096,
                 "temperature": 0.2,
@@ -82,7 +97,7 @@ def create_bias_analysis_chain():
 
         chain = (
                 RunnablePassthrough() |
-                BiasAnalysisSimplifiedPrompt |
+                BIAS_PROMPTS[prompt_version] |
                 llm
         )
 
@@ -92,27 +107,17 @@ def create_bias_analysis_chain():
         print(f"Error creating bias analysis chain: {e}")
         raise
 
-def format_article(article: dict) -> dict:
+def format_article(article: dict) -> str:
     """Formats article for analysis"""
-    title = article.get('title') or article.get('headline') or 'Untitled'
-    content = article.get('full_content') or article.get('content') or ''
-    source = article.get('source') or article.get('source_name') or 'Unknown Source'
-    date = article.get('date') or article.get('publishedAt') or 'No date provided'
-
-    formatted_text = f"""
-    Title: {title}
-    Content: {content}
-    Source: {source}
-    Date: {date}
-    """.strip()
-
-    # return dictionary with the formatted text
-    return formatted_text
+    # The record's prompt view reads the canonical fields in place, no per-call dict is built
+    return as_article_record(article).format_for_prompt()
 transformer = None
+entity_extractor = None
 
 def initialize_entity_extractor(llm) -> None:
-    """Initialize the LLMGraphTransformer for entity extraction"""
-    global transformer
+    """Initialize the entity-only extractor and the LLMGraphTransformer for entity extraction"""
+    global transformer, entity_extractor
+    entity_extractor = EntityExtractor(llm)
     transformer = LLMGraphTransformer(
         llm=llm,
         allowed_nodes=[
@@ -130,7 +135,7 @@ def initialize_entity_extractor(llm) -> None:
 
 
 def extract_entities(article: str) -> List[str]:
-    """Extracts named entities from article content using LLM-based graph transformation."""
+    """Extracts named entities from article content (entity-only prompt or LLM-based graph transformation, see ENTITY_EXTRACTION_MODE)."""
     logging.info(f"Extracting from article: {article.get('title', '')}")
     global transformer
 
@@ -146,13 +151,20 @@ def extract_entities(article: str) -> List[str]:
             return ["Test Entity 1", "Test Entity 2"]
 
     # Original function logic continues...
+    record = as_article_record(article)
+    if ENTITY_EXTRACTION_MODE == "entities" and entity_extractor is not None:
+        entities = entity_extractor.entity_names(
+            "\n\n".join(part for part in (record.title, record.full_content) if part))
+        logging.info(f"Extracted entities: {entities}")
+        return entities
+
     doc = Document(
-        page_content=article.get("full_content", "") or article.get("content", ""),
+        page_content=record.full_content or "",
         metadata={
-            "title": article.get("title", ""),
-            "source": article.get("source", ""),
-            "date": article.get("date", ""),
-            "url": article.get("url", "")
+            "title": record.title or "",
+            "source": record.source or "",
+            "date": record.date or "",
+            "url": record.url or ""
         }
     )
     graph_objs = transformer.convert_to_graph_documents([doc])
@@ -0,0 +1,91 @@
+"""
+Entity-only extraction for the agents.
+
+The agents need nothing but entity names from a claim or article, yet
+LLMGraphTransformer asks the model for nodes and relationships across 19
+relationship types. The entity-only prompt asks for typed names as a short
+JSON array instead, which cuts output tokens and latency per call. The full
+transformer is still used for KG building, and for the agents when
+ENTITY_EXTRACTION_MODE=graph.
+"""
+import os
+import re
+import json
+import logging
+from typing import List, Sequence, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src_v3.components.kg_builder.graph_artifacts import EXTRACTION_PROMPT_VERSION
+
+# ENTITY_EXTRACTION_MODE selects how the agents extract entities:
+#   entities - compact entity-only prompt (default)
+#   graph    - full LLMGraphTransformer, keeping only the node names
+ENTITY_EXTRACTION_MODES = ("entities", "graph")
+ENTITY_EXTRACTION_MODE = os.getenv("ENTITY_EXTRACTION_MODE", "entities").lower()
+if ENTITY_EXTRACTION_MODE not in ENTITY_EXTRACTION_MODES:
+    raise ValueError(f"Unknown ENTITY_EXTRACTION_MODE '{ENTITY_EXTRACTION_MODE}', "
+                     f"expected one of {ENTITY_EXTRACTION_MODES}")
+
+# Bump when the prompt text changes so token usage and results can be compared per version
+ENTITY_PROMPT_VERSION = "entities-only-v1"
+
+# Prompt version of the agents' entity extraction in the configured mode (recorded by the token meter)
+AGENT_EXTRACTION_PROMPT_VERSION = (
+    ENTITY_PROMPT_VERSION if ENTITY_EXTRACTION_MODE == "entities" else EXTRACTION_PROMPT_VERSION)
+
+ENTITY_TYPES = ("Person", "Organization", "Event", "Policy", "Issue", "Location",
+                "Election", "Bill", "Vote", "Speech", "Alliance")
+
+EntityOnlyPrompt = ChatPromptTemplate.from_messages([
+    ("system", """Extract the named entities from the text. Allowed types: {entity_types}.
+Use each entity's most complete name as it appears in the text. Skip generic nouns and pronouns.
+Respond ONLY with a JSON array of [name, type] pairs, e.g. [["Joe Biden", "Person"], ["Senate", "Organization"]]. Respond [] if there are none."""),
+    ("user", "{text}")
+])
+
+_ARRAY = re.compile(r"\[[\s\S]*\]")
+
+
+def parse_entity_response(content: str) -> List[Tuple[str, str]]:
+    """(name, type) pairs from the model's JSON array; an empty list if it cannot be parsed"""
+    try:
+        match = _ARRAY.search(content or "")
+        items = json.loads(match.group(0)) if match else []
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse entity list: {e}")
+        return []
+
+    entities = []
+    for item in items:
+        if isinstance(item, str):
+            name, entity_type = item, ""
+        elif isinstance(item, (list, tuple)) and item and isinstance(item[0], str):
+            name, entity_type = item[0], str(item[1]) if len(item) > 1 else ""
+        elif isinstance(item, dict) and isinstance(item.get("name"), str):
+            name, entity_type = item["name"], str(item.get("type", ""))
+        else:
+            continue
+        if name.strip():
+            entities.append((name.strip(), entity_type.strip()))
+    return entities
+
+
+class EntityExtractor:
+    """Entity-only extraction chain: compact prompt, typed names back"""
+
+    def __init__(self, llm, entity_types: Sequence[str] = ENTITY_TYPES):
+        self.entity_types = tuple(entity_types)
+        # Models vary the casing of types ("person", "ORGANIZATION"); match on lower case
+        self._canonical_types = {entity_type.lower(): entity_type for entity_type in self.entity_types}
+        self.chain = EntityOnlyPrompt | llm
+
+    def extract(self, text: str) -> List[Tuple[str, str]]:
+        """(name, type) pairs mentioned in the text, types in their configured casing"""
+        response = self.chain.invoke({"entity_types": ", ".join(self.entity_types), "text": text})
+        entities = parse_entity_response(getattr(response, "content", response))
+        return [(name, self._canonical_types.get(entity_type.lower(), entity_type)) for name, entity_type in entities
+                if not entity_type or entity_type.lower() in self._canonical_types]
+
+    def entity_names(self, text: str) -> List[str]:
+        return list(dict.fromkeys(name for name, _ in self.extract(text)))
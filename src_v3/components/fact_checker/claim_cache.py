@@ -0,0 +1,188 @@
+"""
+Semantic cache of fact-check verdicts keyed by claim meaning.
+
+Users and evaluation sets resubmit paraphrases of claims that were already
+checked. Incoming claims are embedded with the configured CPU embedder
+(src_v3.utils.embeddings) and looked up in a local nearest-neighbour index
+of earlier results. A hit returns the earlier verdict when:
+- the normalised text is identical, or the cosine similarity reaches the threshold
+- the entry is younger than the staleness window
+- both claims mention the same numbers and have the same negation polarity,
+  which cosine similarity alone does not separate ("did" vs "did not")
+
+Entries are namespaced by fact-check prompt version, embedder and whether KG
+context was used, so a prompt bump or a KG-less run never reads old verdicts.
+They are appended to CLAIM_CACHE_DIR/claim_cache.jsonl, and the cache is only
+enabled when that variable is set.
+"""
+import os
+import re
+import json
+import base64
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src_v3.utils.embeddings import VectorIndex, get_embedder
+from .fc_prompt import FACT_CHECK_PROMPT_VERSION
+
+CLAIM_CACHE_MAX_AGE_HOURS = float(os.getenv("CLAIM_CACHE_MAX_AGE_HOURS", "72"))
+
+# Verdicts that say nothing about the claim are not worth serving again
+UNCACHEABLE_VERDICTS = {"unknown", ""}
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_WORD = re.compile(r"[a-z0-9']+")
+_NEGATIONS = {"not", "no", "never", "none", "neither", "nor", "without", "cannot"}
+
+
+def normalize_claim(text: str) -> str:
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def _claim_guard(text: str) -> tuple:
+    """Numbers mentioned and negation parity; a cached verdict is only reused when both match"""
+    words = normalize_claim(text).split()
+    negations = sum(word in _NEGATIONS or word.endswith("n't") for word in words)
+    numbers = frozenset(number.replace(",", "") for number in _NUMBER.findall(text or ""))
+    return numbers, negations % 2
+
+
+def _guard_json(claim: str) -> List:
+    """_claim_guard in the form stored with entries"""
+    numbers, negation = _claim_guard(claim)
+    return [sorted(numbers), negation]
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class ClaimCache:
+    """
+    Append-only JSONL store of fact-check results with an in-memory ANN index.
+
+    Every namespace gets its own index, built lazily from the file on first use.
+    """
+
+    def __init__(self, directory: str, embedder=None, threshold: Optional[float] = None,
+                 max_age_hours: float = CLAIM_CACHE_MAX_AGE_HOURS, filename: str = "claim_cache.jsonl"):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.embedder = embedder or get_embedder()
+        self.threshold = threshold if threshold is not None else float(
+            os.getenv("CLAIM_CACHE_THRESHOLD", self.embedder.default_threshold))
+        self.max_age = timedelta(hours=max_age_hours)
+        self.hits = 0
+        self.misses = 0
+        self._namespaces: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def namespace(self, use_kg: bool) -> str:
+        return f"{FACT_CHECK_PROMPT_VERSION}|{self.embedder.name}|{'kg' if use_kg else 'llm_only'}"
+
+    def _space(self, namespace: str) -> Dict[str, Any]:
+        return self._namespaces.setdefault(
+            namespace, {"index": VectorIndex(self.embedder.dim), "entries": [], "exact": {}})
+
+    def _index(self, namespace: str, entry: Dict[str, Any], vector: np.ndarray):
+        space = self._space(namespace)
+        space["index"].add(vector)
+        space["entries"].append(entry)
+        space["exact"][entry["normalized"]] = entry
+
+    def _load(self):
+        if self._namespaces is None:
+            self._namespaces = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self._index(entry["namespace"], entry, _decode_vector(entry.pop("vector")))
+                logging.info(f"Loaded claim cache from {self.path}")
+
+    def _fresh(self, entry: Dict[str, Any], now: datetime) -> bool:
+        return now - datetime.fromisoformat(entry["checked_at"]) <= self.max_age
+
+    def lookup(self, claim: str, use_kg: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Earlier result for the claim or a paraphrase of it.
+
+        Returns:
+            Copy of the cached result with a "cache" entry (similarity, matched_claim, checked_at), or None
+        """
+        namespace = self.namespace(use_kg)
+        normalized = normalize_claim(claim)
+        now = datetime.now()
+        with self._lock:
+            self._load()
+            space = self._space(namespace)
+            match, similarity = space["exact"].get(normalized), 1.0
+            if match is None and space["entries"]:
+                vector = self.embedder.embed([claim])[0]
+                guard = _guard_json(claim)
+                for position, score in space["index"].search(vector, top_k=3):
+                    candidate = space["entries"][position]
+                    if score < self.threshold:
+                        break
+                    if candidate["guard"] == guard and self._fresh(candidate, now):
+                        match, similarity = candidate, score
+                        break
+            if match is not None and not self._fresh(match, now):
+                match = None
+            if match is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        result = dict(match["result"])
+        result["cache"] = {"similarity": round(similarity, 4), "matched_claim": match["claim"],
+                           "checked_at": match["checked_at"]}
+        logging.info(f"[Claim cache] Hit ({similarity:.3f}) for '{claim[:80]}' -> '{match['claim'][:80]}'")
+        return result
+
+    def put(self, claim: str, result: Dict[str, Any], use_kg: bool = True) -> bool:
+        """Store a fresh result; returns False for results that are not cached"""
+        if str(result.get("verdict", "")).lower() in UNCACHEABLE_VERDICTS:
+            return False
+        vector = self.embedder.embed([claim])[0]
+        entry = {
+            "namespace": self.namespace(use_kg),
+            "claim": claim,
+            "normalized": normalize_claim(claim),
+            "guard": _guard_json(claim),
+            "checked_at": datetime.now().isoformat(),
+            "result": {k: v for k, v in result.items() if k != "cache"},
+        }
+        with self._lock:
+            self._load()
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(entry, vector=_encode_vector(vector)), default=str) + "\n")
+            self._index(entry["namespace"], entry, vector)
+        return True
+
+
+_claim_cache = None
+_claim_cache_lock = threading.Lock()
+
+
+def get_claim_cache() -> Optional[ClaimCache]:
+    """Shared cache in CLAIM_CACHE_DIR, or None when the variable is not set"""
+    global _claim_cache
+    directory = os.getenv("CLAIM_CACHE_DIR")
+    if not directory:
+        return None
+    if _claim_cache is None:
+        with _claim_cache_lock:
+            if _claim_cache is None:
+                _claim_cache = ClaimCache(directory)
+    return _claim_cache
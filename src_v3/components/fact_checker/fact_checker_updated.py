@@ -1,7 +1,11 @@
 from typing import List, Dict, Any
+from collections.abc import Mapping
 from datetime import datetime
 import json
+import time
 from src_v3.memory.schema import GraphState
+from src_v3.memory.entity_matcher import match_entities
+from src_v3.components.kg_builder.chunk_pipeline import related_passages_text
 from .tools import (
     extract_entities_from_claim,
     create_factcheck_chain,
@@ -11,17 +15,89 @@ from .tools import (
     get_bedrock_llm
 )
 from src_v3.utils.aws_helpers import get_bedrock_llm
+from src_v3.utils.tracing import span, token_usage
+from src_v3.utils.token_meter import metering
+from src_v3.components.entity_extraction import AGENT_EXTRACTION_PROMPT_VERSION
+from .fc_prompt import FACT_CHECK_PROMPT_VERSION
 import logging
 
 fact_check_chain = create_factcheck_chain()
 
 
-def fact_checker_agent(state: GraphState, knowledge_graph, store_to_kg: bool = False) -> GraphState:
+def _check_claim(claim_text: str, knowledge_graph, store_to_kg: bool, claim_cache=None) -> dict:
+    """Entity extraction, KG context, LLM call and response parsing for one claim, one span per stage"""
+    use_kg = bool(knowledge_graph)
+    if claim_cache is not None:
+        with span("fact_check.claim_cache") as stage:
+            cached = claim_cache.lookup(claim_text, use_kg=use_kg)
+            stage.set_attribute("cache_hit", cached is not None)
+        if cached is not None:
+            return cached
+
+    # A KG context snapshot carries the entities it was materialised with
+    frozen_entities = getattr(knowledge_graph, "frozen_entities", None)
+    entities = frozen_entities(claim_text) if frozen_entities is not None else None
+    if not isinstance(entities, list):
+        # Entities the graph already holds are matched locally; the LLM transformer is the fallback
+        with span("fact_check.match_entities") as stage:
+            entities = match_entities(knowledge_graph, claim_text)
+            stage.set_attribute("entity_count", len(entities or []))
+    if entities is None:
+        with span("fact_check.extract_entities") as stage, \
+                metering(stage="entity_extraction", prompt_version=AGENT_EXTRACTION_PROMPT_VERSION):
+            entities = extract_entities_from_claim(claim_text)
+            stage.set_attribute("entity_count", len(entities))
+
+    # Use KG to retrieve relevant context
+    kg_context = ""
+    if knowledge_graph:
+        with span("fact_check.kg_context", entity_count=len(entities)) as stage:
+            kg_context = knowledge_graph.retrieve_related_facts_text(entities)
+            stage.set_attribute("context_chars", len(kg_context or ""))
+        with span("fact_check.passages") as stage:
+            passages = related_passages_text(knowledge_graph, claim_text)
+            stage.set_attribute("context_chars", len(passages))
+        if passages:
+            kg_context = "\n\n".join(filter(None, (kg_context, f"Related article passages:\n{passages}")))
+
+    # Build input and run the fact check chain
+    input_vars = {
+        "claim": claim_text,
+        "related_kg_context": kg_context
+    }
+    with span("fact_check.llm_call") as stage, metering(stage="fact_check", prompt_version=FACT_CHECK_PROMPT_VERSION):
+        response = fact_check_chain.invoke(input_vars)
+        stage.set_attributes(**token_usage(response))
+
+    with span("fact_check.parse_response") as stage:
+        result = parse_llm_response(response.content)
+        stage.set_attribute("verdict", result.get("verdict"))
+
+    # Only store in KG if explicitly requested
+    if store_to_kg and knowledge_graph:
+        try:
+            with span("fact_check.store_result"):
+                knowledge_graph.add_fact_check_result(
+                    claim=claim_text,
+                    result=response,
+                    related_entities=entities
+                )
+        except Exception as e:
+            logging.warning(f"Failed to store fact-check in KG: {e}")
+
+    if claim_cache is not None:
+        claim_cache.put(claim_text, result, use_kg=use_kg)
+    return result
+
+
+def fact_checker_agent(state: GraphState, knowledge_graph, store_to_kg: bool = False,
+                       claim_cache=None) -> GraphState:
     """Update factchecker agent that directly interacts with the knowledge graph.
     Args:
         state: current system state
         knowledge_graph: knowledgeGraph instance for direct interaction
         store_to_kg: whether to store results in knowledge graph (default: False)
+        claim_cache: ClaimCache answering repeated and paraphrased claims (default: None, no caching)
     """
     # Initialize transformer if needed
     global transformer
@@ -36,127 +112,84 @@ def fact_checker_agent(state: GraphState, knowledge_graph, store_to_kg: bool = F
     if isinstance(state, dict):
         state = GraphState(**state)
 
-    new_state = state.copy()
-    updated_articles = []
+    with span("fact_checker_agent", article_count=len(state.articles), direct_query=bool(state.news_query),
+              kg_context=bool(knowledge_graph)):
+        new_state = state.copy()
+        updated_articles = []
 
-    # Handle direct query case
-    if new_state.news_query and not new_state.articles:
-        try:
-            # Process direct query
-            claim_text = new_state.news_query
-            logging.info(f"Processing direct query: {claim_text}")
+        # Handle direct query case
+        if new_state.news_query and not new_state.articles:
+            try:
+                # Process direct query
+                claim_text = new_state.news_query
+                logging.info(f"Processing direct query: {claim_text}")
+
+                with span("fact_check.claim", direct_query=True), metering(agent="fact_checker", article="direct_query"):
+                    result = _check_claim(claim_text, knowledge_graph, store_to_kg, claim_cache)
+
+                # Create a new article with the query and result
+                new_article = {
+                    "title": f"Query: {claim_text[:50]}...",
+                    "content": claim_text,
+                    "source": "Direct Query",
+                    "date": datetime.now().isoformat(),
+                    "fact_check_result": result
+                }
+                updated_articles.append(new_article)
 
-            # Extract entities
-            entities = extract_entities_from_claim(claim_text)
+            except Exception as e:
+                logging.error(f"Error during direct query fact checking: {e}")
+                new_article = {
+                    "title": f"Query: {new_state.news_query[:50]}...",
+                    "content": new_state.news_query,
+                    "source": "Direct Query",
+                    "date": datetime.now().isoformat(),
+                    "fact_check_result": {
+                        "verdict": "False",
+                        "confidence_score": 0,
+                        "reasoning": f"Error encountered: {str(e)}",
+                        "supporting_nodes": []
+                    }
+                }
+                updated_articles.append(new_article)
 
-            # Use KG to retrieve relevant context
-            kg_context = ""
-            if knowledge_graph:
-                kg_context = knowledge_graph.retrieve_related_facts_text(entities)
-
-            # Build input and run fact check chain
-            input_vars = {
-                "claim": claim_text,
-                "related_kg_context": kg_context
-            }
-            response = fact_check_chain.invoke(input_vars)
-            result = parse_llm_response(response.content)
-
-            # Create a new article with the query and result
-            new_article = {
-                "title": f"Query: {claim_text[:50]}...",
-                "content": claim_text,
-                "source": "Direct Query",
-                "date": datetime.now().isoformat(),
-                "fact_check_result": result
-            }
-            updated_articles.append(new_article)
-
-            # Only store in KG if explicitly requested
-            if store_to_kg and knowledge_graph:
+        # Process each article in the list
+        for article in new_state.articles:
+            if isinstance(article, str):
                 try:
-                    knowledge_graph.add_fact_check_result(
-                        claim=claim_text,
-                        result=response,
-                        related_entities=entities
-                    )
+                    article = json.loads(article)
                 except Exception as e:
-                    logging.warning(f"Failed to store fact-check in KG: {e}")
+                    logging.error(f"Skipping string article, failed to parse JSON: {e}")
+                    continue
 
-        except Exception as e:
-            logging.error(f"Error during direct query fact checking: {e}")
-            new_article = {
-                "title": f"Query: {new_state.news_query[:50]}...",
-                "content": new_state.news_query,
-                "source": "Direct Query",
-                "date": datetime.now().isoformat(),
-                "fact_check_result": {
+            if not isinstance(article, Mapping):
+                logging.error(f"Invalid article type: {type(article)} — skipping")
+                continue
+
+            claim_text = article.get("claim") or article.get("content") or article.get("full_content", "")
+            if not claim_text:
+                article['fact_check_result'] = {"error": "No claim or content provided"}
+                updated_articles.append(article)
+                continue
+
+            try:
+                start = time.perf_counter()
+                with span("fact_check.claim", url=article.get("url"), claim_chars=len(claim_text)), \
+                        metering(agent="fact_checker", article=article.get("url") or claim_text[:80]):
+                    article["fact_check_result"] = _check_claim(claim_text, knowledge_graph, store_to_kg, claim_cache)
+                article["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+            except Exception as e:
+                logging.error(f"Error during fact checking: {e}")
+                article["fact_check_result"] = {
                     "verdict": "False",
                     "confidence_score": 0,
                     "reasoning": f"Error encountered: {str(e)}",
                     "supporting_nodes": []
                 }
-            }
-            updated_articles.append(new_article)
-
-    # Process each article in the list
-    for article in new_state.articles:
-        if isinstance(article, str):
-            try:
-                article = json.loads(article)
-            except Exception as e:
-                logging.error(f"Skipping string article, failed to parse JSON: {e}")
-                continue
 
-        if not isinstance(article, dict):
-            logging.error(f"Invalid article type: {type(article)} — skipping")
-            continue
-
-        claim_text = article.get("claim") or article.get("content") or article.get("full_content", "")
-        if not claim_text:
-            article['fact_check_result'] = {"error": "No claim or content provided"}
             updated_articles.append(article)
-            continue
-
-        try:
-            # Step 1: Extract entities
-            entities = extract_entities_from_claim(claim_text)
 
-            # Step 2: Use KG to retrieve relevant context
-            kg_context = ""
-            if knowledge_graph:
-                kg_context = knowledge_graph.retrieve_related_facts_text(entities)
-
-            # Step 3: Build input and run the fact check chain
-            input_vars = {
-                "claim": claim_text,
-                "related_kg_context": kg_context
-            }
-            response = fact_check_chain.invoke(input_vars)
-            article["fact_check_result"] = parse_llm_response(response.content)
-
-            # Only store in KG if explicitly requested
-            if store_to_kg and knowledge_graph:
-                try:
-                    knowledge_graph.add_fact_check_result(
-                        claim=claim_text,
-                        result=response,
-                        related_entities=entities
-                    )
-                except Exception as e:
-                    logging.warning(f"Failed to store fact-check in KG: {e}")
-
-        except Exception as e:
-            logging.error(f"Error during fact checking: {e}")
-            article["fact_check_result"] = {
-                "verdict": "False",
-                "confidence_score": 0,
-                "reasoning": f"Error encountered: {str(e)}",
-                "supporting_nodes": []
-            }
-
-        updated_articles.append(article)
-
-    new_state.articles = updated_articles
-    new_state.current_status = "fact_checked"
+        new_state.articles = updated_articles
+        new_state.current_status = "fact_checked"
     return new_state
\ No newline at end of file
@@ -1,5 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate
 
+# Bump when the prompt text changes so token usage and results can be compared per version
+FACT_CHECK_PROMPT_VERSION = "fact-check-kg-v1"
+
 FactCheckPromptWithKG = ChatPromptTemplate.from_messages([
     ("system", """You are a political fact-checking assistant with access to a comprehensive U.S. politics knowledge graph.
         
@@ -11,17 +11,20 @@ from datetime import datetime, timedelta
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_core.documents import Document
 from src_v3.components.fact_checker.fc_prompt import FactCheckPromptWithKG
+from src_v3.components.entity_extraction import ENTITY_EXTRACTION_MODE, EntityExtractor
+from src_v3.utils.llm_backend import bedrock_runtime_client
 from langchain.chains import LLMChain
 
 load_dotenv()
 
 transformer = None
+entity_extractor = None
 
 def get_bedrock_llm():
     """Initialize and return a Bedrock LLM client."""
     # Always use real AWS Bedrock
     print("Using real AWS Bedrock")
-    client = boto3.client("bedrock-runtime", region_name="us-east-1")
+    client = bedrock_runtime_client(boto3.client("bedrock-runtime", region_name="us-east-1"))
     llm = ChatBedrock(
         client=client,
         model_id='anthropic.claude-3-5-sonnet-20240620-v1:0',
@@ -31,8 +34,9 @@ def get_bedrock_llm():
 
 
 def initialize_entity_extractor(llm) -> None:
-    """Initialize the LLMGraphTransformer for entity extraction"""
-    global transformer
+    """Initialize the entity-only extractor and the LLMGraphTransformer for entity extraction"""
+    global transformer, entity_extractor
+    entity_extractor = EntityExtractor(llm)
     transformer = LLMGraphTransformer(
         llm=llm,
         allowed_nodes=[
@@ -50,10 +54,15 @@ def initialize_entity_extractor(llm) -> None:
 
 
 def extract_entities_from_claim(claim_text: str) -> List[str]:
-    """Extracts named entities from article content using LLM-based graph transformation."""
+    """Extracts named entities from claim text (entity-only prompt or LLM-based graph transformation, see ENTITY_EXTRACTION_MODE)."""
     logging.info(f"Extracting entities from claim text (length: {len(claim_text)})")
     global transformer
 
+    if ENTITY_EXTRACTION_MODE == "entities" and entity_extractor is not None:
+        entities = entity_extractor.entity_names(claim_text)
+        logging.info(f"Extracted entities: {entities}")
+        return entities
+
     if transformer is None:
         raise RuntimeError("Transformer not initialized. Call initialize_entity_extractor(llm) first.")
 
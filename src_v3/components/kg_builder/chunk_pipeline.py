@@ -0,0 +1,197 @@
+"""
+Chunk ingestion for passage-level retrieval.
+
+Article full_content is split into overlapping, sentence-aligned chunks,
+which are embedded in large batches with the CPU embedder CHUNK_EMBEDDER
+(src_v3.utils.embeddings) and written to the knowledge graph.
+There they become Chunk nodes linked to their Article by HAS_CHUNK, with the
+embedding in the chunkVector index.
+
+Ingestion runs it for every article it writes (KnowledgeGraph.add_article and
+add_articles_from_json on every backend, and create_kg); the command below
+(re-)indexes a JSON file of articles already in the graph.
+
+Re-runs are incremental. Every article records the hash of the text and the
+embedder its chunks came from, and only new or changed articles are
+re-chunked; their old chunks are replaced.
+
+    python -m src_v3.components.kg_builder.chunk_pipeline <articles.json>
+"""
+import os
+import re
+import sys
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, NamedTuple
+
+from src_v3.memory.article import as_article_record
+from src_v3.memory.schema_manager import CHUNK_VECTOR_DIMENSIONS
+from src_v3.components.kg_builder.graph_artifacts import content_hash
+from src_v3.utils.embeddings import create_embedder
+from src_v3.utils.tracing import span
+
+# Chunk articles as they are added to the KG (add_article, add_articles_from_json, create_kg)
+CHUNK_INDEXING_ENABLED = os.getenv("CHUNK_INDEXING", "on").lower() not in ("off", "false", "0")
+CHUNK_WORDS = int(os.getenv("CHUNK_WORDS", "200"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHUNK_OVERLAP_WORDS", "40"))
+# Chunks embedded (and written) per batch
+CHUNK_EMBED_BATCH = int(os.getenv("CHUNK_EMBED_BATCH", "512"))
+# Passages added to the fact checker's KG context; 0 disables passage retrieval
+FACT_CHECK_PASSAGES = int(os.getenv("FACT_CHECK_PASSAGES", "3"))
+# Embedder for chunks and passage queries, separate from TEXT_EMBEDDER: its vectors must
+# match the chunkVector index size, CHUNK_VECTOR_DIMENSIONS (the hashing default is sized to it)
+CHUNK_EMBEDDER = os.getenv("CHUNK_EMBEDDER", "hashing").lower()
+
+_SENTENCE = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|\n+|$)")
+
+
+class Chunk(NamedTuple):
+    id: str
+    url: str
+    index: int
+    text: str
+
+
+def _sentences(text: str) -> List[List[str]]:
+    """Sentences as word lists"""
+    return [words for words in (match.group(0).split() for match in _SENTENCE.finditer(text or "")) if words]
+
+
+def split_into_chunks(text: str, max_words: int = CHUNK_WORDS, overlap: int = CHUNK_OVERLAP_WORDS) -> List[str]:
+    """
+    Sentence-aligned chunks of at most max_words words.
+
+    Each chunk repeats the trailing sentences (up to overlap words) of the
+    previous one; sentences longer than max_words are split on words.
+    """
+    pieces = []
+    for words in _sentences(text):
+        for start in range(0, len(words), max_words):
+            pieces.append(words[start:start + max_words])
+
+    chunks, current = [], []
+    for piece in pieces:
+        if current and sum(map(len, current)) + len(piece) > max_words:
+            chunks.append(" ".join(word for sentence in current for word in sentence))
+            carried = []
+            for sentence in reversed(current):
+                if sum(map(len, carried)) + len(sentence) > overlap:
+                    break
+                carried.insert(0, sentence)
+            if sum(map(len, carried)) + len(piece) > max_words:
+                carried = []
+            current = carried
+        current.append(piece)
+    if current:
+        chunks.append(" ".join(word for sentence in current for word in sentence))
+    return chunks
+
+
+def chunk_article(article) -> List[Chunk]:
+    record = as_article_record(article)
+    return [Chunk(f"{record.url}#chunk-{i}", record.url, i, text)
+            for i, text in enumerate(split_into_chunks(record.full_content or ""))]
+
+
+def chunks_hash(article, embedder) -> str:
+    """Identifies the chunk set of an article: its text and the embedder that embedded it"""
+    return f"{embedder.name}:{embedder.dim}:{content_hash(as_article_record(article).full_content)}"
+
+
+def index_article_chunks(articles: Iterable, knowledge_graph, embedder=None,
+                         batch_size: int = CHUNK_EMBED_BATCH, force: bool = False) -> Dict[str, int]:
+    """
+    Chunk, embed and store the articles whose text or embedder changed since the last run.
+
+    Args:
+        articles: Article dicts or records; articles without url or text are skipped
+        knowledge_graph: Graph providing chunk_hashes() and replace_chunks()
+        embedder: Text embedder (default: the shared chunk embedder)
+        batch_size: Chunks per embedding call; articles are never split across batches
+        force: Re-chunk every article
+
+    Returns:
+        Counts of articles indexed and unchanged, chunks written and embedding batches
+    """
+    embedder = embedder or get_chunk_embedder()
+    records = [as_article_record(a) for a in articles]
+    records = list({r.url: r for r in records if r.url and r.full_content}.values())
+    stats = {"articles": 0, "unchanged": 0, "chunks": 0, "batches": 0}
+
+    with span("chunks.index", article_count=len(records), embedder=embedder.name) as index_span:
+        existing = knowledge_graph.chunk_hashes([r.url for r in records]) if not force else {}
+        pending = []
+        for record in records:
+            record_hash = chunks_hash(record, embedder)
+            if existing.get(record.url) == record_hash:
+                stats["unchanged"] += 1
+            else:
+                pending.append((record, record_hash, chunk_article(record)))
+
+        def flush(group):
+            texts = [chunk.text for _, _, chunks in group for chunk in chunks]
+            with span("chunks.embed_batch", chunk_count=len(texts)):
+                vectors = iter(embedder.embed(texts)) if texts else iter(())
+            knowledge_graph.replace_chunks({
+                record.url: (record_hash, [{"id": chunk.id, "index": chunk.index, "text": chunk.text,
+                                            "embedding": next(vectors).tolist()} for chunk in chunks])
+                for record, record_hash, chunks in group
+            })
+            stats["articles"] += len(group)
+            stats["chunks"] += len(texts)
+            stats["batches"] += 1
+
+        group, group_chunks = [], 0
+        for item in pending:
+            group.append(item)
+            group_chunks += len(item[2])
+            if group_chunks >= batch_size:
+                flush(group)
+                group, group_chunks = [], 0
+        if group:
+            flush(group)
+        index_span.set_attributes(**stats)
+
+    logging.info(f"Chunk index: {stats['articles']} articles re-chunked into {stats['chunks']} chunks "
+                 f"in {stats['batches']} batches, {stats['unchanged']} unchanged")
+    return stats
+
+
+def related_passages_text(knowledge_graph, text: str, limit: int = FACT_CHECK_PASSAGES) -> str:
+    """Nearest chunks to the text as context lines; empty when the graph has no passage index"""
+    retrieve = getattr(knowledge_graph, "retrieve_related_passages", None)
+    if retrieve is None or limit <= 0 or not text:
+        return ""
+    passages = retrieve(get_chunk_embedder().embed([text])[0].tolist(), limit=limit)
+    if not isinstance(passages, list):
+        return ""
+    return "\n".join(f"- [{passage.get('title') or passage['url']}] {passage['text']}" for passage in passages)
+
+
+_chunk_embedder = None
+_chunk_embedder_lock = threading.Lock()
+
+
+def get_chunk_embedder():
+    """Shared embedder for chunks and passage queries (hashing vectors sized for the chunkVector index)"""
+    global _chunk_embedder
+    if _chunk_embedder is None:
+        with _chunk_embedder_lock:
+            if _chunk_embedder is None:
+                embedder = create_embedder(CHUNK_EMBEDDER, dim=CHUNK_VECTOR_DIMENSIONS)
+                if embedder.dim != CHUNK_VECTOR_DIMENSIONS:
+                    raise ValueError(f"CHUNK_EMBEDDER '{CHUNK_EMBEDDER}' produces {embedder.dim}-d vectors, "
+                                     f"the chunkVector index holds {CHUNK_VECTOR_DIMENSIONS}-d vectors")
+                _chunk_embedder = embedder
+    return _chunk_embedder
+
+
+if __name__ == "__main__":
+    from src_v3.memory.graph_backends import create_knowledge_graph
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    with open(sys.argv[1], encoding="utf-8") as f:
+        data = json.load(f)
+    print(index_article_chunks(data.get("articles", data) if isinstance(data, dict) else data,
+                               create_knowledge_graph(), force="--force" in sys.argv))
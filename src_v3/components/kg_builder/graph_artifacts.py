@@ -0,0 +1,227 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.documents import Document
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+
+from src_v3.memory.article import as_article_record
+from src_v3.utils.tracing import span
+from src_v3.utils.token_meter import metering
+
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph_artifacts")
+
+# LLMGraphTransformer runs with its built-in extraction prompt; bump if a custom prompt is passed
+EXTRACTION_PROMPT_VERSION = "llm-graph-transformer-default"
+
+# Article fields kept with each artifact so a rebuild needs nothing but the store
+ARTIFACT_ARTICLE_FIELDS = ("url", "title", "source", "author", "date", "full_content", "bias", "duplicate_of")
+
+
+def content_hash(text: Optional[str]) -> str:
+    """Hash of the text that was sent to the graph transformer"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _node_to_dict(node: Node) -> Dict[str, Any]:
+    return {"id": node.id, "type": node.type, "properties": node.properties}
+
+
+def serialize_graph_documents(graph_docs: List[GraphDocument]) -> List[Dict[str, Any]]:
+    """JSON-ready form of transformer output (source text is not repeated, only its metadata)"""
+    return [
+        {
+            "nodes": [_node_to_dict(node) for node in graph_doc.nodes],
+            "relationships": [
+                {"source": _node_to_dict(rel.source), "target": _node_to_dict(rel.target),
+                 "type": rel.type, "properties": rel.properties}
+                for rel in graph_doc.relationships
+            ],
+            "metadata": graph_doc.source.metadata if graph_doc.source else {},
+        }
+        for graph_doc in graph_docs
+    ]
+
+
+def deserialize_graph_documents(data: List[Dict[str, Any]], page_content: str = "") -> List[GraphDocument]:
+    """Rebuild GraphDocument objects; each call returns fresh objects that callers may mutate"""
+    graph_docs = []
+    for doc in data:
+        nodes = {}
+        for node in doc["nodes"]:
+            nodes[(node["id"], node["type"])] = Node(**node)
+
+        def resolve(node):
+            return nodes.get((node["id"], node["type"])) or Node(**node)
+
+        relationships = [
+            Relationship(source=resolve(rel["source"]), target=resolve(rel["target"]),
+                         type=rel["type"], properties=rel.get("properties", {}))
+            for rel in doc["relationships"]
+        ]
+        graph_docs.append(GraphDocument(
+            nodes=list(nodes.values()),
+            relationships=relationships,
+            source=Document(page_content=page_content, metadata=doc.get("metadata", {}))
+        ))
+    return graph_docs
+
+
+class GraphArtifactStore:
+    """
+    Append-only JSONL store of graph transformer output.
+
+    Each line holds one extraction keyed by article url and the hash of the
+    text it was extracted from, together with the article fields needed to
+    recreate the article node. A changed article gets a new line; the latest
+    line per url wins when rebuilding.
+    """
+
+    def __init__(self, directory: Optional[str] = None, filename: str = "graph_documents.jsonl"):
+        self.directory = directory or os.environ.get("KG_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+        self.path = os.path.join(self.directory, filename)
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[tuple, Dict[str, Any]]:
+        if self._index is None:
+            index = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            index[(entry["url"], entry["content_hash"])] = entry
+            self._index = index
+        return self._index
+
+    def get(self, url: str, text_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get((url, text_hash))
+
+    def put(self, article, graph_docs: List[GraphDocument], text_hash: Optional[str] = None,
+            model_id: Optional[str] = None) -> Dict[str, Any]:
+        record = as_article_record(article)
+        entry = {
+            "url": record.url,
+            "content_hash": text_hash or content_hash(record.full_content),
+            "model_id": model_id,
+            "created_at": datetime.now().isoformat(),
+            "article": {field: record.get(field) for field in ARTIFACT_ARTICLE_FIELDS},
+            "graph_documents": serialize_graph_documents(graph_docs),
+        }
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+            self._load()[(entry["url"], entry["content_hash"])] = entry
+        return entry
+
+    def latest(self) -> Iterator[Dict[str, Any]]:
+        """Most recent extraction per article url"""
+        with self._lock:
+            entries = list(self._load().values())
+        by_url = {}
+        for entry in entries:
+            current = by_url.get(entry["url"])
+            if current is None or entry["created_at"] >= current["created_at"]:
+                by_url[entry["url"]] = entry
+        return iter(by_url.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+_artifact_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> Optional[GraphArtifactStore]:
+    """Process-wide artifact store for online ingestion, or None unless KG_ARTIFACT_DIR is set"""
+    global _artifact_store
+    if not os.environ.get("KG_ARTIFACT_DIR"):
+        return None
+    if _artifact_store is None:
+        with _store_lock:
+            if _artifact_store is None:
+                _artifact_store = GraphArtifactStore()
+    return _artifact_store
+
+
+def extract_graph_documents(transformer, documents: List[Document], article,
+                            store: Optional[GraphArtifactStore] = None) -> List[GraphDocument]:
+    """
+    Run the graph transformer unless the store already holds output for this article text.
+
+    Args:
+        transformer: LLMGraphTransformer (or anything with convert_to_graph_documents)
+        documents: Documents to convert, as built for the article
+        article: Article dict or record the documents were built from
+        store: Artifact store; defaults to the process-wide store
+
+    Returns:
+        Fresh GraphDocument objects
+    """
+    store = store if store is not None else get_artifact_store()
+    record = as_article_record(article)
+    text_hash = content_hash("".join(doc.page_content for doc in documents))
+
+    with span("kg.extract_graph", url=record.url, artifact_store=store is not None) as stage:
+        if store is not None and record.url:
+            entry = store.get(record.url, text_hash)
+            if entry is not None:
+                logging.info(f"Reusing stored graph documents for {record.url}")
+                graph_docs = deserialize_graph_documents(entry["graph_documents"], documents[0].page_content)
+                stage.set_attributes(cache_hit=True, entity_count=sum(len(doc.nodes) for doc in graph_docs))
+                return graph_docs
+
+        with metering(stage="entity_extraction", prompt_version=EXTRACTION_PROMPT_VERSION, article=record.url):
+            graph_docs = transformer.convert_to_graph_documents(documents)
+        stage.set_attributes(cache_hit=False, entity_count=sum(len(doc.nodes) for doc in graph_docs),
+                             relationship_count=sum(len(doc.relationships) for doc in graph_docs))
+    if store is not None and record.url:
+        model_id = getattr(getattr(transformer, "llm", None), "model_id", None)
+        try:
+            # Stored before callers add their own relationships to the documents
+            store.put(record, graph_docs, text_hash=text_hash, model_id=model_id)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not store graph documents for {record.url}: {e}")
+    return graph_docs
+
+def rebuild_knowledge_graph(kg=None, store: Optional[GraphArtifactStore] = None) -> int:
+    """
+    Rebuild a knowledge graph from stored extractions without calling the LLM.
+
+    Args:
+        kg: Target graph; defaults to create_knowledge_graph() for the configured KG_BACKEND
+        store: Artifact store; defaults to the process-wide store
+
+    Returns:
+        Number of articles written
+    """
+    if kg is None:
+        from src_v3.memory.graph_backends import create_knowledge_graph
+        kg = create_knowledge_graph()
+    store = store or GraphArtifactStore()
+
+    count = 0
+    for entry in store.latest():
+        article = entry["article"]
+        graph_docs = deserialize_graph_documents(entry["graph_documents"], article.get("full_content") or "")
+        kg.add_article(article, graph_docs=graph_docs)
+        count += 1
+        if count % 100 == 0:
+            logging.info(f"Rebuilt {count} articles from graph artifacts")
+
+    logging.info(f"Rebuilt knowledge graph from {count} stored extractions in {store.path}")
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rebuild_knowledge_graph()
@@ -8,6 +8,19 @@ from langchain_neo4j import Neo4jGraph
 from langchain_aws import ChatBedrock
 from langchain_openai import ChatOpenAI
 from langchain_community.graphs.graph_document import Node, Relationship
+from src_v3.utils.rate_limiter import Priority
+from src_v3.utils.llm_backend import bedrock_runtime_client
+from src_v3.components.kg_builder.graph_artifacts import (
+    GraphArtifactStore,
+    deserialize_graph_documents,
+    extract_graph_documents,
+    serialize_graph_documents,
+)
+from src_v3.components.kg_builder.tools.near_duplicates import link_near_duplicates
+from src_v3.components.kg_builder.chunk_pipeline import CHUNK_INDEXING_ENABLED, index_article_chunks
+from src_v3.memory.knowledge_graph import LABEL_ENTITIES_QUERY, Neo4jChunkStore
+from src_v3.memory.schema_manager import ensure_schema
+from src_v3.utils.token_meter import get_token_meter, metering
 
 
 
@@ -29,7 +42,8 @@ def create_bedrock_client():
         bedrock_client= session.client(service_name='bedrock-runtime',
                                        region_name=os.getenv('AWS_REGION', 'us-east-1')
                                        )
-        return bedrock_client
+        # KG building is bulk work and yields to interactive and batch traffic
+        return bedrock_runtime_client(bedrock_client, Priority.BACKGROUND)
     except Exception as e:
         print(f"Error creating bedrock client: {e}")
         raise
@@ -62,13 +76,22 @@ def create_kg():
         articles_data = json.load(json_file)
     articles = articles_data.get('articles', [])
 
+    # Syndicated copies (duplicate_of) reuse the extraction of their cluster's canonical article
+    link_near_duplicates(articles)
+    canonical_urls = {article["duplicate_of"] for article in articles if article.get("duplicate_of")}
+    shared_extractions = {}
+
     llm = create_llm()
+    # Extractions are kept so the KG can be rebuilt without calling the LLM again
+    artifact_store = GraphArtifactStore()
 
     graph = Neo4jGraph(
         url=os.getenv("NEO4J_URI"),
         username=os.getenv("NEO4J_USERNAME"),
         password=os.getenv("NEO4J_PASSWORD")
     )
+    # constraints and indexes (including the chunk vector index) before the bulk load
+    ensure_schema(graph)
 
     article_transformer = LLMGraphTransformer(
         llm=llm,
@@ -113,6 +136,7 @@ def create_kg():
         full_content = article.get("full_content")
         content = article.get("content")
         bias = article.get("bias")
+        duplicate_of = article.get("duplicate_of")
 
         text = full_content or content
         if not text:
@@ -125,11 +149,13 @@ def create_kg():
         graph.query(
             """
             MERGE (a:Article {url: $url})
-            SET a.source_name = $source_name,
+            SET a.id = $url,
+                a.source_name = $source_name,
                 a.author = $author,
                 a.publishedAt = $publishedAt,
                 a.title = $title,
-                a.bias = $bias
+                a.bias = $bias,
+                a.duplicate_of = $duplicate_of
             """,
             {
                 "url": url,
@@ -137,7 +163,8 @@ def create_kg():
                 "author": author,
                 "publishedAt": published_at,
                 "title": title,
-                "bias": bias
+                "bias": bias,
+                "duplicate_of": duplicate_of
             }
         )
 
@@ -157,8 +184,16 @@ def create_kg():
             )
         ]
 
-        # convert the article to a graph
-        graph_docs = article_transformer.convert_to_graph_documents(article_doc)
+        # convert the article to a graph, reusing the stored extraction when the text is unchanged
+        # and the canonical copy's extraction for syndicated copies
+        if duplicate_of in shared_extractions:
+            print(f"Reusing extraction of syndicated original: {duplicate_of}")
+            graph_docs = deserialize_graph_documents(shared_extractions[duplicate_of], text)
+        else:
+            with metering(agent="kg_builder"):
+                graph_docs = extract_graph_documents(article_transformer, article_doc, article, store=artifact_store)
+            if url in canonical_urls:
+                shared_extractions[url] = serialize_graph_documents(graph_docs)
         for graph_doc in graph_docs:
             graph_doc.nodes = [n for n in graph_doc.nodes if n.type != "Article"]
 
@@ -182,17 +217,21 @@ def create_kg():
                         )
                     )
 
-        # add the generated nodes and relationships to the graph
+        # add the generated nodes and relationships to the graph, entities under the indexed Entity label
+        entities = [{"id": node.id, "type": node.type} for graph_doc in graph_docs for node in graph_doc.nodes]
+        if entities:
+            graph.query(LABEL_ENTITIES_QUERY, {"entities": entities})
         graph.add_graph_documents(graph_docs)
 
-    graph.query("""
-        CREATE VECTOR INDEX `chunkVector`
-        IF NOT EXISTS
-        FOR (c: Chunk) ON (c.textEmbedding)
-        OPTIONS {indexConfig: {
-        `vector.dimensions`: 1536,
-        `vector.similarity_function`: 'cosine'
-        }};""")
+    # Chunk Article nodes for passage retrieval (the chunkVector index); unchanged articles are skipped
+    if CHUNK_INDEXING_ENABLED:
+        try:
+            index_article_chunks(articles, Neo4jChunkStore(graph))
+        except Exception as e:
+            print(f"Chunk indexing failed, the graph is built without passages: {e}")
+
+    # Extraction spend for the build (articles served from the artifact store cost nothing)
+    get_token_meter().log_summary(by=("agent", "stage", "model_id"))
 
 
 if __name__ == "__main__":
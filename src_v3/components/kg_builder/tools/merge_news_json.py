@@ -2,8 +2,10 @@ import json
 import glob
 import os
 
+from .near_duplicates import link_near_duplicates
 
-def merge_json_files(input_dir, output_path):
+
+def merge_json_files(input_dir, output_path, near_duplicates=True):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     json_files = glob.glob(os.path.join(input_dir, "*.json"))
 
@@ -21,6 +23,10 @@ def merge_json_files(input_dir, output_path):
     merged_data["articles"] = list(unique_articles.values())
     merged_data["totalResults"] = len(merged_data["articles"])
 
+    # Mark syndicated copies (duplicate_of) so extraction runs once per wire story
+    if near_duplicates:
+        link_near_duplicates(merged_data["articles"])
+
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(merged_data, f, indent=2)
 
@@ -0,0 +1,182 @@
+"""
+MinHash/LSH near-duplicate detection for syndicated news articles.
+
+Wire stories (AP, Reuters) are republished by other outlets under their own
+URLs, so exact-URL dedup keeps every copy. Articles whose word-shingle sets
+have an estimated Jaccard similarity of at least the threshold end up in one
+cluster. The first article of a cluster is its canonical copy; the others
+get duplicate_of set to its url. Ingestion extracts entities for the
+canonical copy only, and links every copy to that extraction under its own
+source and bias.
+"""
+import os
+import re
+import zlib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHINGLE_BASE = np.uint64(0x100000001B3)
+_WORD = re.compile(r"\w+")
+
+
+def article_text(article) -> str:
+    """Text compared between articles: title, description and body"""
+    body = article.get("full_content") or article.get("content") or ""
+    return " ".join(part for part in (article.get("title"), article.get("description"), body) if part)
+
+
+def _lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) minimising the false positive + false negative area around the threshold"""
+    step = 0.005
+    grid = np.arange(0.0, 1.0 + step, step)
+    below = grid < threshold
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        candidate = 1 - (1 - grid ** rows) ** bands
+        error = (candidate[below].sum() + (1 - candidate[~below]).sum()) * step
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from multiply-shift hashes ((a * h + b) mod 2^64) >> 32 of 32-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Odd multipliers keep every permutation a bijection on 64-bit words
+        self._a = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        """
+        Distinct 32-bit hashes of the text's word shingles.
+
+        Words are hashed once (crc32) and combined per shingle as a polynomial
+        in numpy, which avoids building and hashing every shingle string.
+        """
+        words = _WORD.findall((text or "").lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        word_hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words),
+                                  dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(words))
+        combined = np.zeros(len(words) - size + 1, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(size):
+                combined = combined * _SHINGLE_BASE + word_hashes[offset:offset + len(combined)]
+        return np.unique((combined ^ (combined >> np.uint64(32))) & _MAX_HASH)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the text, or None when it has no words"""
+        hashes = self.shingle_hashes(text)
+        if not len(hashes):
+            return None
+        # Arithmetic wraps modulo 2^64; the high 32 bits are the hash (no division needed)
+        with np.errstate(over="ignore"):
+            permuted = hashes[:, None] * self._a + self._b
+        return (permuted >> np.uint64(32)).min(axis=0)
+
+
+def estimated_jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    return float(np.count_nonzero(signature_a == signature_b)) / len(signature_a)
+
+
+class NearDuplicateIndex:
+    """
+    LSH index that assigns each added article to a cluster.
+
+    Candidates share at least one band bucket. A candidate only joins a
+    cluster when its estimated Jaccard similarity to that cluster's canonical
+    copy reaches the threshold, so clusters do not chain through loose matches.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, num_perm: int = NUM_PERM,
+                 shingle_size: int = SHINGLE_SIZE):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = _lsh_bands(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Index an article.
+
+        Returns:
+            Key of the canonical copy it duplicates, or None if it starts a new cluster
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+
+        best_key, best_similarity = None, self.threshold
+        band_keys = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        seen = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            for candidate in bucket.get(band_key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                similarity = estimated_jaccard(signature, self._signatures[candidate])
+                if similarity >= best_similarity:
+                    best_key, best_similarity = candidate, similarity
+        if best_key is not None:
+            return best_key
+
+        # Only canonical copies are indexed, so every match points at a cluster's canonical article
+        self._signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, band_keys):
+            bucket.setdefault(band_key, []).append(key)
+        return None
+
+
+def cluster_articles(articles: Sequence, threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                     key_field: str = "url") -> Dict[str, str]:
+    """
+    Near-duplicate clusters of articles, in input order.
+
+    Returns:
+        Key of every duplicate -> key of its cluster's canonical (first) copy
+    """
+    index = NearDuplicateIndex(threshold)
+    duplicates = {}
+    for article in articles:
+        key = article.get(key_field)
+        if not key or key in duplicates:
+            continue
+        canonical = index.add(key, article_text(article))
+        if canonical is not None and canonical != key:
+            duplicates[key] = canonical
+    return duplicates
+
+
+def link_near_duplicates(articles: Iterable[dict], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> int:
+    """
+    Set duplicate_of (canonical url) on syndicated copies and clear it elsewhere.
+
+    Returns:
+        Number of articles marked as duplicates
+    """
+    articles = list(articles)
+    duplicates = cluster_articles(articles, threshold)
+    for article in articles:
+        canonical = duplicates.get(article.get("url"))
+        if canonical:
+            article["duplicate_of"] = canonical
+        else:
+            article.pop("duplicate_of", None)
+    clusters = len(set(duplicates.values()))
+    logging.info(f"Near-duplicate detection: {len(duplicates)} of {len(articles)} articles are copies "
+                 f"within {clusters} clusters (threshold {threshold})")
+    return len(duplicates)
@@ -0,0 +1,145 @@
+"""
+Writes a fresh knowledge graph as CSV files for `neo4j-admin database import full`.
+
+The offline importer builds the store files directly instead of running one
+MERGE per node, so it needs every id to be unique up front: nodes are
+deduplicated by id (labels from repeated ids are unioned) and relationships
+by (start, end, type) while the files are written.
+"""
+import os
+import csv
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from src_v3.components.kg_builder.graph_artifacts import GraphArtifactStore, deserialize_graph_documents
+from src_v3.components.kg_builder.tools.allsides_datagen import build_bias_map, clean_name
+from src_v3.memory.in_memory_graph import neo4j_relationship_type
+
+
+ARTICLE_HEADER = ["id:ID", "url", "title", "source_name", "author", "publishedAt", "bias", "full_content", ":LABEL"]
+SOURCE_HEADER = ["id:ID", "name", "bias", ":LABEL"]
+ENTITY_HEADER = ["id:ID", "type", ":LABEL"]
+# Shared label on every extracted entity, next to its type (as in create_kg)
+ENTITY_LABEL = "Entity"
+RELATIONSHIP_HEADER = [":START_ID", ":END_ID", ":TYPE"]
+
+# Article -> entity links use the same relationship as kg_builder.create_kg
+ARTICLE_ENTITY_RELATIONSHIP = "MENTIONS"
+PUBLISHED_BY_RELATIONSHIP = "PUBLISHED_BY"
+
+
+def source_node_id(source_name: str) -> str:
+    return f"source://{clean_name(source_name)}"
+
+
+def _labels(labels) -> str:
+    return ";".join(sorted(labels))
+
+
+def export_bulk_import_csv(output_dir: str, store: Optional[GraphArtifactStore] = None,
+                           allsides_csv: Optional[str] = None,
+                           extractions: Optional[Iterable[Tuple[dict, list]]] = None) -> Dict[str, str]:
+    """
+    Export articles, news sources and extracted entities as neo4j-admin import CSVs.
+
+    Args:
+        output_dir: Directory for the CSV files
+        store: Artifact store with the extracted graph documents (see graph_artifacts)
+        allsides_csv: AllSides ratings CSV; adds News Source nodes with their bias rating
+            and fills in missing article bias labels
+        extractions: (article, graph_docs) pairs to export instead of the store contents
+
+    Returns:
+        Paths of the written files plus the import command, keyed by name
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    bias_map = build_bias_map(allsides_csv) if allsides_csv else {}
+    if extractions is None:
+        store = store or GraphArtifactStore()
+        extractions = ((entry["article"], deserialize_graph_documents(entry["graph_documents"]))
+                       for entry in store.latest())
+
+    paths = {name: os.path.join(output_dir, f"{name}.csv")
+             for name in ("articles", "sources", "entities", "relationships")}
+
+    seen_articles = set()
+    sources: Dict[str, list] = {}
+    # Entities are written at the end so labels of repeated ids can be merged first
+    entities: Dict[str, Tuple[str, set]] = {}
+    seen_relationships = set()
+
+    with open(paths["articles"], "w", newline="", encoding="utf-8") as article_file, \
+            open(paths["relationships"], "w", newline="", encoding="utf-8") as rel_file:
+        article_writer = csv.writer(article_file)
+        rel_writer = csv.writer(rel_file)
+        article_writer.writerow(ARTICLE_HEADER)
+        rel_writer.writerow(RELATIONSHIP_HEADER)
+
+        def write_relationship(start, rel_type, end):
+            key = (start, end, rel_type)
+            if key not in seen_relationships:
+                seen_relationships.add(key)
+                rel_writer.writerow(key)
+
+        for article, graph_docs in extractions:
+            url = article.get("url")
+            if not url or url in seen_articles:
+                continue
+            seen_articles.add(url)
+
+            source_name = article.get("source") or ""
+            rating = bias_map.get(clean_name(source_name)) if source_name else None
+            bias = article.get("bias") or rating
+            article_writer.writerow([url, url, article.get("title"), source_name, article.get("author"),
+                                     article.get("date"), bias, article.get("full_content"), "Article"])
+
+            if source_name:
+                source_id = source_node_id(source_name)
+                sources.setdefault(source_id, [source_id, source_name, rating, "News Source"])
+                write_relationship(url, PUBLISHED_BY_RELATIONSHIP, source_id)
+
+            for graph_doc in graph_docs:
+                for node in graph_doc.nodes:
+                    # Articles come from the article file, not from the extraction
+                    if node.type == "Article" or node.id in seen_articles:
+                        continue
+                    entities.setdefault(node.id, (node.type, set()))[1].add(node.type)
+                    write_relationship(url, ARTICLE_ENTITY_RELATIONSHIP, node.id)
+                for rel in graph_doc.relationships:
+                    for end in (rel.source, rel.target):
+                        if end.id not in seen_articles:
+                            entities.setdefault(end.id, (end.type, set()))[1].add(end.type)
+                    write_relationship(rel.source.id, neo4j_relationship_type(rel.type), rel.target.id)
+
+    # An id used for an article or source must not be exported again as an entity
+    for node_id in seen_articles.union(sources):
+        entities.pop(node_id, None)
+
+    with open(paths["sources"], "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SOURCE_HEADER)
+        writer.writerows(sources.values())
+
+    with open(paths["entities"], "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(ENTITY_HEADER)
+        for node_id, (node_type, labels) in entities.items():
+            writer.writerow([node_id, node_type, _labels(labels | {ENTITY_LABEL})])
+
+    paths["command"] = (
+        "neo4j-admin database import full --multiline-fields=true --skip-duplicate-nodes=true "
+        f"--nodes={paths['articles']} --nodes={paths['sources']} --nodes={paths['entities']} "
+        f"--relationships={paths['relationships']} neo4j"
+    )
+    logging.info(f"Exported {len(seen_articles)} articles, {len(sources)} sources, {len(entities)} entities "
+                 f"and {len(seen_relationships)} relationships to {output_dir}")
+    return paths
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = export_bulk_import_csv(
+        output_dir="../neo4j_import",
+        allsides_csv="./AllSides Media Bias Ratings 3.11.25.csv"
+    )
+    print(f"Run with the database stopped:\n{result['command']}")
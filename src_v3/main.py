@@ -1,7 +1,6 @@
 from typing import Dict, Any, Optional
-from src_v3.workflow.graph import create_workflow
+from src_v3.workflow.factory import get_workflow, get_knowledge_graph
 from src_v3.memory.schema import GraphState
-from src_v3.components.kg_builder.kg_builder import KnowledgeGraph
 # from src_v3.components.bias_analyzer.bias_agent import bias_analyzer_agent
 from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
 # from src_v3.components.fact_checker.fact_checker_Agent import fact_checker_agent
@@ -18,8 +17,8 @@ def initialize_state() -> GraphState:
 
 def run_workflow(input_data: Dict[str, Any] = None) -> GraphState:
     """Run the workflow with optional input data"""
-    # Create workflow
-    workflow = create_workflow()
+    # Reuse the compiled workflow and its shared KG across calls
+    workflow = get_workflow()
 
     # Initialize state
     initial_state = initialize_state()
@@ -50,8 +49,8 @@ def process_direct_query(query: str, query_type: str = "fact_check") -> GraphSta
     Returns:
         Updated GraphState with results
     """
-    # Initialize KG
-    kg = KnowledgeGraph()
+    # Shared KG
+    kg = get_knowledge_graph()
 
     # Create initial state
     state = initialize_state()
@@ -85,8 +84,8 @@ def fetch_and_analyze_news(topic: str = "politics", days: int = 1, limit: int =
     Returns:
         GraphState with analyzed articles
     """
-    # Initialize KG
-    kg = KnowledgeGraph()
+    # Shared KG
+    kg = get_knowledge_graph()
 
     # Fetch articles directly from KG builder
     articles = kg.fetch_news_articles(query=topic, days=days, limit=limit)
@@ -0,0 +1,248 @@
+import sys
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Alternate spellings used by NewsAPI payloads, the evaluation CSVs and the KG
+# rows, in priority order for each canonical field
+CANONICAL_ALIASES = {
+    "title": ("title", "headline"),
+    "full_content": ("full_content", "content"),
+    "source": ("source", "source_name"),
+    "date": ("date", "publishedAt", "published_at"),
+    "url": ("url",),
+    "author": ("author",),
+}
+
+FIELD_ALIASES = {alias: field for field, aliases in CANONICAL_ALIASES.items() for alias in aliases}
+
+# Placeholder values used when an article is rendered for a prompt
+DISPLAY_DEFAULTS = {
+    "title": "Untitled",
+    "full_content": "",
+    "source": "Unknown Source",
+    "date": "No date provided",
+}
+
+# Low-cardinality extra fields whose string values are worth interning
+INTERNED_EXTRAS = ("bias", "ground_truth_bias", "ground_truth", "ground_truth_verdict")
+
+ARTICLE_PROMPT_TEMPLATE = """Title: {title}
+    Content: {content}
+    Source: {source}
+    Date: {date}"""
+
+
+def _intern(value):
+    """Intern short repeated strings (source names, labels) so batches share one copy"""
+    if isinstance(value, str) and len(value) <= 256:
+        return sys.intern(value)
+    return value
+
+
+def _source_name(source):
+    """NewsAPI nests the source as {'id': ..., 'name': ...}"""
+    if isinstance(source, dict):
+        return source.get("name") or source.get("id")
+    return source
+
+
+class ArticleRecord(MutableMapping):
+    """
+    Compact article record used on the hot pipeline path.
+
+    The canonical fields live in slots and every alias ('content',
+    'source_name', 'publishedAt', ...) resolves to the same slot, so the
+    normalisation happens once when the record is built. Anything else an
+    agent attaches (bias_result, fact_check_result, ground truth labels)
+    goes into a small extras dict. The record keeps the dict protocol so
+    existing `article.get(...)` / `article[...] = ...` code keeps working.
+    """
+
+    __slots__ = ("title", "_full_content", "_content_loader", "source", "date", "url", "author", "extras")
+
+    def __init__(self, title: Optional[str] = None, full_content: Optional[str] = None,
+                 source: Optional[str] = None, date: Optional[str] = None, url: Optional[str] = None,
+                 author: Optional[str] = None, extras: Optional[Dict[str, Any]] = None,
+                 content_loader: Optional[Callable[[], Optional[str]]] = None):
+        self.title = title
+        self._full_content = full_content
+        self._content_loader = content_loader if full_content is None else None
+        self.source = _intern(_source_name(source))
+        self.date = _intern(date)
+        self.url = url
+        self.author = _intern(author)
+        self.extras = extras if extras is not None else {}
+
+    @classmethod
+    def from_dict(cls, article: Mapping, content_loader: Optional[Callable[[], Optional[str]]] = None) -> "ArticleRecord":
+        """Build a record from a free-form article dict, resolving field aliases.
+
+        Args:
+            article: Article dict from NewsAPI, a dataset row or a KG query
+            content_loader: Optional callable that fetches full_content on first access
+
+        Returns:
+            ArticleRecord
+        """
+        if isinstance(article, ArticleRecord):
+            return article
+
+        canonical = {}
+        for field, aliases in CANONICAL_ALIASES.items():
+            # First non-empty alias wins, matching the old `a.get(x) or a.get(y)` chains
+            for alias in aliases:
+                value = article.get(alias)
+                if value:
+                    canonical[field] = value
+                    break
+
+        extras = {
+            key: _intern(value) if key in INTERNED_EXTRAS else value
+            for key, value in article.items()
+            if key not in FIELD_ALIASES
+        }
+
+        return cls(extras=extras, content_loader=content_loader, **canonical)
+
+    @property
+    def full_content(self) -> Optional[str]:
+        """Article body, loaded on first access when a content loader was given"""
+        if self._full_content is None and self._content_loader is not None:
+            self._full_content = self._content_loader()
+            self._content_loader = None
+        return self._full_content
+
+    @full_content.setter
+    def full_content(self, value: Optional[str]) -> None:
+        self._full_content = value
+        self._content_loader = None
+
+    def fill_defaults(self, defaults: Optional[Dict[str, str]] = None) -> "ArticleRecord":
+        """Fill missing canonical fields with placeholder values"""
+        for field, value in (defaults or DISPLAY_DEFAULTS).items():
+            if not self._get_field(field):
+                self._set_field(field, value)
+        return self
+
+    def prompt_view(self) -> "ArticlePromptView":
+        """Return a read-only view of the fields used in prompts without copying them"""
+        return ArticlePromptView(self)
+
+    def format_for_prompt(self) -> str:
+        """Render the article with the shared prompt template"""
+        return ARTICLE_PROMPT_TEMPLATE.format_map(self.prompt_view())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with canonical keys plus extras, e.g. for JSON output"""
+        return dict(self.items())
+
+    def copy(self) -> "ArticleRecord":
+        """Shallow copy: strings are shared, extras get a new dict"""
+        clone = ArticleRecord.__new__(ArticleRecord)
+        clone.title = self.title
+        clone._full_content = self._full_content
+        clone._content_loader = self._content_loader
+        clone.source = self.source
+        clone.date = self.date
+        clone.url = self.url
+        clone.author = self.author
+        clone.extras = dict(self.extras)
+        return clone
+
+    def _get_field(self, field):
+        if field == "full_content":
+            return self.full_content
+        return getattr(self, field)
+
+    def _set_field(self, field, value):
+        if field == "full_content":
+            self.full_content = value
+        elif field == "source":
+            self.source = _intern(_source_name(value))
+        elif field in ("date", "author"):
+            setattr(self, field, _intern(value))
+        else:
+            setattr(self, field, value)
+
+    def __getitem__(self, key: str) -> Any:
+        field = FIELD_ALIASES.get(key)
+        if field is not None:
+            value = self._get_field(field)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        field = FIELD_ALIASES.get(key)
+        if field is not None:
+            self._set_field(field, value)
+        else:
+            self.extras[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        field = FIELD_ALIASES.get(key)
+        if field is not None:
+            if self._get_field(field) is None:
+                raise KeyError(key)
+            self._set_field(field, None)
+        else:
+            del self.extras[key]
+
+    def __contains__(self, key) -> bool:
+        field = FIELD_ALIASES.get(key)
+        if field is not None:
+            # Avoid triggering the lazy loader just for a membership test
+            if field == "full_content" and self._full_content is None:
+                return self._content_loader is not None
+            return getattr(self, field) is not None
+        return key in self.extras
+
+    def __iter__(self) -> Iterator[str]:
+        for field in CANONICAL_ALIASES:
+            if field in self:
+                yield field
+        yield from self.extras
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(title={self.title!r}, source={self.source!r}, url={self.url!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+
+class ArticlePromptView(Mapping):
+    """Read-only mapping over an ArticleRecord for `str.format_map`, with display defaults"""
+
+    __slots__ = ("_record",)
+
+    _KEYS = ("title", "content", "source", "date")
+
+    def __init__(self, record: ArticleRecord):
+        self._record = record
+
+    def __getitem__(self, key: str) -> Any:
+        field = FIELD_ALIASES.get(key)
+        if field is None or key not in self._KEYS:
+            raise KeyError(key)
+        return self._record._get_field(field) or DISPLAY_DEFAULTS[field]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+def as_article_record(article: Any) -> ArticleRecord:
+    """Return the article as an ArticleRecord, converting dicts once"""
+    if isinstance(article, ArticleRecord):
+        return article
+    return ArticleRecord.from_dict(article)
@@ -0,0 +1,226 @@
+"""
+Local entity extraction from the knowledge graph's own vocabulary.
+
+The agents only use extracted entity names to look up e.id in the graph, so
+an LLM round trip is not needed when the text mentions entities the graph
+already holds. EntityMatcher is a word-level Aho-Corasick automaton over
+every entity id, name and alias, which finds all mentions in one pass over
+the text. It grows with add_article (see KnowledgeGraph.entity_matcher).
+
+match_entities() is the agents' fast path. It returns None, so the caller
+falls back to the LLM transformer, when the matches cover too few of the
+text's proper-noun tokens.
+"""
+import os
+import re
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Labels of graph nodes that are not extracted entities
+NON_ENTITY_LABELS = ("Article", "Bias", "FactCheck", "Chunk", "Document")
+
+ENTITY_MATCHER_ENABLED = os.getenv("ENTITY_MATCHER", "on").lower() not in ("off", "false", "0")
+# Share of the text's proper-noun tokens the matches must cover to skip the LLM
+ENTITY_MATCH_MIN_COVERAGE = float(os.getenv("ENTITY_MATCH_MIN_COVERAGE", "0.6"))
+
+# Single-word aliases this short ("US", "EU") only match with the same capitalisation
+CASE_SENSITIVE_MAX_CHARS = 3
+
+_TOKEN = re.compile(r"\w+")
+_SENTENCE_BREAK = re.compile(r"[.!?:\n]")
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "by", "with", "from", "as", "is",
+    "was", "are", "were", "be", "it", "its", "this", "that", "he", "she", "they", "we", "i", "you", "his",
+    "her", "their", "our", "s", "mr", "mrs", "ms", "dr",
+}
+
+
+class EntityMatch(NamedTuple):
+    entities: List[str]
+    coverage: float
+
+
+def entity_aliases(properties: Dict) -> List[str]:
+    """Surface forms of an entity node besides its id: name and aliases properties"""
+    aliases = []
+    for value in (properties.get("name"), properties.get("aliases")):
+        if isinstance(value, str):
+            aliases.append(value)
+        elif isinstance(value, (list, tuple)):
+            aliases.extend(alias for alias in value if isinstance(alias, str))
+    return aliases
+
+
+def _tokens(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group(0), m.start(), m.end()) for m in _TOKEN.finditer(text or "")]
+
+
+class EntityMatcher:
+    """
+    Word-level Aho-Corasick automaton mapping surface forms to entity ids.
+
+    Patterns are inserted into the trie as they arrive; failure links are
+    rebuilt lazily on the next match after an insert (linear in trie size).
+    Matching is linear in the number of words plus matches, and keeps the
+    leftmost-longest non-overlapping mentions.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # state -> [(entity id, pattern length in words, original tokens if case-sensitive)]
+        self._outputs: List[List[tuple]] = [[]]
+        self._outputs_with_fail: List[List[tuple]] = [[]]
+        self._patterns = set()
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_vocabulary(cls, vocabulary: Iterable[Tuple[str, Sequence[str]]]) -> "EntityMatcher":
+        """Build from (entity id, aliases) pairs"""
+        matcher = cls()
+        count = 0
+        for entity_id, aliases in vocabulary:
+            matcher.add(entity_id, aliases)
+            count += 1
+        logging.info(f"Built entity matcher over {count} entities ({len(matcher._patterns)} surface forms)")
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def add(self, entity_id: str, aliases: Sequence[str] = ()) -> None:
+        """Index an entity under its id and aliases"""
+        if not entity_id:
+            return
+        with self._lock:
+            for surface in (entity_id, *aliases):
+                tokens = [token for token, _, _ in _tokens(surface)]
+                words = [token.lower() for token in tokens]
+                if not words or all(word in _STOPWORDS or word.isdigit() for word in words):
+                    continue
+                cased = tuple(tokens) if len(words) == 1 and len(words[0]) <= CASE_SENSITIVE_MAX_CHARS else None
+                pattern = (entity_id, len(words), cased)
+                if (tuple(words), pattern) in self._patterns:
+                    continue
+                self._patterns.add((tuple(words), pattern))
+
+                state = 0
+                for word in words:
+                    next_state = self._goto[state].get(word)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._outputs.append([])
+                        self._outputs_with_fail.append([])
+                        self._goto[state][word] = next_state
+                    state = next_state
+                self._outputs[state].append(pattern)
+                self._dirty = True
+
+    def add_graph_documents(self, graph_docs) -> None:
+        """Index the entity nodes of transformer output (called on ingest)"""
+        for graph_doc in graph_docs:
+            for node in graph_doc.nodes:
+                if node.type not in NON_ENTITY_LABELS:
+                    self.add(node.id, entity_aliases(node.properties or {}))
+
+    def _build_failure_links(self) -> None:
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        self._outputs_with_fail[0] = []
+        while queue:
+            state = queue.popleft()
+            self._outputs_with_fail[state] = self._outputs[state] + self._outputs_with_fail[self._fail[state]]
+            for word, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                queue.append(child)
+        self._dirty = False
+
+    def match(self, text: str) -> EntityMatch:
+        """Entity ids mentioned in the text (first mention order) and their proper-noun coverage"""
+        tokens = _tokens(text)
+        spans = []
+        with self._lock:
+            if self._dirty:
+                self._build_failure_links()
+            state = 0
+            for end, (token, _, _) in enumerate(tokens):
+                word = token.lower()
+                while state and word not in self._goto[state]:
+                    state = self._fail[state]
+                state = self._goto[state].get(word, 0)
+                for entity_id, length, cased in self._outputs_with_fail[state]:
+                    start = end - length + 1
+                    if cased is None or tuple(t for t, _, _ in tokens[start:end + 1]) == cased:
+                        spans.append((start, end, entity_id))
+
+        # Leftmost-longest mentions; every entity sharing a selected span is kept
+        spans.sort(key=lambda s: (s[0], s[0] - s[1]))
+        entities, covered, taken_until, selected = [], set(), -1, None
+        for start, end, entity_id in spans:
+            if start > taken_until:
+                selected, taken_until = (start, end), end
+                covered.update(range(start, end + 1))
+            if (start, end) == selected and entity_id not in entities:
+                entities.append(entity_id)
+
+        proper = _proper_noun_positions(text, tokens, covered)
+        if proper:
+            coverage = len(proper & covered) / len(proper)
+        else:
+            coverage = 1.0 if entities else 0.0
+        return EntityMatch(entities, coverage)
+
+
+def _proper_noun_positions(text: str, tokens: List[Tuple[str, int, int]], matched: set) -> set:
+    """Capitalised, non-stopword tokens that are matched or do not start a sentence"""
+    positions = set()
+    for i, (token, start, _) in enumerate(tokens):
+        if not token[0].isupper() or token.lower() in _STOPWORDS:
+            continue
+        if i in matched:
+            positions.add(i)
+            continue
+        if i == 0 or _SENTENCE_BREAK.search(text, tokens[i - 1][2], start):
+            continue
+        positions.add(i)
+    return positions
+
+
+def match_entities(knowledge_graph, text: str, min_coverage: float = ENTITY_MATCH_MIN_COVERAGE) -> Optional[List[str]]:
+    """
+    Entities found locally in the graph's vocabulary, or None to fall back to the LLM.
+
+    Args:
+        knowledge_graph: Graph providing entity_matcher(); others always fall back
+        text: Claim or article text
+        min_coverage: Share of proper-noun tokens the matches must cover
+    """
+    if not ENTITY_MATCHER_ENABLED or not text:
+        return None
+    get_matcher = getattr(knowledge_graph, "entity_matcher", None)
+    if get_matcher is None:
+        return None
+    try:
+        matcher = get_matcher()
+    except Exception as e:
+        logging.warning(f"[Entity matcher] Could not load the graph vocabulary: {e}")
+        return None
+    if not isinstance(matcher, EntityMatcher):
+        return None
+
+    result = matcher.match(text)
+    if not result.entities or result.coverage < min_coverage:
+        logging.info(f"[Entity matcher] {len(result.entities)} entities, coverage {result.coverage:.2f}, "
+                     f"falling back to LLM extraction")
+        return None
+    return result.entities
@@ -0,0 +1,35 @@
+import os
+import logging
+from typing import Optional
+
+from src_v3.memory.knowledge_graph import KnowledgeGraph
+
+# KG_BACKEND selects the graph store behind the KnowledgeGraph interface:
+#   neo4j  - Neo4j server from NEO4J_URI (default)
+#   memory - in-process graph, optionally persisted to KG_SNAPSHOT_PATH
+#   sqlite - embedded SQLite file at KG_SQLITE_PATH
+KG_BACKENDS = ("neo4j", "memory", "sqlite")
+
+
+def create_knowledge_graph(backend: Optional[str] = None) -> KnowledgeGraph:
+    """
+    Create a knowledge graph for the configured backend.
+
+    Args:
+        backend: One of KG_BACKENDS; defaults to the KG_BACKEND environment variable
+
+    Returns:
+        Object implementing the KnowledgeGraph methods
+    """
+    backend = (backend or os.getenv("KG_BACKEND", "neo4j")).lower()
+    if backend not in KG_BACKENDS:
+        raise ValueError(f"Unknown KG_BACKEND '{backend}', expected one of {KG_BACKENDS}")
+
+    logging.info(f"Creating knowledge graph with backend: {backend}")
+    if backend == "memory":
+        from src_v3.memory.in_memory_graph import InMemoryKnowledgeGraph
+        return InMemoryKnowledgeGraph()
+    if backend == "sqlite":
+        from src_v3.memory.sqlite_graph import SQLiteKnowledgeGraph
+        return SQLiteKnowledgeGraph()
+    return KnowledgeGraph()
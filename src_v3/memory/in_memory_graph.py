@@ -0,0 +1,506 @@
+import os
+import json
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_experimental.graph_transformers import LLMGraphTransformer
+
+from src_v3.memory.article import as_article_record
+from src_v3.utils.tracing import span
+from src_v3.components.kg_builder.graph_artifacts import extract_graph_documents
+from src_v3.memory.knowledge_graph import ALLOWED_NODES, KnowledgeGraph, article_document
+from src_v3.memory.entity_matcher import NON_ENTITY_LABELS, entity_aliases
+from src_v3.utils.embeddings import VectorIndex
+
+# Edges linking an article to the entities it mentions, followed per query as the Neo4j
+# queries do: structural bias uses the MENTIONS edges the offline KG builder writes for
+# ground-truth articles, similar articles the HAS_ENTITY edges KnowledgeGraph.add_article writes
+BIAS_CONTEXT_RELATIONSHIPS = ("MENTIONS",)
+SIMILAR_ARTICLE_RELATIONSHIPS = ("HAS_ENTITY",)
+
+SNAPSHOT_VERSION = 1
+
+
+def neo4j_relationship_type(rel_type: str) -> str:
+    """Relationship type as Neo4jGraph.add_graph_documents stores it"""
+    return rel_type.replace(" ", "_").replace("`", "").upper()
+
+
+def cosine_rank(query, embeddings, top_k: int) -> List[tuple]:
+    """(index, cosine similarity) of the top_k embeddings, best first, from one matrix product"""
+    matrix = np.array(embeddings, dtype=float)
+    query = np.array(query, dtype=float)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+    return [(int(i), float(scores[i])) for i in np.argsort(-scores)[:top_k]]
+
+
+class InMemoryKnowledgeGraph(KnowledgeGraph):
+    """
+    Knowledge graph held in process memory, with the same public methods as KnowledgeGraph.
+
+    Nodes live in a hash index keyed by id (articles are keyed by url), with
+    a secondary index per label. Relationships are kept as outgoing and
+    incoming adjacency maps so neighbourhood lookups never scan the graph.
+    The graph can be saved to and loaded from a JSON snapshot.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, article_transformer=None):
+        """
+        Args:
+            snapshot_path: JSON snapshot to load on start-up and write in save_snapshot();
+                defaults to the KG_SNAPSHOT_PATH environment variable
+            article_transformer: Graph transformer for add_article; a Bedrock-backed
+                LLMGraphTransformer is created on first use if omitted
+        """
+        self.graph = None
+        self.snapshot_path = snapshot_path or os.getenv("KG_SNAPSHOT_PATH")
+        self._article_transformer = article_transformer
+        self._lock = threading.RLock()
+
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._labels: Dict[str, set] = defaultdict(set)
+        # node id -> {(relationship type, neighbour id): properties}
+        self._out: Dict[str, Dict[tuple, Dict[str, Any]]] = defaultdict(dict)
+        self._in: Dict[str, Dict[tuple, Dict[str, Any]]] = defaultdict(dict)
+        # Nearest-neighbour index over Chunk embeddings, rebuilt on the first query after chunks change
+        self._chunk_index = None
+
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            self.load_snapshot(self.snapshot_path)
+
+    @property
+    def article_transformer(self):
+        # The transformer needs an LLM; graphs used only for lookups never create one
+        if self._article_transformer is None:
+            self.llm = self.create_llm()
+            self._article_transformer = LLMGraphTransformer(llm=self.llm, allowed_nodes=ALLOWED_NODES)
+        return self._article_transformer
+
+    # --- Storage primitives -------------------------------------------------
+
+    def merge_node(self, node_id: str, label: Optional[str] = None,
+                   properties: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create the node if missing, then add the label and set the properties (MERGE ... SET)"""
+        with self._lock:
+            node = self._nodes.get(node_id)
+            if node is None:
+                node = {"id": node_id, "labels": set(), "properties": {"id": node_id}}
+                self._nodes[node_id] = node
+            if label:
+                node["labels"].add(label)
+                self._labels[label].add(node_id)
+            node["properties"].update(properties or {})
+            return node
+
+    def merge_relationship(self, source_id: str, rel_type: str, target_id: str,
+                           properties: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            edge = self._out[source_id].setdefault((rel_type, target_id), {})
+            edge.update(properties or {})
+            self._in[target_id][(rel_type, source_id)] = edge
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        node = self._nodes.get(node_id)
+        return node["properties"] if node else None
+
+    def delete_node(self, node_id: str) -> None:
+        """Remove the node and its relationships (DETACH DELETE)"""
+        with self._lock:
+            node = self._nodes.pop(node_id, None)
+            if node is None:
+                return
+            for label in node["labels"]:
+                self._labels[label].discard(node_id)
+            for rel_type, other in self._out.pop(node_id, {}):
+                self._in.get(other, {}).pop((rel_type, node_id), None)
+            for rel_type, other in self._in.pop(node_id, {}):
+                self._out.get(other, {}).pop((rel_type, node_id), None)
+
+    def _articles(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._nodes[node_id]["properties"] for node_id in self._labels.get("Article", ())]
+
+    def _neighbours(self, node_id: str, rel_types, incoming: bool = False) -> List[str]:
+        adjacency = self._in if incoming else self._out
+        with self._lock:
+            return [other for (rel_type, other) in adjacency.get(node_id, {}) if rel_type in rel_types]
+
+    def _article_entities(self, url: str, rel_types) -> List[str]:
+        return self._neighbours(url, rel_types)
+
+    def _articles_mentioning(self, entity_id: str, rel_types) -> List[str]:
+        return [node_id for node_id in self._neighbours(entity_id, rel_types, incoming=True)
+                if "Article" in self._nodes[node_id]["labels"]]
+
+    def _article_bias_label(self, url: str) -> Optional[str]:
+        for bias_id in self._neighbours(url, ("has_bias", "HAS_BIAS")):
+            bias = self._nodes[bias_id]["properties"]
+            return bias.get("label") or bias.get("overall_assessment")
+        return None
+
+    def add_graph_documents(self, graph_docs) -> None:
+        """Store transformer output the way Neo4jGraph.add_graph_documents does"""
+        with self._lock:
+            for graph_doc in graph_docs:
+                for node in graph_doc.nodes:
+                    self.merge_node(node.id, node.type, node.properties)
+                for rel in graph_doc.relationships:
+                    self.merge_node(rel.source.id, rel.source.type)
+                    self.merge_node(rel.target.id, rel.target.type)
+                    self.merge_relationship(rel.source.id, neo4j_relationship_type(rel.type), rel.target.id,
+                                            rel.properties)
+            self._index_entities(graph_docs)
+
+    # --- KnowledgeGraph interface -------------------------------------------
+
+    def add_article(self, article, graph_docs=None, index_chunks=True):
+        """Add a single article to the knowledge graph
+
+        Args:
+            article: Article dict or record
+            graph_docs: Previously extracted graph documents; the graph transformer runs if omitted
+            index_chunks: Chunk and embed the article text (callers adding many articles do it in one batch)
+        """
+        record = as_article_record(article)
+        url = record.url
+
+        # Convert the article to a graph, reusing a stored extraction of the same text
+        if graph_docs is None:
+            graph_docs = extract_graph_documents(self.article_transformer, article_document(record), record)
+
+        with self._lock, span("kg.write_graph_documents", url=url):
+            properties = {"url": url, "source_name": record.source, "author": record.author,
+                          "publishedAt": record.date, "title": record.title, "full_content": record.full_content}
+            # Ground-truth bias, as the offline KG builder stores it
+            if record.get("bias"):
+                properties["bias"] = record["bias"]
+            if record.get("duplicate_of"):
+                properties["duplicate_of"] = record["duplicate_of"]
+            self.merge_node(url, "Article", properties)
+
+            self.add_graph_documents(graph_docs)
+            for graph_doc in graph_docs:
+                for node in graph_doc.nodes:
+                    self.merge_relationship(url, "HAS_ENTITY", node.id)
+                    if record.get("bias"):
+                        self.merge_relationship(url, "MENTIONS", node.id)
+
+        if "bias_analysis" in article:
+            self.add_bias_analysis(url, article["bias_analysis"])
+
+        if "fact_check" in article:
+            self.add_fact_check(article)
+
+        if index_chunks:
+            self._index_chunks([record])
+
+        return True
+
+    def add_bias_analysis(self, article_url: str, bias_analysis: Dict) -> bool:
+        """Add bias analysis results to an article.
+
+        Args:
+            article_url (str): URL of the article
+            bias_analysis (Dict): Bias analysis results
+
+        Returns:
+            bool: Success status
+        """
+        with self._lock:
+            if article_url not in self._nodes:
+                return False
+            bias_id = article_url + "_bias"
+            self.merge_node(bias_id, "Bias", {
+                "overall_assessment": bias_analysis.get('bias', 'Neutral'),
+                "confidence_score": bias_analysis.get('confidence_score', 50),
+                "reasoning": bias_analysis.get('reasoning', ''),
+                "timestamp": datetime.now().isoformat()
+            })
+            self.merge_relationship(article_url, "has_bias", bias_id)
+        logging.info(f"Added bias analysis for article: {article_url}")
+        return True
+
+    def add_fact_check(self, article):
+        """Add fact check data to the knowledge graph"""
+        url = article.get("url")
+        fact_check = article.get("fact_check", {})
+        with self._lock:
+            if url not in self._nodes:
+                return
+            fact_check_id = f"factcheck://article/{url}"
+            self.merge_node(fact_check_id, "FactCheck", {
+                "article_url": url,
+                "overall_verdict": fact_check.get("report", {}).get("overall_verdict", ""),
+                "verified_claims": str(fact_check.get("verified_claims", []))
+            })
+            self.merge_relationship(url, "HAS_FACT_CHECK", fact_check_id)
+
+    def create_vector_index(self):
+        """No index to build; lookups go through the in-memory hash indexes"""
+        pass
+
+    def add_articles_from_json(self, filename):
+        """Add articles from a JSON file and write the snapshot if one is configured"""
+        super().add_articles_from_json(filename)
+        if self.snapshot_path:
+            self.save_snapshot()
+
+    def retrieve_related_articles(self, query, limit=5):
+        """Retrieve articles related to a query"""
+        results = []
+        for article in self._articles():
+            if query in (article.get("title") or "") or query in (article.get("full_content") or ""):
+                results.append({
+                    "title": article.get("title"),
+                    "source_name": article.get("source_name"),
+                    "url": article.get("url"),
+                    "published_at": article.get("publishedAt"),
+                    "content": article.get("full_content"),
+                })
+                if len(results) >= limit:
+                    break
+        return results
+
+    def get_similar_articles(self, article_url, limit=3):
+        """Find similar articles based on shared entities"""
+        shared = Counter()
+        for entity_id in self._article_entities(article_url, SIMILAR_ARTICLE_RELATIONSHIPS):
+            for other_url in self._articles_mentioning(entity_id, SIMILAR_ARTICLE_RELATIONSHIPS):
+                if other_url != article_url:
+                    shared[other_url] += 1
+
+        results = []
+        for url, count in shared.most_common(limit):
+            article = self._nodes[url]["properties"]
+            results.append({"title": article.get("title"), "source_name": article.get("source_name"),
+                            "url": url, "shared_entities": count})
+        return results
+
+    def get_bias_report(self, topic, limit=10):
+        """Get a report of bias across news sources on a topic.
+
+        Args:
+            topic (str): Topic to analyze bias for
+            limit (int): Maximum number of sources to include
+
+        Returns:
+            List of dictionaries with source name and bias assessment
+        """
+        counts = Counter()
+        for article in self._articles():
+            if topic not in (article.get("title") or "") and topic not in (article.get("full_content") or ""):
+                continue
+            assessment = self._article_bias_label(article["url"])
+            if assessment is not None:
+                counts[(article.get("source_name") or 'Unknown Source', assessment)] += 1
+
+        return [{'source': source, 'assessment': assessment, 'article_count': count}
+                for (source, assessment), count in counts.most_common(limit)]
+
+    def get_similar_articles_by_embedding(self, article_url: str, top_k: int = 5) -> list:
+        """Find top-k articles most similar to the given article using Node2Vec embeddings."""
+        target = self.get_node(article_url)
+        if not target or not target.get("node2vecEmbedding"):
+            return []
+
+        candidates = []
+        for article in self._articles():
+            bias = self._article_bias_label(article["url"])
+            if article["url"] != article_url and article.get("node2vecEmbedding") and bias is not None:
+                candidates.append((article, bias))
+        if not candidates:
+            return []
+
+        ranked = cosine_rank(target["node2vecEmbedding"], [article["node2vecEmbedding"] for article, _ in candidates],
+                             top_k)
+        return [{"title": candidates[i][0].get("title"), "url": candidates[i][0]["url"],
+                 "bias": candidates[i][1], "similarity": score} for i, score in ranked]
+
+    def entity_vocabulary(self) -> List[tuple]:
+        """(entity id, aliases) of every extracted entity in the graph"""
+        with self._lock:
+            return [(node_id, entity_aliases(node["properties"])) for node_id, node in self._nodes.items()
+                    if node["labels"] and not node["labels"] & set(NON_ENTITY_LABELS)]
+
+    def chunk_hashes(self, urls: List[str]) -> Dict[str, str]:
+        """Chunk set hash per article url, for articles that have chunks"""
+        with self._lock:
+            return {url: self._nodes[url]["properties"]["chunks_hash"] for url in urls
+                    if url in self._nodes and self._nodes[url]["properties"].get("chunks_hash")}
+
+    def replace_chunks(self, chunks_by_article: Dict[str, tuple]) -> None:
+        """
+        Replace the Chunk nodes of articles already in the graph.
+
+        Args:
+            chunks_by_article: url -> (chunks hash, [{"id", "index", "text", "embedding"}])
+        """
+        with self._lock:
+            for url, (chunks_hash, chunks) in chunks_by_article.items():
+                if "Article" not in self._nodes.get(url, {}).get("labels", ()):
+                    continue
+                for chunk_id in self._neighbours(url, ("HAS_CHUNK",)):
+                    self.delete_node(chunk_id)
+                for chunk in chunks:
+                    self.merge_node(chunk["id"], "Chunk", {"url": url, "index": chunk["index"], "text": chunk["text"],
+                                                           "textEmbedding": list(chunk["embedding"])})
+                    self.merge_relationship(url, "HAS_CHUNK", chunk["id"])
+                self._nodes[url]["properties"]["chunks_hash"] = chunks_hash
+            self._chunk_index = None
+
+    def retrieve_related_passages(self, embedding: List[float], limit: int = 5) -> List[Dict[str, Any]]:
+        """Article chunks nearest to the embedding, best first"""
+        with self._lock:
+            if self._chunk_index is None:
+                chunk_ids = sorted(self._labels.get("Chunk", ()))
+                if not chunk_ids:
+                    return []
+                vectors = np.array([self._nodes[chunk_id]["properties"]["textEmbedding"] for chunk_id in chunk_ids],
+                                   dtype=np.float32)
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                index = VectorIndex(vectors.shape[1])
+                index.add(vectors / np.where(norms == 0, 1.0, norms))
+                self._chunk_index = (chunk_ids, index)
+            chunk_ids, index = self._chunk_index
+
+            query = np.asarray(embedding, dtype=np.float32)
+            query /= np.linalg.norm(query) or 1.0
+            passages = []
+            for position, score in index.search(query, top_k=limit):
+                chunk = self._nodes[chunk_ids[position]]["properties"]
+                article = self._nodes.get(chunk["url"], {}).get("properties", {})
+                passages.append({"url": chunk["url"], "title": article.get("title"), "text": chunk["text"],
+                                 "score": score})
+            return passages
+
+    def query_most_structurally_similar_bias(self, entities: list) -> str:
+        """
+        Finds the single most structurally similar article based on shared entities and returns its bias.
+        """
+        if not entities:
+            return ""
+
+        overlap = Counter()
+        for entity_id in set(entities):
+            for url in self._articles_mentioning(entity_id, BIAS_CONTEXT_RELATIONSHIPS):
+                if self._nodes[url]["properties"].get("bias") is not None:
+                    overlap[url] += 1
+
+        if not overlap:
+            return "Unknown"
+        url, _ = overlap.most_common(1)[0]
+        article = self._nodes[url]["properties"]
+        logging.info(f"Most similar article from KG: {article.get('title')} with bias {article['bias']}")
+        return article["bias"].capitalize()
+
+    def retrieve_related_facts_text(self, entities: List[str], limit: int = 25) -> str:
+        """
+        Retrieve relationship-level context from the KG for the given entities.
+        Returns a human-readable string summary.
+        """
+        if not entities:
+            logging.warning("[KG] No entities provided for context retrieval.")
+            return ""
+
+        logging.info(f"[KG] Retrieving context for entities: {entities}")
+        summaries = []
+        seen = set()
+        with self._lock:
+            for entity_id in entities:
+                if entity_id not in self._nodes:
+                    continue
+                edges = [(rel_type, entity_id, other) for (rel_type, other) in self._out.get(entity_id, {})]
+                edges += [(rel_type, other, entity_id) for (rel_type, other) in self._in.get(entity_id, {})]
+                for rel_type, source_id, target_id in edges:
+                    if (source_id, rel_type, target_id) in seen:
+                        continue
+                    seen.add((source_id, rel_type, target_id))
+                    summaries.append(f"{source_id} -[{rel_type}]-> {target_id}")
+                    if len(summaries) >= limit:
+                        return "\n".join(summaries)
+        return "\n".join(summaries)
+
+    def add_fact_check_result(self, claim: str, result: Dict[str, Any], related_entities: List[str]) -> bool:
+        """
+        Store a fact-check result in the knowledge graph.
+
+        Args:
+            claim: The evaluated claim text.
+            result: The structured result from the fact-checking agent.
+            related_entities: List of entity IDs mentioned in the claim.
+
+        Returns:
+            True if added successfully, False otherwise.
+        """
+        factcheck_id = f"factcheck://{datetime.now().strftime('%Y%m%d%H%M%S')}/{abs(hash(claim))}"
+        with self._lock:
+            self.merge_node(factcheck_id, "FactCheck", {
+                "claim": claim,
+                "verdict": result.get("verdict"),
+                "confidence_score": result.get("confidence_score", 0),
+                "reasoning": result.get("reasoning", ""),
+                "timestamp": datetime.now().isoformat()
+            })
+            for entity_id in related_entities:
+                if entity_id in self._nodes:
+                    self.merge_relationship(factcheck_id, "MENTIONS", entity_id)
+        return True
+
+    # --- Snapshots ----------------------------------------------------------
+
+    def save_snapshot(self, path: Optional[str] = None) -> str:
+        """Write the graph to a JSON snapshot (atomically, via a temporary file)"""
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path given and KG_SNAPSHOT_PATH is not set")
+
+        with self._lock:
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "nodes": [{"id": node_id, "labels": sorted(node["labels"]), "properties": node["properties"]}
+                          for node_id, node in self._nodes.items()],
+                "relationships": [[source_id, rel_type, target_id, properties]
+                                  for source_id, edges in self._out.items()
+                                  for (rel_type, target_id), properties in edges.items()],
+            }
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_path, path)
+        logging.info(f"Saved KG snapshot with {len(snapshot['nodes'])} nodes to {path}")
+        return path
+
+    def load_snapshot(self, path: str) -> None:
+        """Replace the graph contents with a JSON snapshot"""
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+
+        with self._lock:
+            self._nodes.clear()
+            self._labels.clear()
+            self._out.clear()
+            self._in.clear()
+            for node in snapshot.get("nodes", []):
+                entry = self.merge_node(node["id"], properties=node.get("properties"))
+                for label in node.get("labels", []):
+                    entry["labels"].add(label)
+                    self._labels[label].add(node["id"])
+            for source_id, rel_type, target_id, properties in snapshot.get("relationships", []):
+                self.merge_relationship(source_id, rel_type, target_id, properties)
+            self._chunk_index = None
+        logging.info(f"Loaded KG snapshot with {len(self._nodes)} nodes from {path}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "nodes": len(self._nodes),
+                "relationships": sum(len(edges) for edges in self._out.values()),
+                "articles": len(self._labels.get("Article", ())),
+            }
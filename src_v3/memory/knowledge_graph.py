@@ -1,6 +1,7 @@
 import os, json
 from typing import List, Dict, Any
 import logging
+import threading
 import boto3
 from dotenv import load_dotenv
 from langchain_core.documents import Document
@@ -8,6 +9,15 @@ from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_neo4j import Neo4jGraph
 from langchain_aws import ChatBedrock
 from langchain_community.graphs.graph_document import Node, Relationship
+from src_v3.memory.article import as_article_record
+from src_v3.memory.schema_manager import CHUNK_VECTOR_DIMENSIONS, ENTITY_LABEL, ensure_schema, report_label_scans
+from src_v3.memory.entity_matcher import EntityMatcher, entity_aliases
+from src_v3.memory.query_instrumentation import instrument_graph
+from src_v3.components.kg_builder.graph_artifacts import extract_graph_documents
+from src_v3.components.kg_builder.chunk_pipeline import CHUNK_INDEXING_ENABLED, index_article_chunks
+from src_v3.utils.rate_limiter import Priority
+from src_v3.utils.llm_backend import bedrock_runtime_client
+from src_v3.utils.tracing import span
 import requests
 from datetime import datetime, timedelta
 from sklearn.metrics.pairwise import cosine_similarity
@@ -15,26 +25,186 @@ import numpy as np
 
 load_dotenv()
 
+# Node labels the graph transformer may extract from article text
+ALLOWED_NODES = [
+    "Person", "Organization", "Event", "Policy", "Issue", "Location",
+    "Election", "Bill", "Vote", "Speech", "Scandal", "Movement",
+    "Alliance", "Media", "Article", "News Source", "Fact Check", "Bias"
+]
+
+
+def article_document(record) -> List[Document]:
+    """LangChain Document for an article record, as fed to the graph transformer"""
+    return [
+        Document(
+            page_content=record.full_content or "",
+            metadata={
+                "source_name": record.source,
+                "author": record.author,
+                "publishedAt": record.date,
+                "url": record.url,
+                "title": record.title
+            }
+        )
+    ]
+
+
+# Entities are merged on the shared Entity label (index-backed) before the
+# graph documents are written; add_graph_documents then finds them by type and id
+LABEL_ENTITIES_QUERY = f"""
+UNWIND $entities AS entity
+MERGE (e:{ENTITY_LABEL} {{id: entity.id}})
+WITH e, entity
+CALL apoc.create.addLabels(e, [entity.type]) YIELD node
+RETURN count(node) AS labelled
+"""
+
+STRUCTURAL_BIAS_QUERY = f"""
+MATCH (e:{ENTITY_LABEL})
+WHERE e.id IN $entities
+
+MATCH (e)<-[:MENTIONS]-(a:Article)
+WHERE a.bias IS NOT NULL
+
+WITH a, a.bias AS bias, count(*) AS overlap_score
+ORDER BY overlap_score DESC
+RETURN a.title AS title, bias
+LIMIT 1
+"""
+
+RELATED_FACTS_QUERY = f"""
+MATCH (e:{ENTITY_LABEL})
+WHERE e.id IN $entities
+MATCH (e)-[r]-(n)
+RETURN DISTINCT
+  e.id AS source_node,
+  labels(e) AS source_labels,
+  type(r) AS relationship,
+  n.id AS target_node,
+  labels(n) AS target_labels
+LIMIT $limit
+"""
+
+SIMILAR_ARTICLES_QUERY = """
+MATCH (a:Article {url: $url})-[:HAS_ENTITY]->(e)
+MATCH (e)<-[:HAS_ENTITY]-(similar:Article)
+WHERE similar.url <> $url
+RETURN similar.title as title, similar.source_name as source_name, 
+       similar.url as url, COUNT(e) as shared_entities
+ORDER BY shared_entities DESC
+LIMIT $limit
+"""
+
+CHUNK_HASHES_QUERY = """
+MATCH (a:Article)
+WHERE a.url IN $urls AND a.chunks_hash IS NOT NULL
+RETURN a.url AS url, a.chunks_hash AS chunks_hash
+"""
+
+DELETE_CHUNKS_QUERY = """
+MATCH (a:Article)-[:HAS_CHUNK]->(c:Chunk)
+WHERE a.url IN $urls
+DETACH DELETE c
+"""
+
+# Chunks only attach to articles already in the graph, like the other MATCH ... MERGE writes
+WRITE_CHUNKS_QUERY = """
+UNWIND $chunks AS chunk
+MATCH (a:Article {url: chunk.url})
+MERGE (c:Chunk {id: chunk.id})
+SET c.url = chunk.url, c.index = chunk.index, c.text = chunk.text
+WITH a, c, chunk
+CALL db.create.setNodeVectorProperty(c, 'textEmbedding', chunk.embedding)
+MERGE (a)-[:HAS_CHUNK]->(c)
+"""
+
+SET_CHUNKS_HASH_QUERY = """
+UNWIND $articles AS article
+MATCH (a:Article {url: article.url})
+SET a.chunks_hash = article.chunks_hash
+"""
+
+RELATED_PASSAGES_QUERY = """
+CALL db.index.vector.queryNodes('chunkVector', $limit, $embedding) YIELD node, score
+MATCH (a:Article)-[:HAS_CHUNK]->(node)
+RETURN a.url AS url, a.title AS title, node.text AS text, score
+"""
+
+ENTITY_VOCABULARY_QUERY = f"""
+MATCH (e:{ENTITY_LABEL})
+RETURN e.id AS id, e.name AS name, e.aliases AS aliases
+"""
+
+LINK_FACT_CHECK_QUERY = f"""
+MATCH (f:FactCheck {{id: $factcheck_id}})
+UNWIND $entity_ids AS entity_id
+MATCH (e:{ENTITY_LABEL} {{id: entity_id}})
+MERGE (f)-[:MENTIONS]->(e)
+"""
+
+# Queries on the agents' hot path with example parameters, checked by report_label_scans()
+HOT_QUERIES = {
+    "query_most_structurally_similar_bias": (STRUCTURAL_BIAS_QUERY, {"entities": ["example"]}),
+    "retrieve_related_facts_text": (RELATED_FACTS_QUERY, {"entities": ["example"], "limit": 25}),
+    "get_similar_articles": (SIMILAR_ARTICLES_QUERY, {"url": "https://example.com", "limit": 3}),
+    "retrieve_related_passages": (RELATED_PASSAGES_QUERY,
+                                  {"embedding": [0.0] * CHUNK_VECTOR_DIMENSIONS, "limit": 3}),
+}
+
+# Guards the lazy entity matcher build of every graph instance
+_entity_matcher_lock = threading.Lock()
+
+
+class Neo4jChunkStore:
+    """Chunk writes for a Neo4jGraph, shared by KnowledgeGraph and the offline KG builder"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def chunk_hashes(self, urls: List[str]) -> Dict[str, str]:
+        """Chunk set hash per article url, for articles that have chunks"""
+        records = self.graph.query(CHUNK_HASHES_QUERY, {"urls": list(urls)})
+        return {record["url"]: record["chunks_hash"] for record in records}
+
+    def replace_chunks(self, chunks_by_article: Dict[str, tuple]) -> None:
+        """
+        Replace the Chunk nodes of articles in three batched queries.
+
+        Args:
+            chunks_by_article: url -> (chunks hash, [{"id", "index", "text", "embedding"}])
+        """
+        chunks = [dict(chunk, url=url) for url, (_, article_chunks) in chunks_by_article.items()
+                  for chunk in article_chunks]
+        for chunk in chunks:
+            if len(chunk["embedding"]) != CHUNK_VECTOR_DIMENSIONS:
+                raise ValueError(f"Chunk embeddings have {len(chunk['embedding'])} dimensions, "
+                                 f"the chunkVector index expects {CHUNK_VECTOR_DIMENSIONS}")
+        with span("kg.replace_chunks", article_count=len(chunks_by_article), chunk_count=len(chunks)):
+            self.graph.query(DELETE_CHUNKS_QUERY, {"urls": list(chunks_by_article)})
+            if chunks:
+                self.graph.query(WRITE_CHUNKS_QUERY, {"chunks": chunks})
+            self.graph.query(SET_CHUNKS_HASH_QUERY, {"articles": [
+                {"url": url, "chunks_hash": chunks_hash} for url, (chunks_hash, _) in chunks_by_article.items()]})
+
 
 class KnowledgeGraph:
     def __init__(self):
         """Initialize the Knowledge Graph with Neo4j connection"""
-        self.graph = Neo4jGraph(
+        # Every query is timed per method; slow ones go to the slow-query log
+        self.graph = instrument_graph(Neo4jGraph(
             url=os.getenv("NEO4J_URI"),
             username=os.getenv("NEO4J_USERNAME"),
             password=os.getenv("NEO4J_PASSWORD")
-        )
+        ))
+        # Create or migrate constraints and indexes once per process
+        try:
+            ensure_schema(self.graph)
+        except Exception as e:
+            logging.error(f"[KG schema] Schema bootstrap failed: {e}")
         # Initialize LLM
         self.llm = self.create_llm()
         # Initialize the article transformer
-        self.article_transformer = LLMGraphTransformer(
-            llm=self.llm,
-            allowed_nodes=[
-                "Person", "Organization", "Event", "Policy", "Issue", "Location",
-                "Election", "Bill", "Vote", "Speech", "Scandal", "Movement",
-                "Alliance", "Media", "Article", "News Source", "Fact Check", "Bias"
-            ],
-        )
+        self.article_transformer = LLMGraphTransformer(llm=self.llm, allowed_nodes=ALLOWED_NODES)
 
     def create_bedrock_client(self):
         """Create bedrock authenticated Bedrock client"""
@@ -48,7 +218,8 @@ class KnowledgeGraph:
             bedrock_client = session.client(service_name='bedrock-runtime',
                                             region_name=os.getenv('AWS_REGION', 'us-east-1')
                                             )
-            return bedrock_client
+            # KG ingestion is bulk work and yields to interactive and batch traffic
+            return bedrock_runtime_client(bedrock_client, Priority.BACKGROUND)
         except Exception as e:
             print(f"Error creating bedrock client: {e}")
             raise
@@ -119,82 +290,95 @@ class KnowledgeGraph:
             print(f"Error fetching news articles: {e}")
             return []
 
-    def add_article(self, article):
-        """Add a single article to the knowledge graph"""
-        source = article.get("source")
-        source_name = source["name"] if isinstance(source, dict) else source
-
-        author = article.get("author")
-        published_at = article.get("date") or article.get("publishedAt")
-        url = article.get("url")
-        title = article.get("title")
-        full_content = article.get("content") or article.get("full_content")
-
-        # Create a LangChain Document with metadata
-        article_doc = [
-            Document(
-                page_content=full_content or "",
-                metadata={
-                    "source_name": source_name,
-                    "author": author,
-                    "publishedAt": published_at,
-                    "url": url,
-                    "title": title
-                }
-            )
-        ]
+    def add_article(self, article, graph_docs=None, index_chunks=True):
+        """Add a single article to the knowledge graph
 
-        # Convert the article to a graph
-        graph_docs = self.article_transformer.convert_to_graph_documents(article_doc)
-
-        # Create the article node
-        self.graph.query(
-            """
-            MERGE (a:Article {url: $url})
-            SET a.source_name = $source_name,
-                a.author = $author,
-                a.publishedAt = $publishedAt,
-                a.title = $title,
-                a.full_content = $full_content
-            """,
-            {
-                "url": url,
-                "source_name": source_name,
-                "author": author,
-                "publishedAt": published_at,
-                "title": title,
-                "full_content": full_content
-            }
-        )
-
-        article_node = Node(
-            id=url,
-            type="Article"
-        )
-
-        # Create relationships between the article node and the generated graph
-        for graph_doc in graph_docs:
-            for node in graph_doc.nodes:
-                graph_doc.relationships.append(
-                    Relationship(
-                        source=article_node,
-                        target=node,
-                        type="HAS_ENTITY"
-                    )
+        Args:
+            article: Article dict or record
+            graph_docs: Previously extracted graph documents; the graph transformer runs if omitted
+            index_chunks: Chunk and embed the article text (callers adding many articles do it in one batch)
+        """
+        record = as_article_record(article)
+        with span("kg.add_article", url=record.url) as article_span:
+            source_name = record.source
+            author = record.author
+            published_at = record.date
+            url = record.url
+            title = record.title
+            full_content = record.full_content
+
+            # Convert the article to a graph, reusing a stored extraction of the same text
+            article_span.set_attribute("graph_docs_provided", graph_docs is not None)
+            if graph_docs is None:
+                graph_docs = extract_graph_documents(self.article_transformer, article_document(record), record)
+
+            # Create the article node
+            with span("kg.write_article"):
+                self.graph.query(
+                    """
+                    MERGE (a:Article {url: $url})
+                    SET a.id = $url,
+                        a.source_name = $source_name,
+                        a.author = $author,
+                        a.publishedAt = $publishedAt,
+                        a.title = $title,
+                        a.full_content = $full_content,
+                        a.bias = coalesce($bias, a.bias),
+                        a.duplicate_of = coalesce($duplicate_of, a.duplicate_of)
+                    """,
+                    {
+                        "url": url,
+                        "source_name": source_name,
+                        "author": author,
+                        "publishedAt": published_at,
+                        "title": title,
+                        "full_content": full_content,
+                        # Ground-truth bias and syndication, as the offline KG builder stores them
+                        "bias": record.get("bias") or None,
+                        "duplicate_of": record.get("duplicate_of") or None
+                    }
                 )
 
-        # Add the generated nodes and relationships to the graph
-        self.graph.add_graph_documents(graph_docs)
-
-        # Add bias analysis if available
-        if "bias_analysis" in article:
-            self.add_bias_analysis(article)
+            article_node = Node(
+                id=url,
+                type="Article"
+            )
 
-        # Add fact check if available
-        if "fact_check" in article:
-            self.add_fact_check(article)
+            # Create relationships between the article node and the generated graph; ground-truth
+            # articles also get the MENTIONS edges STRUCTURAL_BIAS_QUERY follows
+            entity_relationships = ("HAS_ENTITY", "MENTIONS") if record.get("bias") else ("HAS_ENTITY",)
+            for graph_doc in graph_docs:
+                for node in graph_doc.nodes:
+                    for rel_type in entity_relationships:
+                        graph_doc.relationships.append(
+                            Relationship(
+                                source=article_node,
+                                target=node,
+                                type=rel_type
+                            )
+                        )
+
+            # Add the generated nodes and relationships to the graph
+            entities = [{"id": node.id, "type": node.type}
+                        for graph_doc in graph_docs for node in graph_doc.nodes if node.type != "Article"]
+            with span("kg.write_graph_documents", entity_count=len(entities)):
+                if entities:
+                    self.graph.query(LABEL_ENTITIES_QUERY, {"entities": entities})
+                self.graph.add_graph_documents(graph_docs)
+            self._index_entities(graph_docs)
+
+            # Add bias analysis if available
+            if "bias_analysis" in article:
+                self.add_bias_analysis(article)
+
+            # Add fact check if available
+            if "fact_check" in article:
+                self.add_fact_check(article)
+
+            if index_chunks:
+                self._index_chunks([record])
 
-        return True
+            return True
 
     def add_bias_analysis(self, article_url: str, bias_analysis: Dict) -> bool:
         """Add bias analysis results to an article.
@@ -260,15 +444,58 @@ class KnowledgeGraph:
         )
 
     def create_vector_index(self):
-        """Create a vector index for semantic search"""
-        self.graph.query("""
-            CREATE VECTOR INDEX `chunkVector`
-            IF NOT EXISTS
-            FOR (c: Chunk) ON (c.textEmbedding)
-            OPTIONS {indexConfig: {
-            `vector.dimensions`: 1536,
-            `vector.similarity_function`: 'cosine'
-            }};""")
+        """Make sure the vector index (and the rest of the schema) exists; a no-op after the first call"""
+        ensure_schema(self.graph)
+
+    def chunk_hashes(self, urls: List[str]) -> Dict[str, str]:
+        """Chunk set hash per article url, for articles that have chunks"""
+        return Neo4jChunkStore(self.graph).chunk_hashes(urls)
+
+    def replace_chunks(self, chunks_by_article: Dict[str, tuple]) -> None:
+        """Replace the Chunk nodes of articles (see Neo4jChunkStore.replace_chunks)"""
+        Neo4jChunkStore(self.graph).replace_chunks(chunks_by_article)
+
+    def _index_chunks(self, articles) -> None:
+        """Chunk and embed ingested articles for passage retrieval; unchanged articles are skipped"""
+        if not CHUNK_INDEXING_ENABLED:
+            return
+        try:
+            index_article_chunks(articles, self)
+        except Exception as e:
+            logging.error(f"[KG] Chunk indexing failed: {e}")
+
+    def retrieve_related_passages(self, embedding: List[float], limit: int = 5) -> List[Dict[str, Any]]:
+        """Article chunks nearest to the embedding (chunkVector index), best first"""
+        try:
+            records = self.graph.query(RELATED_PASSAGES_QUERY, {"embedding": list(embedding), "limit": limit})
+        except Exception as e:
+            logging.error(f"[KG] Failed to retrieve related passages: {e}")
+            return []
+        return [dict(record) for record in records]
+
+    def entity_vocabulary(self) -> List[tuple]:
+        """(entity id, aliases) of every extracted entity in the graph"""
+        records = self.graph.query(ENTITY_VOCABULARY_QUERY)
+        return [(record["id"], entity_aliases(record)) for record in records if record.get("id")]
+
+    def entity_matcher(self) -> EntityMatcher:
+        """Matcher over the graph's entity vocabulary, built on first use and extended by add_article"""
+        if getattr(self, "_entity_matcher", None) is None:
+            with _entity_matcher_lock:
+                if getattr(self, "_entity_matcher", None) is None:
+                    with span("kg.build_entity_matcher"):
+                        self._entity_matcher = EntityMatcher.from_vocabulary(self.entity_vocabulary())
+        return self._entity_matcher
+
+    def _index_entities(self, graph_docs) -> None:
+        """Add ingested entities to the matcher if it has been built"""
+        matcher = getattr(self, "_entity_matcher", None)
+        if matcher is not None:
+            matcher.add_graph_documents(graph_docs)
+
+    def report_label_scans(self) -> Dict[str, List[str]]:
+        """Hot queries whose plans fall back to label or all-node scans"""
+        return report_label_scans(self.graph, HOT_QUERIES)
 
     def retrieve_related_articles(self, query, limit=5):
         """Retrieve articles related to a query"""
@@ -297,7 +524,8 @@ class KnowledgeGraph:
         articles = articles_data.get('articles', [])
 
         for article in articles:
-            self.add_article(article)
+            self.add_article(article, index_chunks=False)
+        self._index_chunks(articles)
 
         # Create vector index after adding articles
         self.create_vector_index()
@@ -305,15 +533,7 @@ class KnowledgeGraph:
     def get_similar_articles(self, article_url, limit=3):
         """Find similar articles based on shared entities"""
         results = self.graph.query(
-            """
-            MATCH (a:Article {url: $url})-[:HAS_ENTITY]->(e)
-            MATCH (e)<-[:HAS_ENTITY]-(similar:Article)
-            WHERE similar.url <> $url
-            RETURN similar.title as title, similar.source_name as source_name, 
-                   similar.url as url, COUNT(e) as shared_entities
-            ORDER BY shared_entities DESC
-            LIMIT $limit
-            """,
+            SIMILAR_ARTICLES_QUERY,
             {
                 "url": article_url,
                 "limit": limit
@@ -333,18 +553,17 @@ class KnowledgeGraph:
             List of dictionaries with source name and bias assessment
         """
         try:
-            # Escape the topic for search
-            search_topic = topic.replace("'", "\\'")
-
+            # Parameters instead of string interpolation; CONTAINS is served by the article text indexes
             results = self.graph.query(
-                f"""
+                """
                 MATCH (a:Article)-[:has_bias]->(b:Bias)
-                WHERE a.title CONTAINS '{search_topic}' OR a.content CONTAINS '{search_topic}'
+                WHERE a.title CONTAINS $topic OR a.full_content CONTAINS $topic
                 WITH a.source_name as source, b.overall_assessment as assessment, count(*) as article_count
                 RETURN source, assessment, article_count
                 ORDER BY article_count DESC
-                LIMIT {limit}
-                """
+                LIMIT $limit
+                """,
+                {"topic": topic, "limit": limit}
             )
 
             bias_report = []
@@ -408,24 +627,9 @@ class KnowledgeGraph:
         if not entities:
             return ""
 
-        escaped = [f'"{e.replace("\"", "")}"' for e in entities]
-        entity_list = f"[{', '.join(escaped)}]"
-
-        cypher = f"""
-        MATCH (e)
-        WHERE e.id IN {entity_list}
-
-        MATCH (e)<-[:MENTIONS]-(a:Article)
-        WHERE a.bias IS NOT NULL
-
-        WITH a, a.bias AS bias, count(*) AS overlap_score
-        ORDER BY overlap_score DESC
-        RETURN a.title AS title, bias
-        LIMIT 1
-        """
-
         try:
-            results = self.graph.query(cypher)
+            # Entities are passed as a parameter, so the plan is cached and the lookup uses entity_id_idx
+            results = self.graph.query(STRUCTURAL_BIAS_QUERY, {"entities": list(entities)})
             if results:
                 logging.info(f"Most similar article from KG: {results[0]['title']} with bias {results[0]['bias']}")
                 return results[0]["bias"].capitalize()
@@ -448,23 +652,8 @@ class KnowledgeGraph:
             return ""
 
         logging.info(f"[KG] Retrieving context for entities: {entities}")
-        query = """
-        MATCH (e)
-        WHERE e.id IN $entities
-        OPTIONAL MATCH (n1)-[r2]-(n2)
-
-        MATCH (e)-[r]-(n)
-        RETURN DISTINCT
-          e.id AS source_node,
-          labels(e) AS source_labels,
-          type(r) AS relationship,
-          n.id AS target_node,
-          labels(n) AS target_labels
-        LIMIT $limit
-        """
-
         try:
-            records = self.graph.query(query, params={"entities": entities, "limit": limit})
+            records = self.graph.query(RELATED_FACTS_QUERY, params={"entities": entities, "limit": limit})
 
             facts = []
             for record in records:
@@ -532,16 +721,11 @@ class KnowledgeGraph:
                 "timestamp": datetime.now().isoformat()
             })
 
-            # Connect FactCheck to related entities
-            for entity_id in related_entities:
-                self.graph.query("""
-                MATCH (e) WHERE e.id = $entity_id
-                MATCH (f:FactCheck {id: $factcheck_id})
-                MERGE (f)-[:MENTIONS]->(e)
-                """, {
-                    "entity_id": entity_id,
-                    "factcheck_id": factcheck_id
-                })
+            # Connect FactCheck to related entities in one round trip
+            self.graph.query(LINK_FACT_CHECK_QUERY, {
+                "entity_ids": list(related_entities),
+                "factcheck_id": factcheck_id
+            })
 
             return True
         except Exception as e:
@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import time
+import atexit
+import bisect
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+# Latency histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# KG_CAPTURE_PLANS: off, explain (plan only, the query is not re-run) or profile (re-runs
+# read-only queries; writes fall back to their EXPLAIN plan)
+PLAN_MODES = ("off", "explain", "profile")
+
+SLOW_QUERY_LOGGER = "kg.slow_queries"
+
+
+class MethodStats:
+    """Latency histogram, row and byte counts for one KG method"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, rows: int, size: int, error: bool = False) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+        self.bytes += size
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        if not self.calls:
+            return 0.0
+        threshold = fraction * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "buckets": list(self.buckets),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MethodStats":
+        stats = cls()
+        for key, value in data.items():
+            setattr(stats, key, value)
+        return stats
+
+
+class QueryMetrics:
+    """Process-wide per-method query statistics"""
+
+    def __init__(self):
+        self._stats: Dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, elapsed_ms: float, rows: int = 0, size: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get(method)
+            if stats is None:
+                stats = self._stats[method] = MethodStats()
+            stats.record(elapsed_ms, rows, size, error)
+
+    def snapshot(self) -> Dict[str, MethodStats]:
+        with self._lock:
+            return {method: MethodStats.from_dict(stats.to_dict()) for method, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path: str) -> None:
+        with self._lock:
+            data = {method: stats.to_dict() for method, stats in self._stats.items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"buckets_ms": LATENCY_BUCKETS_MS, "methods": data}, f, indent=2)
+
+
+_metrics = QueryMetrics()
+
+
+def get_query_metrics() -> QueryMetrics:
+    return _metrics
+
+
+def _slow_query_logger() -> logging.Logger:
+    logger = logging.getLogger(SLOW_QUERY_LOGGER)
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            os.getenv("KG_SLOW_QUERY_LOG", "kg_slow_queries.log"),
+            maxBytes=int(os.getenv("KG_SLOW_QUERY_LOG_BYTES", str(5 * 1024 * 1024))),
+            backupCount=3,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        # Slow-query entries go to their own file only
+        logger.propagate = False
+    return logger
+
+
+def summarize_plan(plan) -> Optional[Dict[str, Any]]:
+    """Operator tree of a driver plan/profile with the fields worth reading in a log"""
+    if not plan:
+        return None
+    as_dict = isinstance(plan, dict)
+    operator = plan.get("operatorType", "") if as_dict else getattr(plan, "operator_type", "")
+    arguments = (plan.get("args", {}) if as_dict else getattr(plan, "arguments", {})) or {}
+    children = plan.get("children", []) if as_dict else getattr(plan, "children", [])
+    summary = {"operator": operator.split("@")[0], "details": arguments.get("Details")}
+    for field, attribute in (("rows", "rows"), ("dbHits", "db_hits")):
+        value = plan.get(field) if as_dict else getattr(plan, attribute, None)
+        if value is not None:
+            summary[field] = value
+    summary["children"] = [summarize_plan(child) for child in children]
+    return summary
+
+
+def _calling_method() -> str:
+    """Name of the KG method that issued the query (first frame outside this module)"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    return frame.f_code.co_name if frame is not None else "unknown"
+
+
+class InstrumentedGraph:
+    """
+    Wraps a Neo4jGraph and times every query.
+
+    Per-method latency, row counts and result sizes go to the shared
+    QueryMetrics. Queries slower than KG_SLOW_QUERY_MS are written to a
+    rotating slow-query log, with their EXPLAIN or PROFILE plan when
+    KG_CAPTURE_PLANS asks for it.
+    """
+
+    def __init__(self, graph, metrics: Optional[QueryMetrics] = None, slow_query_ms: Optional[float] = None,
+                 plan_mode: Optional[str] = None):
+        self._graph = graph
+        self._metrics = metrics or _metrics
+        self.slow_query_ms = float(slow_query_ms if slow_query_ms is not None
+                                   else os.getenv("KG_SLOW_QUERY_MS", "500"))
+        self.plan_mode = (plan_mode or os.getenv("KG_CAPTURE_PLANS", "off")).lower()
+        if self.plan_mode not in PLAN_MODES:
+            raise ValueError(f"Unknown KG_CAPTURE_PLANS '{self.plan_mode}', expected one of {PLAN_MODES}")
+
+    def __getattr__(self, name):
+        return getattr(self._graph, name)
+
+    def query(self, query: str, params: Optional[dict] = None, **kwargs) -> List[Dict[str, Any]]:
+        method = _calling_method()
+        params = params or {}
+        start = time.perf_counter()
+        try:
+            result = self._graph.query(query, params, **kwargs)
+        except Exception:
+            self._metrics.record(method, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        size = len(json.dumps(result, default=str)) if result else 0
+        self._metrics.record(method, elapsed_ms, len(result or []), size)
+        if elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(method, query, params, elapsed_ms, len(result or []), size)
+        return result
+
+    def add_graph_documents(self, graph_documents, *args, **kwargs):
+        method = _calling_method()
+        start = time.perf_counter()
+        try:
+            return self._graph.add_graph_documents(graph_documents, *args, **kwargs)
+        finally:
+            rows = sum(len(doc.nodes) + len(doc.relationships) for doc in graph_documents)
+            self._metrics.record(f"{method}.add_graph_documents", (time.perf_counter() - start) * 1000, rows)
+
+    def capture_plan(self, query: str, params: dict) -> Optional[Dict[str, Any]]:
+        """
+        EXPLAIN plan of the query, or its PROFILE in profile mode.
+
+        Only read-only queries are profiled: PROFILE executes the query, so a
+        write would be applied a second time. Writes get their EXPLAIN plan.
+        """
+        if self.plan_mode == "off":
+            return None
+        try:
+            with self._graph._driver.session(database=self._graph._database) as session:
+                summary = session.run("EXPLAIN " + query, params).consume()
+                if self.plan_mode == "profile" and summary.query_type == "r":
+                    return summarize_plan(session.run("PROFILE " + query, params).consume().profile)
+            return summarize_plan(summary.plan)
+        except Exception as e:
+            logging.warning(f"[KG] Could not capture {self.plan_mode} plan: {e}")
+            return None
+
+    def _log_slow_query(self, method, query, params, elapsed_ms, rows, size) -> None:
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "method": method,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "rows": rows,
+            "bytes": size,
+            "query": " ".join(query.split()),
+            "params": {key: (str(value)[:200]) for key, value in params.items()},
+            "plan": self.capture_plan(query, params),
+        }
+        _slow_query_logger().info(json.dumps(entry, default=str))
+
+
+def instrument_graph(graph):
+    """Wrap a Neo4jGraph unless KG_QUERY_INSTRUMENTATION=false"""
+    if os.getenv("KG_QUERY_INSTRUMENTATION", "true").lower() != "true" or isinstance(graph, InstrumentedGraph):
+        return graph
+    return InstrumentedGraph(graph)
+
+
+def format_report(stats: Dict[str, MethodStats]) -> str:
+    """Per-method table ordered by total time"""
+    header = f"{'method':<45} {'calls':>7} {'err':>4} {'avg ms':>9} {'p50':>7} {'p95':>7} {'max ms':>9} " \
+             f"{'rows':>8} {'KB':>9}"
+    lines = [header, "-" * len(header)]
+    for method, s in sorted(stats.items(), key=lambda item: item[1].total_ms, reverse=True):
+        avg = s.total_ms / s.calls if s.calls else 0.0
+        lines.append(f"{method:<45} {s.calls:>7} {s.errors:>4} {avg:>9.1f} {s.percentile(0.5):>7.0f} "
+                     f"{s.percentile(0.95):>7.0f} {s.max_ms:>9.1f} {s.rows:>8} {s.bytes / 1024:>9.1f}")
+    return "\n".join(lines)
+
+
+def read_slow_queries(path: str, top: int = 10) -> List[Dict[str, Any]]:
+    """Slowest entries of a slow-query log, including rotated files"""
+    entries = []
+    for candidate in [path] + [f"{path}.{i}" for i in range(1, 4)]:
+        if os.path.exists(candidate):
+            with open(candidate, encoding="utf-8") as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+    return sorted(entries, key=lambda e: e["elapsed_ms"], reverse=True)[:top]
+
+
+def _dump_metrics_at_exit():
+    path = os.getenv("KG_QUERY_METRICS_PATH")
+    if path and _metrics.snapshot():
+        _metrics.dump(path)
+
+
+atexit.register(_dump_metrics_at_exit)
+
+
+if __name__ == "__main__":
+    # Report on a finished run: python -m src_v3.memory.query_instrumentation [metrics.json] [slow log]
+    metrics_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("KG_QUERY_METRICS_PATH", "kg_query_metrics.json")
+    log_path = sys.argv[2] if len(sys.argv) > 2 else os.getenv("KG_SLOW_QUERY_LOG", "kg_slow_queries.log")
+
+    if os.path.exists(metrics_path):
+        with open(metrics_path, encoding="utf-8") as f:
+            methods = json.load(f)["methods"]
+        print(format_report({method: MethodStats.from_dict(data) for method, data in methods.items()}))
+    else:
+        print(f"No metrics file at {metrics_path} (set KG_QUERY_METRICS_PATH for the run)")
+
+    print(f"\nSlowest queries in {log_path}:")
+    for entry in read_slow_queries(log_path):
+        print(f"{entry['elapsed_ms']:>10.1f} ms  {entry['method']:<40} rows={entry['rows']:<6} {entry['query'][:100]}")
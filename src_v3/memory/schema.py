@@ -1,8 +1,9 @@
 from typing import List, Dict, TypedDict, Optional, Any, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 import json
 import logging
+from src_v3.memory.article import ArticleRecord
 
 class NewsArticle(TypedDict):
     title: str
@@ -16,7 +17,9 @@ class NewsArticle(TypedDict):
 # For articles processed through the system
 class GraphState(BaseModel):
     """Shared state schema that all agents can access - simplified for direct KG interaction"""
-    articles: List[Dict] = Field(default_factory=list)  # Standardized on 'articles' (plural)
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    articles: List[Union[ArticleRecord, Dict]] = Field(default_factory=list)  # Standardized on 'articles' (plural)
     current_status: str = "ready"
     error: Optional[str] = None
     news_query: Optional[str] = None  # For direct fact-checking queries
@@ -27,19 +30,23 @@ class GraphState(BaseModel):
 
     @validator('articles', pre=True)
     def parse_json_strings(cls, articles):
-        """Parse any string articles as JSON"""
+        """Parse any string articles as JSON and normalise them into ArticleRecords once at ingestion"""
         parsed_articles = []
         for article in articles:
             if isinstance(article, str):
                 try:
-                    parsed_articles.append(json.loads(article))
+                    article = json.loads(article)
                 except json.JSONDecodeError as e:
                     logging.error(f"Skipping string article, failed to parse JSON: {e}")
                     continue
-            else:
-                parsed_articles.append(article)
+            if isinstance(article, dict):
+                article = ArticleRecord.from_dict(article)
+            parsed_articles.append(article)
         return parsed_articles
 
     def copy(self):
         """Create a proper copy that returns a GraphState, not a dict"""
-        return GraphState(**self.model_dump())  # Updated to use model_dump() instead of dict()
\ No newline at end of file
+        data = self.model_dump()  # Updated to use model_dump() instead of dict()
+        # Records are not deep-copied by model_dump; give the copy its own (shallow) records
+        data["articles"] = [a.copy() if isinstance(a, ArticleRecord) else a for a in data["articles"]]
+        return GraphState(**data)
\ No newline at end of file
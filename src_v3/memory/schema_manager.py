@@ -0,0 +1,204 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Label shared by every extracted entity so entity lookups can use one index
+# instead of scanning all nodes (entities also keep their type label)
+ENTITY_LABEL = "Entity"
+
+# Size of Chunk.textEmbedding vectors in the chunkVector index
+CHUNK_VECTOR_DIMENSIONS = 1536
+
+# Plan operators that mean a query is not using an index
+SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan")
+
+# Versioned migrations: (version, description, [(object name or None, statement)]).
+# Named statements create an index or constraint and are re-run by verify_schema()
+# if the object has gone missing; unnamed ones are one-off data migrations.
+MIGRATIONS: List[Tuple[int, str, List[Tuple[Optional[str], str]]]] = [
+    (1, "article url constraint and title index", [
+        ("article_url_constraint",
+         "CREATE CONSTRAINT article_url_constraint IF NOT EXISTS FOR (a:Article) REQUIRE a.url IS UNIQUE"),
+        ("article_title_idx",
+         "CREATE INDEX article_title_idx IF NOT EXISTS FOR (a:Article) ON (a.title)"),
+    ]),
+    (2, "lookup indexes for entity, bias and fact-check queries", [
+        ("entity_id_idx", f"CREATE INDEX entity_id_idx IF NOT EXISTS FOR (e:{ENTITY_LABEL}) ON (e.id)"),
+        ("article_id_idx", "CREATE INDEX article_id_idx IF NOT EXISTS FOR (a:Article) ON (a.id)"),
+        ("article_bias_idx", "CREATE INDEX article_bias_idx IF NOT EXISTS FOR (a:Article) ON (a.bias)"),
+        ("bias_id_constraint",
+         "CREATE CONSTRAINT bias_id_constraint IF NOT EXISTS FOR (b:Bias) REQUIRE b.id IS UNIQUE"),
+        ("factcheck_id_idx", "CREATE INDEX factcheck_id_idx IF NOT EXISTS FOR (f:FactCheck) ON (f.id)"),
+        ("factcheck_article_url_idx",
+         "CREATE INDEX factcheck_article_url_idx IF NOT EXISTS FOR (f:FactCheck) ON (f.article_url)"),
+    ]),
+    (3, "label existing entities and give articles their graph-document id", [
+        (None, f"""
+            MATCH (n) WHERE n.id IS NOT NULL
+              AND NOT (n:Article OR n:Bias OR n:FactCheck OR n:Chunk OR n:{ENTITY_LABEL})
+            CALL {{ WITH n SET n:{ENTITY_LABEL} }} IN TRANSACTIONS OF 10000 ROWS
+            """),
+        (None, """
+            MATCH (a:Article) WHERE a.id IS NULL AND a.url IS NOT NULL
+            CALL { WITH a SET a.id = a.url } IN TRANSACTIONS OF 10000 ROWS
+            """),
+    ]),
+    (4, "text indexes for article search", [
+        ("article_title_text_idx",
+         "CREATE TEXT INDEX article_title_text_idx IF NOT EXISTS FOR (a:Article) ON (a.title)"),
+        ("article_content_text_idx",
+         "CREATE TEXT INDEX article_content_text_idx IF NOT EXISTS FOR (a:Article) ON (a.full_content)"),
+        ("article_fulltext_idx",
+         "CREATE FULLTEXT INDEX article_fulltext_idx IF NOT EXISTS FOR (a:Article) ON EACH [a.title, a.full_content]"),
+    ]),
+    (5, "chunk vector index", [
+        ("chunkVector", f"""
+            CREATE VECTOR INDEX `chunkVector` IF NOT EXISTS
+            FOR (c:Chunk) ON (c.textEmbedding)
+            OPTIONS {{indexConfig: {{
+            `vector.dimensions`: {CHUNK_VECTOR_DIMENSIONS},
+            `vector.similarity_function`: 'cosine'
+            }}}}"""),
+    ]),
+    (6, "chunk id constraint", [
+        ("chunk_id_constraint", "CREATE CONSTRAINT chunk_id_constraint IF NOT EXISTS FOR (c:Chunk) REQUIRE c.id IS UNIQUE"),
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def required_objects() -> Dict[str, str]:
+    """Index/constraint name -> statement that creates it"""
+    return {name: statement for _, _, statements in MIGRATIONS for name, statement in statements if name}
+
+
+def current_version(graph) -> int:
+    records = graph.query("MATCH (m:SchemaMigration) RETURN max(m.version) AS version")
+    return (records[0].get("version") if records else None) or 0
+
+
+def migrate(graph, target_version: int = SCHEMA_VERSION) -> List[int]:
+    """
+    Apply the migrations newer than the version recorded in the database.
+
+    Returns:
+        Versions applied
+    """
+    version = current_version(graph)
+    applied = []
+    for migration_version, description, statements in MIGRATIONS:
+        if migration_version <= version or migration_version > target_version:
+            continue
+        logging.info(f"[KG schema] Applying migration {migration_version}: {description}")
+        for _, statement in statements:
+            graph.query(statement)
+        graph.query(
+            "MERGE (m:SchemaMigration {version: $version}) SET m.description = $description, m.applied_at = $applied_at",
+            {"version": migration_version, "description": description, "applied_at": datetime.now().isoformat()}
+        )
+        applied.append(migration_version)
+    return applied
+
+
+def existing_objects(graph) -> set:
+    names = {record["name"] for record in graph.query("SHOW INDEXES YIELD name RETURN name")}
+    names.update(record["name"] for record in graph.query("SHOW CONSTRAINTS YIELD name RETURN name"))
+    return names
+
+
+def verify_schema(graph, repair: bool = True) -> List[str]:
+    """
+    Check that every required index and constraint exists, recreating missing ones.
+
+    Returns:
+        Names that were missing
+    """
+    missing = [name for name in required_objects() if name not in existing_objects(graph)]
+    for name in missing:
+        logging.warning(f"[KG schema] Missing index or constraint: {name}")
+        if repair:
+            graph.query(required_objects()[name])
+    return missing
+
+
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+
+
+def database_key(graph) -> tuple:
+    """
+    Identity of the database a graph connects to: server addresses and database name.
+
+    Every KnowledgeGraph opens its own Neo4jGraph, so the bootstrap cache is
+    keyed on the connection rather than the object. Graphs without a neo4j
+    driver fall back to the object itself.
+    """
+    addresses = getattr(getattr(graph, "_driver", None), "initial_addresses", None)
+    if not isinstance(addresses, (list, tuple)) or not addresses:
+        return ("instance", id(graph))
+    return tuple(sorted(str(address) for address in addresses)), getattr(graph, "_database", None)
+
+
+def ensure_schema(graph, force: bool = False) -> Dict[str, Any]:
+    """
+    Migrate and verify the schema once per database per process.
+
+    Disabled with KG_SCHEMA_BOOTSTRAP=false, e.g. for read-only accounts.
+
+    Returns:
+        Applied migration versions and repaired object names
+    """
+    if os.getenv("KG_SCHEMA_BOOTSTRAP", "true").lower() != "true":
+        return {"applied": [], "repaired": []}
+
+    key = database_key(graph)
+    with _bootstrap_lock:
+        if key in _bootstrapped and not force:
+            return {"applied": [], "repaired": []}
+        applied = migrate(graph)
+        repaired = verify_schema(graph)
+        _bootstrapped.add(key)
+    logging.info(f"[KG schema] Schema at version {SCHEMA_VERSION} "
+                 f"(applied {applied or 'none'}, repaired {repaired or 'none'})")
+    return {"applied": applied, "repaired": repaired}
+
+
+def _plan_operators(plan) -> List[str]:
+    """Operator names in an EXPLAIN plan, as returned by the neo4j driver"""
+    if not plan:
+        return []
+    operator = plan.get("operatorType", "") if isinstance(plan, dict) else getattr(plan, "operator_type", "")
+    children = plan.get("children", []) if isinstance(plan, dict) else getattr(plan, "children", [])
+    operators = [operator.split("@")[0]]
+    for child in children:
+        operators.extend(_plan_operators(child))
+    return operators
+
+
+def explain(graph, query: str, params: Optional[Dict[str, Any]] = None):
+    """EXPLAIN plan of a query (nothing is executed)"""
+    with graph._driver.session(database=graph._database) as session:
+        return session.run("EXPLAIN " + query, params or {}).consume().plan
+
+
+def report_label_scans(graph, queries: Dict[str, Tuple[str, Dict[str, Any]]]) -> Dict[str, List[str]]:
+    """
+    Find queries whose plans scan labels or all nodes instead of seeking an index.
+
+    Args:
+        graph: Neo4jGraph
+        queries: Query name -> (cypher, example parameters)
+
+    Returns:
+        Query name -> scan operators, for the queries that scan
+    """
+    report = {}
+    for name, (query, params) in queries.items():
+        scans = [op for op in _plan_operators(explain(graph, query, params)) if op in SCAN_OPERATORS]
+        if scans:
+            logging.warning(f"[KG schema] Query '{name}' is not index-backed: {', '.join(scans)}")
+            report[name] = scans
+    return report
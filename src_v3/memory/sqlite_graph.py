@@ -0,0 +1,571 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from langchain_experimental.graph_transformers import LLMGraphTransformer
+
+from src_v3.memory.article import as_article_record
+from src_v3.utils.tracing import span
+from src_v3.components.kg_builder.graph_artifacts import extract_graph_documents
+from src_v3.memory.knowledge_graph import ALLOWED_NODES, KnowledgeGraph, article_document
+from src_v3.memory.in_memory_graph import (BIAS_CONTEXT_RELATIONSHIPS, SIMILAR_ARTICLE_RELATIONSHIPS,
+                                           neo4j_relationship_type, cosine_rank)
+from src_v3.memory.entity_matcher import NON_ENTITY_LABELS, entity_aliases
+from src_v3.utils.embeddings import VectorIndex
+
+DEFAULT_SQLITE_PATH = "knowledge_graph.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    properties TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS node_labels (
+    label TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    PRIMARY KEY (label, node_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS node_labels_node ON node_labels (node_id);
+CREATE TABLE IF NOT EXISTS edges (
+    source TEXT NOT NULL,
+    type TEXT NOT NULL,
+    target TEXT NOT NULL,
+    properties TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (source, type, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target, type, source);
+CREATE TABLE IF NOT EXISTS articles (
+    rowid INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    source_name TEXT,
+    author TEXT,
+    published_at TEXT,
+    full_content TEXT,
+    bias TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_url ON chunks (url);
+CREATE TABLE IF NOT EXISTS chunk_sets (
+    url TEXT PRIMARY KEY,
+    chunks_hash TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, full_content, content='articles', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, full_content) VALUES (new.rowid, new.title, new.full_content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, full_content)
+    VALUES ('delete', old.rowid, old.title, old.full_content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, full_content)
+    VALUES ('delete', old.rowid, old.title, old.full_content);
+    INSERT INTO articles_fts (rowid, title, full_content) VALUES (new.rowid, new.title, new.full_content);
+END;
+"""
+
+UPSERT_NODE = """
+INSERT INTO nodes (id, properties) VALUES (?, ?)
+ON CONFLICT (id) DO UPDATE SET properties = json_patch(nodes.properties, excluded.properties)
+"""
+INSERT_LABEL = "INSERT OR IGNORE INTO node_labels (label, node_id) VALUES (?, ?)"
+UPSERT_EDGE = """
+INSERT INTO edges (source, type, target, properties) VALUES (?, ?, ?, ?)
+ON CONFLICT (source, type, target) DO UPDATE SET properties = json_patch(edges.properties, excluded.properties)
+"""
+UPSERT_ARTICLE = """
+INSERT INTO articles (url, title, source_name, author, published_at, full_content, bias)
+VALUES (:url, :title, :source_name, :author, :published_at, :full_content, :bias)
+ON CONFLICT (url) DO UPDATE SET
+    title = excluded.title, source_name = excluded.source_name, author = excluded.author,
+    published_at = excluded.published_at, full_content = excluded.full_content,
+    bias = COALESCE(excluded.bias, articles.bias)
+"""
+
+
+def _placeholders(values) -> str:
+    return ", ".join("?" for _ in values)
+
+
+def _fts_phrase(query: str) -> str:
+    """Quote free text as a single FTS5 phrase so operators in it are matched literally"""
+    return '"' + query.replace('"', '""') + '"'
+
+
+class SQLiteKnowledgeGraph(KnowledgeGraph):
+    """
+    Knowledge graph stored in a single SQLite file, with the same public methods as KnowledgeGraph.
+
+    Nodes, labels and edges live in indexed tables (edges are indexed from
+    both ends), article text is searchable through an FTS5 index, and every
+    ingestion call writes in one transaction. The database file can be
+    copied between machines as is, or with backup() while in use.
+    """
+
+    def __init__(self, path: Optional[str] = None, article_transformer=None):
+        """
+        Args:
+            path: Database file, ":memory:" for a throwaway graph; defaults to
+                the KG_SQLITE_PATH environment variable
+            article_transformer: Graph transformer for add_article; a Bedrock-backed
+                LLMGraphTransformer is created on first use if omitted
+        """
+        self.graph = None
+        self.path = path or os.getenv("KG_SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        self._article_transformer = article_transformer
+        self._lock = threading.RLock()
+        # Nearest-neighbour index over chunk embeddings, rebuilt on the first query after chunks change
+        self._chunk_index = None
+
+        # One connection shared by all threads, serialised by the lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    @property
+    def article_transformer(self):
+        if self._article_transformer is None:
+            self.llm = self.create_llm()
+            self._article_transformer = LLMGraphTransformer(llm=self.llm, allowed_nodes=ALLOWED_NODES)
+        return self._article_transformer
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, tuple(params)).fetchall()
+
+    # --- Writes -------------------------------------------------------------
+
+    def _write_graph_documents(self, graph_docs) -> None:
+        """Batched node, label and edge upserts; the caller holds the transaction"""
+        nodes, labels, edges = [], [], []
+        for graph_doc in graph_docs:
+            for node in graph_doc.nodes:
+                nodes.append((node.id, json.dumps(node.properties, default=str)))
+                labels.append((node.type, node.id))
+            for rel in graph_doc.relationships:
+                for end in (rel.source, rel.target):
+                    nodes.append((end.id, "{}"))
+                    labels.append((end.type, end.id))
+                edges.append((rel.source.id, neo4j_relationship_type(rel.type), rel.target.id,
+                              json.dumps(rel.properties, default=str)))
+        self.conn.executemany(UPSERT_NODE, nodes)
+        self.conn.executemany(INSERT_LABEL, labels)
+        self.conn.executemany(UPSERT_EDGE, edges)
+
+    def add_graph_documents(self, graph_docs) -> None:
+        """Store transformer output the way Neo4jGraph.add_graph_documents does, in one transaction"""
+        with self._lock, self.conn:
+            self._write_graph_documents(graph_docs)
+        self._index_entities(graph_docs)
+
+    def merge_node(self, node_id: str, label: Optional[str] = None,
+                   properties: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(UPSERT_NODE, (node_id, json.dumps(properties or {}, default=str)))
+            if label:
+                self.conn.execute(INSERT_LABEL, (label, node_id))
+
+    def merge_relationship(self, source_id: str, rel_type: str, target_id: str,
+                           properties: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(UPSERT_EDGE, (source_id, rel_type, target_id, json.dumps(properties or {}, default=str)))
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT properties FROM nodes WHERE id = ?", (node_id,))
+        if not rows:
+            return None
+        return {"id": node_id, **json.loads(rows[0]["properties"])}
+
+    def _node_exists(self, node_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM nodes WHERE id = ?", (node_id,)))
+
+    # --- KnowledgeGraph interface -------------------------------------------
+
+    def add_article(self, article, graph_docs=None, index_chunks=True):
+        """Add a single article to the knowledge graph
+
+        Args:
+            article: Article dict or record
+            graph_docs: Previously extracted graph documents; the graph transformer runs if omitted
+            index_chunks: Chunk and embed the article text (callers adding many articles do it in one batch)
+        """
+        record = as_article_record(article)
+        url = record.url
+
+        # Convert the article to a graph, reusing a stored extraction of the same text
+        if graph_docs is None:
+            graph_docs = extract_graph_documents(self.article_transformer, article_document(record), record)
+
+        with self._lock, self.conn, span("kg.write_graph_documents", url=url):
+            self.conn.execute(UPSERT_ARTICLE, {
+                "url": url, "title": record.title, "source_name": record.source, "author": record.author,
+                "published_at": record.date, "full_content": record.full_content,
+                # Ground-truth bias, as the offline KG builder stores it
+                "bias": record.get("bias") or None,
+            })
+            self.conn.execute(UPSERT_NODE, (url, json.dumps({"url": url})))
+            self.conn.execute(INSERT_LABEL, ("Article", url))
+            self._write_graph_documents(graph_docs)
+            # Ground-truth articles also get the offline KG builder's MENTIONS edges
+            entity_types = ("HAS_ENTITY", "MENTIONS") if record.get("bias") else ("HAS_ENTITY",)
+            self.conn.executemany(UPSERT_EDGE, [(url, rel_type, node.id, "{}")
+                                                for graph_doc in graph_docs for node in graph_doc.nodes
+                                                for rel_type in entity_types])
+        self._index_entities(graph_docs)
+
+        if "bias_analysis" in article:
+            self.add_bias_analysis(url, article["bias_analysis"])
+
+        if "fact_check" in article:
+            self.add_fact_check(article)
+
+        if index_chunks:
+            self._index_chunks([record])
+
+        return True
+
+    def add_bias_analysis(self, article_url: str, bias_analysis: Dict) -> bool:
+        """Add bias analysis results to an article.
+
+        Args:
+            article_url (str): URL of the article
+            bias_analysis (Dict): Bias analysis results
+
+        Returns:
+            bool: Success status
+        """
+        try:
+            if not self._node_exists(article_url):
+                return False
+            bias_id = article_url + "_bias"
+            self.merge_node(bias_id, "Bias", {
+                "overall_assessment": bias_analysis.get('bias', 'Neutral'),
+                "confidence_score": bias_analysis.get('confidence_score', 50),
+                "reasoning": bias_analysis.get('reasoning', ''),
+                "timestamp": datetime.now().isoformat()
+            })
+            self.merge_relationship(article_url, "has_bias", bias_id)
+            logging.info(f"Added bias analysis for article: {article_url}")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Error adding bias analysis: {e}")
+            return False
+
+    def add_fact_check(self, article):
+        """Add fact check data to the knowledge graph"""
+        url = article.get("url")
+        fact_check = article.get("fact_check", {})
+        if not self._node_exists(url):
+            return
+        fact_check_id = f"factcheck://article/{url}"
+        self.merge_node(fact_check_id, "FactCheck", {
+            "article_url": url,
+            "overall_verdict": fact_check.get("report", {}).get("overall_verdict", ""),
+            "verified_claims": str(fact_check.get("verified_claims", []))
+        })
+        self.merge_relationship(url, "HAS_FACT_CHECK", fact_check_id)
+
+    def create_vector_index(self):
+        """No vector index; article text search goes through FTS5"""
+        pass
+
+    def retrieve_related_articles(self, query, limit=5):
+        """Retrieve articles related to a query"""
+        rows = self._query(
+            """
+            SELECT a.title, a.source_name, a.url, a.published_at, a.full_content AS content
+            FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (_fts_phrase(query), limit)
+        )
+        return [dict(row) for row in rows]
+
+    def get_similar_articles(self, article_url, limit=3):
+        """Find similar articles based on shared entities"""
+        types = SIMILAR_ARTICLE_RELATIONSHIPS
+        rows = self._query(
+            f"""
+            SELECT other.source AS url, a.title AS title, a.source_name AS source_name,
+                   COUNT(*) AS shared_entities
+            FROM edges mine
+            JOIN edges other ON other.target = mine.target
+            JOIN node_labels l ON l.label = 'Article' AND l.node_id = other.source
+            LEFT JOIN articles a ON a.url = other.source
+            WHERE mine.source = ? AND mine.type IN ({_placeholders(types)})
+              AND other.type IN ({_placeholders(types)}) AND other.source <> ?
+            GROUP BY other.source
+            ORDER BY shared_entities DESC, other.source
+            LIMIT ?
+            """,
+            (article_url, *types, *types, article_url, limit)
+        )
+        return [{"title": row["title"], "source_name": row["source_name"], "url": row["url"],
+                 "shared_entities": row["shared_entities"]} for row in rows]
+
+    def get_bias_report(self, topic, limit=10):
+        """Get a report of bias across news sources on a topic.
+
+        Args:
+            topic (str): Topic to analyze bias for
+            limit (int): Maximum number of sources to include
+
+        Returns:
+            List of dictionaries with source name and bias assessment
+        """
+        try:
+            rows = self._query(
+                """
+                SELECT COALESCE(a.source_name, 'Unknown Source') AS source,
+                       json_extract(b.properties, '$.overall_assessment') AS assessment,
+                       COUNT(*) AS article_count
+                FROM articles_fts
+                JOIN articles a ON a.rowid = articles_fts.rowid
+                JOIN edges e ON e.source = a.url AND e.type IN ('has_bias', 'HAS_BIAS')
+                JOIN nodes b ON b.id = e.target
+                WHERE articles_fts MATCH ?
+                GROUP BY source, assessment
+                ORDER BY article_count DESC
+                LIMIT ?
+                """,
+                (_fts_phrase(topic), limit)
+            )
+            return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            logging.error(f"Error getting bias report: {e}")
+            return []
+
+    def get_similar_articles_by_embedding(self, article_url: str, top_k: int = 5) -> list:
+        """Find top-k articles most similar to the given article using Node2Vec embeddings."""
+        target = self.get_node(article_url)
+        if not target or not target.get("node2vecEmbedding"):
+            return []
+
+        rows = self._query(
+            """
+            SELECT a.id AS url, ar.title AS title, json_extract(a.properties, '$.node2vecEmbedding') AS embedding,
+                   COALESCE(json_extract(b.properties, '$.label'),
+                            json_extract(b.properties, '$.overall_assessment')) AS bias
+            FROM node_labels l
+            JOIN nodes a ON a.id = l.node_id
+            JOIN edges e ON e.source = a.id AND e.type IN ('has_bias', 'HAS_BIAS')
+            JOIN nodes b ON b.id = e.target
+            LEFT JOIN articles ar ON ar.url = a.id
+            WHERE l.label = 'Article' AND a.id <> ?
+              AND json_extract(a.properties, '$.node2vecEmbedding') IS NOT NULL
+            """,
+            (article_url,)
+        )
+        if not rows:
+            return []
+
+        ranked = cosine_rank(target["node2vecEmbedding"], [json.loads(row["embedding"]) for row in rows], top_k)
+        return [{"title": rows[i]["title"], "url": rows[i]["url"], "bias": rows[i]["bias"], "similarity": score}
+                for i, score in ranked]
+
+    def entity_vocabulary(self) -> List[tuple]:
+        """(entity id, aliases) of every extracted entity in the graph"""
+        rows = self._query(
+            f"""
+            SELECT n.id, n.properties FROM nodes n
+            WHERE EXISTS (SELECT 1 FROM node_labels l WHERE l.node_id = n.id)
+              AND NOT EXISTS (SELECT 1 FROM node_labels l
+                              WHERE l.node_id = n.id AND l.label IN ({_placeholders(NON_ENTITY_LABELS)}))
+            """,
+            NON_ENTITY_LABELS
+        )
+        return [(row["id"], entity_aliases(json.loads(row["properties"]))) for row in rows]
+
+    def chunk_hashes(self, urls: List[str]) -> Dict[str, str]:
+        """Chunk set hash per article url, for articles that have chunks"""
+        urls = list(urls)
+        if not urls:
+            return {}
+        rows = self._query(f"SELECT url, chunks_hash FROM chunk_sets WHERE url IN ({_placeholders(urls)})", urls)
+        return {row["url"]: row["chunks_hash"] for row in rows}
+
+    def replace_chunks(self, chunks_by_article: Dict[str, tuple]) -> None:
+        """
+        Replace the chunks of articles already in the graph, in one transaction.
+
+        Args:
+            chunks_by_article: url -> (chunks hash, [{"id", "index", "text", "embedding"}])
+        """
+        with self._lock, self.conn:
+            known = {row["url"] for row in self.conn.execute(
+                f"SELECT url FROM articles WHERE url IN ({_placeholders(chunks_by_article)})",
+                tuple(chunks_by_article))}
+            self.conn.executemany("DELETE FROM chunks WHERE url = ?", [(url,) for url in known])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, url, idx, text, embedding) VALUES (?, ?, ?, ?, ?)",
+                [(chunk["id"], url, chunk["index"], chunk["text"],
+                  np.asarray(chunk["embedding"], dtype=np.float32).tobytes())
+                 for url, (_, chunks) in chunks_by_article.items() if url in known for chunk in chunks])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunk_sets (url, chunks_hash) VALUES (?, ?)",
+                [(url, chunks_hash) for url, (chunks_hash, _) in chunks_by_article.items() if url in known])
+            self._chunk_index = None
+
+    def retrieve_related_passages(self, embedding: List[float], limit: int = 5) -> List[Dict[str, Any]]:
+        """Article chunks nearest to the embedding, best first"""
+        with self._lock:
+            if self._chunk_index is None:
+                rows = self.conn.execute("SELECT id, embedding FROM chunks ORDER BY id").fetchall()
+                if not rows:
+                    return []
+                vectors = np.stack([np.frombuffer(row["embedding"], dtype=np.float32) for row in rows])
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                index = VectorIndex(vectors.shape[1])
+                index.add(vectors / np.where(norms == 0, 1.0, norms))
+                self._chunk_index = ([row["id"] for row in rows], index)
+            chunk_ids, index = self._chunk_index
+
+            query = np.asarray(embedding, dtype=np.float32)
+            query /= np.linalg.norm(query) or 1.0
+            hits = index.search(query, top_k=limit)
+            if not hits:
+                return []
+            ids = [chunk_ids[position] for position, _ in hits]
+            rows = {row["id"]: row for row in self.conn.execute(
+                f"""
+                SELECT c.id, c.url, c.text, a.title FROM chunks c JOIN articles a ON a.url = c.url
+                WHERE c.id IN ({_placeholders(ids)})
+                """, ids)}
+        return [{"url": rows[chunk_id]["url"], "title": rows[chunk_id]["title"], "text": rows[chunk_id]["text"],
+                 "score": score} for chunk_id, (_, score) in zip(ids, hits) if chunk_id in rows]
+
+    def query_most_structurally_similar_bias(self, entities: list) -> str:
+        """
+        Finds the single most structurally similar article based on shared entities and returns its bias.
+        """
+        if not entities:
+            return ""
+
+        entities = list(dict.fromkeys(entities))
+        types = BIAS_CONTEXT_RELATIONSHIPS
+        try:
+            rows = self._query(
+                f"""
+                SELECT a.title, a.bias, COUNT(*) AS overlap_score
+                FROM edges e JOIN articles a ON a.url = e.source
+                WHERE e.target IN ({_placeholders(entities)}) AND e.type IN ({_placeholders(types)})
+                  AND a.bias IS NOT NULL
+                GROUP BY a.url
+                ORDER BY overlap_score DESC
+                LIMIT 1
+                """,
+                (*entities, *types)
+            )
+            if rows:
+                logging.info(f"Most similar article from KG: {rows[0]['title']} with bias {rows[0]['bias']}")
+                return rows[0]["bias"].capitalize()
+        except sqlite3.Error as e:
+            logging.error(f"[KG query error] {e}")
+
+        return "Unknown"
+
+    def retrieve_related_facts_text(self, entities: List[str], limit: int = 25) -> str:
+        """
+        Retrieve relationship-level context from the KG for the given entities.
+        Returns a human-readable string summary.
+        """
+        if not entities:
+            logging.warning("[KG] No entities provided for context retrieval.")
+            return ""
+
+        logging.info(f"[KG] Retrieving context for entities: {entities}")
+        marks = _placeholders(entities)
+        try:
+            rows = self._query(
+                f"""
+                SELECT source, type, target FROM edges WHERE source IN ({marks})
+                UNION
+                SELECT source, type, target FROM edges WHERE target IN ({marks})
+                LIMIT ?
+                """,
+                (*entities, *entities, limit)
+            )
+        except sqlite3.Error as e:
+            logging.error(f"[KG] Failed to retrieve structured KG facts: {e}")
+            return ""
+        return "\n".join(f"{row['source']} -[{row['type']}]-> {row['target']}" for row in rows)
+
+    def add_fact_check_result(self, claim: str, result: Dict[str, Any], related_entities: List[str]) -> bool:
+        """
+        Store a fact-check result in the knowledge graph.
+
+        Args:
+            claim: The evaluated claim text.
+            result: The structured result from the fact-checking agent.
+            related_entities: List of entity IDs mentioned in the claim.
+
+        Returns:
+            True if added successfully, False otherwise.
+        """
+        factcheck_id = f"factcheck://{datetime.now().strftime('%Y%m%d%H%M%S')}/{abs(hash(claim))}"
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(UPSERT_NODE, (factcheck_id, json.dumps({
+                    "claim": claim,
+                    "verdict": result.get("verdict"),
+                    "confidence_score": result.get("confidence_score", 0),
+                    "reasoning": result.get("reasoning", ""),
+                    "timestamp": datetime.now().isoformat()
+                })))
+                self.conn.execute(INSERT_LABEL, ("FactCheck", factcheck_id))
+                # Only link entities that already exist, like MATCH (e) ... MERGE in Cypher
+                self.conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO edges (source, type, target)
+                    SELECT ?, 'MENTIONS', id FROM nodes WHERE id IN ({_placeholders(related_entities)})
+                    """,
+                    (factcheck_id, *related_entities)
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error adding fact check to KG: {e}")
+            return False
+
+    # --- Maintenance --------------------------------------------------------
+
+    def backup(self, path: str) -> str:
+        """Consistent copy of the database to another file while it stays in use"""
+        with self._lock:
+            target = sqlite3.connect(path)
+            try:
+                self.conn.backup(target)
+            finally:
+                target.close()
+        return path
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "nodes": self._query("SELECT COUNT(*) FROM nodes")[0][0],
+            "relationships": self._query("SELECT COUNT(*) FROM edges")[0][0],
+            "articles": self._query("SELECT COUNT(*) FROM node_labels WHERE label = 'Article'")[0][0],
+        }
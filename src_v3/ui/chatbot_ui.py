@@ -14,9 +14,10 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 # Import from new architecture
-from src_v3.memory.knowledge_graph import KnowledgeGraph
+from src_v3.memory.graph_backends import create_knowledge_graph
 from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
 from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
+from src_v3.components.fact_checker.claim_cache import get_claim_cache
 from src_v3.memory.schema import GraphState
 from src_v3.utils.aws_helpers import get_bedrock_llm, test_neo4j_connection
 
@@ -36,7 +37,7 @@ load_dotenv()
 # Initialize the knowledge graph
 try:
     logging.info("Attempting to initialize Knowledge Graph and LLM...")
-    kg = KnowledgeGraph()
+    kg = create_knowledge_graph()
     llm = get_bedrock_llm()
 
     # Pre-initialize transformers for both agents
@@ -204,9 +205,9 @@ def process_fact_check_query(query):
         state = GraphState(news_query=query)
         logging.debug(f"Created GraphState for fact check: {state}")
 
-        # Process with fact checker agent - don't store in KG
+        # Process with fact checker agent - don't store in KG; repeated claims are answered from the claim cache
         logging.info("Calling fact_checker_agent...")
-        result_state = fact_checker_agent(state, kg, store_to_kg=False)
+        result_state = fact_checker_agent(state, kg, store_to_kg=False, claim_cache=get_claim_cache())
         logging.info(f"Fact checker completed with status: {result_state.current_status}")
         logging.debug(f"Fact checker result: {result_state.model_dump()}")
 
@@ -55,6 +55,8 @@ def get_aws_credentials():
 
 def get_bedrock_client():
     """Get authenticated Bedrock client"""
+    from src_v3.utils.llm_backend import bedrock_runtime_client
+
     # Get AWS credentials
     credentials = get_aws_credentials()
 
@@ -66,7 +68,8 @@ def get_bedrock_client():
             # If no credentials, use default credentials from environment
             client = boto3.client("bedrock-runtime", region_name=credentials['region_name'])
 
-        return client
+        # All Bedrock traffic in the process shares one rate limiter
+        return bedrock_runtime_client(client)
     except Exception as e:
         print(f"Error creating Bedrock client: {e}")
         raise
@@ -100,6 +103,7 @@ def get_bedrock_llm():
 def test_neo4j_connection():
     """Test Neo4j connection and create necessary constraints/indexes"""
     from langchain_neo4j import Neo4jGraph
+    from src_v3.memory.schema_manager import ensure_schema
 
     try:
         graph = Neo4jGraph(
@@ -112,17 +116,8 @@ def test_neo4j_connection():
         result = graph.query("RETURN 'Neo4j connection successful' as message")
         print(result[0]['message'])
 
-        # Create constraint on Article nodes
-        graph.query("""
-        CREATE CONSTRAINT article_url_constraint IF NOT EXISTS
-        FOR (a:Article) REQUIRE a.url IS UNIQUE
-        """)
-
-        # Create indexes for improved query performance
-        graph.query("""
-        CREATE INDEX article_title_idx IF NOT EXISTS
-        FOR (a:Article) ON (a.title)
-        """)
+        # Create or migrate all constraints and indexes the KG queries rely on
+        ensure_schema(graph)
 
         return True
     except Exception as e:
@@ -0,0 +1,177 @@
+import os
+import re
+import zlib
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# TEXT_EMBEDDER selects the CPU-only text embedder:
+#   hashing               - signed feature hashing of words, word bigrams and character trigrams (default, no dependencies)
+#   sentence-transformers - SentenceTransformer model EMBEDDING_MODEL on the CPU (falls back to hashing if not installed)
+TEXT_EMBEDDERS = ("hashing", "sentence-transformers")
+
+DEFAULT_SENTENCE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free lexical embedder.
+
+    Words, word bigrams and character trigrams are hashed into a fixed number
+    of signed buckets with sublinear counts, and vectors are L2-normalised.
+    Paraphrases that keep most of their wording score high; it does not know
+    synonyms, so the threshold it is used with should be conservative.
+    """
+    name = "hashing"
+    default_threshold = 0.9
+
+    def __init__(self, dim: int = 2048):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN.findall((text or "").lower())
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(f"#3{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features),
+                                 dtype=np.uint32, count=len(features))
+            signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dim, signs)
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize_rows(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """SentenceTransformer model pinned to the CPU (needs the sentence-transformers package)"""
+    name = "sentence-transformers"
+    default_threshold = 0.9
+
+    def __init__(self, model_name: Optional[str] = None):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name or os.getenv("EMBEDDING_MODEL", DEFAULT_SENTENCE_MODEL)
+        self.name = f"sentence-transformers:{self.model_name}"
+        self._model = SentenceTransformer(self.model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return vectors.astype(np.float32)
+
+
+def create_embedder(kind: Optional[str] = None, dim: Optional[int] = None):
+    """
+    Create the configured text embedder.
+
+    Args:
+        kind: One of TEXT_EMBEDDERS; defaults to the TEXT_EMBEDDER environment variable
+        dim: Vector size of the hashing embedder (model embedders have their own)
+    """
+    kind = (kind or os.getenv("TEXT_EMBEDDER", "hashing")).lower()
+    if kind not in TEXT_EMBEDDERS:
+        raise ValueError(f"Unknown TEXT_EMBEDDER '{kind}', expected one of {TEXT_EMBEDDERS}")
+    if kind == "sentence-transformers":
+        try:
+            return SentenceTransformerEmbedder()
+        except ImportError:
+            logging.warning("sentence-transformers is not installed, using the hashing embedder instead")
+    return HashingEmbedder(dim) if dim else HashingEmbedder()
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbour index over L2-normalised vectors.
+
+    Random-hyperplane LSH: each of n_tables tables buckets vectors by the
+    signs of n_bits projections, and the union of the query's buckets is
+    re-ranked by exact cosine similarity. With 8 bits and 16 tables, a
+    neighbour at cosine 0.9 is found with probability above 0.99. Below
+    exact_below vectors the whole index is scanned, which is just as fast.
+    """
+
+    def __init__(self, dim: int, n_bits: int = 8, n_tables: int = 16, exact_below: int = 4096, seed: int = 7):
+        rng = np.random.RandomState(seed)
+        self.dim = dim
+        self.exact_below = exact_below
+        self._planes = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self._weights = (1 << np.arange(n_bits)).astype(np.int64)
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+        # Rows [0, _size) are in use; capacity doubles when full, so adding one row at a time stays linear
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _bucket_ids(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, n_tables) bucket id per vector and table"""
+        bits = np.einsum("tbd,nd->ntb", self._planes, vectors) > 0
+        return bits.astype(np.int64) @ self._weights
+
+    def add(self, vectors: np.ndarray) -> List[int]:
+        """Add rows; returns their ids (positions)"""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        buckets = self._bucket_ids(vectors)
+        with self._lock:
+            start = self._size
+            end = start + len(vectors)
+            if end > len(self._vectors):
+                grown = np.zeros((max(end, 2 * len(self._vectors), 16), self.dim), dtype=np.float32)
+                grown[:start] = self._vectors[:start]
+                self._vectors = grown
+            self._vectors[start:end] = vectors
+            self._size = end
+            for offset, row in enumerate(buckets):
+                for table, bucket in zip(self._tables, row):
+                    table.setdefault(int(bucket), []).append(start + offset)
+        return list(range(start, start + len(vectors)))
+
+    def search(self, query: np.ndarray, top_k: int = 1) -> List[Tuple[int, float]]:
+        """(id, cosine similarity) of the nearest vectors, best first"""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            # Rows below _size are never written again, so the view stays valid after the lock is released
+            vectors = self._vectors[:self._size]
+            if len(vectors) < self.exact_below:
+                candidates = np.arange(len(vectors))
+            else:
+                row = self._bucket_ids(query[None, :])[0]
+                ids = set()
+                for table, bucket in zip(self._tables, row):
+                    ids.update(table.get(int(bucket), ()))
+                candidates = np.fromiter(ids, dtype=np.int64, count=len(ids))
+        if not len(candidates):
+            return []
+        scores = vectors[candidates] @ query
+        best = np.argsort(-scores)[:top_k]
+        return [(int(candidates[i]), float(scores[i])) for i in best]
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = create_embedder()
+    return _embedder
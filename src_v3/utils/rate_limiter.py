@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import heapq
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from src_v3.utils.token_meter import get_token_meter, response_token_usage
+
+# Bedrock error codes that mean "slow down" rather than "request is broken"
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+    "ModelNotReadyException",
+}
+
+# Client methods that send a model request and count against the quota
+RATE_LIMITED_METHODS = (
+    "invoke_model",
+    "invoke_model_with_response_stream",
+    "converse",
+    "converse_stream",
+)
+
+
+class Priority(IntEnum):
+    """Priority classes for Bedrock traffic; lower values are served first"""
+    INTERACTIVE = 0  # chatbot / direct user queries
+    BATCH = 1  # evaluation and batch analysis runs
+    BACKGROUND = 2  # KG building and other bulk ingestion
+
+
+_request_priority: ContextVar[Optional[Priority]] = ContextVar("bedrock_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run the enclosed Bedrock calls under the given priority class"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at capacity per minute"""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill(now)
+        # Requests larger than the bucket only need a full bucket, otherwise they would never run
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """Give back (or, when negative, charge) the difference between estimate and actual usage"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class BedrockRateLimiter:
+    """
+    Process-wide limiter for Bedrock requests.
+
+    Two token buckets enforce the requests-per-minute and tokens-per-minute
+    quotas. The number of requests in flight follows AIMD: it grows by about
+    one slot per window of successful requests and is multiplied by
+    `decrease_factor` when Bedrock throttles. Waiting callers are served by
+    priority class, then in arrival order.
+    """
+
+    def __init__(self, requests_per_minute: float = 50, tokens_per_minute: float = 400000,
+                 max_concurrency: int = 16, min_concurrency: int = 1, initial_concurrency: Optional[int] = None,
+                 decrease_factor: float = 0.5, throttle_cooldown: float = 2.0, max_retries: int = 3,
+                 default_output_tokens: int = 1024):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        # Start halfway and let additive increase find the ceiling
+        self.concurrency_limit = float(initial_concurrency or max(min_concurrency, max_concurrency // 2))
+        self.decrease_factor = decrease_factor
+        self.throttle_cooldown = throttle_cooldown
+        self.max_retries = max_retries
+        self.default_output_tokens = default_output_tokens
+
+        self.in_flight = 0
+        self.throttle_count = 0
+        self.request_count = 0
+        self._last_decrease = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, estimated_tokens: float, priority: Priority = Priority.INTERACTIVE) -> float:
+        """
+        Block until a request of about `estimated_tokens` may be sent.
+
+        Returns:
+            The token amount charged, to be reconciled in release()
+        """
+        entry = (int(priority), next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    wait = self._admission_wait(entry, estimated_tokens)
+                    if wait == 0.0:
+                        break
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(estimated_tokens)
+            self.in_flight += 1
+            self.request_count += 1
+            # Let the next waiter re-check now that the head of the queue changed
+            self._condition.notify_all()
+        return estimated_tokens
+
+    def _admission_wait(self, entry, estimated_tokens: float) -> Optional[float]:
+        """0.0 when the request may go now, otherwise how long to wait (None = until notified)"""
+        if self._waiters[0] != entry:
+            return None
+        if self.in_flight >= max(self.min_concurrency, int(self.concurrency_limit)):
+            return None
+        now = time.monotonic()
+        wait = max(self.request_bucket.wait_time(1, now), self.token_bucket.wait_time(estimated_tokens, now))
+        return wait if wait > 0 else 0.0
+
+    def release(self, charged_tokens: float, actual_tokens: Optional[float] = None, throttled: bool = False) -> None:
+        """Finish a request, reconcile token usage and adapt the concurrency limit"""
+        with self._condition:
+            self.in_flight -= 1
+            if actual_tokens is not None:
+                self.token_bucket.refund(charged_tokens - actual_tokens)
+            if throttled:
+                self._on_throttle()
+            else:
+                self._on_success()
+            self._condition.notify_all()
+
+    def _on_success(self) -> None:
+        # Additive increase: about +1 slot per concurrency_limit successful requests
+        self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1.0 / self.concurrency_limit)
+
+    def _on_throttle(self) -> None:
+        self.throttle_count += 1
+        now = time.monotonic()
+        # One multiplicative decrease per burst of throttles, not one per failed request
+        if now - self._last_decrease < self.throttle_cooldown:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+        logging.warning(f"Bedrock throttled; concurrency limit reduced to {self.concurrency_limit:.1f}")
+
+    def estimate_tokens(self, method: str, kwargs: dict) -> float:
+        """Rough token estimate (4 chars per token) for the prompt plus the requested output"""
+        output_tokens = self.default_output_tokens
+        if method.startswith("invoke_model"):
+            body = kwargs.get("body") or ""
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", errors="ignore")
+            try:
+                output_tokens = min(output_tokens, int(json.loads(body).get("max_tokens", output_tokens)))
+            except (ValueError, TypeError, AttributeError):
+                pass
+            prompt_chars = len(body)
+        else:
+            max_tokens = (kwargs.get("inferenceConfig") or {}).get("maxTokens")
+            if max_tokens:
+                output_tokens = min(output_tokens, int(max_tokens))
+            prompt_chars = len(json.dumps(kwargs.get("messages", []), default=str)) + \
+                len(json.dumps(kwargs.get("system", []), default=str))
+        return prompt_chars / 4.0 + output_tokens
+
+    def call(self, method: str, func, priority: Priority, **kwargs):
+        """Send one Bedrock request through the limiter, retrying when throttled"""
+        # INTERACTIVE is 0, so an unset context is told apart by None rather than truthiness
+        context_priority = _request_priority.get()
+        priority = context_priority if context_priority is not None else priority
+        estimate = self.estimate_tokens(method, kwargs)
+        attempt = 0
+        while True:
+            charged = self.acquire(estimate, priority)
+            try:
+                response = func(**kwargs)
+            except ClientError as e:
+                throttled = e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+                self.release(charged, throttled=throttled)
+                if not throttled or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                # Short exponential backoff on top of the reduced concurrency limit
+                time.sleep(min(0.5 * 2 ** attempt, 10.0))
+                continue
+            except Exception:
+                self.release(charged)
+                raise
+            self.release(charged, actual_tokens=response_token_count(response))
+            get_token_meter().record_response(method, kwargs, response)
+            return response
+
+    def wrap_client(self, client, priority: Priority = Priority.INTERACTIVE):
+        """Wrap a bedrock-runtime client so its model calls go through this limiter"""
+        if isinstance(client, RateLimitedBedrockClient):
+            return client
+        return RateLimitedBedrockClient(client, self, priority)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "in_flight": self.in_flight,
+                "concurrency_limit": self.concurrency_limit,
+                "requests": self.request_count,
+                "throttles": self.throttle_count,
+                "waiting": len(self._waiters),
+            }
+
+
+def response_token_count(response) -> Optional[int]:
+    """Input + output tokens reported by Bedrock, from the converse usage block or invoke_model headers"""
+    usage = response_token_usage(response)
+    return sum(usage) if usage is not None else None
+
+
+class RateLimitedBedrockClient:
+    """Proxy around a bedrock-runtime client; model calls go through the shared limiter"""
+
+    def __init__(self, client, limiter: BedrockRateLimiter, priority: Priority):
+        self._client = client
+        self._limiter = limiter
+        self._priority = priority
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in RATE_LIMITED_METHODS:
+            return attr
+
+        def limited(**kwargs):
+            return self._limiter.call(name, attr, self._priority, **kwargs)
+
+        return limited
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> BedrockRateLimiter:
+    """Return the process-wide Bedrock limiter, configured from the environment on first use"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = BedrockRateLimiter(
+                    requests_per_minute=float(os.environ.get("BEDROCK_REQUESTS_PER_MINUTE", "50")),
+                    tokens_per_minute=float(os.environ.get("BEDROCK_TOKENS_PER_MINUTE", "400000")),
+                    max_concurrency=int(os.environ.get("BEDROCK_MAX_CONCURRENCY", "16")),
+                )
+    return _rate_limiter
+
+
+def rate_limited_client(client, priority: Priority = Priority.INTERACTIVE):
+    """Wrap a bedrock-runtime client with the process-wide limiter"""
+    return get_rate_limiter().wrap_client(client, priority)
@@ -0,0 +1,181 @@
+import os
+import csv
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Labels every metered Bedrock call is attributed to, set with metering()
+METER_LABELS = ("run", "agent", "stage", "prompt_version", "article")
+
+# On-demand Bedrock prices in USD per 1000 input / output tokens, matched by model id prefix
+MODEL_PRICES_PER_1K_TOKENS = {
+    "anthropic.claude-3-5-sonnet": (0.003, 0.015),
+    "anthropic.claude-3-sonnet": (0.003, 0.015),
+    "anthropic.claude-3-5-haiku": (0.0008, 0.004),
+    "anthropic.claude-3-haiku": (0.00025, 0.00125),
+    "anthropic.claude-3-opus": (0.015, 0.075),
+    "amazon.titan-embed-text": (0.0001, 0.0),
+}
+
+CSV_FIELDS = list(METER_LABELS) + ["model_id", "calls", "input_tokens", "output_tokens", "cost_usd"]
+
+_attribution: ContextVar[Dict[str, str]] = ContextVar("token_meter_attribution", default={})
+
+
+@contextmanager
+def metering(**labels):
+    """Attribute the enclosed Bedrock calls to the given labels (merged over the enclosing ones)"""
+    unknown = set(labels) - set(METER_LABELS)
+    if unknown:
+        raise ValueError(f"Unknown meter labels {sorted(unknown)}, expected some of {METER_LABELS}")
+    merged = dict(_attribution.get())
+    merged.update({key: value for key, value in labels.items() if value is not None})
+    token = _attribution.set(merged)
+    try:
+        yield
+    finally:
+        _attribution.reset(token)
+
+
+def current_attribution() -> Dict[str, str]:
+    """Labels in effect, to re-apply in worker threads (they do not inherit the caller's context)"""
+    return dict(_attribution.get())
+
+
+def response_token_usage(response) -> Optional[Tuple[int, int]]:
+    """(input, output) tokens reported by Bedrock, from the converse usage block or invoke_model headers"""
+    if not isinstance(response, dict):
+        return None
+    usage = response.get("usage")
+    if isinstance(usage, dict) and "inputTokens" in usage:
+        return int(usage.get("inputTokens", 0)), int(usage.get("outputTokens", 0))
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    input_tokens = headers.get("x-amzn-bedrock-input-token-count")
+    output_tokens = headers.get("x-amzn-bedrock-output-token-count")
+    if input_tokens is None and output_tokens is None:
+        return None
+    return int(input_tokens or 0), int(output_tokens or 0)
+
+
+def model_price(model_id: Optional[str]) -> Optional[Tuple[float, float]]:
+    """Per-1k-token prices for a model id, ignoring region prefixes such as 'us.'"""
+    if not model_id:
+        return None
+    for prefix, price in MODEL_PRICES_PER_1K_TOKENS.items():
+        if prefix in model_id:
+            return price
+    return None
+
+
+class TokenMeter:
+    """
+    Process-wide token and cost totals for Bedrock calls.
+
+    Totals are kept per (run, agent, stage, prompt_version, article, model_id).
+    Calls made outside any run label are attributed to the meter's run_id.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or os.getenv("METER_RUN_ID") or datetime.now().strftime("run-%Y%m%d-%H%M%S")
+        self._totals: Dict[tuple, List[float]] = {}
+        self._unmetered = 0
+        self._lock = threading.Lock()
+
+    def record(self, model_id: Optional[str], input_tokens: int, output_tokens: int,
+               labels: Optional[Dict[str, str]] = None) -> None:
+        labels = labels if labels is not None else _attribution.get()
+        key = tuple(labels.get(label) or "" for label in METER_LABELS) + (model_id or "",)
+        key = (key[0] or self.run_id,) + key[1:]
+        price = model_price(model_id)
+        cost = (input_tokens * price[0] + output_tokens * price[1]) / 1000 if price else 0.0
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = [0, 0, 0, 0.0]
+            totals[0] += 1
+            totals[1] += input_tokens
+            totals[2] += output_tokens
+            totals[3] += cost
+
+    def record_response(self, method: str, kwargs: dict, response) -> None:
+        """Meter one Bedrock response; streamed responses carry no usage up front and are only counted"""
+        usage = response_token_usage(response)
+        if usage is None:
+            with self._lock:
+                self._unmetered += 1
+            return
+        self.record(kwargs.get("modelId"), *usage)
+
+    def rows(self) -> List[Dict[str, object]]:
+        with self._lock:
+            items = [(key, list(totals)) for key, totals in self._totals.items()]
+        rows = []
+        for key, (calls, input_tokens, output_tokens, cost) in sorted(items):
+            row = dict(zip(list(METER_LABELS) + ["model_id"], key))
+            row.update(calls=calls, input_tokens=input_tokens, output_tokens=output_tokens,
+                       cost_usd=round(cost, 6))
+            rows.append(row)
+        return rows
+
+    def summary(self, by: Iterable[str] = ("run", "agent", "stage")) -> List[Dict[str, object]]:
+        """Totals grouped by some of the labels, largest spend first"""
+        by = list(by)
+        groups: Dict[tuple, Dict[str, object]] = {}
+        for row in self.rows():
+            key = tuple(row[label] for label in by)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = dict(zip(by, key), calls=0, input_tokens=0, output_tokens=0, cost_usd=0.0)
+            for field in ("calls", "input_tokens", "output_tokens", "cost_usd"):
+                group[field] += row[field]
+        return sorted(groups.values(), key=lambda g: (g["cost_usd"], g["input_tokens"]), reverse=True)
+
+    def article_totals(self, run: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+        """Article label -> (input, output) tokens, optionally for one run label"""
+        totals: Dict[str, Tuple[int, int]] = {}
+        for row in self.rows():
+            if not row["article"] or (run is not None and row["run"] != run):
+                continue
+            input_tokens, output_tokens = totals.get(row["article"], (0, 0))
+            totals[row["article"]] = (input_tokens + row["input_tokens"], output_tokens + row["output_tokens"])
+        return totals
+
+    def export_csv(self, path: str) -> int:
+        """Write one row per label combination; returns the number of rows"""
+        rows = self.rows()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        logging.info(f"Saved token usage ({len(rows)} rows, {self._unmetered} unmetered calls) to {path}")
+        return len(rows)
+
+    def log_summary(self, by: Iterable[str] = ("run", "agent", "stage")) -> None:
+        for group in self.summary(by):
+            labels = " ".join(f"{key}={group[key] or '-'}" for key in by)
+            logging.info(f"[tokens] {labels}: {group['calls']} calls, {group['input_tokens']} in, "
+                         f"{group['output_tokens']} out, ${group['cost_usd']:.4f}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._unmetered = 0
+
+
+_token_meter = None
+_meter_lock = threading.Lock()
+
+
+def get_token_meter() -> TokenMeter:
+    global _token_meter
+    if _token_meter is None:
+        with _meter_lock:
+            if _token_meter is None:
+                _token_meter = TokenMeter()
+    return _token_meter
@@ -0,0 +1,278 @@
+import os
+import sys
+import json
+import time
+import logging
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# TRACE_EXPORTER selects where finished spans go:
+#   none    - spans are timed but not exported (default)
+#   console - one log line per span
+#   file    - JSON lines appended to TRACE_FILE
+#   otel    - OpenTelemetry spans through the globally configured tracer provider
+TRACE_EXPORTERS = ("none", "console", "file", "otel")
+
+TRACER_NAME = "src_v3"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_trace_span", default=None)
+
+
+def _attribute_value(value):
+    """Attribute values as OpenTelemetry accepts them: primitives or lists of primitives"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple, set)):
+        return [v if isinstance(v, (bool, int, float, str)) else str(v) for v in value]
+    return str(value)
+
+
+class Span:
+    """
+    One timed pipeline stage.
+
+    Ids use the OpenTelemetry sizes (32 hex digit trace id, 16 hex digit span
+    id) so file-exported spans can be loaded next to collector output.
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.attributes: Dict[str, Any] = {}
+        self.status = "OK"
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+        self._start = time.perf_counter()
+        self.duration_ms = None
+        self._otel = None
+        if attributes:
+            self.set_attributes(**attributes)
+
+    def set_attribute(self, key: str, value) -> None:
+        value = _attribute_value(value)
+        self.attributes[key] = value
+        if self._otel is not None and value is not None:
+            self._otel.set_attribute(key, value)
+
+    def set_attributes(self, **attributes) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "ERROR"
+        self.error = f"{type(error).__name__}: {error}"
+        if self._otel is not None:
+            from opentelemetry.trace import Status, StatusCode
+            self._otel.record_exception(error)
+            self._otel.set_status(Status(StatusCode.ERROR, str(error)))
+
+    def end(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.end_time = self.start_time + self.duration_ms / 1000
+        if self._otel is not None:
+            self._otel.end()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": datetime.fromtimestamp(self.start_time, timezone.utc).isoformat(),
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class ConsoleSpanExporter:
+    def export(self, span: Span) -> None:
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        logging.info(f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.1f} ms {span.status} {attributes}")
+
+
+class FileSpanExporter:
+    """Appends finished spans to a JSONL file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("TRACE_FILE", "traces.jsonl")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the configured exporter"""
+
+    def __init__(self, exporter: Optional[str] = None, path: Optional[str] = None):
+        self.exporter_name = (exporter or os.getenv("TRACE_EXPORTER", "none")).lower()
+        if self.exporter_name not in TRACE_EXPORTERS:
+            raise ValueError(f"Unknown TRACE_EXPORTER '{self.exporter_name}', expected one of {TRACE_EXPORTERS}")
+
+        self._otel_tracer = None
+        self._exporter = None
+        if self.exporter_name == "otel":
+            try:
+                from opentelemetry import trace
+                self._otel_tracer = trace.get_tracer(TRACER_NAME)
+            except ImportError:
+                logging.warning("opentelemetry is not installed, writing spans to TRACE_FILE instead")
+                self.exporter_name = "file"
+        if self.exporter_name == "file":
+            self._exporter = FileSpanExporter(path)
+        elif self.exporter_name == "console":
+            self._exporter = ConsoleSpanExporter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter_name != "none"
+
+    def start_span(self, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        span = Span(name, parent, None)
+        if self._otel_tracer is not None:
+            from opentelemetry import trace
+            context = trace.set_span_in_context(parent._otel) if parent is not None and parent._otel else None
+            span._otel = self._otel_tracer.start_span(name, context=context)
+            span_context = span._otel.get_span_context()
+            span.trace_id = format(span_context.trace_id, "032x")
+            span.span_id = format(span_context.span_id, "016x")
+        if attributes:
+            span.set_attributes(**attributes)
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end()
+        if self._exporter is not None:
+            try:
+                self._exporter.export(span)
+            except OSError as e:
+                logging.warning(f"Could not export span {span.name}: {e}")
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace the process-wide tracer (None re-reads the environment on next use)"""
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_attributes(**attributes) -> None:
+    """Set attributes on the active span, if there is one"""
+    active = _current_span.get()
+    if active is not None:
+        active.set_attributes(**attributes)
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None, **attributes):
+    """
+    Time the enclosed block as a span, nested under the active span.
+
+    Args:
+        name: Stage name, e.g. "bias.llm_call"
+        parent: Explicit parent, for work handed to another thread (defaults to the active span)
+        **attributes: Initial span attributes
+
+    Yields:
+        The Span, for attributes known only after the stage ran
+    """
+    tracer = get_tracer()
+    active = tracer.start_span(name, parent if parent is not None else _current_span.get(), attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(active)
+
+
+def token_usage(message) -> Dict[str, int]:
+    """Input/output token counts of an LLM response message, when the provider reported them"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return {"input_tokens": usage.get("input_tokens", 0), "output_tokens": usage.get("output_tokens", 0)}
+    metadata = (getattr(message, "response_metadata", None) or {}).get("usage") or {}
+    if metadata:
+        return {"input_tokens": metadata.get("prompt_tokens", metadata.get("input_tokens", 0)),
+                "output_tokens": metadata.get("completion_tokens", metadata.get("output_tokens", 0))}
+    return {}
+
+
+def read_spans(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def format_trace(spans: List[Dict[str, Any]]) -> str:
+    """Indented stage tree of one trace, children in start order"""
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    span_ids = {s["span_id"] for s in spans}
+    for s in sorted(spans, key=lambda s: s["start"]):
+        parent = s["parent_id"] if s["parent_id"] in span_ids else None
+        children.setdefault(parent, []).append(s)
+
+    lines = []
+
+    def walk(parent, depth):
+        for s in children.get(parent, []):
+            attributes = ", ".join(f"{key}={value}" for key, value in s["attributes"].items())
+            lines.append(f"{'  ' * depth}{s['name']:<{40 - 2 * depth}} {s['duration_ms']:>10.1f} ms  "
+                         f"{s['status']:<5} {attributes}")
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def slowest_traces(spans: List[Dict[str, Any]], top: int = 5) -> List[List[Dict[str, Any]]]:
+    """Traces ordered by the duration of their root span"""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for s in spans:
+        traces.setdefault(s["trace_id"], []).append(s)
+
+    def root_duration(trace_spans):
+        return max(s["duration_ms"] or 0 for s in trace_spans)
+
+    return sorted(traces.values(), key=root_duration, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    # Stage breakdown of the slowest traces: python -m src_v3.utils.tracing [traces.jsonl] [count]
+    trace_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("TRACE_FILE", "traces.jsonl")
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    for trace_spans in slowest_traces(read_spans(trace_path), count):
+        print(f"trace {trace_spans[0]['trace_id']}")
+        print(format_trace(trace_spans))
+        print()
@@ -1,3 +1,4 @@
 from .graph import create_workflow
+from .factory import get_workflow, get_knowledge_graph, clear_workflow_cache
 
-__all__ = ['create_workflow']
\ No newline at end of file
+__all__ = ['create_workflow', 'get_workflow', 'get_knowledge_graph', 'clear_workflow_cache']
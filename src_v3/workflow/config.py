@@ -15,7 +15,11 @@ WORKFLOW_CONFIG = {
         "bias_path": ["bias_analyzer"],
 
         #full processing path (default)
-        "full_processing_path":["kg_builder", "bias_analyzer", "fact_checker"]
+        "full_processing_path":["kg_builder", "bias_analyzer", "fact_checker"],
+
+        # full processing with bias analysis and fact checking fanned out after the KG build
+        # (create_workflow(parallel=True))
+        "parallel_processing_path": ["kg_builder", ["bias_branch", "fact_check_branch"], "join_results"]
     },
 
     # Define routing conditions
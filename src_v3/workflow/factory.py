@@ -0,0 +1,62 @@
+import os
+import logging
+import threading
+from src_v3.memory.knowledge_graph import KnowledgeGraph
+from src_v3.memory.graph_backends import create_knowledge_graph
+from src_v3.workflow.graph import create_workflow
+
+# Compiled workflows keyed by configuration, plus the KG they share.
+# Building either is expensive (Neo4j connection, Bedrock client, graph
+# transformer, LangGraph compilation), so each is created once per process.
+_workflow_cache = {}
+_shared_kg = None
+_lock = threading.Lock()
+
+
+def get_knowledge_graph() -> KnowledgeGraph:
+    """Return the process-wide KnowledgeGraph, creating it on first use"""
+    global _shared_kg
+    if _shared_kg is None:
+        with _lock:
+            if _shared_kg is None:
+                _shared_kg = create_knowledge_graph()
+                logging.info("Initialized shared Knowledge Graph")
+    return _shared_kg
+
+
+def get_workflow(evaluation_mode: bool = False, parallel: bool = False):
+    """
+    Return a compiled workflow for the given configuration, compiling it only once.
+
+    The compiled graph holds no per-request state, so the same instance can be
+    invoked from several threads at the same time.
+
+    Args:
+        evaluation_mode: Whether to run in evaluation mode
+        parallel: Use the fan-out variant of the workflow
+
+    Returns:
+        Compiled workflow
+    """
+    if os.environ.get("EVALUATION_MODE", "false").lower() == "true":
+        evaluation_mode = True
+
+    key = (evaluation_mode, parallel)
+    workflow = _workflow_cache.get(key)
+    if workflow is None:
+        kg = get_knowledge_graph()
+        with _lock:
+            workflow = _workflow_cache.get(key)
+            if workflow is None:
+                workflow = create_workflow(evaluation_mode=evaluation_mode, parallel=parallel, kg=kg)
+                _workflow_cache[key] = workflow
+                logging.info(f"Compiled workflow for configuration {key}")
+    return workflow
+
+
+def clear_workflow_cache():
+    """Drop cached workflows and the shared KG, e.g. after changing connection settings"""
+    global _shared_kg
+    with _lock:
+        _workflow_cache.clear()
+        _shared_kg = None
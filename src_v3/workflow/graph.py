@@ -1,13 +1,23 @@
 
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, START, END
-from src_v3.memory.knowledge_graph import KnowledgeGraph
+from src_v3.memory.graph_backends import create_knowledge_graph
+from src_v3.memory.schema import GraphState as AgentState
 from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
 from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
+from src_v3.utils.tracing import span
+from src_v3.utils.token_meter import metering
 import os
 
 
+def merge_article_results(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reducer for per-article result channels written by parallel branches"""
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+
 # Define state class with proper annotations for channels that receive multiple updates
 class GraphState(BaseModel):
     articles: List[Dict[str, Any]] = Field(default_factory=list)
@@ -17,14 +27,49 @@ class GraphState(BaseModel):
     bias_analysis_result: Optional[Dict[str, Any]] = None
     current_status: str = "ready"
     error: Optional[str] = None
+    # Per-article results keyed by article_key(), filled by the parallel branches
+    bias_results: Annotated[Dict[str, Any], merge_article_results] = Field(default_factory=dict)
+    fact_check_results: Annotated[Dict[str, Any], merge_article_results] = Field(default_factory=dict)
+
+
+# Input position stamped on the articles each branch receives; the agents carry it through
+FANOUT_INDEX_FIELD = "_fanout_index"
+
 
+def stamped_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copies of the articles carrying their position in the workflow's article list"""
+    return [dict(article, **{FANOUT_INDEX_FIELD: index}) for index, article in enumerate(articles)]
 
-def create_workflow(evaluation_mode=False):
+
+def article_key(index: int, article: Dict[str, Any]) -> str:
+    """
+    Key used to match branch results back to their article.
+
+    The position in the input list keeps articles without url, title or
+    content (and duplicates) apart. It is stamped on the articles before the
+    fan-out, so an agent dropping a failed article does not shift the others.
+    """
+    return f"{index}|{article.get('url') or article.get('title') or ''}"
+
+
+def branch_results(articles, result_field: str) -> Dict[str, Any]:
+    """Per-article results of a branch, keyed by the stamped input position"""
+    results = {}
+    for article in articles:
+        index = article.get(FANOUT_INDEX_FIELD) if hasattr(article, "get") else None
+        if index is not None:
+            results[article_key(index, article)] = article.get(result_field)
+    return results
+
+
+def create_workflow(evaluation_mode=False, parallel=False, kg=None):
     """
     Create the workflow graph with direct KG interaction.
 
     Args:
         evaluation_mode: Whether to run in evaluation mode
+        parallel: Run bias analysis and fact checking side by side after KG building
+        kg: Knowledge Graph instance to share; a new one is created if omitted
 
     Returns:
         Compiled workflow
@@ -34,7 +79,11 @@ def create_workflow(evaluation_mode=False):
         evaluation_mode = True
 
     # Initialize Knowledge Graph (shared between all nodes)
-    kg = KnowledgeGraph()
+    if kg is None:
+        kg = create_knowledge_graph()
+
+    if parallel:
+        return create_parallel_workflow(kg)
 
     # Create the workflow graph
     workflow = StateGraph(GraphState)
@@ -82,6 +131,97 @@ def create_workflow(evaluation_mode=False):
     return workflow.compile()
 
 
+def create_parallel_workflow(kg):
+    """
+    Create the fan-out variant of the workflow.
+
+    After the KG is built, bias analysis and fact checking run in the same
+    step and a join node merges their per-article results, so the full path
+    takes as long as the slower agent instead of both combined.
+
+    Args:
+        kg: Knowledge Graph instance shared by all nodes
+
+    Returns:
+        Compiled workflow
+    """
+    workflow = StateGraph(GraphState)
+
+    workflow.add_node("start", lambda x: x)  # Identity node for conditional branching
+
+    workflow.add_node("kg_builder", lambda state: build_kg(state, kg))
+    workflow.add_node("bias_branch", lambda state: bias_branch(state, kg))
+    workflow.add_node("fact_check_branch", lambda state: fact_check_branch(state, kg))
+    workflow.add_node("join_results", join_results)
+
+    # Direct query paths keep using the agents on the whole state
+    workflow.add_node("bias_analyzer", lambda state: bias_analyzer_agent(state, kg))
+    workflow.add_node("fact_checker", lambda state: fact_checker_agent(state, kg))
+
+    def route_start(state):
+        """Determine first step based on state"""
+        if state.news_query:
+            return "fact_check_path"
+        elif state.bias_query:
+            return "bias_path"
+        return "kg_builder_path"
+
+    workflow.add_conditional_edges(
+        "start",
+        route_start,
+        {
+            "fact_check_path": "fact_checker",
+            "bias_path": "bias_analyzer",
+            "kg_builder_path": "kg_builder"
+        }
+    )
+
+    # Fan out after the KG is built, then wait for both branches before joining
+    workflow.add_edge("kg_builder", "bias_branch")
+    workflow.add_edge("kg_builder", "fact_check_branch")
+    workflow.add_edge(["bias_branch", "fact_check_branch"], "join_results")
+    workflow.add_edge("join_results", END)
+
+    workflow.add_edge("bias_analyzer", END)
+    workflow.add_edge("fact_checker", END)
+
+    workflow.set_entry_point("start")
+
+    return workflow.compile()
+
+
+def bias_branch(state, kg):
+    """
+    Run the bias analyzer on its own copy of the articles.
+
+    Only the bias_results channel is written, so this node can run in the
+    same step as fact_check_branch without conflicting updates.
+    """
+    result_state = bias_analyzer_agent(AgentState(articles=stamped_articles(state.articles)), kg)
+    return {"bias_results": branch_results(result_state.articles, "bias_result")}
+
+
+def fact_check_branch(state, kg):
+    """Run the fact checker on its own copy of the articles and write fact_check_results"""
+    result_state = fact_checker_agent(AgentState(articles=stamped_articles(state.articles)), kg)
+    return {"fact_check_results": branch_results(result_state.articles, "fact_check_result")}
+
+
+def join_results(state):
+    """Attach the merged branch results to each article"""
+    merged_articles = []
+    for index, article in enumerate(state.articles):
+        merged = dict(article)
+        key = article_key(index, article)
+        if key in state.bias_results:
+            merged["bias_result"] = state.bias_results[key]
+        if key in state.fact_check_results:
+            merged["fact_check_result"] = state.fact_check_results[key]
+        merged_articles.append(merged)
+
+    return {"articles": merged_articles, "current_status": "analyzed"}
+
+
 def build_kg(state, kg):
     """
     Build knowledge graph from news articles.
@@ -99,8 +239,9 @@ def build_kg(state, kg):
     try:
         # If we have articles in the state, add them to the KG
         if state.articles:
-            for article in state.articles:
-                kg.add_article(article)
+            with span("build_kg", article_count=len(state.articles)), metering(agent="kg_builder"):
+                for article in state.articles:
+                    kg.add_article(article)
             new_state.current_status = "kg_updated"
         # Otherwise, we could fetch new articles from a news API here
         else:
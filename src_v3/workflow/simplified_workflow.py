@@ -2,9 +2,10 @@ import logging
 import os
 from typing import List, Dict, Any, Optional
 from src_v3.memory.schema import GraphState
-from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
+from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent, bias_analyzer_batch
 from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
-from src_v3.memory.knowledge_graph import KnowledgeGraph
+from src_v3.workflow.factory import get_knowledge_graph
+from src_v3.memory.article import ArticleRecord, as_article_record
 
 # Configure logging
 logging.basicConfig(
@@ -15,52 +16,34 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
-def normalize_article_fields(article: Dict[str, Any]) -> Dict[str, Any]:
+ARTICLE_FIELD_DEFAULTS = {
+    'full_content': '',
+    'title': 'Unknown Title',
+    'source': 'Unknown Source',
+    'date': 'Unknown Date',
+}
+
+
+def normalize_article_fields(article: Dict[str, Any]) -> ArticleRecord:
     """Ensure all necessary fields exist before agent processing."""
-    article['full_content'] = article.get('full_content') or article.get('content') or ''
-    article['title'] = article.get('title') or 'Unknown Title'
-    article['source'] = article.get('source') or article.get('source_name') or 'Unknown Source'
-    article['date'] = article.get('date') or article.get('publishedAt') or 'Unknown Date'
-    return article
+    return as_article_record(article).fill_defaults(ARTICLE_FIELD_DEFAULTS)
 
-def process_articles(graph_state: GraphState, knowledge_graph: Optional[object] = None, use_kg: bool = True) -> GraphState:
+def process_articles(graph_state: GraphState, knowledge_graph: Optional[object] = None, use_kg: bool = True,
+                     batch_size: Optional[int] = None, max_workers: Optional[int] = None) -> GraphState:
     """Evaluate bias of articles using knowledge graph context, without modifying the KG."""
-    results = []
-
     # Initialize Knowledge Graph for querying
     kg = knowledge_graph
     if use_kg and kg is None:
         try:
-            from src_v3.memory.knowledge_graph import KnowledgeGraph
-            kg = KnowledgeGraph()
+            kg = get_knowledge_graph()
             logging.info("Knowledge Graph initialized for bias analysis (query-only mode)")
         except Exception as e:
             logging.error(f"Knowledge Graph initialization failed: {e}")
             kg = None
-    # Evaluate each article
-    for article in graph_state.articles:
-        try:
-            article = normalize_article_fields(article)
 
-            # Step 1: Create single-article state
-            single_state = GraphState(articles=[article])
-
-            # Step 2: Run bias analyzer agent (uses KG context only)
-            bias_state = bias_analyzer_agent(single_state, kg)
-
-            if hasattr(bias_state, "articles") and bias_state.articles:
-                processed_article = bias_state.articles[0]
-                results.append(processed_article)
-            else:
-                logging.warning(f"Bias analysis failed for article: {article.get('title', 'Unknown')}")
-                article['bias_analysis'] = {'status': 'failed', 'message': 'No output from bias analyzer'}
-                results.append(article)
-
-        except Exception as e:
-            logging.error(f"Error processing article: {article.get('title', 'Unknown')} - {str(e)}")
-            article['processing_error'] = str(e)
-            article['bias_analysis'] = {'status': 'error', 'message': str(e)}
-            results.append(article)
+    # Submit the whole batch at once; failing articles come back marked with processing_error
+    articles = [normalize_article_fields(article) for article in graph_state.articles]
+    results = bias_analyzer_batch(articles, kg, batch_size=batch_size, max_workers=max_workers)
 
     # Update and return new graph state
     graph_state.articles = results
@@ -79,8 +62,8 @@ def process_direct_query(query: str, query_type="fact_check"):
         Results of the query processing
     """
     try:
-        # Initialize Knowledge Graph
-        kg = KnowledgeGraph()
+        # Shared Knowledge Graph
+        kg = get_knowledge_graph()
 
         # Create initial state based on query type
         if query_type == "fact_check":
@@ -104,7 +87,7 @@ def process_direct_query(query: str, query_type="fact_check"):
 def retrieve_related_articles(query: str, limit: int = 5):
     """Retrieve articles from the knowledge graph related to a query"""
     try:
-        kg = KnowledgeGraph()
+        kg = get_knowledge_graph()
         return kg.retrieve_related_articles(query, limit)
     except Exception as e:
         logging.error(f"Error retrieving from KG: {e}")
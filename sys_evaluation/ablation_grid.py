@@ -0,0 +1,313 @@
+"""
+Prompt / model / KG / context-size ablation grid for bias detection.
+
+Runs a matrix of configurations over one set of articles without repeating
+the work they share:
+
+- Article formatting and entity extraction happen once per article.
+- The KG lookup happens once per (article, context size).
+- Identical prompts to the same model are sent once. For example, a KG
+  configuration whose context size exceeds the article's entity count
+  reuses the result of the uncapped one. The tokens and cost of a shared
+  call are split evenly across the configurations that use it.
+
+The remaining LLM calls of every configuration go through one thread pool
+at batch priority, under the process-wide Bedrock rate limit.
+"""
+import os
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from src_v3.components.bias_analyzer.b_prompts import BIAS_PROMPT_VERSION, BIAS_PROMPTS
+from src_v3.components.bias_analyzer.bias_agent_update import (
+    _extract_article_entities,
+    _invoke_bias_chain,
+    _prepare_bias_analysis,
+    _similar_bias,
+)
+from src_v3.components.bias_analyzer.tools import BIAS_MODEL_ID, create_bias_analysis_chain, format_article
+from src_v3.utils.rate_limiter import Priority, request_priority
+from src_v3.utils.token_meter import current_attribution, get_token_meter, metering
+from src_v3.utils.tracing import current_span, span
+from sys_evaluation.metrics_updated import score_predictions
+from sys_evaluation.results_store import ResultsStore, prediction_rows
+
+BIAS_LABELS = ["left", "center", "right"]
+ABLATION_MAX_WORKERS = int(os.environ.get("ABLATION_MAX_WORKERS", "10"))
+
+# Meter run label of the work shared by all configurations (entity extraction)
+SHARED_RUN_LABEL = "ablation_shared"
+
+
+class AblationConfig(NamedTuple):
+    """One cell of the grid; context_size caps the entities used for the KG lookup and prompt (None = all)"""
+    prompt_version: str
+    model_id: str
+    use_kg: bool
+    context_size: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        model = self.model_id.rsplit(".", 1)[-1].split(":")[0]
+        kg = "kg" if self.use_kg else "llm_only"
+        context = f"-ctx{self.context_size}" if self.use_kg and self.context_size is not None else ""
+        return f"{self.prompt_version}__{model}__{kg}{context}"
+
+
+def config_grid(prompt_versions: Sequence[str] = (BIAS_PROMPT_VERSION,), model_ids: Sequence[str] = (BIAS_MODEL_ID,),
+                kg_options: Sequence[bool] = (False, True),
+                context_sizes: Sequence[Optional[int]] = (None,)) -> List[AblationConfig]:
+    """
+    Cartesian product of the options. LLM-only configurations have no KG context,
+    so they are not multiplied by the context sizes.
+    """
+    unknown = set(prompt_versions) - set(BIAS_PROMPTS)
+    if unknown:
+        raise ValueError(f"Unknown bias prompts {sorted(unknown)}, expected some of {sorted(BIAS_PROMPTS)}")
+    configs = []
+    for prompt_version, model_id, use_kg in product(prompt_versions, model_ids, kg_options):
+        for context_size in (context_sizes if use_kg else (None,)):
+            configs.append(AblationConfig(prompt_version, model_id, use_kg, context_size))
+    return configs
+
+
+def _predicted_bias(result) -> str:
+    """Lower-cased bias label of an analysis result (AIMessage, JSON string or dict)"""
+    if hasattr(result, "content"):
+        result = result.content
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return "unknown"
+    if isinstance(result, dict):
+        return str(result.get("bias", "unknown")).strip().lower()
+    return "unknown"
+
+
+class ArticleContextCache:
+    """
+    Per-article intermediates shared by all configurations.
+
+    For article i: text[i] is the formatted prompt text, entities[i] the
+    entity list in extraction (mention) order, so a context size keeps the
+    first-mentioned entities, and similar_bias[(i, context_size)] the KG
+    lookup result.
+    """
+
+    def __init__(self, knowledge_graph=None):
+        self.knowledge_graph = knowledge_graph
+        self.text: Dict[int, str] = {}
+        self.entities: Dict[int, List[str]] = {}
+        self.similar_bias: Dict[tuple, str] = {}
+
+    def prepare(self, articles: Sequence[dict], context_sizes: Iterable[Optional[int]],
+                max_workers: int = ABLATION_MAX_WORKERS) -> None:
+        """Format every article and, when context_sizes is non-empty, extract entities and query the KG"""
+        context_sizes = list(dict.fromkeys(context_sizes))
+        parent_span = current_span()
+        attribution = current_attribution()
+
+        def prepare_one(i):
+            article = articles[i]
+            with request_priority(Priority.BATCH), \
+                    span("ablation.prepare_article", parent=parent_span, url=article.get("url")), \
+                    metering(**attribution), \
+                    metering(run=SHARED_RUN_LABEL, agent="bias_analyzer", article=article.get("url")):
+                self.text[i] = format_article(article)
+                if not context_sizes or self.knowledge_graph is None:
+                    return
+                try:
+                    self.entities[i] = list(dict.fromkeys(_extract_article_entities(article, self.knowledge_graph)))
+                except Exception as e:
+                    logging.error(f"Entity extraction failed for '{article.get('title', 'Untitled')}': {e}")
+                    self.entities[i] = []
+                for size in context_sizes:
+                    try:
+                        self.similar_bias[(i, size)] = _similar_bias(self.context_entities(i, size),
+                                                                     self.knowledge_graph)
+                    except Exception as e:
+                        logging.error(f"KG lookup failed for '{article.get('title', 'Untitled')}': {e}")
+                        self.similar_bias[(i, size)] = "Unknown"
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(prepare_one, range(len(articles))))
+
+    def context_entities(self, i: int, context_size: Optional[int]) -> List[str]:
+        entities = self.entities.get(i, [])
+        return entities if context_size is None else entities[:context_size]
+
+    def prompt_inputs(self, i: int, config: AblationConfig) -> tuple:
+        """(similar_bias, entities_str) the configuration sends for article i"""
+        if not config.use_kg or self.knowledge_graph is None:
+            return "Unknown", "N/A"
+        entities = self.context_entities(i, config.context_size)
+        return self.similar_bias.get((i, config.context_size), "Unknown"), ", ".join(entities)
+
+
+def run_ablation_grid(articles: Sequence[dict], configs: Sequence[AblationConfig], knowledge_graph=None,
+                      max_workers: int = ABLATION_MAX_WORKERS, store: Optional[ResultsStore] = None,
+                      chain_factory=create_bias_analysis_chain) -> Dict[str, Any]:
+    """
+    Run every configuration over the articles, sharing the per-article work.
+
+    Args:
+        articles: Bias test articles with ground_truth_bias
+        configs: Grid cells, e.g. from config_grid
+        knowledge_graph: Knowledge graph for the use_kg configurations
+        max_workers: Concurrent LLM calls across all configurations
+        store: Results store for the per-configuration predictions (default ResultsStore())
+        chain_factory: Builds the analysis chain for (prompt_version, model_id)
+
+    Returns:
+        run_id, summary (one row per configuration: metrics, its share of tokens and cost,
+        and shared_prompts, the articles whose call it shares with other configurations),
+        llm_calls, shared_calls (prompts answered by another configuration's call)
+        and predictions per configuration name
+    """
+    articles = list(articles)
+    configs = list(dict.fromkeys(configs))
+    if knowledge_graph is not None and any(c.use_kg for c in configs):
+        # Entity extractor setup (the default chain it also builds is not used)
+        _prepare_bias_analysis()
+
+    with span("ablation.grid", article_count=len(articles), config_count=len(configs)) as grid_span:
+        contexts = ArticleContextCache(knowledge_graph)
+        contexts.prepare(articles, {c.context_size for c in configs if c.use_kg}, max_workers)
+
+        chains = {(c.prompt_version, c.model_id): chain_factory(c.prompt_version, c.model_id) for c in configs}
+
+        # One job per distinct prompt; every configuration sending it points at the same job
+        jobs: Dict[tuple, Dict[str, Any]] = {}
+        assignments: Dict[tuple, tuple] = {}
+        for config in configs:
+            for i, article in enumerate(articles):
+                similar_bias, entities_str = contexts.prompt_inputs(i, config)
+                # Entity order does not change what the KG lookup returns, so it is not part of the key
+                key = (i, config.prompt_version, config.model_id, similar_bias,
+                       tuple(sorted(entities_str.split(", "))))
+                assignments[(config, i)] = key
+                jobs.setdefault(key, {"config": config, "article": article, "similar_bias": similar_bias,
+                                      "entities_str": entities_str})
+
+        parent_span = current_span()
+        attribution = current_attribution()
+
+        def call(key):
+            job = jobs[key]
+            i, article, config = key[0], job["article"], job["config"]
+            try:
+                with request_priority(Priority.BATCH), \
+                        span("ablation.llm_call", parent=parent_span, config=config.name, url=article.get("url")), \
+                        metering(**attribution), \
+                        metering(run=config.name, agent="bias_analyzer", article=article.get("url")):
+                    return key, _invoke_bias_chain(chains[(config.prompt_version, config.model_id)],
+                                                   contexts.text[i], job["similar_bias"], job["entities_str"],
+                                                   prompt_version=config.prompt_version)
+            except Exception as e:
+                logging.error(f"[ablation] {config.name} failed on '{article.get('title', 'Untitled')}': {e}")
+                return key, None
+
+        logging.info(f"[ablation] {len(configs)} configurations x {len(articles)} articles: "
+                     f"{len(jobs)} LLM calls for {len(assignments)} predictions")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(executor.map(call, list(jobs)))
+        grid_span.set_attributes(llm_calls=len(jobs), shared_calls=len(assignments) - len(jobs))
+
+    store = store or ResultsStore()
+    run_id = store.new_run_id("bias_ablation")
+    job_usage = _job_usage(get_token_meter().rows(), jobs)
+    users = Counter(assignments.values())
+    summary, predictions = [], {}
+    for config in configs:
+        processed = [dict(article, bias_result=results[assignments[(config, i)]])
+                     for i, article in enumerate(articles)]
+        y_true = [str(a.get("ground_truth_bias", "")).strip().lower() for a in processed]
+        y_pred = [_predicted_bias(a["bias_result"]) for a in processed]
+        predictions[config.name] = (y_true, y_pred)
+
+        metrics = score_predictions(y_true, y_pred, BIAS_LABELS)
+        # This configuration's share of every call it used
+        keys = [assignments[(config, i)] for i in range(len(articles))]
+        usage = [[value / users[key] for value in job_usage[key]] for key in keys]
+        summary.append({
+            "config": config.name,
+            "prompt_version": config.prompt_version,
+            "model_id": config.model_id,
+            "use_kg": config.use_kg,
+            "context_size": config.context_size,
+            "accuracy": metrics["accuracy"],
+            "macro_f1": metrics["macro_f1"],
+            "llm_calls": round(sum(u[0] for u in usage), 2),
+            "shared_prompts": sum(users[key] > 1 for key in keys),
+            "input_tokens": round(sum(u[1] for u in usage), 1),
+            "output_tokens": round(sum(u[2] for u in usage), 1),
+            "cost_usd": round(sum(u[3] for u in usage), 6),
+        })
+        token_totals = {}
+        for article, (_, input_tokens, output_tokens, _) in zip(articles, usage):
+            url = article.get("url") or ""
+            previous = token_totals.get(url, (0, 0))
+            token_totals[url] = (round(previous[0] + input_tokens, 1), round(previous[1] + output_tokens, 1))
+        rows = prediction_rows(processed, y_true, y_pred, token_totals=token_totals)
+        store.write(run_id, config.name, rows, {"task": "bias", "mode": "ablation", "articles": len(articles),
+                                                "configs_detail": {c.name: c._asdict() for c in configs}})
+
+    summary_df = pd.DataFrame(summary).sort_values("macro_f1", ascending=False).reset_index(drop=True)
+    logging.info(f"[ablation] Stored grid run {run_id} in {store.root}\n{summary_df.to_string()}")
+    return {
+        "run_id": run_id,
+        "summary": summary_df,
+        "llm_calls": len(jobs),
+        "shared_calls": len(assignments) - len(jobs),
+        "predictions": predictions,
+    }
+
+
+def _job_usage(meter_rows: List[Dict[str, Any]], jobs: Dict[tuple, Dict[str, Any]]) -> Dict[tuple, List[float]]:
+    """
+    [calls, input tokens, output tokens, cost] of every job.
+
+    A job is metered under the run label of the first configuration that sends
+    it and its article's url; that configuration sends one job per article.
+    """
+    metered: Dict[tuple, List[float]] = {}
+    for row in meter_rows:
+        totals = metered.setdefault((row["run"], row["article"]), [0, 0, 0, 0.0])
+        for position, field in enumerate(("calls", "input_tokens", "output_tokens", "cost_usd")):
+            totals[position] += row[field]
+    return {key: metered.get((job["config"].name, job["article"].get("url") or ""), [0, 0, 0, 0.0])
+            for key, job in jobs.items()}
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [value.strip() for value in os.getenv(name, default).split(",") if value.strip()]
+
+
+if __name__ == "__main__":
+    # ABLATION_PROMPTS, ABLATION_MODELS and ABLATION_CONTEXT_SIZES are comma-separated
+    # ("all" = uncapped context); ABLATION_SAMPLE limits the run to a stratified sample
+    from sys_evaluation.datasets import load_bias_articles
+    from sys_evaluation.kg_snapshot import evaluation_knowledge_graph
+    from sys_evaluation.sequential_eval import stratified_order
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    grid = config_grid(
+        prompt_versions=_env_list("ABLATION_PROMPTS", ",".join(BIAS_PROMPTS)),
+        model_ids=_env_list("ABLATION_MODELS", BIAS_MODEL_ID),
+        context_sizes=[None if size == "all" else int(size)
+                       for size in _env_list("ABLATION_CONTEXT_SIZES", "all")],
+    )
+    test_articles = stratified_order(load_bias_articles())
+    sample = os.getenv("ABLATION_SAMPLE")
+    if sample:
+        test_articles = test_articles[:int(sample)]
+    report = run_ablation_grid(test_articles, grid, knowledge_graph=evaluation_knowledge_graph())
+    print(report["summary"].to_string())
+    get_token_meter().export_csv("sys_evaluation/ablation_token_usage.csv")
@@ -0,0 +1,201 @@
+"""
+Evaluation datasets with a columnar on-disk cache.
+
+The source CSV/TSV files are parsed and label-normalised once, then cached
+as Parquet (when pyarrow or fastparquet is installed) or as a pickled
+DataFrame. Low-cardinality columns (labels, source names, dates) are stored
+as categoricals. The cache is keyed by the source file's size and mtime plus
+NORMALIZATION_VERSION, so editing the file or the normalisation rebuilds it.
+"""
+import os
+import json
+import logging
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from src_v3.memory.article import ArticleRecord
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_dataset")
+BIAS_DATASET_PATH = os.path.join(DATASET_DIR, "bias_cleaned_file.csv")
+FACT_CHECK_DATASET_PATH = os.path.join(DATASET_DIR, "fact_check_test.tsv")
+
+# Bump when the normalisation below changes so existing caches are rebuilt
+NORMALIZATION_VERSION = 1
+
+BIAS_LABEL_MAP = {"lean left": "left", "lean right": "right"}
+
+# Dataset column -> article field, as the evaluation scripts build them
+BIAS_ARTICLE_FIELDS = {
+    "title": "title",
+    "full_content": "content",
+    "source_name": "source",
+    "publishedAt": "date",
+    "url": "url",
+    "bias": "ground_truth_bias",
+}
+FACT_CHECK_FIELDS = {"date": "date", "claim": "claim", "ground_truth": "ground_truth"}
+
+CATEGORY_COLUMNS = ("source_name", "bias", "publishedAt", "date", "rating", "ground_truth")
+
+
+def cache_dir() -> str:
+    return os.environ.get("EVAL_DATASET_CACHE", os.path.join(DATASET_DIR, ".cache"))
+
+
+def parquet_engine() -> Optional[str]:
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+            return engine
+        except ImportError:
+            continue
+    return None
+
+
+def _cache_path(source_path: str) -> str:
+    stat = os.stat(source_path)
+    key = f"{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}|{NORMALIZATION_VERSION}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    extension = "parquet" if parquet_engine() else "pkl"
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir(), f"{name}-{digest}.{extension}")
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def _read_cache(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=list(columns) if columns else None)
+    df = pd.read_pickle(path)
+    return df[list(columns)] if columns else df
+
+
+def _write_cache(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    # Readers never see a half-written cache file
+    os.replace(tmp_path, path)
+
+
+def _remove_stale_caches(path: str) -> None:
+    """Drop caches of older versions of the same source file"""
+    directory, current = os.path.split(path)
+    prefix = current.rsplit("-", 1)[0] + "-"
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name != current and not name.endswith(".tmp"):
+            os.remove(os.path.join(directory, name))
+
+
+def _cached_frame(source_path: str, build: Callable[[], pd.DataFrame], refresh: bool = False,
+                  columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    path = _cache_path(source_path)
+    if not refresh and os.path.exists(path):
+        try:
+            return _read_cache(path, columns)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable dataset cache {path}: {e}")
+
+    df = _compact(build())
+    try:
+        _write_cache(df, path)
+        _remove_stale_caches(path)
+        logging.info(f"Cached {len(df)} rows of {os.path.basename(source_path)} at {path}")
+    except OSError as e:
+        logging.warning(f"Could not write dataset cache {path}: {e}")
+    return df[list(columns)] if columns else df
+
+
+def _build_bias_frame(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, usecols=list(BIAS_ARTICLE_FIELDS))
+    df["bias"] = df["bias"].str.lower().str.strip().replace(BIAS_LABEL_MAP)
+    return df
+
+
+def _build_fact_check_frame(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, sep="\t", encoding="utf-8")
+    # Same result as normalize_label(): stripped and capitalised, "Unknown" for non-strings
+    df["ground_truth"] = df["rating"].str.strip().str.capitalize().fillna("Unknown")
+    return df
+
+
+def load_bias_frame(path: str = BIAS_DATASET_PATH, refresh: bool = False,
+                    columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Bias test set with normalised labels ('lean left' -> 'left', ...)"""
+    return _cached_frame(path, lambda: _build_bias_frame(path), refresh, columns)
+
+
+def load_factcheck_frame(path: str = FACT_CHECK_DATASET_PATH, refresh: bool = False) -> pd.DataFrame:
+    """Fact-check test set with the normalised ground_truth column"""
+    return _cached_frame(path, lambda: _build_fact_check_frame(path), refresh)
+
+
+def _records(df: pd.DataFrame, fields: Dict[str, str]) -> List[dict]:
+    """Column-wise conversion to dicts; NaN becomes None like a missing value"""
+    frame = df[list(fields)].rename(columns=fields).astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+class _ContentColumn:
+    """Article bodies read from the cache in one go, the first time any record needs one"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._values = None
+        self._lock = threading.Lock()
+
+    def get(self, row: int) -> Optional[str]:
+        if self._values is None:
+            with self._lock:
+                if self._values is None:
+                    column = load_bias_frame(self.path, columns=["full_content"])["full_content"]
+                    self._values = column.astype(object).where(column.notna(), None).tolist()
+        return self._values[row]
+
+
+def load_bias_articles(path: str = BIAS_DATASET_PATH, lazy: bool = False, refresh: bool = False) -> List:
+    """
+    Articles of the bias test set, with ground_truth_bias set.
+
+    Args:
+        path: Source CSV
+        lazy: Return ArticleRecords whose full_content is only read when first used;
+            the default plain dicts can be deep-copied through JSON
+        refresh: Rebuild the cache from the source file
+
+    Returns:
+        List of article dicts, or ArticleRecords when lazy
+    """
+    if not lazy:
+        return _records(load_bias_frame(path, refresh), BIAS_ARTICLE_FIELDS)
+
+    metadata_fields = {column: field for column, field in BIAS_ARTICLE_FIELDS.items() if column != "full_content"}
+    frame = load_bias_frame(path, refresh, columns=list(metadata_fields))
+    content = _ContentColumn(path)
+    return [
+        ArticleRecord.from_dict(row, content_loader=lambda row_index=i: content.get(row_index))
+        for i, row in enumerate(_records(frame, metadata_fields))
+    ]
+
+
+def load_factcheck_claims(path: str = FACT_CHECK_DATASET_PATH, refresh: bool = False) -> List[dict]:
+    """Claims of the fact-check test set as {date, claim, ground_truth} dicts"""
+    return _records(load_factcheck_frame(path, refresh), FACT_CHECK_FIELDS)
+
+
+if __name__ == "__main__":
+    # Build (or rebuild) both caches ahead of an evaluation run
+    logging.basicConfig(level=logging.INFO)
+    for frame in (load_bias_frame(refresh=True), load_factcheck_frame(refresh=True)):
+        print(json.dumps({"rows": len(frame), "bytes": int(frame.memory_usage(deep=True).sum())}))
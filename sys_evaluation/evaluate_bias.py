@@ -11,14 +11,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import components
 from src_v3.memory.schema import GraphState
-from src_v3.memory.knowledge_graph import KnowledgeGraph
+from sys_evaluation.kg_snapshot import evaluation_knowledge_graph, kg_context_label
 from sys_evaluation.metrics_updated import (
     calculate_bias_metrics,
     calculate_fact_check_metrics
 )
 from sys_evaluation.visualization_updated import generate_evaluation_chart, plot_confusion_matrix
+from sys_evaluation.datasets import load_bias_articles
+from sys_evaluation.results_store import ResultsStore, prediction_rows
+from sys_evaluation.sequential_eval import SequentialEvaluator, sequential_settings, stratified_order, store_report
+from src_v3.components.bias_analyzer.b_prompts import BIAS_PROMPT_VERSION
 from src_v3.workflow.simplified_workflow import process_articles
 from src_v3.utils.aws_helpers import get_bedrock_llm
+from src_v3.utils.token_meter import get_token_meter, metering
 # Import for direct query route
 # from src_v3.components.fact_checker.fact_checker_Agent import FactCheckerAgent
 # from src_v3.components.fact_checker.fact_checker_updated import FactCheckerAgent, fact_checker_agent
@@ -35,35 +40,8 @@ logging.basicConfig(
 
 
 def load_bias_dataset():
-    """Loading pre-labeled test articles"""
-
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Project root
-    DATASET_PATH = os.path.join(BASE_DIR, 'sys_evaluation', 'test_dataset', 'bias_cleaned_file.csv')
-
-    # Load from CSV file
-    df = pd.read_csv(DATASET_PATH)
-    df['bias'] = df['bias'].str.lower().str.strip()
-    df['bias'] = df['bias'].replace({
-        'lean left': 'left',
-        'lean right': 'right'
-    })
-
-
-    # Convert DataFrame rows to article dictionaries
-    test_articles = []
-    for _, row in df.iterrows():
-        article = {
-            "title": row['title'],
-            "content": row['full_content'],
-            "source": row['source_name'],
-            "date": row['publishedAt'],
-            "url": row['url'],
-            # Ground truth labels for evaluation
-            'ground_truth_bias': row['bias']
-        }
-        test_articles.append(article)
-
-    return test_articles
+    """Loading pre-labeled test articles (normalised once into the dataset cache)"""
+    return load_bias_articles()
 
 
 def evaluate_bias_workflow():
@@ -73,11 +51,12 @@ def evaluate_bias_workflow():
     articles = load_bias_dataset()
 
     # Step 2: Initialize system components
-    graph = KnowledgeGraph()
+    graph = evaluation_knowledge_graph()
     graph_state = GraphState(articles=articles, current_status="ready")
 
     # Step 3: Run bias detection workflow
-    updated_state = process_articles(graph_state, knowledge_graph=graph)
+    with metering(run="llm_kg"):
+        updated_state = process_articles(graph_state, knowledge_graph=graph)
 
     # Step 4: Extract predictions and ground truth
     y_true = []
@@ -127,11 +106,48 @@ def evaluate_bias_workflow():
     results_df.to_csv("bias_eval_results.csv", index=False)
     logging.info("Saved results to bias_eval_results.csv")
 
+    get_token_meter().export_csv("bias_eval_token_usage.csv")
+    get_token_meter().log_summary()
+
 
     return metrics
 
 
 
+def get_predictions(articles):
+    """(y_true, y_pred) bias labels of processed articles"""
+    y_true, y_pred = [], []
+    for art in articles:
+        truth = art.get("ground_truth_bias", "").strip().lower()
+        pred_raw = art.get("bias_result")
+        pred = "unknown"
+
+        # Case 1: Dict
+        if isinstance(pred_raw, dict):
+            pred = pred_raw.get("bias", "unknown").strip().lower()
+
+        # Case 2: LangChain Output object with .content
+        elif hasattr(pred_raw, "content"):
+            try:
+                parsed = json.loads(pred_raw.content)
+                pred = parsed.get("bias", "unknown").strip().lower()
+            except Exception as e:
+                logging.warning(f"Failed to parse bias_result.content: {e}")
+
+        # Case 3: JSON string
+        elif isinstance(pred_raw, str):
+            try:
+                parsed = json.loads(pred_raw)
+                pred = parsed.get("bias", "unknown").strip().lower()
+            except Exception as e:
+                logging.warning(f"Failed to parse bias_result string: {e}")
+
+        y_true.append(truth)
+        y_pred.append(pred)
+
+    return y_true, y_pred
+
+
 def benchmark_bias_detection(articles):
     logging.info("=== BENCHMARKING: LLM vs LLM+KG ===")
 
@@ -141,47 +157,18 @@ def benchmark_bias_detection(articles):
 
     # --- Step 2: LLM-only baseline ---
     logging.info("[BASELINE] Evaluating with LLM only (no KG)...")
-    baseline_state = process_articles(GraphState(articles=articles_copy), knowledge_graph=None, use_kg=False)
+    with metering(run="llm_only"):
+        baseline_state = process_articles(GraphState(articles=articles_copy), knowledge_graph=None, use_kg=False)
 
     # --- Step 3: LLM+KG full system ---
     logging.info("[FULL SYSTEM] Evaluating with KG-enhanced context...")
-    full_state = process_articles(GraphState(articles=articles), knowledge_graph=KnowledgeGraph())
+    knowledge_graph = evaluation_knowledge_graph()
+    with metering(run="llm_kg"):
+        full_state = process_articles(GraphState(articles=articles), knowledge_graph=knowledge_graph)
 
     # --- Step 4: Extract predictions ---
-    def get_predictions(state):
-        y_true, y_pred = [], []
-        for art in state.articles:
-            truth = art.get("ground_truth_bias", "").strip().lower()
-            pred_raw = art.get("bias_result")
-            pred = "unknown"
-
-            # Case 1: Dict
-            if isinstance(pred_raw, dict):
-                pred = pred_raw.get("bias", "unknown").strip().lower()
-
-            # Case 2: LangChain Output object with .content
-            elif hasattr(pred_raw, "content"):
-                try:
-                    parsed = json.loads(pred_raw.content)
-                    pred = parsed.get("bias", "unknown").strip().lower()
-                except Exception as e:
-                    logging.warning(f"Failed to parse bias_result.content: {e}")
-
-            # Case 3: JSON string
-            elif isinstance(pred_raw, str):
-                try:
-                    parsed = json.loads(pred_raw)
-                    pred = parsed.get("bias", "unknown").strip().lower()
-                except Exception as e:
-                    logging.warning(f"Failed to parse bias_result string: {e}")
-
-            y_true.append(truth)
-            y_pred.append(pred)
-
-        return y_true, y_pred
-
-    y_true_baseline, y_pred_baseline = get_predictions(baseline_state)
-    y_true_kg, y_pred_kg = get_predictions(full_state)
+    y_true_baseline, y_pred_baseline = get_predictions(baseline_state.articles)
+    y_true_kg, y_pred_kg = get_predictions(full_state.articles)
 
     # --- Step 5: Calculate metrics ---
     metrics_baseline = calculate_bias_metrics(y_true_baseline, y_pred_baseline)
@@ -238,6 +225,22 @@ def benchmark_bias_detection(articles):
     comparison_df.to_csv("bias_benchmark_comparison.csv", index=False)
     logging.info("Saved benchmark comparison to bias_benchmark_comparison.csv")
 
+    # Token usage per article, agent, stage and prompt version for both runs
+    get_token_meter().export_csv("bias_benchmark_token_usage.csv")
+    get_token_meter().log_summary()
+
+    # Keep this run's predictions next to earlier runs for diffing and re-scoring
+    store = ResultsStore()
+    run_id = store.new_run_id("bias")
+    metadata = {"task": "bias", "prompt_version": BIAS_PROMPT_VERSION, "articles": len(articles),
+                "kg_context": kg_context_label(knowledge_graph)}
+    for config, state, y_true, y_pred in (("llm_only", baseline_state, y_true_baseline, y_pred_baseline),
+                                          ("llm_kg", full_state, y_true_kg, y_pred_kg)):
+        rows = prediction_rows(state.articles, y_true, y_pred,
+                               token_totals=get_token_meter().article_totals(run=config))
+        store.write(run_id, config, rows, metadata)
+    logging.info(f"Stored benchmark run {run_id} in {store.root}")
+
     # --- Step 8: Save confusion matrices ---
     from sys_evaluation.visualization_updated import plot_confusion_matrix
 
@@ -259,6 +262,36 @@ def benchmark_bias_detection(articles):
 
 
 
+def benchmark_bias_detection_sequential(articles):
+    """
+    LLM-only vs LLM+KG on a stratified (label, source) sample, stopping once the
+    paired accuracy difference is known precisely enough (see sequential_eval).
+    """
+    logging.info("=== SEQUENTIAL BENCHMARK: LLM vs LLM+KG ===")
+    knowledge_graph = evaluation_knowledge_graph()
+
+    def llm_only(batch):
+        with metering(run="llm_only"):
+            return process_articles(GraphState(articles=batch), knowledge_graph=None, use_kg=False).articles
+
+    def llm_kg(batch):
+        with metering(run="llm_kg"):
+            return process_articles(GraphState(articles=batch), knowledge_graph=knowledge_graph).articles
+
+    evaluator = SequentialEvaluator(llm_only, llm_kg, get_predictions, ["left", "center", "right"],
+                                    **sequential_settings())
+    report = evaluator.run(stratified_order(articles, strata=("ground_truth_bias", "source")))
+
+    for name, metrics in (("LLM-only", report["metrics_a"]), ("LLM+KG", report["metrics_b"])):
+        logging.info(f"{name:>9}: accuracy = {metrics['accuracy']:.3f}  macro F1 = {metrics['macro_f1']:.3f}")
+
+    get_token_meter().export_csv("bias_benchmark_token_usage.csv")
+    get_token_meter().log_summary()
+    store_report(report, "bias", {"prompt_version": BIAS_PROMPT_VERSION,
+                                  "kg_context": kg_context_label(knowledge_graph)})
+    return report
+
+
 def extract_bias_from_result(result_obj) -> dict:
     """Safely extract the bias dict from LLM output (AIMessage, string, or dict)."""
     if isinstance(result_obj, dict):
@@ -286,5 +319,7 @@ if __name__ == "__main__":
     elif mode == "benchmark":
         articles = load_bias_dataset()
         benchmark_bias_detection(articles)
+    elif mode == "sequential":
+        benchmark_bias_detection_sequential(load_bias_dataset())
     else:
-        print("Unsupported mode. Use EVALUATION_MODE=bias or EVALUATION_MODE=benchmark")
\ No newline at end of file
+        print("Unsupported mode. Use EVALUATION_MODE=bias, benchmark or sequential")
\ No newline at end of file
@@ -4,11 +4,16 @@ import json
 import pandas as pd
 from sklearn.metrics import classification_report
 from src_v3.memory.schema import GraphState
-from src_v3.memory.knowledge_graph import KnowledgeGraph
+from sys_evaluation.kg_snapshot import evaluation_knowledge_graph, kg_context_label
 from src_v3.workflow.simplified_workflow import process_articles
 from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
+from src_v3.utils.token_meter import get_token_meter, metering
 from src_v3.components.fact_checker.tools import create_factcheck_chain, initialize_entity_extractor, get_bedrock_llm
 from sys_evaluation.metrics_updated import save_fact_check_results
+from sys_evaluation.datasets import load_factcheck_claims
+from sys_evaluation.results_store import ResultsStore, prediction_rows
+from sys_evaluation.sequential_eval import SequentialEvaluator, sequential_settings, stratified_order, store_report
+from src_v3.components.fact_checker.fc_prompt import FACT_CHECK_PROMPT_VERSION
 from sys_evaluation.visualization_updated import plot_confusion_matrix
 
 
@@ -28,20 +33,8 @@ def normalize_label(label: str) -> str:
     return "Unknown"
 
 def load_factcheck_dataset():
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    path = os.path.join(BASE_DIR, "sys_evaluation", "test_dataset", "fact_check_test.tsv")
-    df = pd.read_csv(path, sep='\t', encoding='utf-8')
-
-    df['ground_truth'] = df['rating'].apply(normalize_label)
-
-    claims = []
-    for _, row in df.iterrows():
-        claims.append({
-            "date": row['date'],
-            "claim": row['claim'],
-            "ground_truth": row['ground_truth']
-        })
-    return claims
+    """Claims with normalised ground truth (same rules as normalize_label), read from the dataset cache"""
+    return load_factcheck_claims()
 
 def run_fact_check(articles, knowledge_graph=None, store_to_kg=False):
     graph_state = GraphState(articles=articles, current_status="ready")
@@ -77,8 +70,9 @@ def evaluate_factcheck_workflow():
     logging.info("[SETUP] Initializing LLM and entity extractor")
     llm = get_bedrock_llm()
     initialize_entity_extractor(llm)
-    knowledge_graph = KnowledgeGraph()
-    updated_state = run_fact_check(articles, knowledge_graph=knowledge_graph)
+    knowledge_graph = evaluation_knowledge_graph()
+    with metering(run="llm_kg"):
+        updated_state = run_fact_check(articles, knowledge_graph=knowledge_graph)
 
     # Step 3: Extract predictions and ground truth
     y_true, y_pred = extract_predictions(updated_state)
@@ -129,6 +123,9 @@ def evaluate_factcheck_workflow():
     results_df.to_csv("sys_evaluation/factcheck_eval_results.csv", index=False)
     logging.info("Saved results to sys_evaluation/factcheck_eval_results.csv")
 
+    get_token_meter().export_csv("sys_evaluation/factcheck_eval_token_usage.csv")
+    get_token_meter().log_summary()
+
     return report
 
 
@@ -177,11 +174,14 @@ def benchmark_fact_checking():
 
     # Baseline: LLM only
     logging.info("[BASELINE] LLM-only fact checking")
-    state_baseline = run_fact_check(articles_copy, knowledge_graph=None)
+    with metering(run="llm_only"):
+        state_baseline = run_fact_check(articles_copy, knowledge_graph=None)
 
     # KG-enhanced: LLM + KG
     logging.info("[FULL SYSTEM] LLM + KG fact checking")
-    state_kg = run_fact_check(articles, knowledge_graph=KnowledgeGraph())
+    knowledge_graph = evaluation_knowledge_graph()
+    with metering(run="llm_kg"):
+        state_kg = run_fact_check(articles, knowledge_graph=knowledge_graph)
 
     # Extract predictions
     y_true_baseline, y_pred_baseline = extract_predictions(state_baseline)
@@ -191,6 +191,21 @@ def benchmark_fact_checking():
     save_fact_check_results("sys_evaluation/fact_check_raw_results_llm_only.csv", state_baseline.articles, y_true_baseline,
                            y_pred_baseline)
     save_fact_check_results("sys_evaluation/fact_check_raw_results_llm_kg.csv", state_kg.articles, y_true_kg, y_pred_kg)
+    get_token_meter().export_csv("sys_evaluation/fact_check_token_usage.csv")
+    get_token_meter().log_summary()
+
+    # Keep this run's predictions next to earlier runs for diffing and re-scoring
+    store = ResultsStore()
+    run_id = store.new_run_id("fact_check")
+    metadata = {"task": "fact_check", "prompt_version": FACT_CHECK_PROMPT_VERSION, "articles": len(articles),
+                "kg_context": kg_context_label(knowledge_graph)}
+    for config, state, y_true, y_pred in (("llm_only", state_baseline, y_true_baseline, y_pred_baseline),
+                                          ("llm_kg", state_kg, y_true_kg, y_pred_kg)):
+        rows = prediction_rows(state.articles, y_true, y_pred, key_field="claim",
+                               reasoning_field="fact_check_result",
+                               token_totals=get_token_meter().article_totals(run=config))
+        store.write(run_id, config, rows, metadata)
+    logging.info(f"Stored benchmark run {run_id} in {store.root}")
 
     # Calculate metrics
     logging.info("== METRICS ==")
@@ -201,6 +216,38 @@ def benchmark_fact_checking():
     safe_evaluate(y_true_kg, y_pred_kg, labels=["True", "False"], title="LLM+KG Fact Checking")
 
 
+def benchmark_fact_checking_sequential():
+    """
+    LLM-only vs LLM+KG on a label-stratified sample of claims, stopping once the
+    paired accuracy difference is known precisely enough (see sequential_eval).
+    """
+    logging.info("== SEQUENTIAL FACT CHECKING BENCHMARK STARTED ==")
+    articles = load_factcheck_dataset()
+    knowledge_graph = evaluation_knowledge_graph()
+
+    def llm_only(batch):
+        with metering(run="llm_only"):
+            return run_fact_check(batch, knowledge_graph=None).articles
+
+    def llm_kg(batch):
+        with metering(run="llm_kg"):
+            return run_fact_check(batch, knowledge_graph=knowledge_graph).articles
+
+    evaluator = SequentialEvaluator(llm_only, llm_kg, lambda done: extract_predictions(GraphState(articles=done)),
+                                    ["True", "False"], **sequential_settings())
+    report = evaluator.run(stratified_order(articles, strata=("ground_truth",)))
+
+    for name, metrics in (("LLM-only", report["metrics_a"]), ("LLM+KG", report["metrics_b"])):
+        logging.info(f"{name:>9}: accuracy = {metrics['accuracy']:.3f}  macro F1 = {metrics['macro_f1']:.3f}")
+
+    get_token_meter().export_csv("sys_evaluation/fact_check_token_usage.csv")
+    get_token_meter().log_summary()
+    store_report(report, "fact_check", {"prompt_version": FACT_CHECK_PROMPT_VERSION,
+                                        "kg_context": kg_context_label(knowledge_graph)},
+                 key_field="claim", reasoning_field="fact_check_result")
+    return report
+
+
 if __name__ == "__main__":
     mode = os.environ.get("EVALUATION_MODE", "benchmark")
     if mode == "factcheck":
@@ -208,5 +255,8 @@ if __name__ == "__main__":
     elif mode == "benchmark":
         initialize_entity_extractor(get_bedrock_llm())
         benchmark_fact_checking()
+    elif mode == "sequential":
+        initialize_entity_extractor(get_bedrock_llm())
+        benchmark_fact_checking_sequential()
     else:
-        print("Unsupported mode. Use EVALUATION_MODE=factcheck or EVALUATION_MODE=benchmark")
\ No newline at end of file
+        print("Unsupported mode. Use EVALUATION_MODE=factcheck, benchmark or sequential")
\ No newline at end of file
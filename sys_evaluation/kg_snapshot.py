@@ -0,0 +1,256 @@
+"""
+Frozen per-article KG context for reproducible LLM+KG evaluation.
+
+A snapshot stores, for every test item, the context the agents would fetch
+from the live graph:
+- its extracted entities, in mention order
+- the most structurally similar article's bias
+- the related fact lines
+- the same two lookups for each capped context size (the first N entities)
+- for claims, the related article passages (nearest chunks to the claim)
+
+SnapshotKnowledgeGraph serves that context back through the KnowledgeGraph
+query methods. Later runs therefore see exactly the same context, and pay
+neither entity extraction nor Neo4j latency.
+
+Snapshots are gzipped JSON files named <task>-<timestamp>-<content hash>.json.gz
+in KG_CONTEXT_SNAPSHOT_DIR. Setting KG_CONTEXT_SNAPSHOT to one of them makes
+evaluation_knowledge_graph() return it instead of a live graph.
+"""
+import os
+import sys
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src_v3.components.kg_builder.chunk_pipeline import FACT_CHECK_PASSAGES, get_chunk_embedder
+from src_v3.memory.graph_backends import create_knowledge_graph
+from src_v3.utils.rate_limiter import Priority, request_priority
+from src_v3.utils.token_meter import current_attribution, metering
+from src_v3.utils.tracing import current_span, span
+
+# 2: fact-check items carry their related passages
+# 3: entities in mention order, lookups frozen per capped context size
+SNAPSHOT_FORMAT_VERSION = 3
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kg_snapshots")
+SNAPSHOT_MAX_WORKERS = int(os.environ.get("KG_SNAPSHOT_MAX_WORKERS", "10"))
+
+# Fact lines are materialised with the agents' default limit
+FACTS_LIMIT = 25
+
+
+def snapshot_key(item: Any) -> str:
+    """Key of a test item: the claim text, or the article url (title when there is none)"""
+    if isinstance(item, str):
+        return item
+    return item.get("claim") or item.get("url") or item.get("title") or ""
+
+
+def _entity_key(entities: Sequence[str]) -> str:
+    return "\x1f".join(sorted(set(entities)))
+
+
+def _embedding_key(embedding: Sequence[float]) -> str:
+    """Passage queries are embeddings of the claim text; frozen passages are keyed by their hash"""
+    return hashlib.sha256(np.asarray(embedding, dtype=np.float32).tobytes()).hexdigest()
+
+
+def _content_hash(items: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(items, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SnapshotKnowledgeGraph:
+    """
+    Read-only KnowledgeGraph stand-in answering from a snapshot.
+
+    The agents ask frozen_entities(key) before extracting entities, so the
+    query methods receive the same entity lists that were materialised.
+    Anything the snapshot does not cover is answered by the fallback graph
+    when one is given, otherwise as an empty context, and counted in misses.
+    """
+
+    def __init__(self, snapshot: Dict[str, Any], fallback=None):
+        self.metadata = {k: v for k, v in snapshot.items() if k != "items"}
+        self.items: Dict[str, Dict[str, Any]] = snapshot["items"]
+        self.fallback = fallback
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._by_entities = {_entity_key(context["entities"]): context for item in self.items.values()
+                             for context in [item] + item.get("capped_contexts", [])}
+        self._by_passage_query = {item["passage_query"]: item for item in self.items.values()
+                                  if "passage_query" in item}
+
+    @classmethod
+    def load(cls, path: str, fallback=None) -> "SnapshotKnowledgeGraph":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path}: snapshot format {snapshot.get('format_version')}, "
+                             f"expected {SNAPSHOT_FORMAT_VERSION}")
+        if _content_hash(snapshot["items"]) != snapshot.get("content_hash"):
+            raise ValueError(f"{path}: snapshot content does not match its hash")
+        logging.info(f"Loaded KG context snapshot {snapshot['snapshot_id']} ({len(snapshot['items'])} items)")
+        return cls(snapshot, fallback)
+
+    def _miss(self, what: str):
+        with self._lock:
+            self.misses += 1
+        logging.warning(f"[KG snapshot] No frozen {what}, "
+                        f"{'querying the fallback graph' if self.fallback else 'using an empty context'}")
+
+    def frozen_entities(self, key: str) -> Optional[List[str]]:
+        item = self.items.get(key)
+        return list(item["entities"]) if item is not None else None
+
+    def query_most_structurally_similar_bias(self, entities: list) -> str:
+        item = self._by_entities.get(_entity_key(entities))
+        if item is not None:
+            return item["similar_bias"]
+        self._miss("similar bias")
+        return self.fallback.query_most_structurally_similar_bias(entities) if self.fallback else "Unknown"
+
+    def retrieve_related_facts_text(self, entities: List[str], limit: int = FACTS_LIMIT) -> str:
+        item = self._by_entities.get(_entity_key(entities))
+        if item is not None:
+            return item["facts"]
+        self._miss("facts")
+        return self.fallback.retrieve_related_facts_text(entities, limit) if self.fallback else ""
+
+    def retrieve_related_passages(self, embedding: List[float], limit: int = 5) -> List[Dict[str, Any]]:
+        item = self._by_passage_query.get(_embedding_key(embedding))
+        if item is not None:
+            return [dict(passage) for passage in item["passages"][:limit]]
+        self._miss("passages")
+        fallback = getattr(self.fallback, "retrieve_related_passages", None)
+        return fallback(embedding, limit=limit) if fallback else []
+
+    def add_fact_check_result(self, *args, **kwargs) -> None:
+        logging.info("[KG snapshot] Snapshots are read-only, fact-check result not stored")
+
+
+def _extractor(task: str):
+    if task == "fact_check":
+        from src_v3.components.fact_checker.tools import extract_entities_from_claim
+        return lambda item: extract_entities_from_claim(item["claim"])
+    from src_v3.components.bias_analyzer.tools import extract_entities
+    return extract_entities
+
+
+def materialize_snapshot(items: Sequence[dict], knowledge_graph, task: str = "bias",
+                         directory: Optional[str] = None, extract=None,
+                         max_workers: int = SNAPSHOT_MAX_WORKERS,
+                         context_sizes: Sequence[Optional[int]] = (None,)) -> str:
+    """
+    Extract entities and query the live graph once per item, and write the snapshot.
+
+    Args:
+        items: Bias articles or fact-check claims
+        knowledge_graph: Live graph to freeze
+        task: "bias" or "fact_check" (selects the entity extractor)
+        directory: Output directory (default KG_CONTEXT_SNAPSHOT_DIR)
+        extract: Entity extractor item -> entities, overriding the task's one
+        max_workers: Concurrent items
+        context_sizes: Entity caps the lookups are also frozen for (None = all entities),
+            as the ablation grid's context sizes query with the first N entities
+
+    Returns:
+        Path of the snapshot file
+    """
+    from src_v3.components.entity_extraction import AGENT_EXTRACTION_PROMPT_VERSION
+
+    extract = extract or _extractor(task)
+    passage_embedder = get_chunk_embedder()
+    retrieve_passages = getattr(knowledge_graph, "retrieve_related_passages", None)
+    capped_sizes = sorted({size for size in context_sizes if size is not None})
+    parent_span = current_span()
+    attribution = current_attribution()
+
+    def lookups(entities):
+        return {
+            "entities": entities,
+            "similar_bias": knowledge_graph.query_most_structurally_similar_bias(entities),
+            "facts": knowledge_graph.retrieve_related_facts_text(entities, limit=FACTS_LIMIT),
+        }
+
+    def freeze(item):
+        key = snapshot_key(item)
+        with request_priority(Priority.BATCH), span("kg_snapshot.item", parent=parent_span), \
+                metering(**attribution), metering(run="kg_snapshot", stage="entity_extraction",
+                                                  prompt_version=AGENT_EXTRACTION_PROMPT_VERSION, article=key[:80]):
+            entities = list(dict.fromkeys(extract(item)))
+            frozen_item = lookups(entities)
+            capped = [lookups(entities[:size]) for size in capped_sizes if size < len(entities)]
+            if capped:
+                frozen_item["capped_contexts"] = capped
+            # The fact checker queries passages with the claim text (see related_passages_text)
+            if task == "fact_check" and retrieve_passages is not None:
+                embedding = passage_embedder.embed([item["claim"]])[0].tolist()
+                passages = retrieve_passages(embedding, limit=FACT_CHECK_PASSAGES) if FACT_CHECK_PASSAGES > 0 else []
+                frozen_item["passage_query"] = _embedding_key(embedding)
+                frozen_item["passages"] = [dict(passage) for passage in passages] if isinstance(passages, list) else []
+            return key, frozen_item
+
+    with span("kg_snapshot.materialize", task=task, item_count=len(items)):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frozen = dict(executor.map(freeze, items))
+
+    content_hash = _content_hash(frozen)
+    created_at = datetime.now()
+    snapshot_id = f"{task}-{created_at.strftime('%Y%m%d-%H%M%S')}-{content_hash[:12]}"
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "snapshot_id": snapshot_id,
+        "task": task,
+        "created_at": created_at.isoformat(),
+        "kg_backend": type(knowledge_graph).__name__,
+        "extraction_prompt_version": AGENT_EXTRACTION_PROMPT_VERSION,
+        "passage_embedder": f"{passage_embedder.name}:{passage_embedder.dim}",
+        "context_sizes": capped_sizes,
+        "content_hash": content_hash,
+        "items": frozen,
+    }
+
+    directory = directory or os.getenv("KG_CONTEXT_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{snapshot_id}.json.gz")
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+    logging.info(f"Saved KG context snapshot {snapshot_id} ({len(frozen)} items) to {path}")
+    return path
+
+
+def evaluation_knowledge_graph():
+    """The snapshot named by KG_CONTEXT_SNAPSHOT if set, otherwise the live graph"""
+    path = os.getenv("KG_CONTEXT_SNAPSHOT")
+    if path:
+        return SnapshotKnowledgeGraph.load(path)
+    return create_knowledge_graph()
+
+
+def kg_context_label(knowledge_graph) -> str:
+    """Snapshot id of a snapshot graph, "live" otherwise (recorded with stored runs)"""
+    if isinstance(knowledge_graph, SnapshotKnowledgeGraph):
+        return knowledge_graph.metadata["snapshot_id"]
+    return "live"
+
+
+if __name__ == "__main__":
+    # python -m sys_evaluation.kg_snapshot bias|fact_check   freeze the test set's context from the live graph
+    # (ABLATION_CONTEXT_SIZES, comma-separated, also freezes the lookups of capped context sizes)
+    from sys_evaluation.datasets import load_bias_articles, load_factcheck_claims
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    snapshot_task = sys.argv[1] if len(sys.argv) > 1 else "bias"
+    test_items = load_factcheck_claims() if snapshot_task == "fact_check" else load_bias_articles()
+    sizes = [None if size.strip() == "all" else int(size)
+             for size in os.getenv("ABLATION_CONTEXT_SIZES", "all").split(",") if size.strip()]
+    print(materialize_snapshot(test_items, create_knowledge_graph(), snapshot_task, context_sizes=sizes))
@@ -1,11 +1,203 @@
+import json
 import math
 import os
+import numpy as np
 import pandas as pd
 import logging
-from sklearn.metrics import (
-    classification_report, balanced_accuracy_score,
-    cohen_kappa_score, matthews_corrcoef, confusion_matrix
-)
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Resampled predictions held in memory at once by bootstrap_ci (resamples x predictions)
+BOOTSTRAP_CHUNK_ELEMENTS = 10_000_000
+
+
+def encode_labels(y_true, y_pred, labels: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Encode both label sequences once as integer indices into a shared label list.
+
+    The given labels come first, in order. Any other observed label (e.g. an
+    "unknown" prediction) is appended in sorted order, so it still counts as
+    an error in accuracy, kappa and MCC.
+
+    Returns:
+        (true indices, predicted indices, label list)
+    """
+    # Hash-based factorize of each side; only the few distinct values are handled in Python
+    true_codes, true_values = pd.factorize(np.asarray(y_true, dtype=object), use_na_sentinel=False)
+    pred_codes, pred_values = pd.factorize(np.asarray(y_pred, dtype=object), use_na_sentinel=False)
+    true_values = [str(value) for value in true_values]
+    pred_values = [str(value) for value in pred_values]
+
+    label_list = [str(label) for label in labels] if labels is not None else []
+    known = set(label_list)
+    label_list += sorted(set(true_values + pred_values) - known)
+    position = {label: i for i, label in enumerate(label_list)}
+
+    true_idx = np.array([position[value] for value in true_values], dtype=np.int64)[true_codes]
+    pred_idx = np.array([position[value] for value in pred_values], dtype=np.int64)[pred_codes]
+    return true_idx, pred_idx, label_list
+
+
+def confusion_counts(true_idx: np.ndarray, pred_idx: np.ndarray, n_labels: int) -> np.ndarray:
+    """Full confusion matrix (rows = truth, columns = prediction) from a single bincount"""
+    return np.bincount(true_idx * n_labels + pred_idx, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+
+def _divide(numerator, denominator) -> np.ndarray:
+    """Element-wise division that gives 0 where the denominator is 0 (sklearn's zero_division=0)"""
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                 np.asarray(denominator, dtype=float))
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+
+def matrix_metrics(cm: np.ndarray, report_idx: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Per-class and aggregate metrics derived from confusion matrices.
+
+    Works on one matrix (k x k) or a stack of them (... x k x k), so a whole
+    batch of bootstrap resamples is scored in one pass.
+
+    Args:
+        cm: Confusion matrix or stack of confusion matrices
+        report_idx: Label indices that macro and weighted averages run over (default all)
+
+    Returns:
+        Metric name -> array (per-class metrics keep a trailing class axis)
+    """
+    cm = np.asarray(cm, dtype=float)
+    report_idx = np.arange(cm.shape[-1]) if report_idx is None else np.asarray(report_idx)
+
+    tp = np.diagonal(cm, axis1=-2, axis2=-1)
+    support = cm.sum(axis=-1)
+    predicted = cm.sum(axis=-2)
+    total = support.sum(axis=-1)
+    correct = tp.sum(axis=-1)
+
+    precision = _divide(tp, predicted)
+    recall = _divide(tp, support)
+    f1 = _divide(2 * precision * recall, precision + recall)
+
+    report_support = support[..., report_idx]
+    macro_f1 = f1[..., report_idx].mean(axis=-1)
+    weighted_f1 = _divide((f1[..., report_idx] * report_support).sum(axis=-1), report_support.sum(axis=-1))
+
+    # Balanced accuracy: mean recall over the classes present in the ground truth
+    present = support > 0
+    balanced_accuracy = _divide((recall * present).sum(axis=-1), present.sum(axis=-1))
+
+    # Cohen's kappa: observed agreement against chance agreement from the marginals
+    accuracy = _divide(correct, total)
+    chance = _divide((support * predicted).sum(axis=-1), total ** 2)
+    kappa = _divide(accuracy - chance, 1 - chance)
+
+    # Multiclass Matthews correlation coefficient
+    cov_true_pred = correct * total - (support * predicted).sum(axis=-1)
+    cov_pred = total ** 2 - (predicted ** 2).sum(axis=-1)
+    cov_true = total ** 2 - (support ** 2).sum(axis=-1)
+    mcc = _divide(cov_true_pred, np.sqrt(cov_pred * cov_true))
+
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "support": support,
+        "accuracy": accuracy,
+        "macro_f1": macro_f1,
+        "weighted_f1": weighted_f1,
+        "balanced_accuracy": balanced_accuracy,
+        "cohen_kappa": kappa,
+        "mcc": mcc,
+    }
+
+
+def classification_report_dict(cm: np.ndarray, labels: List[str], report_labels: Sequence[str]) -> Dict:
+    """
+    Report in the layout of sklearn's classification_report(output_dict=True, zero_division=0).
+
+    "accuracy" is included when the report labels cover every observed label,
+    otherwise "micro avg" over the report labels, as sklearn does.
+    """
+    report_idx = [labels.index(str(label)) for label in report_labels]
+    metrics = matrix_metrics(cm, report_idx)
+    support = metrics["support"][report_idx]
+
+    report = {}
+    for label, i in zip(report_labels, report_idx):
+        report[label] = {
+            "precision": float(metrics["precision"][i]),
+            "recall": float(metrics["recall"][i]),
+            "f1-score": float(metrics["f1"][i]),
+            "support": float(metrics["support"][i]),
+        }
+
+    observed = np.flatnonzero(cm.sum(axis=0) + cm.sum(axis=1))
+    if set(observed.tolist()) <= set(report_idx):
+        report["accuracy"] = float(metrics["accuracy"])
+    else:
+        tp = np.diagonal(cm)[report_idx].sum()
+        micro_precision = float(_divide(tp, cm[:, report_idx].sum()))
+        micro_recall = float(_divide(tp, support.sum()))
+        micro_f1 = float(_divide(2 * micro_precision * micro_recall, micro_precision + micro_recall))
+        report["micro avg"] = {"precision": micro_precision, "recall": micro_recall, "f1-score": micro_f1,
+                               "support": float(support.sum())}
+
+    for name, weights in (("macro avg", np.ones(len(report_idx))), ("weighted avg", support)):
+        report[name] = {
+            field: float(_divide((metrics[key][report_idx] * weights).sum(), weights.sum()))
+            for field, key in (("precision", "precision"), ("recall", "recall"), ("f1-score", "f1"))
+        }
+        report[name]["support"] = float(support.sum())
+    return report
+
+
+def bootstrap_ci(y_true, y_pred, labels: Optional[Sequence[str]] = None,
+                 metrics: Sequence[str] = ("accuracy", "macro_f1", "weighted_f1", "cohen_kappa", "mcc"),
+                 n_resamples: int = 1000, confidence: float = 0.95, seed: Optional[int] = 0) -> Dict[str, Dict]:
+    """
+    Percentile bootstrap confidence intervals for aggregate metrics.
+
+    Resamples are drawn as index arrays and scored together: each chunk of
+    resamples becomes one bincount over (resample, truth, prediction) cells.
+
+    Args:
+        y_true: Ground-truth labels
+        y_pred: Predicted labels
+        labels: Labels the macro/weighted averages run over (default all observed)
+        metrics: Aggregate metric names from matrix_metrics
+        n_resamples: Number of bootstrap resamples
+        confidence: Interval coverage
+        seed: Random seed, for reproducible intervals
+
+    Returns:
+        Metric name -> {"estimate", "lower", "upper"}
+    """
+    true_idx, pred_idx, label_list = encode_labels(y_true, y_pred, labels)
+    k = len(label_list)
+    n = len(true_idx)
+    report_idx = list(range(len(labels))) if labels is not None else None
+    if n == 0:
+        return {name: {"estimate": 0.0, "lower": 0.0, "upper": 0.0} for name in metrics}
+    point = matrix_metrics(confusion_counts(true_idx, pred_idx, k), report_idx)
+
+    rng = np.random.default_rng(seed)
+    cells = true_idx * k + pred_idx
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // n)
+    samples = {name: [] for name in metrics}
+    for start in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - start)
+        drawn = cells[rng.integers(0, n, size=(size, n))]
+        drawn += (np.arange(size) * k * k)[:, None]
+        cms = np.bincount(drawn.ravel(), minlength=size * k * k).reshape(size, k, k)
+        resampled = matrix_metrics(cms, report_idx)
+        for name in metrics:
+            samples[name].append(resampled[name])
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name in metrics:
+        lower, upper = np.quantile(np.concatenate(samples[name]), [alpha, 1 - alpha])
+        intervals[name] = {"estimate": float(point[name]), "lower": float(lower), "upper": float(upper)}
+    return intervals
+
 
 def calculate_confusion_matrix(y_pred, y_true, positive_label):
     """
@@ -13,20 +205,10 @@ def calculate_confusion_matrix(y_pred, y_true, positive_label):
     compute confusion matrix terms: TP, FP, TN, FN.
 
     """
-    TP = FP = TN = FN = 0
-    for pred, true in zip(y_pred, y_true):
-        pred_is_pos = (pred == positive_label)
-        true_is_pos = (true == positive_label)
-
-        if pred_is_pos and true_is_pos:
-            TP += 1
-        elif pred_is_pos and not true_is_pos:
-            FP += 1
-        elif not pred_is_pos and not true_is_pos:
-            TN += 1
-        elif not pred_is_pos and true_is_pos:
-            FN += 1
-
+    pred_is_pos = np.asarray(y_pred, dtype=object) == positive_label
+    true_is_pos = np.asarray(y_true, dtype=object) == positive_label
+    # Cells 0..3 = (true, pred) in (neg, neg), (neg, pos), (pos, neg), (pos, pos)
+    TN, FP, FN, TP = (int(c) for c in np.bincount(2 * true_is_pos + pred_is_pos, minlength=4))
     return TP, FP, TN, FN
 
 
@@ -35,53 +217,80 @@ def calculate_metrics_from_confusion_matrix(y_true, y_pred, positive_label):
     Given confusion matrix terms, compute accuracy, precision, recall, f1.
     Returns a dictionary of these metrics.
     """
-    TP, FP, TN, FN = calculate_confusion_matrix(y_true, y_pred, positive_label)
+    TP, FP, TN, FN = calculate_confusion_matrix(y_pred, y_true, positive_label)
     accuracy = (TP + TN) / float(TP + TN + FP + FN) if (TP + TN + FP + FN) else 0.0
     precision = TP / float(TP + FP) if (TP + FP) else 0.0
     recall = TP / float(TP + FN) if (TP + FN) else 0.0
     f1 = (2 * precision * recall / (precision + recall)) if (precision + recall) else 0.0
-    kappa = cohen_kappa_score(y_true, y_pred)
-    mcc = matthews_corrcoef(y_true, y_pred)
+
+    # Kappa and MCC come from the full multiclass matrix, built once
+    true_idx, pred_idx, labels = encode_labels(y_true, y_pred)
+    overall = matrix_metrics(confusion_counts(true_idx, pred_idx, len(labels)))
 
     return {
         "accuracy": accuracy,
         "precision": precision,
         "recall": recall,
         "f1_score": f1,
-        "cohen_kappa": kappa,
-        "mcc": mcc
+        "cohen_kappa": float(overall["cohen_kappa"]),
+        "mcc": float(overall["mcc"])
+    }
+
+
+def score_predictions(y_true, y_pred, label_order: Sequence[str], n_bootstrap: int = 0) -> Dict:
+    """
+    Classification report plus aggregate metrics from one confusion matrix.
+
+    Args:
+        y_true: Ground-truth labels
+        y_pred: Predicted labels
+        label_order: Labels the report and the macro/weighted averages cover
+        n_bootstrap: Bootstrap resamples for confidence intervals (0 = none)
+
+    Returns:
+        Metrics dict; includes "confidence_intervals" when n_bootstrap > 0
+    """
+    true_idx, pred_idx, labels = encode_labels(y_true, y_pred, label_order)
+    cm = confusion_counts(true_idx, pred_idx, len(labels))
+    overall = matrix_metrics(cm)
+    report = classification_report_dict(cm, labels, label_order)
+
+    metrics = {
+        "classification_report": report,
+        "accuracy": float(overall["accuracy"]),
+        "macro_f1": report["macro avg"]["f1-score"],
+        "weighted_f1": report["weighted avg"]["f1-score"],
+        "cohen_kappa": float(overall["cohen_kappa"]),
+        "mcc": float(overall["mcc"]),
+        "balanced_accuracy": float(overall["balanced_accuracy"]),
+        "confusion_matrix": cm[:len(label_order), :len(label_order)].tolist()
     }
+    if n_bootstrap:
+        metrics["confidence_intervals"] = bootstrap_ci(y_true, y_pred, label_order, n_resamples=n_bootstrap)
+    return metrics
 
 
-def calculate_bias_metrics(y_true, y_pred, label_order=None):
+def calculate_bias_metrics(y_true, y_pred, label_order=None, n_bootstrap: int = 0):
 
     if label_order is None:
         label_order = ['left', 'center','right']
 
-    report = classification_report(
-        y_true,
-        y_pred,
-        labels=label_order,
-        output_dict=True,
-        zero_division=0
-    )
-    macro_f1 = report['macro avg']['f1-score']
-    weighted_f1 = report['weighted avg']['f1-score']
-    kappa = cohen_kappa_score(y_true, y_pred)
-    mcc = matthews_corrcoef(y_true, y_pred)
-    balanced_acc = balanced_accuracy_score(y_true, y_pred)
+    metrics = score_predictions(y_true, y_pred, label_order, n_bootstrap)
 
-    return {
-        "classification_report": report,
-        "macro_f1": macro_f1,
-        "weighted_f1": weighted_f1,
-        "cohen_kappa": kappa,
-        "mcc": mcc,
-        "balanced_accuracy": balanced_acc
+    result = {
+        "classification_report": metrics["classification_report"],
+        "macro_f1": metrics["macro_f1"],
+        "weighted_f1": metrics["weighted_f1"],
+        "cohen_kappa": metrics["cohen_kappa"],
+        "mcc": metrics["mcc"],
+        "balanced_accuracy": metrics["balanced_accuracy"]
     }
+    if n_bootstrap:
+        result["confidence_intervals"] = metrics["confidence_intervals"]
+    return result
 
 
-def calculate_fact_check_metrics(results):
+def calculate_fact_check_metrics(results, n_bootstrap: int = 0):
     """
     Compute fact-check evaluation metrics from system results.
     Each result must contain:
@@ -97,25 +306,9 @@ def calculate_fact_check_metrics(results):
         y_pred.append(pred_raw.strip().lower())
         y_true.append(true_raw.strip().lower())
 
-    # Main report
-    report = classification_report(
-        y_true, y_pred,
-        labels=["true", "false"],
-        output_dict=True,
-        zero_division=0
-    )
-
-    metrics = {
-        "classification_report": report,
-        "accuracy": report.get("accuracy", 0.0),
-        "macro_f1": report.get("macro avg", {}).get("f1-score", 0.0),
-        "weighted_f1": report.get("weighted avg", {}).get("f1-score", 0.0),
-        "cohen_kappa": cohen_kappa_score(y_true, y_pred),
-        "mcc": matthews_corrcoef(y_true, y_pred),
-        "balanced_accuracy": balanced_accuracy_score(y_true, y_pred),
-        "confusion_matrix": confusion_matrix(y_true, y_pred, labels=["true", "false"]).tolist()
-    }
-
+    metrics = score_predictions(y_true, y_pred, ["true", "false"], n_bootstrap)
+    # sklearn's report only has "accuracy" when no other label was observed
+    metrics["accuracy"] = metrics["classification_report"].get("accuracy", 0.0)
     return metrics
 
 def save_fact_check_results(filename, articles, y_true, y_pred):
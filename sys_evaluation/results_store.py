@@ -0,0 +1,222 @@
+"""
+Per-run, per-configuration store of benchmark predictions.
+
+Layout (hive-style partitions, one columnar file per partition):
+
+    <root>/run_id=<run>/config=<config>/predictions.parquet   (or .pkl without a parquet engine)
+    <root>/run_id=<run>/run.json                              run metadata
+
+Runs never overwrite each other, so two runs can be diffed and re-scored
+later without calling the LLM again.
+"""
+import os
+import sys
+import json
+import secrets
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from sys_evaluation.datasets import parquet_engine
+from sys_evaluation.metrics_updated import score_predictions
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "runs")
+
+# Columns of every prediction row; extra keys are kept as additional columns
+PREDICTION_COLUMNS = ["key", "title", "source", "true_label", "predicted_label", "reasoning",
+                      "latency_ms", "input_tokens", "output_tokens"]
+
+# Label sets used when scoring a stored run, by task
+TASK_LABELS = {"bias": ["left", "center", "right"], "fact_check": ["True", "False"]}
+
+
+def _partition_name(key: str, value: str) -> str:
+    return f"{key}={str(value).replace(os.sep, '_')}"
+
+
+class ResultsStore:
+    """Writes and queries partitioned prediction datasets"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.environ.get("EVAL_RESULTS_DIR", DEFAULT_RESULTS_DIR)
+        self.extension = "parquet" if parquet_engine() else "pkl"
+
+    @staticmethod
+    def new_run_id(task: str) -> str:
+        return f"{task}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+    def _run_dir(self, run_id: str) -> str:
+        return os.path.join(self.root, _partition_name("run_id", run_id))
+
+    def _partition_path(self, run_id: str, config: str) -> str:
+        return os.path.join(self._run_dir(run_id), _partition_name("config", config), f"predictions.{self.extension}")
+
+    def write(self, run_id: str, config: str, rows: Iterable[Dict[str, Any]],
+              metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store the predictions of one configuration within a run.
+
+        Args:
+            run_id: Run identifier (see new_run_id)
+            config: Configuration name, e.g. "llm_only" or "llm_kg"
+            rows: Prediction dicts with PREDICTION_COLUMNS
+            metadata: Run-level metadata (task, model, prompt versions, ...), merged into run.json
+
+        Returns:
+            Path of the written partition file
+        """
+        df = pd.DataFrame(list(rows))
+        for column in PREDICTION_COLUMNS:
+            if column not in df.columns:
+                df[column] = None
+        df = df[PREDICTION_COLUMNS + [c for c in df.columns if c not in PREDICTION_COLUMNS]]
+        for column in ("source", "true_label", "predicted_label"):
+            df[column] = df[column].astype("category")
+
+        path = self._partition_path(run_id, config)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.extension == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            df.to_pickle(path)
+
+        self._update_metadata(run_id, config, metadata or {})
+        logging.info(f"Stored {len(df)} predictions for run {run_id} ({config}) at {path}")
+        return path
+
+    def _update_metadata(self, run_id: str, config: str, metadata: Dict[str, Any]) -> None:
+        path = os.path.join(self._run_dir(run_id), "run.json")
+        current = self.run_metadata(run_id)
+        current.setdefault("run_id", run_id)
+        current.setdefault("created_at", datetime.now().isoformat())
+        current.update(metadata)
+        current["configs"] = sorted(set(current.get("configs", [])) | {config})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, default=str)
+
+    def run_metadata(self, run_id: str) -> Dict[str, Any]:
+        path = os.path.join(self._run_dir(run_id), "run.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def runs(self) -> pd.DataFrame:
+        """One row of metadata per stored run, newest first"""
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=["run_id", "created_at", "configs"])
+        records = [self.run_metadata(name.split("=", 1)[1])
+                   for name in os.listdir(self.root) if name.startswith("run_id=")]
+        df = pd.DataFrame([r for r in records if r])
+        return df.sort_values("created_at", ascending=False).reset_index(drop=True) if len(df) else df
+
+    def load(self, run_id: str, config: Optional[str] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Predictions of a run (all configs unless one is given), with run_id and config columns"""
+        configs = [config] if config else self.run_metadata(run_id).get("configs", [])
+        frames = []
+        for name in configs:
+            path = self._partition_path(run_id, name)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No predictions for run {run_id} ({name}) at {path}")
+            if self.extension == "parquet":
+                df = pd.read_parquet(path, columns=list(columns) if columns else None)
+            else:
+                df = pd.read_pickle(path)
+                df = df[list(columns)] if columns else df
+            frames.append(df.assign(run_id=run_id, config=name))
+        if not frames:
+            raise FileNotFoundError(f"No stored configurations for run {run_id} in {self.root}")
+        return pd.concat(frames, ignore_index=True)
+
+    def metrics(self, run_id: str, config: str, labels: Optional[List[str]] = None,
+                n_bootstrap: int = 0) -> Dict[str, Any]:
+        """Score stored predictions (no LLM calls)"""
+        df = self.load(run_id, config, columns=["true_label", "predicted_label"])
+        labels = labels or TASK_LABELS.get(self.run_metadata(run_id).get("task"))
+        if labels is None:
+            labels = sorted(df["true_label"].dropna().astype(str).unique())
+        return score_predictions(df["true_label"].astype(str).to_numpy(),
+                                 df["predicted_label"].astype(str).to_numpy(), labels, n_bootstrap)
+
+    def diff(self, run_a: str, config_a: str, run_b: str, config_b: str) -> pd.DataFrame:
+        """
+        Per-article comparison of two stored runs/configurations.
+
+        Returns:
+            One row per shared key with both predictions, the truth, the token and
+            latency deltas and a "change" column: fixed, broken, changed or same
+        """
+        columns = ["key", "title", "true_label", "predicted_label", "latency_ms", "input_tokens", "output_tokens"]
+        a = self.load(run_a, config_a, columns=columns)
+        b = self.load(run_b, config_b, columns=["key", "predicted_label", "latency_ms", "input_tokens",
+                                                "output_tokens"])
+        merged = a.drop(columns=["run_id", "config"]).merge(
+            b.drop(columns=["run_id", "config"]), on="key", suffixes=("_a", "_b"))
+
+        pred_a = merged["predicted_label_a"].astype(str)
+        pred_b = merged["predicted_label_b"].astype(str)
+        truth = merged["true_label"].astype(str)
+        merged["change"] = "same"
+        merged.loc[(pred_a != pred_b), "change"] = "changed"
+        merged.loc[(pred_a != truth) & (pred_b == truth), "change"] = "fixed"
+        merged.loc[(pred_a == truth) & (pred_b != truth), "change"] = "broken"
+        for column in ("latency_ms", "input_tokens", "output_tokens"):
+            merged[f"{column}_delta"] = (pd.to_numeric(merged[f"{column}_b"], errors="coerce")
+                                         - pd.to_numeric(merged[f"{column}_a"], errors="coerce"))
+        return merged
+
+
+def prediction_rows(articles, y_true, y_pred, key_field: str = "url", reasoning_field: str = "bias_result",
+                    token_totals: Optional[Dict[str, tuple]] = None) -> List[Dict[str, Any]]:
+    """
+    Prediction rows for the store from processed articles and their extracted labels.
+
+    Args:
+        articles: Articles after the agent ran (latency_ms is set by the agents)
+        y_true: Ground-truth labels, aligned with articles
+        y_pred: Predicted labels, aligned with articles
+        key_field: Article field that identifies it across runs ("url", or "claim" for fact checks)
+        reasoning_field: Article field holding the agent result with its reasoning
+        token_totals: Meter article label -> (input, output) tokens, see TokenMeter.article_totals
+    """
+    token_totals = token_totals or {}
+    rows = []
+    for article, truth, pred in zip(articles, y_true, y_pred):
+        key = article.get(key_field) or ""
+        result = article.get(reasoning_field)
+        if hasattr(result, "content"):
+            try:
+                result = json.loads(result.content)
+            except (TypeError, ValueError):
+                result = {}
+        reasoning = result.get("reasoning", "") if isinstance(result, dict) else ""
+        # The fact checker labels claims without a url by their first 80 characters
+        input_tokens, output_tokens = token_totals.get(key, token_totals.get(key[:80], (None, None)))
+        rows.append({
+            "key": key,
+            "title": article.get("title", ""),
+            "source": article.get("source", ""),
+            "true_label": truth,
+            "predicted_label": pred,
+            "reasoning": reasoning,
+            "latency_ms": article.get("latency_ms"),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    # python -m sys_evaluation.results_store                      list runs
+    # python -m sys_evaluation.results_store RUN_A CFG_A RUN_B CFG_B   diff two runs
+    store = ResultsStore()
+    if len(sys.argv) == 5:
+        diff = store.diff(*sys.argv[1:5])
+        print(diff["change"].value_counts().to_string())
+        print(diff.loc[diff["change"].isin(["fixed", "broken"]),
+                       ["key", "true_label", "predicted_label_a", "predicted_label_b", "change"]].to_string())
+    else:
+        print(store.runs().to_string())
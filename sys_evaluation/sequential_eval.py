@@ -0,0 +1,232 @@
+"""
+Paired sequential evaluation of two system arms (e.g. LLM-only vs LLM+KG).
+
+Articles are taken in a stratified order, so every prefix has roughly the
+label/source mix of the full set. Both arms score the same batch, and after
+each batch ("look") the paired accuracy difference gets a confidence
+interval. The run stops as soon as that interval is narrow enough, or when it
+excludes zero if stop_on_significance is set.
+
+The interval is the Agresti-Min interval for a difference of paired
+proportions. Alpha is Bonferroni-split over the planned number of looks, so
+stopping at any look keeps the overall coverage.
+"""
+import os
+import math
+import random
+import logging
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sys_evaluation.metrics_updated import score_predictions
+from sys_evaluation.results_store import ResultsStore, prediction_rows
+from src_v3.utils.token_meter import get_token_meter
+
+# An arm runs one system configuration on a batch: articles -> processed articles, in the same order
+Arm = Callable[[List[dict]], List[dict]]
+# Extracts aligned (y_true, y_pred) label lists from processed articles
+Extract = Callable[[List[dict]], Tuple[List[str], List[str]]]
+
+
+def sequential_settings() -> Dict[str, Any]:
+    """SequentialEvaluator keyword arguments from the SEQUENTIAL_* environment variables"""
+    return {
+        "batch_size": int(os.getenv("SEQUENTIAL_BATCH_SIZE", "50")),
+        "alpha": float(os.getenv("SEQUENTIAL_ALPHA", "0.05")),
+        "target_half_width": float(os.getenv("SEQUENTIAL_TARGET_HALF_WIDTH", "0.05")),
+        "min_samples": int(os.getenv("SEQUENTIAL_MIN_SAMPLES", "100")),
+        "stop_on_significance": os.getenv("SEQUENTIAL_STOP_ON_SIGNIFICANCE", "false").lower() == "true",
+    }
+
+
+def stratified_order(articles: Sequence[dict], strata: Sequence[str] = ("ground_truth_bias", "source"),
+                     seed: Optional[int] = 0) -> List[dict]:
+    """
+    Order articles so any prefix is close to proportionally stratified.
+
+    Each stratum is shuffled, and its i-th member is placed at (i + u) / n_stratum
+    on a shared [0, 1) axis (u random in [0, 1)). Sorting by that position
+    interleaves the strata in proportion to their size.
+    """
+    rng = random.Random(seed)
+    groups: Dict[tuple, List[dict]] = {}
+    for article in articles:
+        groups.setdefault(tuple(article.get(key) for key in strata), []).append(article)
+
+    positioned = []
+    for members in groups.values():
+        rng.shuffle(members)
+        for i, article in enumerate(members):
+            positioned.append(((i + rng.random()) / len(members), article))
+    positioned.sort(key=lambda item: item[0])
+    return [article for _, article in positioned]
+
+
+def paired_difference_ci(correct_a: np.ndarray, correct_b: np.ndarray, alpha: float) -> Dict[str, float]:
+    """
+    Agresti-Min interval for accuracy(b) - accuracy(a) on the same items.
+
+    Returns:
+        difference, lower, upper and half_width
+    """
+    correct_a = np.asarray(correct_a, dtype=bool)
+    correct_b = np.asarray(correct_b, dtype=bool)
+    n = len(correct_a)
+    # Discordant pairs, plus half a pseudo-count in every cell of the 2x2 table
+    only_b = np.count_nonzero(correct_b & ~correct_a) + 0.5
+    only_a = np.count_nonzero(correct_a & ~correct_b) + 0.5
+    n_adj = n + 2.0
+
+    difference = (only_b - only_a) / n_adj
+    variance = ((only_b + only_a) - (only_b - only_a) ** 2 / n_adj) / n_adj ** 2
+    half_width = NormalDist().inv_cdf(1 - alpha / 2) * math.sqrt(max(variance, 0.0))
+    return {
+        "difference": float((np.count_nonzero(correct_b) - np.count_nonzero(correct_a)) / n) if n else 0.0,
+        "lower": max(-1.0, difference - half_width),
+        "upper": min(1.0, difference + half_width),
+        "half_width": half_width,
+    }
+
+
+class SequentialEvaluator:
+    """
+    Runs two arms batch by batch until the paired difference is settled.
+
+    Args:
+        arm_a: Baseline arm, e.g. LLM-only
+        arm_b: Compared arm, e.g. LLM+KG
+        extract: Turns processed articles into (y_true, y_pred)
+        labels: Labels for the per-arm metrics (macro F1 etc.)
+        batch_size: Articles scored by both arms per look
+        alpha: Overall error rate, split across the planned looks
+        target_half_width: Stop once the interval half-width is at most this
+        min_samples: Never stop before this many paired articles
+        stop_on_significance: Also stop once the interval excludes zero
+    """
+
+    def __init__(self, arm_a: Arm, arm_b: Arm, extract: Extract, labels: Sequence[str], batch_size: int = 50, alpha: float = 0.05,
+                 target_half_width: float = 0.05, min_samples: int = 100, stop_on_significance: bool = False):
+        self.arm_a = arm_a
+        self.arm_b = arm_b
+        self.extract = extract
+        self.labels = list(labels)
+        self.batch_size = batch_size
+        self.alpha = alpha
+        self.target_half_width = target_half_width
+        self.min_samples = min_samples
+        self.stop_on_significance = stop_on_significance
+
+    def _interim(self, look: int, planned_looks: int, y_true, pred_a, pred_b) -> Dict[str, Any]:
+        y_true = np.asarray(y_true, dtype=object)
+        correct_a = y_true == np.asarray(pred_a, dtype=object)
+        correct_b = y_true == np.asarray(pred_b, dtype=object)
+        ci = paired_difference_ci(correct_a, correct_b, self.alpha / planned_looks)
+        return {
+            "look": look,
+            "n": len(y_true),
+            "accuracy_a": float(correct_a.mean()),
+            "accuracy_b": float(correct_b.mean()),
+            "difference": ci["difference"],
+            "ci_lower": ci["lower"],
+            "ci_upper": ci["upper"],
+            "half_width": ci["half_width"],
+        }
+
+    def _stop_reason(self, interim: Dict[str, Any]) -> Optional[str]:
+        if interim["n"] < self.min_samples:
+            return None
+        if interim["half_width"] <= self.target_half_width:
+            return "precision"
+        if self.stop_on_significance and (interim["ci_lower"] > 0 or interim["ci_upper"] < 0):
+            return "significant"
+        return None
+
+    def run(self, articles: Sequence[dict]) -> Dict[str, Any]:
+        """
+        Evaluate articles in order (see stratified_order) until the stopping rule fires.
+
+        Returns:
+            stop_reason, the interim report of every look, per-arm metrics on the
+            evaluated prefix, and the processed articles and predictions of both arms
+        """
+        articles = list(articles)
+        planned_looks = max(1, math.ceil(len(articles) / self.batch_size))
+        y_true, pred_a, pred_b = [], [], []
+        processed_a, processed_b = [], []
+        interims = []
+        stop_reason = "exhausted"
+
+        for look, start in enumerate(range(0, len(articles), self.batch_size), start=1):
+            batch = articles[start:start + self.batch_size]
+            done_a = self.arm_a([dict(article) for article in batch])
+            done_b = self.arm_b([dict(article) for article in batch])
+            truth_a, batch_a = self.extract(done_a)
+            truth_b, batch_b = self.extract(done_b)
+            if len(truth_a) != len(batch) or list(truth_a) != list(truth_b):
+                raise ValueError(f"Look {look}: both arms must return every article of the batch, in order")
+            processed_a.extend(done_a)
+            processed_b.extend(done_b)
+            y_true.extend(truth_a)
+            pred_a.extend(batch_a)
+            pred_b.extend(batch_b)
+
+            interim = self._interim(look, planned_looks, y_true, pred_a, pred_b)
+            interims.append(interim)
+            logging.info(f"[sequential] look {look}/{planned_looks} n={interim['n']} "
+                         f"acc A={interim['accuracy_a']:.3f} B={interim['accuracy_b']:.3f} "
+                         f"diff={interim['difference']:+.3f} "
+                         f"CI=[{interim['ci_lower']:+.3f}, {interim['ci_upper']:+.3f}]")
+
+            reason = self._stop_reason(interim)
+            if reason:
+                stop_reason = reason
+                break
+
+        logging.info(f"[sequential] Stopped after {len(y_true)}/{len(articles)} articles ({stop_reason})")
+        return {
+            "stop_reason": stop_reason,
+            "evaluated": len(y_true),
+            "total": len(articles),
+            "planned_looks": planned_looks,
+            "interims": interims,
+            "metrics_a": score_predictions(y_true, pred_a, self.labels),
+            "metrics_b": score_predictions(y_true, pred_b, self.labels),
+            "y_true": y_true,
+            "y_pred_a": pred_a,
+            "y_pred_b": pred_b,
+            "articles_a": processed_a,
+            "articles_b": processed_b,
+        }
+
+
+def store_report(report: Dict[str, Any], task: str, metadata: Dict[str, Any], key_field: str = "url",
+                 reasoning_field: str = "bias_result", configs: Tuple[str, str] = ("llm_only", "llm_kg"),
+                 store: Optional[ResultsStore] = None) -> str:
+    """
+    Store both arms' predictions of a sequential run plus its interim reports.
+
+    The interims go into run.json and, as a table, next to the predictions
+    (interims.csv in the run directory).
+
+    Returns:
+        The new run id
+    """
+    store = store or ResultsStore()
+    run_id = store.new_run_id(task)
+    metadata = dict(metadata, task=task, mode="sequential", stop_reason=report["stop_reason"],
+                    evaluated=report["evaluated"], articles=report["total"], interims=report["interims"])
+    for config, processed, y_pred in ((configs[0], report["articles_a"], report["y_pred_a"]),
+                                      (configs[1], report["articles_b"], report["y_pred_b"])):
+        rows = prediction_rows(processed, report["y_true"], y_pred, key_field=key_field,
+                               reasoning_field=reasoning_field,
+                               token_totals=get_token_meter().article_totals(run=config))
+        store.write(run_id, config, rows, metadata)
+
+    path = os.path.join(store.root, f"run_id={run_id}", "interims.csv")
+    pd.DataFrame(report["interims"]).to_csv(path, index=False)
+    logging.info(f"Stored sequential run {run_id} ({report['evaluated']}/{report['total']} articles, "
+                 f"{report['stop_reason']}) in {store.root}")
+    return run_id
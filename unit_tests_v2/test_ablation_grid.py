@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src_v3.utils.token_meter import TokenMeter, get_token_meter
+from sys_evaluation.ablation_grid import AblationConfig, config_grid, run_ablation_grid
+from sys_evaluation.results_store import ResultsStore
+
+SONNET = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+HAIKU = "anthropic.claude-3-5-haiku-20241022-v1:0"
+
+ARTICLES = [
+    {"title": f"Article {i}", "content": f"Text {i}", "source": "Source", "url": f"https://example.com/{i}",
+     "ground_truth_bias": label}
+    for i, label in enumerate(["left", "center", "right", "left"])
+]
+
+
+def fake_chain_factory(prompt_version, model_id):
+    """Chain that answers with the KG hint when there is one, else 'center'; meters each call"""
+    chain = MagicMock()
+
+    def invoke(inputs):
+        get_token_meter().record(model_id, 1000, 100)
+        bias = inputs["similar_bias"] if inputs["similar_bias"] != "Unknown" else "Center"
+        return MagicMock(content=json.dumps({"bias": bias, "reasoning": prompt_version}))
+    chain.invoke.side_effect = invoke
+    return chain
+
+
+def test_grid_shape():
+    grid = config_grid(["bias-simplified-v1", "bias-framing-v1"], [SONNET, HAIKU], context_sizes=[None, 5])
+    # 2 prompts x 2 models x (LLM-only + KG with two context sizes)
+    assert len(grid) == 12
+    assert len({config.name for config in grid}) == 12
+    assert AblationConfig("bias-simplified-v1", SONNET, True, 5).name == \
+        "bias-simplified-v1__claude-3-5-sonnet-20240620-v1__kg-ctx5"
+    with pytest.raises(ValueError):
+        config_grid(["missing-prompt"])
+
+
+def test_shared_work_runs_once_per_article(tmp_path):
+    kg = MagicMock()
+    kg.query_most_structurally_similar_bias.side_effect = lambda entities: "Left" if len(entities) > 1 else "Right"
+    grid = config_grid(["bias-simplified-v1", "bias-framing-v1"], [SONNET], context_sizes=[None, 1, 10])
+    meter = TokenMeter(run_id="grid")
+
+    with patch("sys_evaluation.ablation_grid._prepare_bias_analysis"), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.extract_entities",
+                  return_value=["B", "A", "C"]) as extract, \
+            patch("sys_evaluation.ablation_grid.get_token_meter", return_value=meter), \
+            patch(f"{__name__}.get_token_meter", return_value=meter):
+        report = run_ablation_grid(ARTICLES, grid, knowledge_graph=kg, max_workers=4,
+                                   store=ResultsStore(root=str(tmp_path)), chain_factory=fake_chain_factory)
+
+    assert extract.call_count == len(ARTICLES)
+    # One KG lookup per article and distinct context size
+    assert kg.query_most_structurally_similar_bias.call_count == len(ARTICLES) * 3
+    # ctx10 covers all three entities, so it shares the uncapped configuration's calls
+    assert report["llm_calls"] == len(ARTICLES) * 2 * 3
+    assert report["shared_calls"] == len(ARTICLES) * 2
+
+    summary = report["summary"].set_index("config")
+    kg_all = AblationConfig("bias-simplified-v1", SONNET, True, None).name
+    kg_one = AblationConfig("bias-simplified-v1", SONNET, True, 1).name
+    assert summary.loc[kg_all, "accuracy"] == pytest.approx(0.5)
+    assert summary.loc[kg_one, "accuracy"] == pytest.approx(0.25)
+    assert report["predictions"][kg_one][1] == ["right"] * len(ARTICLES)
+
+    # The context cap keeps the first-mentioned entity, not the alphabetically first
+    assert ["B"] in [c.args[0] for c in kg.query_most_structurally_similar_bias.call_args_list]
+    assert ["A"] not in [c.args[0] for c in kg.query_most_structurally_similar_bias.call_args_list]
+
+    # Shared calls are split between the configurations that use them; nothing is reported as free
+    kg_ten = AblationConfig("bias-simplified-v1", SONNET, True, 10).name
+    assert summary.loc[kg_all, "input_tokens"] == 500 * len(ARTICLES)
+    assert summary.loc[kg_ten, "llm_calls"] == pytest.approx(0.5 * len(ARTICLES))
+    assert summary.loc[kg_ten, "shared_prompts"] == len(ARTICLES)
+    assert summary.loc[kg_one, "input_tokens"] == 1000 * len(ARTICLES)
+    assert summary.loc[kg_one, "shared_prompts"] == 0
+    assert summary["input_tokens"].sum() == 1000 * report["llm_calls"]
+
+    stored = ResultsStore(root=str(tmp_path)).load(report["run_id"], kg_ten)
+    assert list(stored["reasoning"]) == ["bias-simplified-v1"] * len(ARTICLES)
+    assert list(stored["input_tokens"]) == [500] * len(ARTICLES)
+
+
+def test_llm_only_grid_skips_entity_extraction(tmp_path):
+    with patch("src_v3.components.bias_analyzer.bias_agent_update.extract_entities") as extract:
+        report = run_ablation_grid(ARTICLES, config_grid(kg_options=(False,)), store=ResultsStore(root=str(tmp_path)),
+                                   chain_factory=fake_chain_factory)
+    extract.assert_not_called()
+    assert report["summary"]["accuracy"].tolist() == [pytest.approx(0.25)]
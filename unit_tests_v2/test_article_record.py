@@ -0,0 +1,95 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src_v3.memory.article import ArticleRecord, as_article_record
+from src_v3.memory.schema import GraphState
+from src_v3.components.bias_analyzer.tools import format_article
+
+# NewsAPI-shaped article with aliased fields
+RAW_ARTICLE = {
+    "source": {"id": "cnn", "name": "CNN"},
+    "author": "Jane Doe",
+    "title": "Test Article",
+    "url": "https://example.com/test",
+    "publishedAt": "2025-04-07T23:23:44Z",
+    "content": "Truncated content… [+2609 chars]",
+    "full_content": "Full article body.",
+    "ground_truth_bias": "left"
+}
+
+
+def test_aliases_resolve_to_canonical_fields():
+    """Test that every alias reads the same canonical slot"""
+    record = ArticleRecord.from_dict(RAW_ARTICLE)
+
+    assert record.source == "CNN"
+    assert record["source_name"] == "CNN"
+    assert record["publishedAt"] == record["date"] == "2025-04-07T23:23:44Z"
+    # full_content takes priority over the truncated NewsAPI content
+    assert record["content"] == record["full_content"] == "Full article body."
+    assert record["ground_truth_bias"] == "left"
+    assert "description" not in record
+    assert record.get("description", "fallback") == "fallback"
+
+
+def test_source_names_are_interned():
+    """Test that repeated source names share one string object"""
+    first = ArticleRecord.from_dict({"source": "".join(["Fox", " News"])})
+    second = ArticleRecord.from_dict({"source_name": "".join(["Fox ", "News"])})
+
+    assert first.source is second.source
+
+
+def test_lazy_content_loader_runs_once():
+    """Test that full_content is only loaded on first access"""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "Loaded body"
+
+    record = ArticleRecord.from_dict({"title": "Lazy"}, content_loader=loader)
+
+    assert "full_content" in record
+    assert calls == []
+    assert record.full_content == "Loaded body"
+    assert record["content"] == "Loaded body"
+    assert len(calls) == 1
+
+
+def test_copy_keeps_extras_separate():
+    """Test that agent results written to a copy do not leak into the original"""
+    record = ArticleRecord.from_dict(RAW_ARTICLE)
+    clone = record.copy()
+    clone["bias_result"] = {"bias": "Left"}
+
+    assert "bias_result" in clone
+    assert "bias_result" not in record
+    assert clone.full_content is record.full_content
+
+
+def test_format_article_matches_prompt_layout():
+    """Test the prompt text for records and plain dicts"""
+    expected = (
+        "Title: Test Article\n"
+        "    Content: Full article body.\n"
+        "    Source: CNN\n"
+        "    Date: 2025-04-07T23:23:44Z"
+    )
+    assert format_article(RAW_ARTICLE) == expected
+    assert format_article(as_article_record(RAW_ARTICLE)) == expected
+    assert format_article({}).startswith("Title: Untitled")
+
+
+def test_graph_state_normalises_articles_at_ingestion():
+    """Test that GraphState turns dicts and JSON strings into records"""
+    state = GraphState(articles=[RAW_ARTICLE, '{"title": "From JSON"}'])
+
+    assert all(isinstance(a, ArticleRecord) for a in state.articles)
+    assert state.articles[1]["title"] == "From JSON"
+
+    copied = state.copy()
+    copied.articles[0]["bias_result"] = {"bias": "Left"}
+    assert "bias_result" not in state.articles[0]
@@ -12,7 +12,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 
-from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent
+from src_v3.components.bias_analyzer.bias_agent_update import bias_analyzer_agent, bias_analyzer_batch
 from src_v3.memory.schema import GraphState
 
 # Sample test article
@@ -183,4 +183,50 @@ def test_bias_analyzer_no_knowledge_graph(mock_chain):
     assert "bias_result" in result_state.articles[0]
 
     # The mock_chain will return its mock result regardless, but the code should have taken
-    # the branch where knowledge_graph is None
\ No newline at end of file
+    # the branch where knowledge_graph is None
+
+
+def test_bias_analyzer_batch_isolates_errors(mock_kg, mock_chain):
+    """Test batch analysis keeps order, reports progress and isolates failing articles"""
+    articles = [dict(SAMPLE_ARTICLE, title=f"Article {i}", url=f"https://example.com/{i}") for i in range(5)]
+    progress = []
+
+    def entities_for(article):
+        if article["title"] == "Article 2":
+            raise Exception("Test exception")
+        return ["Test Entity 1"]
+
+    with patch("src_v3.components.bias_analyzer.bias_agent_update.create_bias_analysis_chain",
+               return_value=mock_chain) as chain_factory, \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.create_llm", return_value=MagicMock()), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.initialize_entity_extractor"), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.extract_entities", side_effect=entities_for), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.diagnostic_check"):
+        results = bias_analyzer_batch(articles, mock_kg, batch_size=2, max_workers=3,
+                                      progress_callback=lambda done, total: progress.append((done, total)))
+
+    # The chain is built once for the whole batch
+    assert chain_factory.call_count == 1
+    assert [a["title"] for a in results] == [f"Article {i}" for i in range(5)]
+    assert results[2]["bias_analysis"]["status"] == "error"
+    assert "bias_result" not in results[2]
+    assert all(results[i]["bias_result"]["bias"] == "Center" for i in (0, 1, 3, 4))
+    assert progress == [(2, 5), (4, 5), (5, 5)]
+
+
+def test_bias_analyzer_batch_marks_articles_when_setup_fails(mock_kg):
+    """Test that a setup failure marks every article instead of aborting the batch"""
+    articles = [dict(SAMPLE_ARTICLE, title=f"Article {i}", url=f"https://example.com/{i}") for i in range(3)]
+    progress = []
+
+    with patch("src_v3.components.bias_analyzer.bias_agent_update.create_bias_analysis_chain",
+               side_effect=Exception("Bedrock unavailable")), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.create_llm", return_value=MagicMock()), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.initialize_entity_extractor"), \
+            patch("src_v3.components.bias_analyzer.bias_agent_update.diagnostic_check"):
+        results = bias_analyzer_batch(articles, mock_kg, progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert [a["title"] for a in results] == [f"Article {i}" for i in range(3)]
+    assert all(a["processing_error"] == "Bedrock unavailable" for a in results)
+    assert all(a["bias_analysis"] == {"status": "error", "message": "Bedrock unavailable"} for a in results)
+    assert progress == [(3, 3)]
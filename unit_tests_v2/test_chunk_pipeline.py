@@ -0,0 +1,135 @@
+import os
+import sys
+import json
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src_v3.components.fact_checker.fact_checker_updated import _check_claim
+from src_v3.components.kg_builder import chunk_pipeline
+from src_v3.components.kg_builder.chunk_pipeline import (
+    get_chunk_embedder,
+    index_article_chunks,
+    related_passages_text,
+    split_into_chunks,
+)
+from src_v3.memory.in_memory_graph import InMemoryKnowledgeGraph
+from src_v3.memory.knowledge_graph import KnowledgeGraph
+from src_v3.memory.schema_manager import CHUNK_VECTOR_DIMENSIONS
+from src_v3.memory.sqlite_graph import SQLiteKnowledgeGraph
+from src_v3.utils.embeddings import HashingEmbedder
+
+ARTICLES = [
+    {"url": "https://example.com/budget", "title": "Budget",
+     "full_content": "The Senate passed the budget bill on Tuesday. " * 30 +
+                     "Senators debated spending cuts for hours before the final vote."},
+    {"url": "https://example.com/tariffs", "title": "Tariffs",
+     "full_content": "The president announced new tariffs on steel imports. Trade partners objected strongly."},
+    {"url": "https://example.com/missing", "title": "Not in the graph", "full_content": "Orphan text."},
+]
+
+
+def graph(backend):
+    kg = backend(article_transformer=MagicMock()) if backend is InMemoryKnowledgeGraph else \
+        backend(":memory:", article_transformer=MagicMock())
+    for article in ARTICLES[:2]:
+        kg.add_article(article, graph_docs=[])
+    return kg
+
+
+def test_split_into_chunks_aligns_sentences_and_overlaps():
+    text = " ".join(f"Sentence number {i} has six words." for i in range(40))
+    chunks = split_into_chunks(text, max_words=50, overlap=12)
+    assert all(len(chunk.split()) <= 50 for chunk in chunks)
+    assert all(chunk.endswith("words.") for chunk in chunks)
+    assert chunks[1].split()[:12] == chunks[0].split()[-12:]
+    assert split_into_chunks("word " * 120, max_words=50, overlap=0) == ["word " * 49 + "word"] * 2 + ["word " * 19 + "word"]
+    assert split_into_chunks("") == []
+
+
+@pytest.mark.parametrize("backend", [InMemoryKnowledgeGraph, SQLiteKnowledgeGraph])
+def test_index_is_incremental_and_searchable(backend):
+    kg = graph(backend)
+    embedder = HashingEmbedder(256)
+    stats = index_article_chunks(ARTICLES, kg, embedder=embedder, batch_size=2)
+    assert stats["articles"] == 3 and stats["batches"] == 2
+    assert set(kg.chunk_hashes([a["url"] for a in ARTICLES])) == {ARTICLES[0]["url"], ARTICLES[1]["url"]}
+
+    query = embedder.embed(["Which tariffs did the president announce on steel?"])[0].tolist()
+    assert kg.retrieve_related_passages(query, limit=1)[0]["url"] == "https://example.com/tariffs"
+
+    stats = index_article_chunks(ARTICLES[:2], kg, embedder=embedder)
+    assert stats == {"articles": 0, "unchanged": 2, "chunks": 0, "batches": 0}
+
+    changed = dict(ARTICLES[1], full_content="The governor vetoed the housing plan.")
+    assert index_article_chunks([changed], kg, embedder=embedder)["articles"] == 1
+    passages = kg.retrieve_related_passages(query, limit=10)
+    assert all("tariffs" not in passage["text"] for passage in passages)
+    assert sum(passage["url"] == changed["url"] for passage in passages) == 1
+
+
+@pytest.mark.parametrize("backend", [InMemoryKnowledgeGraph, SQLiteKnowledgeGraph])
+def test_ingestion_indexes_chunks(backend, tmp_path):
+    """Test that articles added through the normal ingestion path can be found as passages"""
+    kg = backend(article_transformer=MagicMock()) if backend is InMemoryKnowledgeGraph else \
+        backend(":memory:", article_transformer=MagicMock())
+    path = tmp_path / "articles.json"
+    path.write_text(json.dumps({"articles": ARTICLES[:1]}), encoding="utf-8")
+    module = backend.__module__
+
+    with patch(f"{module}.extract_graph_documents", return_value=[]), \
+            patch("src_v3.memory.knowledge_graph.index_article_chunks", wraps=index_article_chunks) as index:
+        kg.add_articles_from_json(str(path))
+        kg.add_article(ARTICLES[1])
+
+    # One batch for the file, one for the single article
+    assert [len(list(c.args[0])) for c in index.call_args_list] == [1, 1]
+    assert set(kg.chunk_hashes([a["url"] for a in ARTICLES[:2]])) == {ARTICLES[0]["url"], ARTICLES[1]["url"]}
+    context = related_passages_text(kg, "Which tariffs did the president announce on steel imports?", limit=1)
+    assert context.startswith("- [Tariffs] The president announced new tariffs")
+
+
+def test_neo4j_writes_chunks_with_unwind():
+    kg = KnowledgeGraph.__new__(KnowledgeGraph)
+    kg.graph = MagicMock()
+    kg.replace_chunks({"https://example.com/a": ("h", [{"id": "https://example.com/a#chunk-0", "index": 0,
+                                                         "text": "t", "embedding": [0.1] * 1536}])})
+    queries = [call.args[0] for call in kg.graph.query.call_args_list]
+    assert "DETACH DELETE c" in queries[0] and "UNWIND $chunks" in queries[1] and "chunks_hash" in queries[2]
+    assert "textEmbedding" in queries[1]
+    with pytest.raises(ValueError):
+        kg.replace_chunks({"https://example.com/a": ("h", [{"id": "x", "index": 0, "text": "t", "embedding": [0.1]}])})
+
+
+def test_chunk_embedder_is_sized_for_the_chunk_vector_index(monkeypatch):
+    """Test that chunks ignore TEXT_EMBEDDER and that a mis-sized CHUNK_EMBEDDER is refused"""
+    monkeypatch.setenv("TEXT_EMBEDDER", "sentence-transformers")
+    monkeypatch.setattr(chunk_pipeline, "_chunk_embedder", None)
+    embedder = get_chunk_embedder()
+    assert isinstance(embedder, HashingEmbedder) and embedder.dim == CHUNK_VECTOR_DIMENSIONS
+
+    monkeypatch.setattr(chunk_pipeline, "_chunk_embedder", None)
+    monkeypatch.setattr(chunk_pipeline, "CHUNK_EMBEDDER", "sentence-transformers")
+    with patch.object(chunk_pipeline, "create_embedder", return_value=MagicMock(dim=384)):
+        with pytest.raises(ValueError):
+            get_chunk_embedder()
+    assert chunk_pipeline._chunk_embedder is None
+
+
+def test_fact_checker_adds_passages_to_context():
+    kg = graph(InMemoryKnowledgeGraph)
+    index_article_chunks(ARTICLES, kg)
+    assert related_passages_text(MagicMock(), "claim") == ""
+
+    chain = MagicMock()
+    chain.invoke.return_value = MagicMock(content='{"verdict": "True"}')
+    with patch("src_v3.components.fact_checker.fact_checker_updated.fact_check_chain", chain), \
+            patch("src_v3.components.fact_checker.fact_checker_updated.extract_entities_from_claim", return_value=[]):
+        _check_claim("The president announced tariffs on steel imports", kg, store_to_kg=False)
+
+    context = chain.invoke.call_args[0][0]["related_kg_context"]
+    assert context.startswith("Related article passages:\n- [Tariffs] The president announced")
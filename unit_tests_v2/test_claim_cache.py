@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from src_v3.components.fact_checker.claim_cache import ClaimCache, get_claim_cache
+from src_v3.components.fact_checker.fact_checker_updated import fact_checker_agent
+from src_v3.memory.schema import GraphState
+from src_v3.utils.embeddings import HashingEmbedder, VectorIndex
+
+CLAIM = "The Senate passed the budget bill on Tuesday"
+VERDICT = {"verdict": "True", "confidence_score": 90, "reasoning": "Reported widely", "supporting_nodes": []}
+
+
+def test_vector_index_lsh_finds_neighbours():
+    rng = np.random.RandomState(0)
+    vectors = rng.standard_normal((5000, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex(64, exact_below=0)
+    index.add(vectors)
+
+    query = vectors[1234] + 0.03 * rng.standard_normal(64).astype(np.float32)
+    query /= np.linalg.norm(query)
+    position, similarity = index.search(query)[0]
+    assert position == 1234
+    assert similarity > 0.9
+    assert VectorIndex(64).search(query) == []
+
+
+def test_vector_index_grows_in_place_one_row_at_a_time():
+    rng = np.random.RandomState(1)
+    vectors = rng.standard_normal((1000, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = VectorIndex(64)
+
+    assert [index.add(vector)[0] for vector in vectors] == list(range(1000))
+    assert len(index) == 1000
+    # Capacity doubles rather than growing by one row per add
+    assert len(index._vectors) < 2 * len(index)
+    assert index.search(vectors[999])[0][0] == 999
+    assert index.search(vectors[0])[0][0] == 0
+
+
+def test_paraphrase_hits_and_guards_reject(tmp_path):
+    cache = ClaimCache(str(tmp_path), embedder=HashingEmbedder())
+    assert cache.lookup(CLAIM) is None
+    assert cache.put(CLAIM, VERDICT)
+    assert not cache.put("Something unclear", {"verdict": "Unknown"})
+
+    hit = cache.lookup("On Tuesday the Senate passed the budget bill")
+    assert hit["verdict"] == "True"
+    assert hit["cache"]["matched_claim"] == CLAIM
+    assert cache.lookup("the senate passed the budget bill on tuesday!")["cache"]["similarity"] == 1.0
+
+    assert cache.lookup("The Senate did not pass the budget bill on Tuesday") is None
+    assert cache.lookup("The president vetoed the tariff policy") is None
+    assert cache.lookup(CLAIM, use_kg=False) is None
+
+    cache.put("Unemployment fell to 4 percent in March", VERDICT)
+    assert cache.lookup("Unemployment fell to 5 percent in March") is None
+    assert (cache.hits, cache.misses) == (2, 5)
+
+
+def test_entries_persist_and_expire(tmp_path):
+    ClaimCache(str(tmp_path), embedder=HashingEmbedder()).put(CLAIM, VERDICT)
+    assert ClaimCache(str(tmp_path), embedder=HashingEmbedder()).lookup(CLAIM)["verdict"] == "True"
+
+    path = tmp_path / "claim_cache.jsonl"
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    entry["checked_at"] = (datetime.now() - timedelta(hours=100)).isoformat()
+    path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+    assert ClaimCache(str(tmp_path), embedder=HashingEmbedder(), max_age_hours=72).lookup(CLAIM) is None
+
+    with patch.dict(os.environ, {}, clear=False):
+        os.environ.pop("CLAIM_CACHE_DIR", None)
+        assert get_claim_cache() is None
+
+
+def test_fact_checker_skips_llm_on_cache_hit(tmp_path):
+    cache = ClaimCache(str(tmp_path), embedder=HashingEmbedder())
+    chain = MagicMock()
+    chain.invoke.return_value = MagicMock(content=json.dumps(VERDICT))
+    with patch("src_v3.components.fact_checker.fact_checker_updated.fact_check_chain", chain), \
+            patch("src_v3.components.fact_checker.fact_checker_updated.extract_entities_from_claim",
+                  return_value=["Senate"]) as extract:
+        first = fact_checker_agent(GraphState(news_query=CLAIM), None, claim_cache=cache)
+        second = fact_checker_agent(GraphState(news_query="On Tuesday, the Senate passed the budget bill"),
+                                    None, claim_cache=cache)
+
+    assert chain.invoke.call_count == 1
+    assert extract.call_count == 1
+    assert first.articles[0]["fact_check_result"]["verdict"] == "True"
+    assert second.articles[0]["fact_check_result"]["cache"]["matched_claim"] == CLAIM
@@ -0,0 +1,81 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import pandas as pd
+
+from sys_evaluation import datasets
+from sys_evaluation.datasets import load_bias_articles, load_bias_frame, load_factcheck_claims
+from src_v3.memory.article import ArticleRecord
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("EVAL_DATASET_CACHE", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def bias_csv(tmp_path):
+    path = tmp_path / "bias.csv"
+    pd.DataFrame([
+        {"source_name": "Source A", "author": "x", "title": "First", "url": "https://a/1",
+         "publishedAt": "2025-04-01", "full_content": "Body one", "bias": " Lean Left"},
+        {"source_name": "Source B", "author": "y", "title": "Second", "url": "https://b/2",
+         "publishedAt": "2025-04-02", "full_content": None, "bias": "Right"},
+    ]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_bias_articles_are_normalised(cache, bias_csv):
+    articles = load_bias_articles(bias_csv)
+    assert articles[0] == {"title": "First", "content": "Body one", "source": "Source A",
+                           "date": "2025-04-01", "url": "https://a/1", "ground_truth_bias": "left"}
+    # Missing values come back as None, not NaN
+    assert articles[1]["content"] is None
+    assert articles[1]["ground_truth_bias"] == "right"
+
+
+def test_cache_is_reused_until_the_source_changes(cache, bias_csv, monkeypatch):
+    load_bias_articles(bias_csv)
+    assert len(os.listdir(cache)) == 1
+
+    def fail(path):
+        raise AssertionError("source re-parsed")
+
+    monkeypatch.setattr(datasets, "_build_bias_frame", fail)
+    assert load_bias_articles(bias_csv)[0]["title"] == "First"
+
+    monkeypatch.undo()
+    monkeypatch.setenv("EVAL_DATASET_CACHE", str(cache))
+    with open(bias_csv, "a", encoding="utf-8") as f:
+        f.write("Source C,z,Third,https://c/3,2025-04-03,Body three,Center\n")
+    assert [a["title"] for a in load_bias_articles(bias_csv)] == ["First", "Second", "Third"]
+    # The stale cache file is replaced, not kept next to the new one
+    assert len(os.listdir(cache)) == 1
+
+
+def test_lazy_articles_load_content_on_demand(cache, bias_csv):
+    articles = load_bias_articles(bias_csv, lazy=True)
+    assert isinstance(articles[0], ArticleRecord)
+    assert articles[0]._full_content is None
+    assert articles[0].full_content == "Body one"
+    assert articles[0]["ground_truth_bias"] == "left"
+    assert articles[0].source == "Source A"
+
+
+def test_label_columns_are_categorical(cache, bias_csv):
+    assert isinstance(load_bias_frame(bias_csv)["bias"].dtype, pd.CategoricalDtype)
+
+
+def test_factcheck_claims_match_normalize_label(cache, tmp_path):
+    path = tmp_path / "claims.tsv"
+    path.write_text("date\tclaim\trating\n2025-04-08\tClaim one\t false \n2025-04-09\tClaim two\t\n",
+                    encoding="utf-8")
+    claims = load_factcheck_claims(str(path))
+    assert claims == [
+        {"date": "2025-04-08", "claim": "Claim one", "ground_truth": "False"},
+        {"date": "2025-04-09", "claim": "Claim two", "ground_truth": "Unknown"},
+    ]
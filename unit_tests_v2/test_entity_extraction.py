@@ -0,0 +1,68 @@
+import os
+import sys
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src_v3.components.entity_extraction import EntityExtractor, parse_entity_response
+from src_v3.components.bias_analyzer import tools as bias_tools
+from src_v3.components.fact_checker import tools as fact_tools
+
+
+def fake_llm(content, prompts=None):
+    def respond(prompt_value):
+        if prompts is not None:
+            prompts.append(prompt_value.to_string())
+        return AIMessage(content=content)
+    return RunnableLambda(respond)
+
+
+def test_parse_entity_response():
+    assert parse_entity_response('Here: [["Joe Biden", "Person"], ["Senate", "Organization"]]') == \
+        [("Joe Biden", "Person"), ("Senate", "Organization")]
+    assert parse_entity_response('[{"name": "NATO", "type": "Alliance"}, "Ohio", [" ", "Person"]]') == \
+        [("NATO", "Alliance"), ("Ohio", "")]
+    assert parse_entity_response("no entities") == []
+    assert parse_entity_response("[not json") == []
+
+
+def test_extractor_keeps_allowed_types_once():
+    prompts = []
+    extractor = EntityExtractor(fake_llm(
+        '[["Joe Biden", "Person"], ["Joe Biden", "Person"], ["inflation", "Concept"], ["Ohio", "Location"]]',
+        prompts))
+    assert extractor.entity_names("Joe Biden visited Ohio to talk about inflation.") == ["Joe Biden", "Ohio"]
+    assert "Joe Biden visited Ohio" in prompts[0]
+    assert "Alliance" in prompts[0]
+
+
+def test_extractor_matches_types_case_insensitively():
+    extractor = EntityExtractor(fake_llm('[["Joe Biden", "person"], ["Senate", "ORGANIZATION"], ["inflation", "concept"]]'))
+    assert extractor.extract("Joe Biden addressed the Senate.") == [("Joe Biden", "Person"), ("Senate", "Organization")]
+
+
+def test_agent_extractors_use_entity_only_mode():
+    extractor = EntityExtractor(fake_llm('[["Senate", "Organization"]]'))
+    graph_transformer = MagicMock()
+    with patch.object(fact_tools, "entity_extractor", extractor), \
+            patch.object(fact_tools, "transformer", graph_transformer), \
+            patch.object(fact_tools, "ENTITY_EXTRACTION_MODE", "entities"):
+        assert fact_tools.extract_entities_from_claim("The Senate passed the bill") == ["Senate"]
+    with patch.object(bias_tools, "entity_extractor", extractor), \
+            patch.object(bias_tools, "transformer", graph_transformer), \
+            patch.object(bias_tools, "ENTITY_EXTRACTION_MODE", "entities"):
+        assert bias_tools.extract_entities({"title": "Vote", "full_content": "The Senate voted"}) == ["Senate"]
+    graph_transformer.convert_to_graph_documents.assert_not_called()
+
+    with patch.object(fact_tools, "entity_extractor", extractor), \
+            patch.object(fact_tools, "transformer", graph_transformer), \
+            patch.object(fact_tools, "ENTITY_EXTRACTION_MODE", "graph"):
+        graph_transformer.convert_to_graph_documents.return_value = []
+        assert fact_tools.extract_entities_from_claim("The Senate passed the bill") == []
+    graph_transformer.convert_to_graph_documents.assert_called_once()
@@ -0,0 +1,82 @@
+import os
+import sys
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_community.graphs.graph_document import GraphDocument, Node
+
+from src_v3.components.fact_checker.fact_checker_updated import _check_claim
+from src_v3.memory.entity_matcher import EntityMatcher, match_entities
+from src_v3.memory.in_memory_graph import InMemoryKnowledgeGraph
+from src_v3.memory.sqlite_graph import SQLiteKnowledgeGraph
+
+
+def graph_docs(*nodes):
+    return [GraphDocument(nodes=[Node(id=node_id, type=node_type, properties=properties)
+                                 for node_id, node_type, properties in nodes],
+                          relationships=[], source=Document(page_content=""))]
+
+
+ENTITIES = graph_docs(
+    ("Donald Trump", "Person", {"aliases": ["Trump", "President Trump"]}),
+    ("United States Senate", "Organization", {"name": "Senate"}),
+    ("US", "Location", {}),
+    ("Inflation Reduction Act", "Bill", {}),
+)
+
+
+def test_matches_longest_mentions_with_aliases():
+    matcher = EntityMatcher.from_vocabulary([
+        ("Donald Trump", ["Trump"]), ("Trump Tower", []), ("US", []), ("The", []), ("Senate", []),
+    ])
+    result = matcher.match("Donald Trump met the Senate at Trump Tower, and told us the US would win.")
+    assert result.entities == ["Donald Trump", "Senate", "Trump Tower", "US"]
+    assert result.coverage == 1.0
+
+    # "us" does not match the case-sensitive short alias; unknown names lower the coverage
+    partial = matcher.match("Trump spoke with Nancy Pelosi and us in Ohio.")
+    assert partial.entities == ["Donald Trump"]
+    assert partial.coverage == 0.25
+    assert matcher.match("nothing known here").entities == []
+
+
+def test_matcher_grows_on_ingest():
+    kg = InMemoryKnowledgeGraph(article_transformer=MagicMock())
+    kg.add_article({"url": "https://example.com/a", "title": "A", "full_content": "x"}, graph_docs=ENTITIES)
+    assert match_entities(kg, "President Trump signed the Inflation Reduction Act") == \
+        ["Donald Trump", "Inflation Reduction Act"]
+
+    assert match_entities(kg, "Governor Newsom criticised Trump") is None
+    kg.add_article({"url": "https://example.com/b", "title": "B", "full_content": "y"},
+                   graph_docs=graph_docs(("Gavin Newsom", "Person", {"aliases": ["Newsom", "Governor Newsom"]})))
+    assert match_entities(kg, "Governor Newsom criticised Trump") == ["Gavin Newsom", "Donald Trump"]
+    assert "https://example.com/a" not in [entity for entity, _ in kg.entity_vocabulary()]
+
+
+def test_sqlite_vocabulary_and_non_graphs():
+    kg = SQLiteKnowledgeGraph(":memory:", article_transformer=MagicMock())
+    kg.add_article({"url": "https://example.com/a", "title": "A", "full_content": "x"}, graph_docs=ENTITIES)
+    assert dict(kg.entity_vocabulary())["United States Senate"] == ["Senate"]
+    assert match_entities(kg, "The Senate voted on the Inflation Reduction Act") == \
+        ["United States Senate", "Inflation Reduction Act"]
+    assert match_entities(MagicMock(), "The Senate voted") is None
+    assert match_entities(None, "The Senate voted") is None
+
+
+def test_fact_checker_skips_llm_extraction_on_match():
+    kg = InMemoryKnowledgeGraph(article_transformer=MagicMock())
+    kg.add_graph_documents(ENTITIES)
+    kg.retrieve_related_facts_text = MagicMock(return_value="")
+    chain = MagicMock()
+    chain.invoke.return_value = MagicMock(content='{"verdict": "True"}')
+    with patch("src_v3.components.fact_checker.fact_checker_updated.fact_check_chain", chain), \
+            patch("src_v3.components.fact_checker.fact_checker_updated.extract_entities_from_claim") as extract:
+        _check_claim("Donald Trump addressed the Senate", kg, store_to_kg=False)
+
+    extract.assert_not_called()
+    kg.retrieve_related_facts_text.assert_called_once_with(["Donald Trump", "United States Senate"])
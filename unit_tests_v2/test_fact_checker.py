@@ -84,8 +84,9 @@ def test_article():
 
 
 def test_extract_entities(mock_llm):
-    """Test entity extraction from claim text."""
-    with patch("src_v3.components.fact_checker.tools.transformer") as mock_transformer:
+    """Test entity extraction from claim text with the graph transformer."""
+    with patch("src_v3.components.fact_checker.tools.transformer") as mock_transformer, \
+            patch("src_v3.components.fact_checker.tools.ENTITY_EXTRACTION_MODE", "graph"):
         # Setup mock graph docs with entities
         mock_graph = MagicMock()
         mock_node1 = MagicMock()
@@ -0,0 +1,87 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+
+from src_v3.components.kg_builder.graph_artifacts import (
+    GraphArtifactStore,
+    extract_graph_documents,
+    rebuild_knowledge_graph,
+)
+from src_v3.memory.in_memory_graph import InMemoryKnowledgeGraph
+from src_v3.memory.knowledge_graph import KnowledgeGraph, article_document
+from src_v3.memory.article import as_article_record
+
+ARTICLE = {"url": "https://example.com/a", "title": "Budget vote", "full_content": "Joe Biden met Congress.",
+           "source": "CNN", "bias": "left"}
+
+
+def counting_transformer():
+    def convert(documents):
+        biden, congress = Node(id="Joe Biden", type="Person"), Node(id="Congress", type="Organization")
+        return [GraphDocument(nodes=[biden, congress],
+                              relationships=[Relationship(source=biden, target=congress, type="met")],
+                              source=documents[0])]
+
+    transformer = MagicMock()
+    transformer.convert_to_graph_documents.side_effect = convert
+    return transformer
+
+
+def test_extraction_is_reused_for_unchanged_text(tmp_path):
+    """Test that the transformer only runs again when the article text changes"""
+    store = GraphArtifactStore(str(tmp_path))
+    transformer = counting_transformer()
+    record = as_article_record(ARTICLE)
+
+    first = extract_graph_documents(transformer, article_document(record), record, store=store)
+    second = extract_graph_documents(transformer, article_document(record), record, store=store)
+
+    assert transformer.convert_to_graph_documents.call_count == 1
+    assert [n.id for n in second[0].nodes] == [n.id for n in first[0].nodes]
+    assert second[0].relationships[0].source is second[0].nodes[0]
+
+    changed = as_article_record({**ARTICLE, "full_content": "Updated text."})
+    extract_graph_documents(transformer, article_document(changed), changed, store=store)
+    assert transformer.convert_to_graph_documents.call_count == 2
+
+
+def test_rebuild_without_llm_calls(tmp_path):
+    """Test that a KG rebuilt from artifacts matches the original, with no transformer calls"""
+    store = GraphArtifactStore(str(tmp_path))
+    original = InMemoryKnowledgeGraph(article_transformer=counting_transformer())
+    record = as_article_record(ARTICLE)
+    original.add_article(ARTICLE, graph_docs=extract_graph_documents(
+        original.article_transformer, article_document(record), record, store=store))
+
+    unused = MagicMock()
+    rebuilt = InMemoryKnowledgeGraph(article_transformer=unused)
+    # A fresh store reads the JSONL file from disk
+    assert rebuild_knowledge_graph(rebuilt, GraphArtifactStore(str(tmp_path))) == 1
+
+    unused.convert_to_graph_documents.assert_not_called()
+    assert rebuilt.stats() == original.stats()
+    assert rebuilt.query_most_structurally_similar_bias(["Joe Biden"]) == "Left"
+
+
+def test_rebuild_writes_ground_truth_to_neo4j(tmp_path):
+    """Test that a Neo4j rebuild stores bias, duplicate_of and the MENTIONS edges structural bias follows"""
+    store = GraphArtifactStore(str(tmp_path))
+    article = {**ARTICLE, "duplicate_of": "https://example.com/original"}
+    record = as_article_record(article)
+    extract_graph_documents(counting_transformer(), article_document(record), record, store=store)
+
+    kg = KnowledgeGraph.__new__(KnowledgeGraph)
+    kg.graph = MagicMock()
+    assert rebuild_knowledge_graph(kg, GraphArtifactStore(str(tmp_path))) == 1
+
+    article_params = kg.graph.query.call_args_list[0].args[1]
+    assert article_params["bias"] == "left"
+    assert article_params["duplicate_of"] == "https://example.com/original"
+    graph_docs = kg.graph.add_graph_documents.call_args.args[0]
+    mentioned = {r.target.id for r in graph_docs[0].relationships
+                 if r.source.id == ARTICLE["url"] and r.type == "MENTIONS"}
+    assert mentioned == {"Joe Biden", "Congress"}
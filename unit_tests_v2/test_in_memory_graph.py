@@ -0,0 +1,99 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+
+from src_v3.memory.in_memory_graph import InMemoryKnowledgeGraph
+from src_v3.memory.graph_backends import create_knowledge_graph
+
+ARTICLES = {
+    "https://example.com/a": ["Joe Biden", "Congress", "Medicare"],
+    "https://example.com/b": ["Joe Biden", "Congress"],
+    "https://example.com/c": ["Medicare"],
+}
+
+
+def fake_transformer():
+    """Transformer returning fixed entities per article url"""
+    def convert(documents):
+        url = documents[0].metadata["url"]
+        nodes = [Node(id=name, type="Person" if name == "Joe Biden" else "Organization") for name in ARTICLES[url]]
+        relationships = [Relationship(source=nodes[0], target=nodes[1], type="affiliated with")] \
+            if len(nodes) > 1 else []
+        return [GraphDocument(nodes=nodes, relationships=relationships, source=documents[0])]
+
+    transformer = MagicMock()
+    transformer.convert_to_graph_documents.side_effect = convert
+    return transformer
+
+
+@pytest.fixture
+def kg():
+    graph = InMemoryKnowledgeGraph(article_transformer=fake_transformer())
+    for url in ARTICLES:
+        graph.add_article({"url": url, "title": f"Title {url[-1]}", "full_content": f"Body about {url[-1]}",
+                           "source": "CNN", "bias": "left" if url.endswith("a") else "right"})
+    return graph
+
+
+def test_similar_articles_ranked_by_shared_entities(kg):
+    """Test that the article sharing most entities comes first"""
+    similar = kg.get_similar_articles("https://example.com/a")
+
+    assert [s["url"] for s in similar] == ["https://example.com/b", "https://example.com/c"]
+    assert similar[0]["shared_entities"] == 2
+
+
+def test_structural_bias_and_related_facts(kg):
+    """Test the lookups used by the bias analyzer and fact checker"""
+    assert kg.query_most_structurally_similar_bias(["Joe Biden", "Medicare"]) == "Left"
+    assert kg.query_most_structurally_similar_bias(["Nobody"]) == "Unknown"
+    assert kg.query_most_structurally_similar_bias([]) == ""
+
+    facts = kg.retrieve_related_facts_text(["Joe Biden"]).splitlines()
+    assert "Joe Biden -[AFFILIATED_WITH]-> Congress" in facts
+    assert "https://example.com/a -[HAS_ENTITY]-> Joe Biden" in facts
+
+
+def test_lookups_follow_their_neo4j_relationship_types(kg):
+    """Test that structural bias follows MENTIONS edges only and similar articles HAS_ENTITY edges only"""
+    kg.merge_node("Nancy Pelosi", "Person")
+    kg.merge_node("https://example.com/d", "Article", {"title": "Title d", "bias": "center"})
+    kg.merge_relationship("https://example.com/d", "HAS_ENTITY", "Nancy Pelosi")
+    kg.merge_node("https://example.com/e", "Article", {"title": "Title e", "bias": "right"})
+    kg.merge_relationship("https://example.com/e", "MENTIONS", "Joe Biden")
+
+    assert kg.query_most_structurally_similar_bias(["Nancy Pelosi"]) == "Unknown"
+    assert "https://example.com/e" not in [s["url"] for s in kg.get_similar_articles("https://example.com/b")]
+
+
+def test_bias_report_and_text_search(kg):
+    """Test that bias analysis results show up in the per-source report"""
+    kg.add_bias_analysis("https://example.com/a", {"bias": "Left", "confidence_score": 80})
+
+    assert kg.get_bias_report("about a") == [{"source": "CNN", "assessment": "Left", "article_count": 1}]
+    assert [a["url"] for a in kg.retrieve_related_articles("Title b")] == ["https://example.com/b"]
+    assert kg.add_bias_analysis("https://unknown.com", {"bias": "Left"}) is False
+
+
+def test_snapshot_round_trip(kg, tmp_path):
+    """Test that a saved snapshot restores nodes, labels and adjacency"""
+    path = kg.save_snapshot(str(tmp_path / "kg.json"))
+    restored = InMemoryKnowledgeGraph(snapshot_path=path)
+
+    assert restored.stats() == kg.stats()
+    assert restored.get_similar_articles("https://example.com/a") == kg.get_similar_articles("https://example.com/a")
+
+
+def test_backend_factory(monkeypatch):
+    """Test that KG_BACKEND selects the in-memory graph"""
+    monkeypatch.setenv("KG_BACKEND", "memory")
+    monkeypatch.delenv("KG_SNAPSHOT_PATH", raising=False)
+
+    assert isinstance(create_knowledge_graph(), InMemoryKnowledgeGraph)
+    with pytest.raises(ValueError):
+        create_knowledge_graph("oracle")
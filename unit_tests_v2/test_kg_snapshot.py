@@ -0,0 +1,121 @@
+import os
+import sys
+import gzip
+import json
+
+os.environ["EVALUATION_MODE"] = "True"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src_v3.components.bias_analyzer.bias_agent_update import _analyze_article
+from src_v3.components.fact_checker.fact_checker_updated import _check_claim
+from sys_evaluation.kg_snapshot import (
+    SnapshotKnowledgeGraph,
+    evaluation_knowledge_graph,
+    kg_context_label,
+    materialize_snapshot,
+)
+
+ARTICLES = [
+    {"title": "A", "content": "Text A", "source": "S", "url": "https://example.com/a"},
+    {"title": "B", "content": "Text B", "source": "S", "url": "https://example.com/b"},
+]
+ENTITIES = {"https://example.com/a": ["Senate", "Budget"], "https://example.com/b": ["Court"]}
+
+
+def live_graph():
+    kg = MagicMock()
+    kg.query_most_structurally_similar_bias.side_effect = lambda entities: "Left" if "Senate" in entities else "Right"
+    kg.retrieve_related_facts_text.side_effect = lambda entities, limit=25: " | ".join(entities)
+    kg.retrieve_related_passages.side_effect = lambda embedding, limit=5: [
+        {"url": "https://example.com/a", "title": "A", "text": "The Senate voted 51-49.", "score": 0.9}][:limit]
+    return kg
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return materialize_snapshot(ARTICLES, live_graph(), task="bias", directory=str(tmp_path),
+                                extract=lambda article: ENTITIES[article["url"]])
+
+
+def test_snapshot_file_is_versioned_and_verified(snapshot_path):
+    snapshot = SnapshotKnowledgeGraph.load(snapshot_path)
+    assert os.path.basename(snapshot_path).startswith("bias-")
+    assert snapshot.metadata["snapshot_id"] in snapshot_path
+    assert snapshot.frozen_entities("https://example.com/a") == ["Senate", "Budget"]
+    assert kg_context_label(snapshot) == snapshot.metadata["snapshot_id"]
+    assert kg_context_label(MagicMock()) == "live"
+
+    with gzip.open(snapshot_path, "rt", encoding="utf-8") as f:
+        tampered = json.load(f)
+    tampered["items"]["https://example.com/b"]["similar_bias"] = "Center"
+    with gzip.open(snapshot_path, "wt", encoding="utf-8") as f:
+        json.dump(tampered, f)
+    with pytest.raises(ValueError):
+        SnapshotKnowledgeGraph.load(snapshot_path)
+
+
+def test_answers_from_snapshot_and_counts_misses(snapshot_path):
+    fallback = live_graph()
+    snapshot = SnapshotKnowledgeGraph.load(snapshot_path, fallback=fallback)
+    assert snapshot.query_most_structurally_similar_bias(["Senate", "Budget"]) == "Left"
+    assert snapshot.retrieve_related_facts_text(["Court"]) == "Court"
+    fallback.query_most_structurally_similar_bias.assert_not_called()
+
+    assert snapshot.query_most_structurally_similar_bias(["Senate"]) == "Left"
+    assert snapshot.misses == 1
+    assert SnapshotKnowledgeGraph.load(snapshot_path).retrieve_related_facts_text(["Other"]) == ""
+
+
+def test_bias_agent_uses_frozen_entities(snapshot_path):
+    chain = MagicMock()
+    chain.invoke.return_value = {"bias": "Left"}
+    snapshot = SnapshotKnowledgeGraph.load(snapshot_path)
+    with patch("src_v3.components.bias_analyzer.bias_agent_update.extract_entities") as extract:
+        result = _analyze_article(ARTICLES[0], chain, snapshot)
+
+    extract.assert_not_called()
+    assert chain.invoke.call_args[0][0]["similar_bias"] == "Left"
+    assert chain.invoke.call_args[0][0]["matched_entities"] == "Senate, Budget"
+    assert result["bias_result"] == {"bias": "Left"}
+
+
+def test_capped_context_sizes_are_frozen(tmp_path):
+    """Test that an ablation context size answers from the snapshot with the first-mentioned entities"""
+    from sys_evaluation.ablation_grid import ArticleContextCache
+
+    path = materialize_snapshot(ARTICLES, live_graph(), task="bias", directory=str(tmp_path),
+                                extract=lambda article: ENTITIES[article["url"]], context_sizes=[None, 1])
+    snapshot = SnapshotKnowledgeGraph.load(path)
+    contexts = ArticleContextCache(snapshot)
+    contexts.prepare(ARTICLES, [None, 1])
+
+    assert contexts.similar_bias == {(0, None): "Left", (0, 1): "Left", (1, None): "Right", (1, 1): "Right"}
+    assert snapshot.retrieve_related_facts_text(["Senate"]) == "Senate"
+    assert snapshot.misses == 0
+
+
+def test_fact_checker_uses_frozen_entities(tmp_path):
+    claims = [{"claim": "The Senate passed the budget", "ground_truth": "True"}]
+    path = materialize_snapshot(claims, live_graph(), task="fact_check", directory=str(tmp_path),
+                                extract=lambda item: ["Budget", "Senate"])
+    chain = MagicMock()
+    chain.invoke.return_value = MagicMock(content='{"verdict": "True"}')
+    with patch("src_v3.components.fact_checker.fact_checker_updated.fact_check_chain", chain), \
+            patch("src_v3.components.fact_checker.fact_checker_updated.extract_entities_from_claim",
+                  return_value=["Budget", "Senate"]) as extract:
+        _check_claim(claims[0]["claim"], live_graph(), store_to_kg=False)
+        live_context = chain.invoke.call_args[0][0]["related_kg_context"]
+        extract.reset_mock()
+        with patch.dict(os.environ, {"KG_CONTEXT_SNAPSHOT": path}):
+            snapshot = evaluation_knowledge_graph()
+            _check_claim(claims[0]["claim"], snapshot, store_to_kg=True)
+
+    extract.assert_not_called()
+    # The snapshot run sees exactly the live context, passages included
+    assert chain.invoke.call_args[0][0]["related_kg_context"] == live_context
+    assert "Budget | Senate" in live_context and "The Senate voted 51-49." in live_context
+    assert snapshot.misses == 0
@@ -0,0 +1,105 @@
+import os
+import sys
+import io
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+from botocore.response import StreamingBody
+from langchain_aws import ChatBedrock
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src_v3.utils.llm_backend import (
+    CassetteMissError,
+    CassetteStore,
+    RecordingBedrockClient,
+    ReplayBedrockClient,
+    SyntheticBedrockClient,
+    bedrock_runtime_client,
+)
+from src_v3.utils.rate_limiter import RateLimitedBedrockClient, response_token_count
+
+MODEL_ID = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+BIAS_SYSTEM_PROMPT = 'Respond with JSON: {"bias": "Left|Center|Right", "confidence_score": 0-100}'
+
+
+def bedrock_response(payload):
+    data = json.dumps(payload).encode("utf-8")
+    return {
+        "body": StreamingBody(io.BytesIO(data), len(data)),
+        "ResponseMetadata": {"HTTPHeaders": {"x-amzn-bedrock-input-token-count": "12",
+                                             "x-amzn-bedrock-output-token-count": "3"}},
+    }
+
+
+def invoke_kwargs(prompt):
+    body = {"anthropic_version": "bedrock-2023-05-31", "max_tokens": 100,
+            "messages": [{"role": "user", "content": prompt}]}
+    return {"modelId": MODEL_ID, "body": json.dumps(body)}
+
+
+def test_synthetic_backend_answers_bias_prompt_through_chat_bedrock():
+    """Test that ChatBedrock gets schema-valid bias JSON without AWS"""
+    llm = ChatBedrock(client=SyntheticBedrockClient(), model_id=MODEL_ID, region_name="us-east-1")
+
+    response = llm.invoke([SystemMessage(content=BIAS_SYSTEM_PROMPT),
+                           HumanMessage(content="Title: Senate Passes Budget")])
+    result = json.loads(response.content)
+
+    assert result["bias"] in ("Left", "Center", "Right")
+    assert 0 <= result["confidence_score"] <= 100
+    # Same request, same answer
+    assert llm.invoke([SystemMessage(content=BIAS_SYSTEM_PROMPT),
+                       HumanMessage(content="Title: Senate Passes Budget")]).content == response.content
+
+
+def test_synthetic_backend_fills_graph_tool_call():
+    """Test the tool_use response for LLMGraphTransformer's DynamicGraph tool"""
+    tool = {
+        "name": "DynamicGraph",
+        "input_schema": {"type": "object", "properties": {"nodes": {"anyOf": [{"type": "array", "items": {
+            "type": "object", "properties": {"id": {"type": "string"}, "type": {
+                "type": "string", "description": "Available options are ['Person', 'Organization']"}}}}]}}},
+    }
+    body = {"messages": [{"role": "user", "content": "Alice Smith joined Acme Corp."}],
+            "tools": [tool], "tool_choice": {"type": "tool", "name": "DynamicGraph"}}
+
+    response = SyntheticBedrockClient().invoke_model(modelId=MODEL_ID, body=json.dumps(body))
+    content = json.loads(response["body"].read())["content"][0]
+
+    assert content["type"] == "tool_use"
+    assert {"id": "Alice Smith", "type": "Person"} in content["input"]["nodes"]
+    assert response_token_count(response) > 0
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    """Test that a recorded response is served back byte-for-byte in replay mode"""
+    store = CassetteStore(str(tmp_path))
+    real_client = MagicMock()
+    real_client.invoke_model.return_value = bedrock_response({"content": [{"type": "text", "text": "hi"}]})
+
+    recorded = RecordingBedrockClient(real_client, store).invoke_model(**invoke_kwargs("Hello"))
+    assert json.loads(recorded["body"].read())["content"][0]["text"] == "hi"
+
+    # A fresh store reads the cassette file back from disk
+    replay = ReplayBedrockClient(CassetteStore(str(tmp_path)))
+    replayed = replay.invoke_model(**invoke_kwargs("Hello"))
+
+    assert json.loads(replayed["body"].read())["content"][0]["text"] == "hi"
+    assert response_token_count(replayed) == 15
+    with pytest.raises(CassetteMissError):
+        replay.invoke_model(**invoke_kwargs("Something else"))
+
+
+@pytest.mark.parametrize("mode, limited", [("synthetic", False), ("replay", False),
+                                           ("record", True), ("bedrock", True)])
+def test_only_bedrock_backed_clients_are_rate_limited(monkeypatch, mode, limited):
+    """Test that replay and synthetic clients bypass the shared rate limiter"""
+    monkeypatch.setenv("LLM_BACKEND", mode)
+
+    client = bedrock_runtime_client(MagicMock())
+
+    assert isinstance(client, RateLimitedBedrockClient) == limited
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    balanced_accuracy_score,
+    classification_report,
+    cohen_kappa_score,
+    matthews_corrcoef,
+)
+
+from sys_evaluation.metrics_updated import (
+    bootstrap_ci,
+    calculate_bias_metrics,
+    calculate_confusion_matrix,
+    calculate_fact_check_metrics,
+    calculate_metrics_from_confusion_matrix,
+    confusion_counts,
+    encode_labels,
+)
+
+BIAS_LABELS = ["left", "center", "right"]
+
+
+@pytest.fixture
+def bias_predictions():
+    rng = np.random.default_rng(7)
+    y_true = rng.choice(BIAS_LABELS, size=500).tolist()
+    # Mostly correct, with some confusions and unparseable predictions
+    y_pred = [truth if rng.random() < 0.6 else rng.choice(BIAS_LABELS + ["unknown"]) for truth in y_true]
+    return y_true, y_pred
+
+
+def test_encode_labels_puts_given_labels_first():
+    true_idx, pred_idx, labels = encode_labels(["right", "left"], ["unknown", "left"], BIAS_LABELS)
+    assert labels == ["left", "center", "right", "unknown"]
+    assert true_idx.tolist() == [2, 0]
+    assert pred_idx.tolist() == [3, 0]
+    assert confusion_counts(true_idx, pred_idx, len(labels))[2, 3] == 1
+
+
+def test_bias_metrics_match_sklearn(bias_predictions):
+    y_true, y_pred = bias_predictions
+    metrics = calculate_bias_metrics(y_true, y_pred)
+    expected = classification_report(y_true, y_pred, labels=BIAS_LABELS, output_dict=True, zero_division=0)
+
+    for label in BIAS_LABELS + ["macro avg", "weighted avg", "micro avg"]:
+        for field in ("precision", "recall", "f1-score", "support"):
+            assert metrics["classification_report"][label][field] == pytest.approx(expected[label][field])
+    assert "accuracy" not in metrics["classification_report"]
+    assert metrics["macro_f1"] == pytest.approx(expected["macro avg"]["f1-score"])
+    assert metrics["cohen_kappa"] == pytest.approx(cohen_kappa_score(y_true, y_pred))
+    assert metrics["mcc"] == pytest.approx(matthews_corrcoef(y_true, y_pred))
+    assert metrics["balanced_accuracy"] == pytest.approx(balanced_accuracy_score(y_true, y_pred))
+
+
+def test_fact_check_metrics_report_accuracy():
+    results = [
+        {"system_verdict": {"overall_verdict": "True"}, "ground_truth_verdict": "true"},
+        {"system_verdict": {"overall_verdict": "False"}, "ground_truth_verdict": "true"},
+        {"system_verdict": {"overall_verdict": "False"}, "ground_truth_verdict": "false"},
+        {"system_verdict": {"overall_verdict": "True"}, "ground_truth_verdict": "true"},
+    ]
+    metrics = calculate_fact_check_metrics(results)
+    assert metrics["accuracy"] == pytest.approx(0.75)
+    assert metrics["confusion_matrix"] == [[2, 1], [0, 1]]
+    assert metrics["mcc"] == pytest.approx(matthews_corrcoef(["t", "t", "f", "t"], ["t", "f", "f", "t"]))
+
+
+def test_binary_confusion_terms_follow_argument_order():
+    y_true = ["pos", "pos", "neg", "neg", "neg"]
+    y_pred = ["pos", "neg", "pos", "pos", "neg"]
+    assert calculate_confusion_matrix(y_pred, y_true, "pos") == (1, 2, 1, 1)
+
+    metrics = calculate_metrics_from_confusion_matrix(y_true, y_pred, "pos")
+    assert metrics["precision"] == pytest.approx(1 / 3)
+    assert metrics["recall"] == pytest.approx(1 / 2)
+    assert metrics["cohen_kappa"] == pytest.approx(cohen_kappa_score(y_true, y_pred))
+
+
+def test_degenerate_inputs_score_zero():
+    metrics = calculate_bias_metrics(["left", "left"], ["left", "left"])
+    assert metrics["cohen_kappa"] == 0.0
+    assert metrics["mcc"] == 0.0
+
+
+def test_bootstrap_ci_brackets_the_estimate(bias_predictions):
+    y_true, y_pred = bias_predictions
+    intervals = bootstrap_ci(y_true, y_pred, BIAS_LABELS, n_resamples=500, seed=1)
+    for name, interval in intervals.items():
+        assert interval["lower"] <= interval["estimate"] <= interval["upper"], name
+    assert intervals == bootstrap_ci(y_true, y_pred, BIAS_LABELS, n_resamples=500, seed=1)
+
+    with_ci = calculate_bias_metrics(y_true, y_pred, n_bootstrap=200)
+    assert set(with_ci["confidence_intervals"]) >= {"macro_f1", "mcc"}
+
+
+def test_scores_a_million_predictions_quickly():
+    rng = np.random.default_rng(0)
+    y_true = rng.choice(BIAS_LABELS, size=1_000_000)
+    y_pred = np.where(rng.random(1_000_000) < 0.7, y_true, rng.choice(BIAS_LABELS, size=1_000_000))
+
+    start = time.perf_counter()
+    metrics = calculate_bias_metrics(y_true, y_pred)
+    assert time.perf_counter() - start < 5
+    assert 0.7 < metrics["classification_report"]["accuracy"] < 0.85
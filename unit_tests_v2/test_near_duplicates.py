@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src_v3.components.kg_builder.tools.merge_news_json import merge_json_files
+from src_v3.components.kg_builder.tools.near_duplicates import (
+    MinHasher,
+    cluster_articles,
+    estimated_jaccard,
+    link_near_duplicates,
+)
+
+WORDS = ("senate budget vote president court ruling tariff policy governor election campaign congress "
+         "minister trade deal immigration border federal judge order agency report official statement").split()
+
+
+def story(seed, length=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) + str(rng.randint(0, 50)) for _ in range(length))
+
+
+def wire_copy(text, seed):
+    """Republished copy: different byline and a few edited words"""
+    words = text.split()
+    rng = random.Random(seed)
+    for i in rng.sample(range(len(words)), 3):
+        words[i] = "edited"
+    return "By Staff Reporter. " + " ".join(words) + " Copyright republished with permission."
+
+
+def article(url, source, text, title="Title"):
+    return {"url": url, "source": {"id": None, "name": source}, "title": title, "full_content": text}
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher()
+    a, b = story(1), story(1, length=300)
+    exact = len(set(hasher.shingle_hashes(a)) & set(hasher.shingle_hashes(b))) / \
+        len(set(hasher.shingle_hashes(a)) | set(hasher.shingle_hashes(b)))
+    assert abs(estimated_jaccard(hasher.signature(a), hasher.signature(b)) - exact) < 0.12
+    assert hasher.signature("") is None
+    assert np.array_equal(MinHasher().signature(a), hasher.signature(a))
+
+
+def test_syndicated_copies_cluster_on_first_copy():
+    ap = story(1)
+    articles = [
+        article("https://apnews.com/x", "Associated Press", ap),
+        article("https://other.com/unrelated", "Other", story(2)),
+        article("https://usatoday.com/x", "USA Today", wire_copy(ap, 1), title="Retitled"),
+        article("https://abcnews.go.com/x", "ABC News", wire_copy(ap, 2)),
+        article("https://empty.com/x", "Empty", ""),
+    ]
+    duplicates = cluster_articles(articles)
+    assert duplicates == {"https://usatoday.com/x": "https://apnews.com/x",
+                          "https://abcnews.go.com/x": "https://apnews.com/x"}
+
+    articles[1]["duplicate_of"] = "stale"
+    assert link_near_duplicates(articles) == 2
+    assert "duplicate_of" not in articles[1]
+    assert articles[3]["duplicate_of"] == "https://apnews.com/x"
+
+
+def test_related_but_different_stories_stay_apart():
+    base = story(3).split()
+    follow_up = " ".join(base[:150] + story(4, length=250).split())
+    assert cluster_articles([article("a", "A", " ".join(base)), article("b", "B", follow_up)]) == {}
+
+
+def test_merge_marks_duplicates(tmp_path):
+    ap = story(5)
+    day = {"status": "ok", "totalResults": 3, "articles": [
+        article("https://apnews.com/y", "Associated Press", ap),
+        article("https://apnews.com/y", "Associated Press", ap),
+        article("https://thehill.com/y", "The Hill", wire_copy(ap, 3)),
+    ]}
+    (tmp_path / "news_2025-03-10.json").write_text(json.dumps(day), encoding="utf-8")
+    output = tmp_path / "merged" / "merged.json"
+
+    merge_json_files(str(tmp_path), str(output))
+    merged = json.loads(output.read_text(encoding="utf-8"))
+    assert merged["totalResults"] == 2
+    assert [a.get("duplicate_of") for a in merged["articles"]] == [None, "https://apnews.com/y"]
@@ -0,0 +1,58 @@
+import os
+import sys
+import csv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+from langchain_core.documents import Document
+
+from src_v3.components.kg_builder.tools.neo4j_bulk_export import export_bulk_import_csv
+
+ALLSIDES_HEADER = ["allsides_media_bias_ratings/publication/source_name",
+                   "allsides_media_bias_ratings/publication/media_bias_rating"]
+
+
+def graph_docs(*names, rel=None):
+    nodes = [Node(id=name, type="Organization" if name == "Congress" else "Person") for name in names]
+    relationships = [Relationship(source=nodes[0], target=nodes[1], type=rel)] if rel else []
+    return [GraphDocument(nodes=nodes, relationships=relationships, source=Document(page_content=""))]
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_dedupes_nodes_and_relationships(tmp_path):
+    """Test that repeated entities, articles and edges are written once"""
+    allsides = tmp_path / "allsides.csv"
+    allsides.write_text(",".join(ALLSIDES_HEADER) + "\nCNN (Online News),Left\n", encoding="utf-8")
+    extractions = [
+        ({"url": "u1", "title": "One", "source": "CNN", "full_content": "Line one\nline two"},
+         graph_docs("Joe Biden", "Congress", rel="affiliated with")),
+        ({"url": "u2", "title": "Two", "source": "CNN", "bias": "Center"},
+         graph_docs("Joe Biden", "Congress", rel="affiliated with")),
+        ({"url": "u1", "title": "One again"}, graph_docs("Someone Else")),
+    ]
+
+    paths = export_bulk_import_csv(str(tmp_path / "out"), allsides_csv=str(allsides), extractions=extractions)
+
+    articles = read_rows(paths["articles"])
+    assert [a["id:ID"] for a in articles] == ["u1", "u2"]
+    # AllSides fills in the missing label; an existing label is kept
+    assert [a["bias"] for a in articles] == ["Left", "Center"]
+    assert articles[0]["full_content"] == "Line one\nline two"
+
+    entities = read_rows(paths["entities"])
+    assert sorted(e["id:ID"] for e in entities) == ["Congress", "Joe Biden"]
+    assert {e[":LABEL"] for e in entities} == {"Entity;Person", "Entity;Organization"}
+
+    sources = read_rows(paths["sources"])
+    assert len(sources) == 1 and sources[0]["bias"] == "Left"
+
+    relationships = [tuple(r.values()) for r in read_rows(paths["relationships"])]
+    assert len(relationships) == len(set(relationships))
+    assert ("Joe Biden", "Congress", "AFFILIATED_WITH") in relationships
+    assert ("u2", "Joe Biden", "MENTIONS") in relationships
+    assert "neo4j-admin database import full" in paths["command"]
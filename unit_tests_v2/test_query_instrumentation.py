@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+
+from src_v3.memory import query_instrumentation
+from src_v3.memory.query_instrumentation import (
+    InstrumentedGraph,
+    MethodStats,
+    QueryMetrics,
+    format_report,
+    read_slow_queries,
+)
+
+
+@pytest.fixture
+def slow_log(tmp_path, monkeypatch):
+    path = str(tmp_path / "slow.log")
+    monkeypatch.setenv("KG_SLOW_QUERY_LOG", path)
+    logger = logging.getLogger(query_instrumentation.SLOW_QUERY_LOGGER)
+    logger.handlers.clear()
+    yield path
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
+
+def retrieve_related_facts_text(graph):
+    """Stand-in KG method; its name is what the metrics are keyed by"""
+    return graph.query("MATCH (e:Entity) WHERE e.id IN $entities RETURN e", {"entities": ["X"]})
+
+
+def test_queries_are_attributed_to_calling_method():
+    """Test per-method call, row and byte counts"""
+    neo4j = MagicMock()
+    neo4j.query.return_value = [{"e": "X"}, {"e": "Y"}]
+    metrics = QueryMetrics()
+    graph = InstrumentedGraph(neo4j, metrics=metrics, slow_query_ms=10 ** 6)
+
+    retrieve_related_facts_text(graph)
+    retrieve_related_facts_text(graph)
+
+    stats = metrics.snapshot()["retrieve_related_facts_text"]
+    assert stats.calls == 2
+    assert stats.rows == 4
+    assert stats.bytes == 2 * len(json.dumps([{"e": "X"}, {"e": "Y"}]))
+    # Other attributes pass through to the wrapped graph
+    assert graph._driver is neo4j._driver
+
+
+def test_slow_queries_are_logged_with_plan(slow_log):
+    """Test that queries over the threshold land in the slow-query log with their plan"""
+    neo4j = MagicMock()
+    neo4j.query.return_value = []
+    plan = {"operatorType": "ProduceResults@neo4j", "args": {}, "children": [
+        {"operatorType": "AllNodesScan@neo4j", "args": {"Details": "e"}, "children": []}]}
+    graph = InstrumentedGraph(neo4j, metrics=QueryMetrics(), slow_query_ms=0, plan_mode="explain")
+
+    session = neo4j._driver.session.return_value.__enter__.return_value
+    session.run.return_value.consume.return_value.plan = plan
+    retrieve_related_facts_text(graph)
+
+    entries = read_slow_queries(slow_log)
+    assert entries[0]["method"] == "retrieve_related_facts_text"
+    assert entries[0]["plan"]["children"][0]["operator"] == "AllNodesScan"
+
+
+@pytest.mark.parametrize("query_type, profiled", [("r", True), ("rw", False), ("w", False)])
+def test_profile_mode_only_reruns_read_only_queries(query_type, profiled):
+    """Test that PROFILE is only run for read-only queries and writes fall back to EXPLAIN"""
+    neo4j = MagicMock()
+    graph = InstrumentedGraph(neo4j, metrics=QueryMetrics(), slow_query_ms=10 ** 6, plan_mode="profile")
+    session = neo4j._driver.session.return_value.__enter__.return_value
+    summary = session.run.return_value.consume.return_value
+    summary.query_type = query_type
+    summary.plan = {"operatorType": "EmptyResult@neo4j", "args": {}, "children": []}
+    summary.profile = {"operatorType": "ProduceResults@neo4j", "args": {}, "children": []}
+
+    plan = graph.capture_plan("MERGE (a:Article {url: $url})", {"url": "u"})
+
+    statements = [c.args[0].split()[0] for c in session.run.call_args_list]
+    assert statements == (["EXPLAIN", "PROFILE"] if profiled else ["EXPLAIN"])
+    assert plan["operator"] == ("ProduceResults" if profiled else "EmptyResult")
+
+
+def test_histogram_percentiles_and_report():
+    """Test bucketed percentiles and the report table"""
+    stats = MethodStats()
+    for elapsed in [3] * 90 + [400] * 10:
+        stats.record(elapsed, rows=1, size=10)
+
+    assert stats.percentile(0.5) == 5
+    assert stats.percentile(0.95) == 500
+    assert "get_similar_articles" in format_report({"get_similar_articles": stats})
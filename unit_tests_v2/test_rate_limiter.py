@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from src_v3.utils.rate_limiter import (
+    BedrockRateLimiter,
+    Priority,
+    request_priority,
+    response_token_count,
+)
+
+
+def throttling_error():
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}}, "InvokeModel")
+
+
+def invoke_response(input_tokens=100, output_tokens=50):
+    """Shape of a bedrock-runtime invoke_model response"""
+    return {
+        "body": MagicMock(),
+        "ResponseMetadata": {"HTTPHeaders": {
+            "x-amzn-bedrock-input-token-count": str(input_tokens),
+            "x-amzn-bedrock-output-token-count": str(output_tokens),
+        }}
+    }
+
+
+def test_waiters_are_served_by_priority():
+    """Test that an interactive request overtakes queued background requests"""
+    limiter = BedrockRateLimiter(requests_per_minute=6000, tokens_per_minute=10 ** 7,
+                                 max_concurrency=1, initial_concurrency=1)
+    order = []
+    charged = limiter.acquire(10)
+
+    def worker(name, priority):
+        limiter.acquire(10, priority)
+        order.append(name)
+        limiter.release(10)
+
+    threads = [threading.Thread(target=worker, args=("background", Priority.BACKGROUND))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=worker, args=("interactive", Priority.INTERACTIVE)))
+    threads[1].start()
+    time.sleep(0.05)
+
+    limiter.release(charged)
+    for t in threads:
+        t.join(timeout=2)
+
+    assert order == ["interactive", "background"]
+
+
+def test_aimd_adjusts_concurrency():
+    """Test additive increase on success and multiplicative decrease on throttling"""
+    limiter = BedrockRateLimiter(max_concurrency=8, initial_concurrency=4, throttle_cooldown=0)
+
+    limiter.acquire(10)
+    limiter.release(10)
+    assert limiter.concurrency_limit == pytest.approx(4.25)
+
+    limiter.acquire(10)
+    limiter.release(10, throttled=True)
+    assert limiter.concurrency_limit == pytest.approx(2.125)
+    assert limiter.throttle_count == 1
+
+
+def test_request_bucket_paces_requests():
+    """Test that the requests-per-minute bucket delays calls once it is empty"""
+    limiter = BedrockRateLimiter(requests_per_minute=1200, tokens_per_minute=10 ** 7, max_concurrency=4)
+    limiter.request_bucket.tokens = 0
+
+    start = time.perf_counter()
+    limiter.acquire(10)
+    elapsed = time.perf_counter() - start
+
+    # 1200 requests per minute refills one request every 50ms
+    assert 0.03 < elapsed < 0.5
+
+
+def test_wrapped_client_retries_throttled_calls():
+    """Test that a throttled call is retried and the limiter backs off"""
+    limiter = BedrockRateLimiter(max_concurrency=4, throttle_cooldown=0)
+    client = MagicMock()
+    client.invoke_model.side_effect = [throttling_error(), invoke_response()]
+    wrapped = limiter.wrap_client(client, Priority.BATCH)
+
+    with patch("src_v3.utils.rate_limiter.time.sleep"):
+        response = wrapped.invoke_model(modelId="model", body=json.dumps({"max_tokens": 200, "messages": []}))
+
+    assert response_token_count(response) == 150
+    assert client.invoke_model.call_count == 2
+    assert limiter.throttle_count == 1
+    assert limiter.in_flight == 0
+    # Other client attributes pass straight through
+    assert wrapped.meta is client.meta
+
+
+def test_request_priority_context_overrides_client_default():
+    """Test that request_priority() sets the class used by wrapped clients"""
+    limiter = BedrockRateLimiter()
+    client = MagicMock()
+    client.invoke_model.return_value = invoke_response()
+    wrapped = limiter.wrap_client(client, Priority.INTERACTIVE)
+
+    with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+        with request_priority(Priority.BACKGROUND):
+            wrapped.invoke_model(modelId="model", body="{}")
+
+    assert acquire.call_args[0][1] == Priority.BACKGROUND
+
+
+def test_interactive_request_priority_overrides_background_client():
+    """Test that request_priority(INTERACTIVE), whose value is 0, still overrides the client default"""
+    limiter = BedrockRateLimiter()
+    client = MagicMock()
+    client.invoke_model.return_value = invoke_response()
+    wrapped = limiter.wrap_client(client, Priority.BACKGROUND)
+
+    with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+        with request_priority(Priority.INTERACTIVE):
+            wrapped.invoke_model(modelId="model", body="{}")
+        wrapped.invoke_model(modelId="model", body="{}")
+
+    assert [c[0][1] for c in acquire.call_args_list] == [Priority.INTERACTIVE, Priority.BACKGROUND]
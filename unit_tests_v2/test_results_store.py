@@ -0,0 +1,78 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+
+from sys_evaluation.results_store import PREDICTION_COLUMNS, ResultsStore, prediction_rows
+
+
+def rows(predictions, truth=("left", "center", "right")):
+    return [
+        {"key": f"https://example.com/{i}", "title": f"Article {i}", "source": "Source", "true_label": t,
+         "predicted_label": p, "reasoning": "", "latency_ms": 100.0 * (i + 1), "input_tokens": 1000,
+         "output_tokens": 50}
+        for i, (t, p) in enumerate(zip(truth, predictions))
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultsStore(root=str(tmp_path / "runs"))
+
+
+def test_runs_are_partitioned_and_never_overwritten(store):
+    store.write("run-1", "llm_only", rows(["left", "left", "right"]), {"task": "bias"})
+    store.write("run-1", "llm_kg", rows(["left", "center", "right"]))
+    store.write("run-2", "llm_kg", rows(["right", "center", "right"]), {"task": "bias"})
+
+    assert os.path.isdir(os.path.join(store.root, "run_id=run-1", "config=llm_kg"))
+    assert store.run_metadata("run-1")["configs"] == ["llm_kg", "llm_only"]
+    assert store.run_metadata("run-1")["task"] == "bias"
+    assert set(store.runs()["run_id"]) == {"run-1", "run-2"}
+
+    df = store.load("run-1")
+    assert len(df) == 6
+    assert set(df["config"]) == {"llm_only", "llm_kg"}
+    assert list(df.columns[:len(PREDICTION_COLUMNS)]) == PREDICTION_COLUMNS
+
+
+def test_metrics_from_stored_predictions(store):
+    store.write("run-1", "llm_kg", rows(["left", "center", "left"]), {"task": "bias"})
+    metrics = store.metrics("run-1", "llm_kg")
+    assert metrics["accuracy"] == pytest.approx(2 / 3)
+    assert metrics["classification_report"]["right"]["recall"] == 0.0
+
+
+def test_diff_classifies_changes(store):
+    store.write("run-1", "llm_only", rows(["left", "left", "right"]))
+    store.write("run-2", "llm_kg", rows(["center", "center", "left"]))
+
+    diff = store.diff("run-1", "llm_only", "run-2", "llm_kg").set_index("key")
+    assert diff.loc["https://example.com/0", "change"] == "broken"
+    assert diff.loc["https://example.com/1", "change"] == "fixed"
+    assert diff.loc["https://example.com/2", "change"] == "broken"
+    assert (diff["latency_ms_delta"] == 0).all()
+
+
+def test_load_missing_run_raises(store):
+    with pytest.raises(FileNotFoundError):
+        store.load("missing")
+
+
+def test_prediction_rows_join_tokens_and_reasoning():
+    articles = [
+        {"url": "https://example.com/a", "title": "A", "source": "S", "latency_ms": 12.5,
+         "bias_result": MagicMock(content='{"bias": "left", "reasoning": "tone"}')},
+        {"claim": "x" * 100, "fact_check_result": {"verdict": "True", "reasoning": "kg"}},
+    ]
+    bias_rows = prediction_rows(articles[:1], ["left"], ["left"], token_totals={"https://example.com/a": (900, 40)})
+    assert bias_rows[0]["reasoning"] == "tone"
+    assert (bias_rows[0]["input_tokens"], bias_rows[0]["output_tokens"]) == (900, 40)
+
+    claim_rows = prediction_rows(articles[1:], ["True"], ["True"], key_field="claim",
+                                 reasoning_field="fact_check_result", token_totals={"x" * 80: (10, 2)})
+    assert claim_rows[0]["input_tokens"] == 10
+    assert claim_rows[0]["reasoning"] == "kg"
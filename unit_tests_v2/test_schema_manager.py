@@ -0,0 +1,97 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src_v3.memory import schema_manager
+from src_v3.memory.schema_manager import (
+    SCHEMA_VERSION,
+    ensure_schema,
+    migrate,
+    report_label_scans,
+    required_objects,
+    verify_schema,
+)
+
+
+class FakeGraph:
+    """Records Cypher statements and answers the schema queries"""
+
+    def __init__(self, version=0, existing=(), uri="localhost:7687", database="neo4j"):
+        self.version = version
+        self.existing = set(existing)
+        self.statements = []
+        # Connection details as Neo4jGraph keeps them
+        self._driver = SimpleNamespace(initial_addresses=[uri])
+        self._database = database
+
+    def query(self, query, params=None):
+        self.statements.append(query.strip())
+        if query.startswith("MATCH (m:SchemaMigration)"):
+            return [{"version": self.version or None}]
+        if query.startswith("MERGE (m:SchemaMigration"):
+            self.version = params["version"]
+        if query.startswith("SHOW INDEXES"):
+            return [{"name": name} for name in self.existing]
+        if query.startswith("SHOW CONSTRAINTS"):
+            return []
+        return []
+
+
+def test_migrate_applies_only_pending_versions():
+    """Test that migrations already recorded in the database are skipped"""
+    graph = FakeGraph(version=3)
+
+    assert migrate(graph) == [4, 5, 6]
+    assert graph.version == SCHEMA_VERSION
+    assert not any("article_url_constraint" in s for s in graph.statements)
+    assert any("chunkVector" in s for s in graph.statements)
+    assert migrate(graph) == []
+
+
+def test_verify_schema_recreates_missing_objects():
+    """Test that a dropped index is detected and created again"""
+    names = set(required_objects())
+    graph = FakeGraph(version=SCHEMA_VERSION, existing=names - {"entity_id_idx"})
+
+    assert verify_schema(graph) == ["entity_id_idx"]
+    assert graph.statements[-1] == required_objects()["entity_id_idx"]
+
+
+def test_ensure_schema_runs_once_per_database():
+    """Test the per-process bootstrap cache, shared by graphs on the same connection"""
+    graph = FakeGraph(existing=required_objects(), uri="kg-test:7687")
+    ensure_schema(graph)
+    count = len(graph.statements)
+
+    assert ensure_schema(graph) == {"applied": [], "repaired": []}
+    assert len(graph.statements) == count
+
+    # A second instance on the same database is not checked again
+    same_database = FakeGraph(existing=required_objects(), uri="kg-test:7687")
+    ensure_schema(same_database)
+    assert same_database.statements == []
+
+    # Another database on the same server is
+    other_database = FakeGraph(existing=required_objects(), uri="kg-test:7687", database="archive")
+    ensure_schema(other_database)
+    assert other_database.statements
+
+    for bootstrapped in (graph, other_database):
+        schema_manager._bootstrapped.discard(schema_manager.database_key(bootstrapped))
+
+
+def test_report_label_scans(monkeypatch):
+    """Test that plans with scan operators are reported"""
+    plans = {
+        "scan": {"operatorType": "ProduceResults@neo4j", "children": [
+            {"operatorType": "Filter@neo4j", "children": [{"operatorType": "AllNodesScan@neo4j", "children": []}]}]},
+        "seek": {"operatorType": "ProduceResults@neo4j", "children": [
+            {"operatorType": "NodeIndexSeek@neo4j", "children": []}]},
+    }
+    monkeypatch.setattr(schema_manager, "explain", lambda graph, query, params: plans[query])
+
+    report = report_label_scans(None, {"bad": ("scan", {}), "good": ("seek", {})})
+
+    assert report == {"bad": ["AllNodesScan"]}
@@ -0,0 +1,104 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+from sys_evaluation.results_store import ResultsStore
+from sys_evaluation.sequential_eval import SequentialEvaluator, paired_difference_ci, stratified_order, store_report
+
+LABELS = ["left", "center", "right"]
+
+
+def make_articles(n, seed=0):
+    rng = random.Random(seed)
+    return [{"url": f"https://example.com/{i}", "title": f"Article {i}", "source": rng.choice(["A", "B"]),
+             "ground_truth_bias": LABELS[i % 3]} for i in range(n)]
+
+
+def arm(accuracy, seed):
+    """Fake system that labels an article correctly with the given probability"""
+    rng = random.Random(seed)
+
+    def run(batch):
+        for article in batch:
+            correct = rng.random() < accuracy
+            article["bias_result"] = {"bias": article["ground_truth_bias"] if correct else "unknown"}
+        return batch
+    return run
+
+
+def extract(articles):
+    return [a["ground_truth_bias"] for a in articles], [a["bias_result"]["bias"] for a in articles]
+
+
+def test_every_prefix_is_close_to_stratified():
+    articles = make_articles(300) + [dict(a, ground_truth_bias="left") for a in make_articles(300, seed=1)]
+    ordered = stratified_order(articles, strata=("ground_truth_bias",))
+    assert sorted(a["url"] for a in ordered) == sorted(a["url"] for a in articles)
+
+    prefix = ordered[:60]
+    share_left = sum(a["ground_truth_bias"] == "left" for a in prefix) / len(prefix)
+    assert share_left == pytest.approx(400 / 600, abs=0.05)
+
+
+def test_paired_ci_covers_difference_and_never_collapses():
+    correct_a = np.array([True] * 70 + [False] * 30)
+    correct_b = np.array([True] * 80 + [False] * 20)
+    ci = paired_difference_ci(correct_a, correct_b, alpha=0.05)
+    assert ci["difference"] == pytest.approx(0.1)
+    assert 0 < ci["lower"] < 0.1 < ci["upper"]
+
+    # Identical arms still get a non-zero width
+    same = paired_difference_ci(correct_a, correct_a, alpha=0.05)
+    assert same["half_width"] > 0
+    assert same["lower"] < 0 < same["upper"]
+
+
+def test_stops_early_once_interval_is_tight():
+    evaluator = SequentialEvaluator(arm(0.8, seed=1), arm(0.8, seed=1), extract, LABELS, batch_size=100,
+                                    target_half_width=0.03, min_samples=200)
+    report = evaluator.run(make_articles(5000))
+
+    assert report["stop_reason"] == "precision"
+    assert 200 <= report["evaluated"] < 5000
+    assert [i["n"] for i in report["interims"]] == list(range(100, report["evaluated"] + 1, 100))
+    assert report["metrics_a"]["accuracy"] == pytest.approx(report["interims"][-1]["accuracy_a"])
+
+
+def test_stops_on_significance_and_exhausts_otherwise():
+    articles = make_articles(2000)
+    decisive = SequentialEvaluator(arm(0.5, seed=1), arm(0.95, seed=2), extract, LABELS, batch_size=50,
+                                   target_half_width=0.0, min_samples=100, stop_on_significance=True)
+    report = decisive.run(articles)
+    assert report["stop_reason"] == "significant"
+    assert report["interims"][-1]["ci_lower"] > 0
+
+    strict = SequentialEvaluator(arm(0.5, seed=1), arm(0.95, seed=2), extract, LABELS, batch_size=500,
+                                 target_half_width=0.0)
+    assert strict.run(articles)["stop_reason"] == "exhausted"
+
+
+def test_misaligned_arms_are_rejected():
+    evaluator = SequentialEvaluator(arm(0.8, seed=1), lambda batch: arm(0.8, seed=2)(batch)[:-1], extract, LABELS,
+                                    batch_size=10)
+    with pytest.raises(ValueError):
+        evaluator.run(make_articles(20))
+
+
+def test_store_report_keeps_both_arms_and_interims(tmp_path):
+    evaluator = SequentialEvaluator(arm(0.6, seed=1), arm(0.9, seed=2), extract, LABELS, batch_size=20,
+                                    target_half_width=0.0)
+    report = evaluator.run(make_articles(60))
+    store = ResultsStore(root=str(tmp_path / "runs"))
+
+    run_id = store_report(report, "bias", {"prompt_version": "v1"}, store=store)
+    metadata = store.run_metadata(run_id)
+    assert metadata["mode"] == "sequential"
+    assert metadata["stop_reason"] == "exhausted"
+    assert len(metadata["interims"]) == 3
+    assert len(store.load(run_id, "llm_kg")) == 60
+    assert os.path.exists(os.path.join(store.root, f"run_id={run_id}", "interims.csv"))
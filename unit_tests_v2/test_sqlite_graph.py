@@ -0,0 +1,81 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+from langchain_core.documents import Document
+
+from src_v3.memory.sqlite_graph import SQLiteKnowledgeGraph
+
+ARTICLES = {
+    "https://example.com/a": ["Joe Biden", "Congress", "Medicare"],
+    "https://example.com/b": ["Joe Biden", "Congress"],
+    "https://example.com/c": ["Medicare"],
+}
+
+
+def fake_transformer():
+    """Transformer returning fixed entities per article url"""
+    def convert(documents):
+        url = documents[0].metadata["url"]
+        nodes = [Node(id=name, type="Person" if name == "Joe Biden" else "Organization") for name in ARTICLES[url]]
+        relationships = [Relationship(source=nodes[0], target=nodes[1], type="affiliated with")] \
+            if len(nodes) > 1 else []
+        return [GraphDocument(nodes=nodes, relationships=relationships, source=documents[0])]
+
+    transformer = MagicMock()
+    transformer.convert_to_graph_documents.side_effect = convert
+    return transformer
+
+
+@pytest.fixture
+def kg(tmp_path):
+    graph = SQLiteKnowledgeGraph(str(tmp_path / "kg.db"), article_transformer=fake_transformer())
+    for url in ARTICLES:
+        graph.add_article({"url": url, "title": f"Title {url[-1]}", "full_content": f"Body about {url[-1]}",
+                           "source": "CNN", "bias": "left" if url.endswith("a") else "right"})
+    yield graph
+    graph.close()
+
+
+def test_entity_queries(kg):
+    """Test shared-entity ranking, structural bias and relationship context"""
+    similar = kg.get_similar_articles("https://example.com/a")
+    assert [s["url"] for s in similar] == ["https://example.com/b", "https://example.com/c"]
+    assert similar[0]["shared_entities"] == 2
+
+    assert kg.query_most_structurally_similar_bias(["Joe Biden", "Medicare"]) == "Left"
+    assert kg.query_most_structurally_similar_bias(["Nobody"]) == "Unknown"
+
+    facts = kg.retrieve_related_facts_text(["Joe Biden"]).splitlines()
+    assert "Joe Biden -[AFFILIATED_WITH]-> Congress" in facts
+
+    # Offline-builder MENTIONS edges feed structural bias only, not shared-entity ranking
+    kg.merge_node("https://example.com/d", "Article")
+    kg.merge_relationship("https://example.com/d", "MENTIONS", "Joe Biden")
+    assert "https://example.com/d" not in [s["url"] for s in kg.get_similar_articles("https://example.com/b")]
+
+
+def test_full_text_search_and_bias_report(kg):
+    """Test FTS5 article search and the per-source bias report"""
+    kg.add_bias_analysis("https://example.com/a", {"bias": "Left", "confidence_score": 80})
+
+    assert [a["url"] for a in kg.retrieve_related_articles("about b")] == ["https://example.com/b"]
+    assert kg.get_bias_report("about a") == [{"source": "CNN", "assessment": "Left", "article_count": 1}]
+
+
+def test_bulk_graph_documents_and_backup(kg, tmp_path):
+    """Test a bulk write in one transaction and copying the database file"""
+    nodes = [Node(id=f"Person {i}", type="Person") for i in range(100)]
+    rels = [Relationship(source=nodes[i], target=nodes[i + 1], type="knows") for i in range(99)]
+    kg.add_graph_documents([GraphDocument(nodes=nodes, relationships=rels, source=Document(page_content=""))])
+
+    copy = SQLiteKnowledgeGraph(kg.backup(str(tmp_path / "copy.db")))
+    assert copy.stats() == kg.stats()
+    assert copy.get_node("Person 5")["id"] == "Person 5"
+    assert kg.add_fact_check_result("Person 1 knows Person 2", {"verdict": "True"}, ["Person 1", "Ghost"])
+    assert "factcheck" in kg.retrieve_related_facts_text(["Person 1"])
+    copy.close()
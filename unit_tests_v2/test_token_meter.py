@@ -0,0 +1,109 @@
+import os
+import sys
+import csv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import patch
+
+from src_v3.utils.rate_limiter import BedrockRateLimiter, Priority
+from src_v3.utils.token_meter import (
+    CSV_FIELDS,
+    TokenMeter,
+    current_attribution,
+    metering,
+    model_price,
+    response_token_usage,
+)
+
+SONNET = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+
+
+def converse_response(input_tokens, output_tokens):
+    return {"output": {}, "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens}}
+
+
+def test_usage_from_converse_and_invoke_model_headers():
+    assert response_token_usage(converse_response(12, 3)) == (12, 3)
+    headers = {"x-amzn-bedrock-input-token-count": "100", "x-amzn-bedrock-output-token-count": "20"}
+    assert response_token_usage({"ResponseMetadata": {"HTTPHeaders": headers}}) == (100, 20)
+    assert response_token_usage({"ResponseMetadata": {"HTTPHeaders": {}}}) is None
+
+
+def test_calls_are_attributed_to_nested_labels():
+    meter = TokenMeter(run_id="run-1")
+    with metering(agent="bias_analyzer", article="https://example.com/a"):
+        with metering(stage="entity_extraction"):
+            meter.record(SONNET, 1000, 100)
+        with metering(stage="bias_analysis", prompt_version="v1"):
+            meter.record(SONNET, 2000, 300)
+    assert current_attribution() == {}
+
+    rows = {row["stage"]: row for row in meter.rows()}
+    assert rows["entity_extraction"]["run"] == "run-1"
+    assert rows["entity_extraction"]["article"] == "https://example.com/a"
+    assert rows["bias_analysis"]["prompt_version"] == "v1"
+    assert rows["bias_analysis"]["cost_usd"] == pytest.approx(2 * 0.003 + 0.3 * 0.015)
+
+
+def test_summary_groups_and_orders_by_cost():
+    meter = TokenMeter(run_id="run-1")
+    for url in ("a", "b"):
+        with metering(run="llm_kg", agent="bias_analyzer", stage="bias_analysis", article=url):
+            meter.record(SONNET, 1000, 100)
+    with metering(run="llm_kg", agent="bias_analyzer", stage="entity_extraction", article="a"):
+        meter.record(SONNET, 100, 10)
+
+    summary = meter.summary(by=("run", "stage"))
+    assert [group["stage"] for group in summary] == ["bias_analysis", "entity_extraction"]
+    assert summary[0]["calls"] == 2
+    assert summary[0]["input_tokens"] == 2000
+
+
+def test_export_csv(tmp_path):
+    meter = TokenMeter(run_id="run-1")
+    with metering(agent="fact_checker"):
+        meter.record("unknown-model", 10, 5)
+    path = str(tmp_path / "usage.csv")
+
+    assert meter.export_csv(path) == 1
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == CSV_FIELDS
+    assert rows[0]["agent"] == "fact_checker"
+    assert float(rows[0]["cost_usd"]) == 0.0
+
+
+def test_rate_limited_calls_are_metered():
+    """Test that responses passing through the Bedrock limiter are recorded in the process meter"""
+    meter = TokenMeter(run_id="run-1")
+    limiter = BedrockRateLimiter(requests_per_minute=6000, tokens_per_minute=10 ** 7)
+    with patch("src_v3.utils.rate_limiter.get_token_meter", return_value=meter), metering(agent="bias_analyzer"):
+        limiter.call("converse", lambda **kwargs: converse_response(40, 8), Priority.BATCH,
+                     modelId=SONNET, messages=[])
+
+    rows = meter.rows()
+    assert rows[0]["model_id"] == SONNET
+    assert (rows[0]["input_tokens"], rows[0]["output_tokens"]) == (40, 8)
+
+
+def test_unknown_label_is_rejected():
+    with pytest.raises(ValueError):
+        with metering(user="x"):
+            pass
+
+
+def test_model_price_ignores_region_prefix():
+    assert model_price("us." + SONNET) == (0.003, 0.015)
+    assert model_price(None) is None
+
+
+def test_article_totals_per_run():
+    meter = TokenMeter(run_id="run-1")
+    for run in ("llm_only", "llm_kg"):
+        with metering(run=run, article="https://example.com/a"):
+            meter.record(SONNET, 100, 10)
+            meter.record(SONNET, 50, 5)
+    assert meter.article_totals(run="llm_kg") == {"https://example.com/a": (150, 15)}
+    assert meter.article_totals() == {"https://example.com/a": (300, 30)}
@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import MagicMock
+from langchain_core.documents import Document
+from langchain_community.graphs.graph_document import GraphDocument, Node
+
+from src_v3.utils import tracing
+from src_v3.utils.tracing import Tracer, current_span, format_trace, read_spans, slowest_traces, span, token_usage
+from src_v3.components.kg_builder.graph_artifacts import GraphArtifactStore, extract_graph_documents
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    tracing.set_tracer(Tracer(exporter="file", path=path))
+    yield path
+    tracing.set_tracer(None)
+
+
+def test_spans_nest_and_export(trace_file):
+    """Test parent/child ids, attributes and errors in the file export"""
+    with span("agent", article_count=2):
+        with span("stage.one") as stage:
+            stage.set_attribute("entity_count", 3)
+        with pytest.raises(ValueError):
+            with span("stage.two"):
+                raise ValueError("bad json")
+    assert current_span() is None
+
+    spans = {s["name"]: s for s in read_spans(trace_file)}
+    root = spans["agent"]
+    assert root["parent_id"] is None
+    assert len(root["trace_id"]) == 32 and len(root["span_id"]) == 16
+    assert spans["stage.one"]["parent_id"] == root["span_id"]
+    assert spans["stage.one"]["trace_id"] == root["trace_id"]
+    assert spans["stage.one"]["attributes"] == {"entity_count": 3}
+    assert spans["stage.two"]["status"] == "ERROR"
+    assert "bad json" in spans["stage.two"]["error"]
+
+    tree = format_trace(list(spans.values()))
+    assert tree.splitlines()[0].startswith("agent")
+    assert tree.splitlines()[1].startswith("  stage.one")
+
+
+def test_explicit_parent_for_worker_threads(trace_file):
+    """Test that spans started in another thread join the caller's trace when given a parent"""
+    def work(parent):
+        with span("article", parent=parent):
+            pass
+
+    with span("batch"):
+        worker = threading.Thread(target=work, args=(current_span(),))
+        worker.start()
+        worker.join()
+
+    spans = {s["name"]: s for s in read_spans(trace_file)}
+    assert spans["article"]["trace_id"] == spans["batch"]["trace_id"]
+    assert spans["article"]["parent_id"] == spans["batch"]["span_id"]
+
+
+def test_slowest_traces_orders_by_root_duration(trace_file):
+    spans = [
+        {"name": "fast", "trace_id": "a", "span_id": "1", "parent_id": None, "start": "1", "duration_ms": 5.0,
+         "status": "OK", "attributes": {}},
+        {"name": "slow", "trace_id": "b", "span_id": "2", "parent_id": None, "start": "2", "duration_ms": 50.0,
+         "status": "OK", "attributes": {}},
+    ]
+    assert [trace[0]["name"] for trace in slowest_traces(spans)] == ["slow", "fast"]
+
+
+def test_token_usage_reads_usage_metadata():
+    assert token_usage(MagicMock(usage_metadata={"input_tokens": 10, "output_tokens": 4})) == \
+        {"input_tokens": 10, "output_tokens": 4}
+    assert token_usage(object()) == {}
+
+
+def test_disabled_tracer_exports_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tracing.set_tracer(Tracer(exporter="none"))
+    try:
+        with span("quiet") as quiet:
+            pass
+        assert quiet.duration_ms is not None
+        assert not os.listdir(tmp_path)
+    finally:
+        tracing.set_tracer(None)
+
+
+def test_unknown_exporter_is_rejected():
+    with pytest.raises(ValueError):
+        Tracer(exporter="zipkin")
+
+
+def test_extraction_span_records_cache_hit(trace_file, tmp_path):
+    """Test the cache_hit attribute on graph extraction spans"""
+    transformer = MagicMock()
+    transformer.convert_to_graph_documents.return_value = [
+        GraphDocument(nodes=[Node(id="Senate", type="Organization")], relationships=[],
+                      source=Document(page_content=""))
+    ]
+    store = GraphArtifactStore(directory=str(tmp_path / "artifacts"))
+    article = {"url": "https://example.com/a", "full_content": "The Senate voted."}
+    documents = [Document(page_content="The Senate voted.")]
+
+    extract_graph_documents(transformer, documents, article, store=store)
+    extract_graph_documents(transformer, documents, article, store=store)
+
+    extractions = [s for s in read_spans(trace_file) if s["name"] == "kg.extract_graph"]
+    assert [s["attributes"]["cache_hit"] for s in extractions] == [False, True]
+    assert all(s["attributes"]["entity_count"] == 1 for s in extractions)
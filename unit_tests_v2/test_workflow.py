@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src_v3.workflow.graph import create_workflow, merge_article_results
+from src_v3.workflow.factory import get_workflow, clear_workflow_cache
+
+SAMPLE_ARTICLES = [
+    {"title": "Article One", "content": "First article content.", "url": "https://example.com/1"},
+    {"title": "Article Two", "content": "Second article content.", "url": "https://example.com/2"},
+]
+
+AGENT_DELAY = 0.3
+
+
+def slow_bias_agent(state, kg):
+    """Stand-in bias agent that takes a fixed amount of time"""
+    time.sleep(AGENT_DELAY)
+    new_state = state.copy()
+    for article in new_state.articles:
+        article["bias_result"] = {"bias": "Center"}
+    return new_state
+
+
+def slow_fact_checker(state, kg, store_to_kg=False):
+    """Stand-in fact checker that takes a fixed amount of time"""
+    time.sleep(AGENT_DELAY)
+    new_state = state.copy()
+    for article in new_state.articles:
+        article["fact_check_result"] = {"verdict": "True"}
+    return new_state
+
+
+class OverlappingAgents:
+    """
+    Stand-in agents that meet at a barrier before returning.
+
+    Run one after the other, the first agent's barrier wait times out and the
+    workflow fails; run side by side, both record their start before either ends.
+    """
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def _run(self, name, state, result_field, result):
+        self._record(("start", name))
+        self.barrier.wait()
+        new_state = state.copy()
+        for article in new_state.articles:
+            article[result_field] = result
+        self._record(("end", name))
+        return new_state
+
+    def bias_agent(self, state, kg):
+        return self._run("bias", state, "bias_result", {"bias": "Center"})
+
+    def fact_checker(self, state, kg, store_to_kg=False):
+        return self._run("fact_check", state, "fact_check_result", {"verdict": "True"})
+
+
+@pytest.fixture
+def patched_agents():
+    with patch("src_v3.workflow.graph.create_knowledge_graph", return_value=MagicMock()), \
+            patch("src_v3.workflow.graph.bias_analyzer_agent", side_effect=slow_bias_agent) as bias_mock, \
+            patch("src_v3.workflow.graph.fact_checker_agent", side_effect=slow_fact_checker) as fact_mock:
+        yield bias_mock, fact_mock
+
+
+def test_merge_article_results():
+    """Test the reducer used by the parallel branches"""
+    assert merge_article_results({"a": 1}, {"b": 2}) == {"a": 1, "b": 2}
+    assert merge_article_results(None, {"b": 2}) == {"b": 2}
+
+
+def test_parallel_workflow_merges_both_results():
+    """Test that the branches overlap and the join node attaches both results to each article"""
+    agents = OverlappingAgents()
+    with patch("src_v3.workflow.graph.create_knowledge_graph", return_value=MagicMock()), \
+            patch("src_v3.workflow.graph.bias_analyzer_agent", side_effect=agents.bias_agent), \
+            patch("src_v3.workflow.graph.fact_checker_agent", side_effect=agents.fact_checker):
+        workflow = create_workflow(parallel=True)
+        final_state = workflow.invoke({"articles": SAMPLE_ARTICLES})
+
+    assert final_state["current_status"] == "analyzed"
+    assert len(final_state["articles"]) == 2
+    for article in final_state["articles"]:
+        assert article["bias_result"] == {"bias": "Center"}
+        assert article["fact_check_result"] == {"verdict": "True"}
+
+    # Both branches started before either finished
+    assert [kind for kind, _ in agents.events] == ["start", "start", "end", "end"]
+
+
+def test_parallel_workflow_keeps_articles_without_identity_apart(patched_agents):
+    """Test that articles without url, title or content get their own results"""
+    bias_mock, fact_mock = patched_agents
+
+    def numbered_bias_agent(state, kg):
+        new_state = state.copy()
+        for i, article in enumerate(new_state.articles):
+            article["bias_result"] = {"bias": f"article-{i}"}
+        return new_state
+
+    bias_mock.side_effect = numbered_bias_agent
+    workflow = create_workflow(parallel=True)
+
+    final_state = workflow.invoke({"articles": [{"source": "a"}, {"source": "b"}]})
+
+    assert [a["bias_result"] for a in final_state["articles"]] == [{"bias": "article-0"}, {"bias": "article-1"}]
+    assert [a["source"] for a in final_state["articles"]] == ["a", "b"]
+
+
+def test_parallel_workflow_survives_dropped_articles(patched_agents):
+    """Test that an agent dropping a failed article does not shift the later results"""
+    bias_mock, fact_mock = patched_agents
+
+    def dropping_bias_agent(state, kg):
+        new_state = state.copy()
+        kept = []
+        for article in new_state.articles:
+            if article["title"] != "Article One":
+                article["bias_result"] = {"bias": article["title"]}
+                kept.append(article)
+        new_state.articles = kept
+        return new_state
+
+    bias_mock.side_effect = dropping_bias_agent
+    workflow = create_workflow(parallel=True)
+
+    final_state = workflow.invoke({"articles": SAMPLE_ARTICLES})
+
+    first, second = final_state["articles"]
+    assert "bias_result" not in first
+    assert second["bias_result"] == {"bias": "Article Two"}
+    assert all(a["fact_check_result"] == {"verdict": "True"} for a in final_state["articles"])
+    assert all("_fanout_index" not in a for a in final_state["articles"])
+
+
+def test_parallel_workflow_direct_fact_check_path(patched_agents):
+    """Test that a direct query still goes straight to the fact checker"""
+    bias_mock, fact_mock = patched_agents
+    workflow = create_workflow(parallel=True)
+
+    final_state = workflow.invoke({"news_query": "Company X grew 20% in Q3"})
+
+    assert fact_mock.call_count == 1
+    assert bias_mock.call_count == 0
+    assert not final_state.get("bias_results")
+
+
+def test_get_workflow_compiles_once_per_configuration():
+    """Test that concurrent callers share one compiled workflow and one KG"""
+    clear_workflow_cache()
+    with patch("src_v3.workflow.factory.create_knowledge_graph", return_value=MagicMock()) as kg_class, \
+            patch("src_v3.workflow.factory.create_workflow", side_effect=lambda **kwargs: object()) as create_mock:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            workflows = list(pool.map(lambda _: get_workflow(), range(16)))
+        parallel_workflow = get_workflow(parallel=True)
+
+    clear_workflow_cache()
+
+    assert all(w is workflows[0] for w in workflows)
+    assert parallel_workflow is not workflows[0]
+    assert create_mock.call_count == 2
+    assert kg_class.call_count == 1